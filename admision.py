@@ -0,0 +1,169 @@
+# Control de admisión de los análisis concurrentes.
+# Limita cuántos análisis usan el modelo a la vez; el resto espera en una cola
+# acotada con tiempo máximo, atendida por orden de llegada (turnos numerados).
+# Bajo presión se degrada en dos pasos: primero se
+# omite el análisis con Transformers (la etapa más cara) y después se rechaza
+# con una sugerencia de cuándo reintentar.
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Análisis simultáneos permitidos (por defecto, uno por CPU)
+MAX_CONCURRENTES = int(os.environ.get("CINEMASCOPE_MAX_CONCURRENTES", os.cpu_count() or 1))
+# Análisis que pueden esperar turno; el siguiente se rechaza de inmediato
+MAX_EN_ESPERA = int(os.environ.get("CINEMASCOPE_MAX_EN_ESPERA", 32))
+# Tiempo máximo de espera en cola (segundos)
+TIEMPO_MAX_ESPERA = float(os.environ.get("CINEMASCOPE_TIEMPO_MAX_ESPERA", 5.0))
+# Ocupación de la cola a partir de la cual se omite Transformers
+FRACCION_DEGRADACION = 0.25
+# Peso de cada nueva medida en la media móvil del tiempo de servicio
+ALFA_SERVICIO = 0.2
+
+class AnalisisRechazado(Exception):
+    """El análisis no se admitió; 'reintentar_en' sugiere la espera en segundos"""
+
+    def __init__(self, motivo, reintentar_en):
+        self.motivo = motivo
+        self.reintentar_en = reintentar_en
+        super().__init__(f"Servicio saturado ({motivo}): reintenta en {reintentar_en:.0f} s")
+
+class Permiso:
+    """Turno concedido: 'degradado' indica que debe omitirse Transformers"""
+
+    def __init__(self, degradado, espera_ms):
+        self.degradado = degradado
+        self.espera_ms = espera_ms
+
+class ControladorAdmision:
+    """Semáforo de concurrencia con cola de espera acotada y degradación
+
+    Uso:
+        with controlador.admitir() as permiso:
+            analyzer = None if permiso.degradado else analyzer_transformers
+            ...
+    """
+
+    def __init__(self, max_concurrentes=MAX_CONCURRENTES, max_en_espera=MAX_EN_ESPERA,
+                 tiempo_max_espera=TIEMPO_MAX_ESPERA, fraccion_degradacion=FRACCION_DEGRADACION):
+        self.max_concurrentes = max(1, max_concurrentes)
+        self.max_en_espera = max(0, max_en_espera)
+        self.tiempo_max_espera = tiempo_max_espera
+        self.umbral_degradacion = int(self.max_en_espera * fraccion_degradacion)
+        self._condicion = threading.Condition()
+        self._activos = 0
+        self._en_espera = 0
+        # Turnos de la cola: el que recibe el siguiente en llegar, el que puede
+        # entrar ahora y los que abandonaron por tiempo antes de que les tocara
+        self._proximo_turno = 0
+        self._turno_actual = 0
+        self._abandonados = set()
+        self._servicio_s = None # media móvil del tiempo de servicio
+        self.metricas = {
+            'admitidos': 0,
+            'degradados': 0,             # admitidos sin Transformers
+            'rechazados_cola_llena': 0,
+            'rechazados_tiempo': 0,
+            'en_curso': 0,
+            'en_espera': 0,
+            'max_en_espera': 0,
+            'espera_total_ms': 0.0,
+        }
+
+    def _reintentar_en(self):
+        """Estimación de cuándo habrá hueco: cola actual por tiempo de servicio"""
+        servicio = self._servicio_s or 1.0
+        return max(1.0, (self._en_espera + 1) * servicio / self.max_concurrentes)
+
+    def _rechazar(self, motivo, metrica):
+        self.metricas[metrica] += 1
+        raise AnalisisRechazado(motivo, self._reintentar_en())
+
+    def _avanzar_turno(self):
+        self._turno_actual += 1
+        while self._turno_actual in self._abandonados:
+            self._abandonados.remove(self._turno_actual)
+            self._turno_actual += 1
+        # Despierta a todos: solo el del turno actual puede entrar
+        self._condicion.notify_all()
+
+    def _abandonar(self, turno):
+        if turno == self._turno_actual:
+            self._avanzar_turno()
+        else:
+            self._abandonados.add(turno)
+
+    def adquirir(self):
+        """Espera turno y devuelve un Permiso, o lanza AnalisisRechazado"""
+        inicio = time.monotonic()
+        with self._condicion:
+            # Con gente esperando, los recién llegados van a la cola (sin colarse)
+            if self._activos >= self.max_concurrentes or self._en_espera:
+                if self._en_espera >= self.max_en_espera:
+                    self._rechazar("cola llena", 'rechazados_cola_llena')
+
+                # La presión se mide al llegar: cuántos esperaban por delante
+                degradado = self._en_espera >= self.umbral_degradacion
+                turno = self._proximo_turno
+                self._proximo_turno += 1
+                self._en_espera += 1
+                self.metricas['en_espera'] = self._en_espera
+                self.metricas['max_en_espera'] = max(self.metricas['max_en_espera'], self._en_espera)
+                try:
+                    limite = inicio + self.tiempo_max_espera
+                    # Entra solo cuando le toca y hay hueco: un hueco libre no
+                    # lo toma quien llegó después
+                    while self._turno_actual != turno or self._activos >= self.max_concurrentes:
+                        restante = limite - time.monotonic()
+                        if restante <= 0:
+                            # Si era su turno, pasa al siguiente de la cola
+                            self._abandonar(turno)
+                            self._rechazar("tiempo de espera agotado", 'rechazados_tiempo')
+                        self._condicion.wait(restante)
+                    self._avanzar_turno()
+                finally:
+                    self._en_espera -= 1
+                    self.metricas['en_espera'] = self._en_espera
+            else:
+                degradado = False
+
+            self._activos += 1
+            espera_ms = (time.monotonic() - inicio) * 1000
+            self.metricas['admitidos'] += 1
+            self.metricas['degradados'] += degradado
+            self.metricas['en_curso'] = self._activos
+            self.metricas['espera_total_ms'] += espera_ms
+        return Permiso(degradado, espera_ms)
+
+    def liberar(self, duracion_s=None):
+        with self._condicion:
+            self._activos -= 1
+            self.metricas['en_curso'] = self._activos
+            if duracion_s is not None:
+                if self._servicio_s is None:
+                    self._servicio_s = duracion_s
+                else:
+                    self._servicio_s += ALFA_SERVICIO * (duracion_s - self._servicio_s)
+            # Todos comprueban su turno; solo entra el primero de la cola
+            self._condicion.notify_all()
+
+    @contextmanager
+    def admitir(self):
+        permiso = self.adquirir()
+        inicio = time.monotonic()
+        try:
+            yield permiso
+        finally:
+            self.liberar(time.monotonic() - inicio)
+
+    def instantanea(self):
+        """Copia de las métricas con la espera media y la tasa de rechazo"""
+        with self._condicion:
+            metricas = dict(self.metricas)
+        rechazados = metricas['rechazados_cola_llena'] + metricas['rechazados_tiempo']
+        total = metricas['admitidos'] + rechazados
+        metricas['rechazados'] = rechazados
+        metricas['espera_media_ms'] = metricas['espera_total_ms'] / metricas['admitidos'] if metricas['admitidos'] else 0.0
+        metricas['tasa_rechazo'] = rechazados / total if total else 0.0
+        return metricas
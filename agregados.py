@@ -0,0 +1,111 @@
+# Agregados de sentimiento por película, actualizados de forma incremental.
+# Cada reseña actualiza contadores, media/varianza de pred_ensemble (Welford)
+# e histograma de niveles de confianza en O(1): nunca se recorren las reseñas.
+
+import time
+
+from almacen import abrir_conexion
+from confianza import NIVELES_CONFIANZA, indice_nivel
+
+# Columnas del histograma, en el mismo orden que confianza.NIVELES_CONFIANZA
+COLUMNAS_NIVEL = ('n_excepcional', 'n_muy_alta', 'n_alta', 'n_media_alta', 'n_buena')
+assert len(COLUMNAS_NIVEL) == len(NIVELES_CONFIANZA)
+
+ESQUEMA_AGREGADOS = f"""
+CREATE TABLE IF NOT EXISTS agregados_pelicula (
+    pelicula_id TEXT PRIMARY KEY,
+    n INTEGER NOT NULL,
+    positivas INTEGER NOT NULL,
+    negativas INTEGER NOT NULL,
+    media REAL NOT NULL,
+    m2 REAL NOT NULL,
+    {', '.join(f'{c} INTEGER NOT NULL' for c in COLUMNAS_NIVEL)},
+    actualizado_en REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_agregados_n ON agregados_pelicula (n);
+"""
+
+# Combinación de dos resúmenes (n, media, m2) con la fórmula de Chan et al.;
+# en el DO UPDATE las columnas sin prefijo son los valores anteriores de la fila
+SQL_ACTUALIZAR = f"""
+INSERT INTO agregados_pelicula (pelicula_id, n, positivas, negativas, media, m2,
+                                {', '.join(COLUMNAS_NIVEL)}, actualizado_en)
+VALUES (?, ?, ?, ?, ?, ?, {', '.join('?' for _ in COLUMNAS_NIVEL)}, ?)
+ON CONFLICT (pelicula_id) DO UPDATE SET
+    n = n + excluded.n,
+    positivas = positivas + excluded.positivas,
+    negativas = negativas + excluded.negativas,
+    media = media + (excluded.media - media) * excluded.n / CAST(n + excluded.n AS REAL),
+    m2 = m2 + excluded.m2
+         + (excluded.media - media) * (excluded.media - media) * n * excluded.n / CAST(n + excluded.n AS REAL),
+    {', '.join(f'{c} = {c} + excluded.{c}' for c in COLUMNAS_NIVEL)},
+    actualizado_en = excluded.actualizado_en
+"""
+
+def crear_esquema(conexion):
+    conexion.executescript(ESQUEMA_AGREGADOS)
+
+def resumir_lote(registros):
+    """Resume un lote por película con Welford: O(1) por reseña"""
+    resumenes = {}
+    for registro in registros:
+        pelicula_id = registro.get('pelicula_id')
+        if not pelicula_id:
+            continue
+        x = registro['pred_ensemble']
+        r = resumenes.get(pelicula_id)
+        if r is None:
+            # [n, positivas, negativas, media, m2, histograma...]
+            r = resumenes[pelicula_id] = [0, 0, 0, 0.0, 0.0] + [0] * len(COLUMNAS_NIVEL)
+        r[0] += 1
+        delta = x - r[3]
+        r[3] += delta / r[0]
+        r[4] += delta * (x - r[3])
+        if x > 0.5:
+            r[1] += 1
+        else:
+            r[2] += 1
+        if registro.get('confianza') is not None:
+            r[5 + indice_nivel(registro['confianza'])] += 1
+    return resumenes
+
+def aplicar_lote(conexion, registros):
+    """Procesador del almacén: suma el lote a los agregados (una fila por película)"""
+    resumenes = resumir_lote(registros)
+    if not resumenes:
+        return
+    ahora = time.time()
+    conexion.executemany(SQL_ACTUALIZAR, [
+        (pelicula_id, *r, ahora) for pelicula_id, r in resumenes.items()
+    ])
+
+def registrar_en_almacen(almacen):
+    """Crea las tablas de agregados y los alimenta con cada lote del almacén"""
+    conexion = abrir_conexion(almacen.ruta)
+    crear_esquema(conexion)
+    conexion.close()
+    almacen.agregar_procesador(aplicar_lote)
+
+def _fila_a_resumen(fila):
+    resumen = dict(fila)
+    n = resumen['n']
+    resumen['varianza'] = resumen['m2'] / (n - 1) if n > 1 else 0.0
+    resumen['desviacion'] = resumen['varianza'] ** 0.5
+    resumen['porcentaje_positivas'] = 100 * resumen['positivas'] / n if n else 0.0
+    resumen['histograma'] = {c: resumen[c] for c in COLUMNAS_NIVEL}
+    return resumen
+
+def consultar_pelicula(conexion, pelicula_id):
+    """Resumen precalculado de una película (None si no tiene reseñas)"""
+    fila = conexion.execute(
+        "SELECT * FROM agregados_pelicula WHERE pelicula_id = ?", (pelicula_id,)
+    ).fetchone()
+    return _fila_a_resumen(fila) if fila is not None else None
+
+def listar_peliculas(conexion, limite=50, minimo_resenas=1):
+    """Películas con más reseñas, leídas directamente de la tabla de agregados"""
+    filas = conexion.execute(
+        "SELECT * FROM agregados_pelicula WHERE n >= ? ORDER BY n DESC LIMIT ?",
+        (minimo_resenas, limite),
+    )
+    return [_fila_a_resumen(fila) for fila in filas]
@@ -0,0 +1,232 @@
+# Almacén persistente de análisis (SQLite en modo WAL).
+# Las escrituras pasan por una cola que vacía un hilo en segundo plano, así que
+# guardar un análisis nunca bloquea la petición que lo generó.
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+RUTA_ALMACEN = os.environ.get("CINEMASCOPE_DB", "cinemascope.db")
+
+# Tamaño máximo de la cola de escritura y de cada transacción
+MAX_COLA = 10000
+TAM_LOTE = 256
+# Espera máxima (segundos) antes de escribir un lote incompleto
+INTERVALO_ESCRITURA = 0.5
+# Conexiones de lectura que se conservan para reutilizar entre hilos (cada
+# ejecución de Streamlit corre en un hilo nuevo); las que sobran se cierran
+MAX_CONEXIONES_LECTURA = 4
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS analisis (
+    id INTEGER PRIMARY KEY,
+    creado_en REAL NOT NULL,
+    texto_hash TEXT NOT NULL,
+    longitud INTEGER NOT NULL,
+    pred_original REAL NOT NULL,
+    pred_ensemble REAL NOT NULL,
+    boost_consenso REAL NOT NULL,
+    boost_palabras REAL NOT NULL,
+    boost_intensidad REAL NOT NULL,
+    palabras_encontradas TEXT NOT NULL,
+    confianza REAL,
+    nivel_confianza TEXT,
+    con_transformers INTEGER NOT NULL,
+    t_tokenizacion_ms REAL,
+    t_modelo_ms REAL,
+    t_ensemble_ms REAL,
+    t_total_ms REAL,
+    version_modelo TEXT NOT NULL,
+    version_lexico TEXT NOT NULL,
+    pelicula_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_analisis_creado_en ON analisis (creado_en);
+CREATE INDEX IF NOT EXISTS idx_analisis_hash ON analisis (texto_hash, version_modelo, version_lexico, con_transformers);
+"""
+
+COLUMNAS = (
+    'creado_en', 'texto_hash', 'longitud', 'pred_original', 'pred_ensemble',
+    'boost_consenso', 'boost_palabras', 'boost_intensidad', 'palabras_encontradas',
+    'confianza', 'nivel_confianza', 'con_transformers', 't_tokenizacion_ms',
+    't_modelo_ms', 't_ensemble_ms', 't_total_ms', 'version_modelo', 'version_lexico',
+    'pelicula_id',
+)
+
+def abrir_conexion(ruta, lectura=False):
+    """Abre una conexión SQLite configurada para WAL
+
+    Las de 'lectura' no repiten los PRAGMA: journal_mode=WAL queda guardado
+    en el archivo y synchronous solo afecta a las escrituras.
+    """
+    conexion = sqlite3.connect(ruta, timeout=30, check_same_thread=False)
+    if not lectura:
+        conexion.execute("PRAGMA journal_mode=WAL")
+        # Con WAL, NORMAL es seguro ante caídas de la app y evita un fsync por transacción
+        conexion.execute("PRAGMA synchronous=NORMAL")
+    conexion.row_factory = sqlite3.Row
+    return conexion
+
+def migrar_esquema(conexion):
+    """Crea las tablas y agrega las columnas nuevas a almacenes existentes"""
+    conexion.executescript(ESQUEMA)
+    columnas = {fila[1] for fila in conexion.execute("PRAGMA table_info(analisis)")}
+    if 'pelicula_id' not in columnas:
+        conexion.execute("ALTER TABLE analisis ADD COLUMN pelicula_id TEXT")
+    conexion.commit()
+
+def registro_desde_analisis(analisis, version_modelo, version_lexico, con_transformers,
+                            confianza=None, nivel_confianza=None, pelicula_id=None):
+    """Convierte el resultado de nucleo.analizar_resena en una fila del almacén"""
+    tiempos = analisis.get('tiempos_ms', {})
+    return {
+        'creado_en': time.time(),
+        'texto_hash': analisis['texto_hash'],
+        'longitud': len(analisis['texto']),
+        'pred_original': float(analisis['pred_original']),
+        'pred_ensemble': float(analisis['pred_ensemble']),
+        'boost_consenso': float(analisis['boost_consenso']),
+        'boost_palabras': float(analisis['boost_palabras']),
+        'boost_intensidad': float(analisis['boost_intensidad']),
+        'palabras_encontradas': json.dumps(list(analisis['palabras_encontradas']), ensure_ascii=False),
+        'confianza': float(confianza) if confianza is not None else None,
+        'nivel_confianza': nivel_confianza,
+        'con_transformers': int(bool(con_transformers)),
+        't_tokenizacion_ms': tiempos.get('tokenizacion'),
+        't_modelo_ms': tiempos.get('modelo'),
+        't_ensemble_ms': tiempos.get('ensemble'),
+        't_total_ms': tiempos.get('total'),
+        'version_modelo': version_modelo,
+        'version_lexico': version_lexico,
+        'pelicula_id': pelicula_id or None,
+    }
+
+class AlmacenAnalisis:
+    """Guarda cada análisis y sirve como caché persistente de textos repetidos"""
+
+    def __init__(self, ruta=RUTA_ALMACEN, max_cola=MAX_COLA, tam_lote=TAM_LOTE,
+                 intervalo=INTERVALO_ESCRITURA):
+        self.ruta = ruta
+        self.tam_lote = tam_lote
+        self.intervalo = intervalo
+        self._cola = queue.Queue(maxsize=max_cola)
+        # Conexiones de lectura libres; cada consulta toma una en exclusiva
+        self._lectores = queue.LifoQueue(maxsize=MAX_CONEXIONES_LECTURA)
+        self._detener = threading.Event()
+        self._lock_metricas = threading.Lock()
+        self.metricas = {'encolados': 0, 'escritos': 0, 'descartados': 0, 'lotes': 0, 'errores': 0}
+
+        self._procesadores = []
+
+        conexion = abrir_conexion(ruta)
+        migrar_esquema(conexion)
+        conexion.close()
+
+        self._escritor = threading.Thread(target=self._bucle_escritura, name="cinemascope-almacen", daemon=True)
+        self._escritor.start()
+
+    def agregar_procesador(self, procesador):
+        """Registra procesador(conexion, lote): corre en la misma transacción que cada lote escrito"""
+        self._procesadores.append(procesador)
+
+    def guardar(self, registro):
+        """Encola un registro sin bloquear; si la cola está llena se descarta y se cuenta"""
+        try:
+            self._cola.put_nowait(registro)
+            self._contar('encolados')
+            return True
+        except queue.Full:
+            self._contar('descartados')
+            return False
+
+    def buscar(self, texto_hash, version_modelo, version_lexico, con_transformers):
+        """Último análisis guardado para el mismo texto, modelo, léxico y configuración"""
+        with self._conexion_lectura() as conexion:
+            fila = conexion.execute(
+                "SELECT * FROM analisis WHERE texto_hash = ? AND version_modelo = ? "
+                "AND version_lexico = ? AND con_transformers = ? ORDER BY id DESC LIMIT 1",
+                (texto_hash, version_modelo, version_lexico, int(bool(con_transformers))),
+            ).fetchone()
+        if fila is None:
+            return None
+        resultado = dict(fila)
+        resultado['palabras_encontradas'] = tuple(json.loads(resultado['palabras_encontradas']))
+        return resultado
+
+    def recientes(self, desde=None, limite=100):
+        """Análisis más recientes (usa el índice por fecha)"""
+        with self._conexion_lectura() as conexion:
+            if desde is None:
+                filas = conexion.execute(
+                    "SELECT * FROM analisis ORDER BY creado_en DESC LIMIT ?", (limite,))
+            else:
+                filas = conexion.execute(
+                    "SELECT * FROM analisis WHERE creado_en >= ? ORDER BY creado_en DESC LIMIT ?", (desde, limite))
+            return [dict(fila) for fila in filas]
+
+    def vaciar(self, espera=10.0):
+        """Espera a que la cola de escritura quede vacía (útil al cerrar o en benchmarks)"""
+        limite = time.monotonic() + espera
+        while self._cola.unfinished_tasks and time.monotonic() < limite:
+            time.sleep(0.01)
+        return not self._cola.unfinished_tasks
+
+    def cerrar(self):
+        self.vaciar()
+        self._detener.set()
+        self._escritor.join(timeout=5)
+        while True:
+            try:
+                self._lectores.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _contar(self, metrica, cantidad=1):
+        with self._lock_metricas:
+            self.metricas[metrica] += cantidad
+
+    @contextmanager
+    def _conexion_lectura(self):
+        """Presta una conexión de lectura del grupo (o abre una si no hay libres)"""
+        try:
+            conexion = self._lectores.get_nowait()
+        except queue.Empty:
+            conexion = abrir_conexion(self.ruta, lectura=True)
+        try:
+            yield conexion
+        finally:
+            try:
+                self._lectores.put_nowait(conexion)
+            except queue.Full:
+                conexion.close()
+
+    def _bucle_escritura(self):
+        conexion = abrir_conexion(self.ruta)
+        sql = f"INSERT INTO analisis ({', '.join(COLUMNAS)}) VALUES ({', '.join('?' for _ in COLUMNAS)})"
+        while not (self._detener.is_set() and self._cola.empty()):
+            try:
+                lote = [self._cola.get(timeout=self.intervalo)]
+            except queue.Empty:
+                continue
+            # Agrupamos todo lo que ya esté en cola en una sola transacción
+            while len(lote) < self.tam_lote:
+                try:
+                    lote.append(self._cola.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with conexion:
+                    conexion.executemany(sql, [tuple(r.get(c) for c in COLUMNAS) for r in lote])
+                    for procesador in self._procesadores:
+                        procesador(conexion, lote)
+                self._contar('escritos', len(lote))
+                self._contar('lotes')
+            except sqlite3.Error:
+                self._contar('errores')
+            finally:
+                for _ in lote:
+                    self._cola.task_done()
+        conexion.close()
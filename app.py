@@ -2,20 +2,13 @@
 # para clasificar reseñas de películas en inglés como POSITIVAS o NEGATIVAS.
 
 import streamlit as st
-import tensorflow as tf
-from tensorflow.keras.preprocessing.text import Tokenizer
-from tensorflow.keras.preprocessing.sequence import pad_sequences
 import numpy as np
 import time
+import os
 import re
-from collections import Counter
-
-# Intentamos importar transformers para análisis adicional
-try:
-    from transformers import pipeline
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+import hashlib
+import json
+import plotly.graph_objects as go
 
 # 1. Configuramos la página 
 st.set_page_config(
@@ -25,1248 +18,966 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# 2. CSS 
-st.markdown("""
-<style>
-    /* Importar fuentes */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&family=Space+Grotesk:wght@300;400;500;600;700&display=swap');
-    
-    /* Variables CSS */
-    :root {
-        --primary-gradient: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        --success-gradient: linear-gradient(135deg, #06d6a0 0%, #00b894 100%);
-        --danger-gradient: linear-gradient(135deg, #ff6b6b 0%, #ee5a52 100%);
-        --neutral-gradient: linear-gradient(135deg, #74b9ff 0%, #0984e3 100%);
-        --background-gradient: linear-gradient(135deg, #f8f9ff 0%, #e8eaf6 100%);
-        --card-shadow: 0 20px 60px rgba(0,0,0,0.08);
-        --hover-shadow: 0 30px 80px rgba(0,0,0,0.12);
-        --text-primary: #2d3436;
-        --text-secondary: #636e72;
-        --border-radius: 20px;
-        --animation-speed: 0.4s;
-    }
-    
-    /* Fondo de la app */
-    .main {
-        background: var(--background-gradient);
-        padding: 1rem 2rem;
-    }
-    
-    /* Header */
-    .hero-section {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
-        padding: 4rem 3rem;
-        border-radius: 30px;
-        margin-bottom: 3rem;
-        text-align: center;
-        color: white;
-        position: relative;
-        overflow: hidden;
-        box-shadow: var(--card-shadow);
-    }
-    
-    .hero-section::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: radial-gradient(circle at 30% 20%, rgba(255,255,255,0.1) 0%, transparent 50%),
-                    radial-gradient(circle at 70% 80%, rgba(255,255,255,0.05) 0%, transparent 50%);
-        pointer-events: none;
-    }
-    
-    .hero-content {
-        position: relative;
-        z-index: 1;
-    }
-    
-    .hero-title {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 3.5rem;
-        font-weight: 800;
-        margin-bottom: 1rem;
-        text-shadow: 2px 4px 8px rgba(0,0,0,0.2);
-        letter-spacing: -0.02em;
-    }
-    
-    .hero-subtitle {
-        font-family: 'Inter', sans-serif;
-        font-size: 1.4rem;
-        font-weight: 400;
-        opacity: 0.95;
-        margin-bottom: 1.5rem;
-        line-height: 1.6;
-    }
-    
-    .hero-description {
-        font-family: 'Inter', sans-serif;
-        font-size: 1.1rem;
-        font-weight: 300;
-        opacity: 0.9;
-        max-width: 600px;
-        margin: 0 auto;
-        line-height: 1.7;
-    }
-    
-    /* Badge */
-    .premium-badge {
-        display: inline-block;
-        background: rgba(255,255,255,0.2);
-        padding: 0.5rem 1.5rem;
-        border-radius: 50px;
-        font-size: 0.9rem;
-        font-weight: 600;
-        margin-bottom: 2rem;
-        backdrop-filter: blur(10px);
-        border: 1px solid rgba(255,255,255,0.1);
-    }
-    
-    /* Cards de características */
-    .features-showcase {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(320px, 1fr));
-        gap: 2rem;
-        margin: 3rem 0;
-    }
-    
-    .feature-card-premium {
-        background: white;
-        padding: 2.5rem;
-        border-radius: var(--border-radius);
-        text-align: center;
-        box-shadow: var(--card-shadow);
-        transition: all var(--animation-speed) cubic-bezier(0.4, 0, 0.2, 1);
-        position: relative;
-        overflow: hidden;
-        border: 1px solid rgba(255,255,255,0.8);
-    }
-    
-    .feature-card-premium::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.4), transparent);
-        transition: left 0.6s;
-    }
-    
-    .feature-card-premium:hover::before {
-        left: 100%;
-    }
-    
-    .feature-card-premium:hover {
-        transform: translateY(-10px) scale(1.02);
-        box-shadow: var(--hover-shadow);
-    }
-    
-    .feature-icon-premium {
-        font-size: 4rem;
-        margin-bottom: 1.5rem;
-        display: block;
-        filter: drop-shadow(0 4px 8px rgba(0,0,0,0.1));
-    }
-    
-    .feature-title-premium {
-        font-family: 'Space Grotesk', sans-serif;
-        font-weight: 700;
-        font-size: 1.4rem;
-        color: var(--text-primary);
-        margin-bottom: 1rem;
-    }
-    
-    .feature-description-premium {
-        color: var(--text-secondary);
-        font-size: 1rem;
-        line-height: 1.6;
-        font-family: 'Inter', sans-serif;
-    }
-    
-    /* Sección de análisis */
-    .analysis-section {
-        background: white;
-        padding: 3rem;
-        border-radius: 25px;
-        margin: 2rem 0;
-        box-shadow: var(--card-shadow);
-        border: 1px solid rgba(255,255,255,0.8);
-    }
-    
-    .section-title {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 2rem;
-        font-weight: 700;
-        color: var(--text-primary);
-        margin-bottom: 1rem;
-        text-align: center;
-    }
-    
-    .section-subtitle {
-        font-family: 'Inter', sans-serif;
-        color: var(--text-secondary);
-        text-align: center;
-        margin-bottom: 2rem;
-        font-size: 1.1rem;
-    }
-    
-    /* Área de texto */
-    .stTextArea > div > div > textarea {
-        border: 2px solid #e8eaf6;
-        border-radius: 15px;
-        padding: 1.5rem;
-        font-family: 'Inter', sans-serif;
-        font-size: 1rem;
-        transition: all 0.3s ease;
-        background: #fafbff;
-        resize: vertical;
-        color: var(--text-primary);
-    }
-    
-    .stTextArea > div > div > textarea::placeholder {
-        color: var(--text-secondary);
-        opacity: 0.8;
-    }
-    
-    .stTextArea > div > div > textarea:disabled {
-        color: #000 !important;
-        -webkit-text-fill-color: #000 !important;
-        opacity: 1 !important;
-        background: #e8eaf6;
-        text-shadow: none !important;
-        filter: none !important;
-    }
-    
-    .stTextArea > div > div > textarea:focus {
-        border-color: #667eea;
-        box-shadow: 0 0 0 4px rgba(102, 126, 234, 0.1);
-        background: white;
-    }
-    
-    /* Botones */
-    .stButton > button {
-        background: var(--primary-gradient);
-        color: white;
-        border: none;
-        border-radius: 15px;
-        padding: 1rem 2.5rem;
-        font-family: 'Inter', sans-serif;
-        font-weight: 600;
-        font-size: 1.1rem;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        box-shadow: 0 8px 30px rgba(102, 126, 234, 0.3);
-        width: 100%;
-        height: 60px;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 15px 40px rgba(102, 126, 234, 0.4);
-    }
-    
-    /* Botones de ejemplo */
-    .example-buttons {
-        display: grid;
-        grid-template-columns: 1fr 1fr;
-        gap: 1rem;
-        margin: 2rem 0;
-    }
-    
-    .example-btn-positive {
-        background: var(--success-gradient);
-        color: white;
-        padding: 1.2rem;
-        border-radius: 15px;
-        text-align: center;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        box-shadow: 0 8px 25px rgba(6, 214, 160, 0.25);
-        font-family: 'Inter', sans-serif;
-        font-weight: 600;
-    }
-    
-    .example-btn-negative {
-        background: var(--danger-gradient);
-        color: white;
-        padding: 1.2rem;
-        border-radius: 15px;
-        text-align: center;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        box-shadow: 0 8px 25px rgba(255, 107, 107, 0.25);
-        font-family: 'Inter', sans-serif;
-        font-weight: 600;
-    }
-    
-    .example-btn-positive:hover,
-    .example-btn-negative:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 15px 35px rgba(0,0,0,0.2);
-    }
-    
-    /* Resultados */
-    .result-card-positive {
-        background: var(--success-gradient);
-        color: white;
-        padding: 3rem;
-        border-radius: 25px;
-        text-align: center;
-        margin: 2rem 0;
-        box-shadow: 0 20px 60px rgba(6, 214, 160, 0.3);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .result-card-negative {
-        background: var(--danger-gradient);
-        color: white;
-        padding: 3rem;
-        border-radius: 25px;
-        text-align: center;
-        margin: 2rem 0;
-        box-shadow: 0 20px 60px rgba(255, 107, 107, 0.3);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .result-card-positive::before,
-    .result-card-negative::before {
-        content: '';
-        position: absolute;
-        top: -50%;
-        right: -50%;
-        width: 100%;
-        height: 100%;
-        background: radial-gradient(circle, rgba(255,255,255,0.1) 0%, transparent 70%);
-        pointer-events: none;
-    }
-    
-    .result-title-premium {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 2.5rem;
-        font-weight: 800;
-        margin-bottom: 1rem;
-        position: relative;
-        z-index: 1;
-    }
-    
-    .result-description {
-        font-family: 'Inter', sans-serif;
-        font-size: 1.2rem;
-        margin-bottom: 2rem;
-        opacity: 0.95;
-        position: relative;
-        z-index: 1;
-    }
-    
-    /* Métricas */
-    .metrics-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(120px, 1fr));
-        gap: 1.5rem;
-        margin: 2rem 0;
-    }
-    
-    .metric-card {
-        background: rgba(255,255,255,0.15);
-        padding: 1.5rem;
-        border-radius: 15px;
-        text-align: center;
-        backdrop-filter: blur(20px);
-        border: 1px solid rgba(255,255,255,0.2);
-    }
-    
-    .metric-value {
-        font-size: 2.2rem;
-        font-weight: 800;
-        display: block;
-        margin-bottom: 0.5rem;
-        font-family: 'Space Grotesk', sans-serif;
-    }
-    
-    .metric-label {
-        font-size: 0.9rem;
-        opacity: 0.9;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        font-weight: 600;
-        font-family: 'Inter', sans-serif;
-    }
-    
-    /* Progress bar */
-    .progress-container-premium {
-        background: rgba(255,255,255,0.2);
-        border-radius: 10px;
-        overflow: hidden;
-        margin: 1.5rem 0;
-        height: 12px;
-        position: relative;
-    }
-    
-    .progress-bar-premium {
-        height: 100%;
-        background: linear-gradient(90deg, rgba(255,255,255,0.8), rgba(255,255,255,0.6));
-        border-radius: 10px;
-        transition: width 1s cubic-bezier(0.4, 0, 0.2, 1);
-        position: relative;
-    }
-    
-    .progress-bar-premium::after {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.4), transparent);
-        animation: shimmer 2s infinite;
-    }
-    
-    @keyframes shimmer {
-        0% { left: -100%; }
-        100% { left: 100%; }
-    }
-    
-    /* Instrucciones */
-    .instructions-card {
-        background: linear-gradient(135deg, #f8f9ff 0%, #e8eaf6 100%);
-        padding: 2.5rem;
-        border-radius: 20px;
-        margin: 2rem 0;
-        border: 1px solid rgba(102, 126, 234, 0.1);
-        box-shadow: 0 10px 30px rgba(0,0,0,0.05);
-    }
-    
-    .instructions-title {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 1.5rem;
-        font-weight: 700;
-        color: var(--text-primary);
-        margin-bottom: 1.5rem;
-        text-align: center;
-    }
-    
-    .instruction-step {
-        display: flex;
-        align-items: center;
-        margin: 1rem 0;
-        padding: 1rem;
-        background: white;
-        border-radius: 15px;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.05);
-        transition: transform 0.3s ease;
-    }
-    
-    .instruction-step:hover {
-        transform: translateX(5px);
-    }
-    
-    .step-number {
-        background: var(--primary-gradient);
-        color: white;
-        width: 40px;
-        height: 40px;
-        border-radius: 50%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        margin-right: 1rem;
-        font-weight: 700;
-        font-family: 'Space Grotesk', sans-serif;
-    }
-    
-    .step-text {
-        font-family: 'Inter', sans-serif;
-        color: var(--text-primary);
-        font-weight: 500;
-        font-size: 1.05rem;
-    }
-    
-    /* Footer */
-    .footer-premium {
-        background: linear-gradient(135deg, #2d3436 0%, #636e72 100%);
-        color: white;
-        padding: 3rem;
-        border-radius: 25px;
-        margin-top: 4rem;
-        text-align: center;
-    }
-    
-    .footer-title {
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 1.5rem;
-        font-weight: 700;
-        margin-bottom: 1rem;
-    }
-    
-    .footer-description {
-        font-family: 'Inter', sans-serif;
-        opacity: 0.9;
-        margin-bottom: 2rem;
-        font-size: 1.1rem;
-    }
-    
-    .tech-stack {
-        display: flex;
-        justify-content: center;
-        gap: 2rem;
-        flex-wrap: wrap;
-    }
-    
-    .tech-item {
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-        padding: 0.5rem 1rem;
-        background: rgba(255,255,255,0.1);
-        border-radius: 10px;
-        font-weight: 600;
-    }
-    
-    /* Animaciones */
-    @keyframes fadeInUp {
-        from {
-            opacity: 0;
-            transform: translateY(50px);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
-    
-    @keyframes pulse {
-        0%, 100% { transform: scale(1); }
-        50% { transform: scale(1.05); }
-    }
-    
-    .fade-in-up {
-        animation: fadeInUp 0.8s cubic-bezier(0.4, 0, 0.2, 1);
-    }
-    
-    .pulse {
-        animation: pulse 2s infinite;
-    }
-    
-    /* Responsive design */
-    @media (max-width: 768px) {
-        .hero-title {
-            font-size: 2.5rem;
-        }
-        
-        .features-showcase {
-            grid-template-columns: 1fr;
-        }
-        
-        .example-buttons {
-            grid-template-columns: 1fr;
-        }
-        
-        .metrics-grid {
-            grid-template-columns: repeat(2, 1fr);
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# 3. Parámetros clave actualizados para CNN+BiGRU
-VOCAB_SIZE = 20000
-SEQUENCE_LENGTH = 300
-MODEL_PATH = "sentiment_cnn_bigru.h5"
-
-# 3b. Funciones de Análisis Avanzado con IA
+# 2. CSS y plantillas estáticas
+# El CSS se sirve como archivo estático (ver .streamlit/config.toml): cada
+# ejecución solo envía la etiqueta <link> y el navegador lo descarga una vez.
+DIRECTORIO_APP = os.path.dirname(os.path.abspath(__file__))
+RUTA_ESTILOS = os.path.join(DIRECTORIO_APP, "static", "estilos.css")
+URL_ESTILOS = "app/static/estilos.css"
+
+@st.cache_data
+def version_estilos():
+    """Huella del CSS para invalidar la caché del navegador cuando cambia"""
+    with open(RUTA_ESTILOS, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+def minificar_html(html):
+    """Colapsa los espacios igual que el navegador para no enviarlos en cada ejecución"""
+    return re.sub(r"\s+", " ", html).strip()
+
+@st.cache_data
+def cargar_plantilla(nombre):
+    """Lee y minifica una plantilla HTML estática (una vez por proceso)"""
+    with open(os.path.join(DIRECTORIO_APP, "plantillas", f"{nombre}.html"), encoding="utf-8") as f:
+        return minificar_html(f.read())
+
+def mostrar_plantilla(nombre):
+    st.markdown(cargar_plantilla(nombre), unsafe_allow_html=True)
+
+# Mensajes de la animación de carga (duración total en segundos)
+DURACION_PROGRESO = 2.0
+ETAPAS_PROGRESO = [
+    '🔍 Procesando vocabulario cinematográfico...',
+    '🧠 Analizando con capas CNN especializadas...',
+    '🔄 Evaluando contexto con BiGRU...',
+    '✨ Generando veredicto final del crítico IA...',
+]
+
+st.markdown(f'<link rel="stylesheet" href="{URL_ESTILOS}?v={version_estilos()}">', unsafe_allow_html=True)
+
+# 3. Parámetros clave y núcleo de análisis (ver nucleo.py)
+from nucleo import (
+    VOCAB_SIZE, SEQUENCE_LENGTH, MODEL_PATH,
+    VERSION_LEXICO, huella_texto,
+    texto_a_secuencia, analizar_resena, analizar_lote, analizar_oraciones,
+)
+import nucleo
+from en_vivo import PlanificadorEnVivo
+from almacen import AlmacenAnalisis, RUTA_ALMACEN, registro_desde_analisis
+import agregados
+from autoajuste_hilos import preparar_hilos
+from confianza import (calcular_confianza, CalibradorConfianza, NIVELES_CONFIANZA,
+                       CONFIANZA_MINIMA, CONFIANZA_MAXIMA)
+from idioma import evaluar_entrada
+from admision import ControladorAdmision, AnalisisRechazado
+from destilacion import ModeloRapido, RUTA_MODELO_RAPIDO, analizar_rapido, analizar_lote_rapido
+from artefactos import cargar_modelo_y_tokenizer
+from versiones import GestorModelos
+from sombra import ComparadorSombra, RUTA_MODELO_SOMBRA
+from evaluacion import RUTA_INFORME
+from aspectos import analizar_aspectos, ICONOS_ASPECTO
+from sondeo import sondear
+from multiples import (SEPARADORES, MAX_RESENAS_MULTIPLES, EXTENSIONES_MULTIPLES, separar_resenas,
+                       leer_resenas_archivo, filas_resultados, resumen_multiples)
+import sqlite3
+
+# 3b. Recursos compartidos entre sesiones
 @st.cache_resource
 def cargar_analizador_transformers():
     """Carga un modelo de transformers para análisis adicional"""
-    if TRANSFORMERS_AVAILABLE:
-        try:
-            # Usamos un modelo pre-entrenado de Hugging Face
-            analyzer = pipeline("sentiment-analysis", 
-                              model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                              return_all_scores=True)
-            return analyzer
-        except:
-            return None
-    return None
+    return nucleo.cargar_analizador_transformers()
 
-def analizar_palabras_clave_avanzado(texto):
-    """Análisis avanzado de palabras clave con pesos específicos"""
-    texto_lower = texto.lower()
-    
-    # Palabras clave con pesos específicos para películas
-    palabras_muy_positivas = {
-        'masterpiece': 5, 'brilliant': 4, 'outstanding': 4, 'exceptional': 4,
-        'magnificent': 4, 'phenomenal': 4, 'incredible': 3, 'amazing': 3,
-        'fantastic': 3, 'excellent': 3, 'superb': 3, 'wonderful': 3,
-        'perfect': 3, 'flawless': 4, 'stunning': 3, 'breathtaking': 4
-    }
-    
-    palabras_positivas = {
-        'good': 2, 'great': 2, 'nice': 1, 'enjoyable': 2, 'entertaining': 2,
-        'solid': 2, 'decent': 1, 'satisfying': 2, 'impressive': 2,
-        'compelling': 2, 'engaging': 2, 'captivating': 3, 'recommend': 2
-    }
-    
-    palabras_muy_negativas = {
-        'terrible': -4, 'awful': -4, 'horrible': -4, 'disaster': -5,
-        'pathetic': -4, 'dreadful': -4, 'abysmal': -5, 'atrocious': -5,
-        'unwatchable': -5, 'waste': -3, 'boring': -3, 'stupid': -3,
-        'ridiculous': -3, 'disappointing': -3, 'worst': -4
-    }
-    
-    palabras_negativas = {
-        'bad': -2, 'poor': -2, 'weak': -2, 'mediocre': -2, 'bland': -2,
-        'forgettable': -2, 'predictable': -2, 'slow': -1, 'confusing': -2,
-        'overrated': -2, 'cliché': -2, 'generic': -2
-    }
-    
-    # Calculamos puntuación
-    puntuacion = 0
-    palabras_encontradas = []
-    
-    for palabra, peso in {**palabras_muy_positivas, **palabras_positivas}.items():
-        if palabra in texto_lower:
-            puntuacion += peso
-            palabras_encontradas.append(f"+{palabra}({peso})")
-    
-    for palabra, peso in {**palabras_muy_negativas, **palabras_negativas}.items():
-        if palabra in texto_lower:
-            puntuacion += peso # peso ya es negativo
-            palabras_encontradas.append(f"{palabra}({peso})")
-    
-    return puntuacion, palabras_encontradas
+# 4. Cargamos modelo y tokenizer (una sola vez por proceso)
+# Antes de cargar el modelo se fijan los hilos de TensorFlow medidos para este
+# host (autoajuste_hilos.py); si nunca se midieron, se miden aquí mismo antes de
+# cargar el modelo (solo el primer arranque; con CINEMASCOPE_AUTOAJUSTE_HILOS=0
+# se omite y hay que ejecutar `python autoajuste_hilos.py` como paso aparte).
+AUTOAJUSTE_HILOS = os.environ.get("CINEMASCOPE_AUTOAJUSTE_HILOS", "1") != "0"
 
-def analizar_intensidad_emocional(texto):
-    """Analiza la intensidad emocional del texto"""
-    texto_lower = texto.lower()
-    
-    # Indicadores de intensidad
-    intensificadores = ['very', 'extremely', 'incredibly', 'absolutely', 'totally', 
-                       'completely', 'utterly', 'really', 'truly', 'definitely']
-    
-    signos_exclamacion = texto.count('!')
-    mayusculas = sum(1 for c in texto if c.isupper())
-    palabras_repetidas = len([word for word, count in Counter(texto_lower.split()).items() if count > 1])
-    
-    intensidad = 0
-    intensidad += sum(2 for intensificador in intensificadores if intensificador in texto_lower)
-    intensidad += signos_exclamacion * 1.5
-    intensidad += min(mayusculas / 10, 3) # Máximo 3 puntos por mayúsculas
-    intensidad += palabras_repetidas * 0.5
-    
-    return min(intensidad, 10) # Máximo 10
+@st.cache_resource
+def obtener_configuracion_hilos():
+    if not os.path.exists(MODEL_PATH):
+        return None
+    return preparar_hilos(MODEL_PATH, autoajustar_si_falta=AUTOAJUSTE_HILOS)
 
-def ensemble_prediccion_avanzada(pred_original, texto, analyzer_transformers=None):
-    """Sistema ensemble que combina múltiples análisis para mejorar confianza"""
-    
-    # 1. Predicción original del modelo CNN+BiGRU
-    peso_original = 0.4
-    
-    # 2. Análisis de palabras clave
-    puntuacion_palabras, palabras_encontradas = analizar_palabras_clave_avanzado(texto)
-    # Normalizar puntuación de palabras (-10 a +10) a (0 a 1)
-    pred_palabras = max(0, min(1, (puntuacion_palabras + 10) / 20))
-    peso_palabras = 0.3
-    
-    # 3. Análisis de intensidad emocional
-    intensidad = analizar_intensidad_emocional(texto)
-    # La intensidad amplifica la confianza pero no cambia la dirección
-    factor_intensidad = 1 + (intensidad / 20) # 1.0 a 1.5
-    
-    # 4. Análisis con Transformers 
-    pred_transformers = 0.5 # neutral por defecto
-    peso_transformers = 0.0
-    
-    if analyzer_transformers and TRANSFORMERS_AVAILABLE:
+@st.cache_resource
+def cargar_modelos():
+    obtener_configuracion_hilos()
+    # Modelo compacto (compactacion.py) si existe para este .h5; si no, el .h5
+    # convertido una vez en SavedModel (artefactos.py). El gestor vigila el .h5
+    # y cambia a la versión nueva en caliente cuando se despliega (versiones.py)
+    gestor = GestorModelos(MODEL_PATH, cargar_modelo_y_tokenizer).cargar().vigilar()
+    analyzer_transformers = cargar_analizador_transformers()
+    return gestor, analyzer_transformers
+
+# 4c. Almacén persistente de análisis (también caché de textos repetidos)
+@st.cache_resource
+def obtener_almacen():
+    """Almacén compartido por todas las sesiones (None si no se puede abrir)"""
+    try:
+        almacen = AlmacenAnalisis(RUTA_ALMACEN)
+        agregados.registrar_en_almacen(almacen)
+        return almacen
+    except sqlite3.Error:
+        return None
+
+# Control de admisión compartido por todas las sesiones (ver admision.py):
+# bajo carga se omite Transformers y, si la cola se llena, se rechaza
+@st.cache_resource
+def obtener_controlador_admision():
+    return ControladorAdmision()
+
+def analizar_con_admision(texto, modelo, tokenizer, analyzer_transformers):
+    """analizar_resena() con turno del controlador; lanza AnalisisRechazado si no hay hueco"""
+    with obtener_controlador_admision().admitir() as permiso:
+        analyzer = None if permiso.degradado else analyzer_transformers
+        return analizar_resena(texto, modelo, tokenizer, analyzer)
+
+def analizar_con_almacen(texto, version, analyzer_transformers):
+    """Reutiliza el análisis guardado de este texto o lo calcula con la versión dada del modelo"""
+    almacen = obtener_almacen()
+    if almacen is not None:
         try:
-            resultado = analyzer_transformers(texto[:512]) # Limitar longitud
-            if resultado and len(resultado[0]) >= 2:
-                # Buscar scores de positivo y negativo
-                scores = {item['label'].lower(): item['score'] for item in resultado[0]}
-                if 'positive' in scores and 'negative' in scores:
-                    pred_transformers = scores['positive']
-                    peso_transformers = 0.3
-                    peso_original = 0.3 # Reducir peso del modelo original
-                    peso_palabras = 0.2
-        except:
-            pass
-    
-    # 5. Combinar predicciones con ensemble ponderado
-    pred_ensemble = (pred_original * peso_original + 
-                    pred_palabras * peso_palabras + 
-                    pred_transformers * peso_transformers)
-    
-    # Normalizar pesos
-    peso_total = peso_original + peso_palabras + peso_transformers
-    if peso_total > 0:
-        pred_ensemble = pred_ensemble / peso_total
-    
-    # 6. Aplicar factor de intensidad
-    if pred_ensemble > 0.5:
-        pred_ensemble = min(1.0, 0.5 + (pred_ensemble - 0.5) * factor_intensidad)
+            guardado = almacen.buscar(huella_texto(texto), version.version,
+                                      VERSION_LEXICO, bool(analyzer_transformers))
+        except sqlite3.Error:
+            guardado = None
+        if guardado is not None:
+            guardado.update(texto=texto, desde_almacen=True, version_modelo=version.version)
+            return guardado
+    analisis = analizar_con_admision(texto, version.modelo, version.tokenizer, analyzer_transformers)
+    analisis['version_modelo'] = version.version
+    # Copia en sombra al motor candidato, si hay uno (no espera ni cambia la respuesta)
+    sombra = obtener_comparador_sombra()
+    if sombra is not None:
+        sombra.observar(texto, analisis)
+    return analisis
+
+def guardar_analisis(analisis, confianza, nivel_confianza, pelicula_id=None):
+    """Encola el análisis en el almacén sin bloquear la respuesta"""
+    almacen = obtener_almacen()
+    # Los resultados del modelo rápido no deben servirse como si fueran del completo
+    if almacen is None or analisis.get('nivel') == 'rapido':
+        return
+    almacen.guardar(registro_desde_analisis(
+        analisis, analisis['version_modelo'], VERSION_LEXICO, analisis['con_transformers'],
+        confianza, nivel_confianza, pelicula_id,
+    ))
+
+# 4d. Calibración opcional de la confianza (tabla ajustada offline con confianza.py)
+RUTA_CALIBRACION = os.environ.get("CINEMASCOPE_CALIBRACION", "calibracion.npz")
+
+@st.cache_resource
+def obtener_calibrador():
+    if not os.path.exists(RUTA_CALIBRACION):
+        return None
+    try:
+        return CalibradorConfianza.cargar(RUTA_CALIBRACION)
+    except (OSError, KeyError, ValueError):
+        return None
+
+def niveles_confianza_markdown(calibrada):
+    """Líneas con los rangos de confianza.NIVELES_CONFIANZA y qué significa la cifra"""
+    lineas = []
+    techo = CONFIANZA_MAXIMA
+    for umbral, nivel, descripcion in NIVELES_CONFIANZA:
+        # La fórmula nunca baja de CONFIANZA_MINIMA; la calibrada sí
+        suelo = umbral if umbral or calibrada else CONFIANZA_MINIMA
+        lineas.append(f"- **{suelo}-{techo}%:** {nivel} ({descripcion})")
+        techo = umbral
+    if calibrada:
+        nota = ("🎯 **Confianza calibrada:** tasa de aciertos observada con datos etiquetados "
+                "para predicciones igual de alejadas de 0.5; puede bajar del 60%.")
     else:
-        pred_ensemble = max(0.0, 0.5 - (0.5 - pred_ensemble) * factor_intensidad)
-    
-    # 7. Calculamos confianza mejorada basada en consenso
-    consenso = 1.0
-    if peso_transformers > 0:
-        # Si tenemos transformers, calcular consenso
-        diferencia_modelos = abs(pred_original - pred_transformers)
-        consenso = max(0.5, 1.0 - diferencia_modelos)
-    
-    # Boost de confianza por consenso y análisis múltiple
-    boost_consenso = consenso * 20 # Hasta 20% de boost
-    boost_palabras = min(15, abs(puntuacion_palabras) * 3) # Hasta 15% por palabras clave
-    boost_intensidad = min(10, intensidad * 2) # Hasta 10% por intensidad
-    
-    return pred_ensemble, boost_consenso, boost_palabras, boost_intensidad, palabras_encontradas
+        nota = (f"ℹ️ **Fórmula con boosts:** la cifra se acota a {CONFIANZA_MINIMA}-{CONFIANZA_MAXIMA}% "
+                "y no es una probabilidad de acierto medida.")
+    return lineas, nota
 
-# 4. Función para crear un tokenizer simple (compatible con el modelo CNN+BiGRU)
+# 4e. Primer nivel opcional: modelo rápido destilado (ver destilacion.py)
 @st.cache_resource
-def crear_tokenizer():
-    # Creamos un tokenizer básico que simule el comportamiento del TextVectorization
-    # En un caso real, tenemos que guardar y cargar el tokenizer usado durante el entrenamiento
-    tokenizer = Tokenizer(num_words=VOCAB_SIZE, oov_token="<OOV>", filters='!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n')
-    
-    # Vocabulario más extenso para reseñas de películas
-    sample_texts = [
-        "this movie film is great amazing excellent wonderful fantastic brilliant masterpiece outstanding superb",
-        "terrible awful horrible bad worst disappointing boring stupid waste pathetic dreadful",
-        "good nice decent okay fine entertaining watchable enjoyable pleasant satisfying",
-        "love like enjoy recommend must watch see definitely worth viewing",
-        "hate dislike boring predictable disappointing avoid skip terrible",
-        "the and or but with for of in at on by from to as",
-        "movie film cinema story plot acting performance direction screenplay",
-        "characters dialogue script writing cinematography editing sound music",
-        "effects visual special makeup costume design production values",
-        "director producer cast actor actress star lead supporting role",
-        "drama comedy action thriller horror romance adventure fantasy",
-        "scene sequence moment part chapter episode beginning middle end",
-        "watch watching watched viewer audience experience entertainment",
-        "time long short duration pacing rhythm flow tempo",
-        "quality high low budget expensive cheap production value"
-    ]
-    
-    tokenizer.fit_on_texts(sample_texts)
-    return tokenizer
-
-# 5. Convertimos el texto en secuencia de índices para la red CNN+BiGRU
-def texto_a_secuencia(texto, tokenizer):
-    texto = texto.lower().strip()
-    # Convertir texto a secuencia de enteros
-    secuencia = tokenizer.texts_to_sequences([texto])
-    
-    # Aseguramos que tenemos una secuencia válida
-    if not secuencia or not secuencia[0]:
-        # Si no hay tokens reconocidos, creamos una secuencia con tokens desconocidos
-        palabras = texto.split()
-        secuencia = [[min(i+1, VOCAB_SIZE-1) for i in range(len(palabras))]]
-    
-    # Padding/truncating a la longitud correcta
-    secuencia_padded = pad_sequences(secuencia, maxlen=SEQUENCE_LENGTH, padding='post', truncating='post')
-    
-    # ✅ FORMA CORRECTA CONFIRMADA: (1, 300, 1) - 3D con última dimensión 1
-    secuencia_3d = np.expand_dims(secuencia_padded, axis=-1)  # (1, 300) -> (1, 300, 1)
-    
-    return secuencia_3d.astype('int32')
+def obtener_modelo_rapido():
+    if not os.path.exists(RUTA_MODELO_RAPIDO):
+        return None
+    try:
+        return ModeloRapido.cargar(RUTA_MODELO_RAPIDO)
+    except (OSError, KeyError, ValueError):
+        return None
 
-# 5b. Función para crear datos de prueba con la forma correcta
-def crear_secuencia_prueba():
-    """Crea una secuencia de prueba con la forma correcta (1, 300, 1)"""
-    import numpy as np
-    # ✅ Usar la forma que sabemos que funciona: (1, 300, 1)
-    secuencia_3d = np.random.randint(1, min(1000, VOCAB_SIZE), size=(1, SEQUENCE_LENGTH, 1))
-    return secuencia_3d.astype('int32')
+# 4f. Modo sombra opcional: un motor candidato puntúa en segundo plano una
+# muestra de los análisis para compararlo con el vigente (ver sombra.py)
+@st.cache_resource
+def obtener_comparador_sombra():
+    if not RUTA_MODELO_SOMBRA or not os.path.exists(RUTA_MODELO_SOMBRA):
+        return None
+    modelo, tokenizer = cargar_modelo_y_tokenizer(RUTA_MODELO_SOMBRA)
+    return ComparadorSombra(
+        modelo, tokenizer,
+        analyzer_transformers=cargar_analizador_transformers(),
+        controlador=obtener_controlador_admision(),
+        nombre=os.path.basename(RUTA_MODELO_SOMBRA),
+    )
 
-# 6. Función principal de la app
-def main():
-    # Hero Section 
-    st.markdown("""
-    <div class="hero-section fade-in-up">
-        <div class="hero-content">
-            <div class="premium-badge">🚀 POWERED BY CNN+BiGRU</div>
-            <div class="hero-title">🎬 CinemaScope AI</div>
-            <div class="hero-subtitle">🎯 Análisis Avanzado de Reseñas de Películas con IA</div>
-            <div class="hero-description">
-                ✨ Tecnología de vanguardia que combina Redes Neuronales Convolucionales (CNN) con 
-                GRU Bidireccionales para analizar reseñas de películas con precisión cinematográfica.
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+# 4g. Exactitud y latencia medidas offline con evaluacion.py (si hay informe)
+RUTA_EVALUACION = os.environ.get("CINEMASCOPE_EVALUACION", RUTA_INFORME)
+# Motor que usa la app, por preferencia: compacto si existe, si no SavedModel
+PREFERENCIA_MOTORES = ("compacto", "savedmodel", "keras", "destilado")
 
-    # Features Showcase
-    st.markdown("""
-    <div class="features-showcase fade-in-up">
-        <div class="feature-card-premium">
-            <div class="feature-icon-premium">🔬</div>
-            <div class="feature-title-premium">Arquitectura CNN+BiGRU</div>
-            <div class="feature-description-premium">
-                Combina la detección de patrones locales de CNN con el procesamiento 
-                secuencial bidireccional de GRU para análisis preciso de reseñas cinematográficas
-            </div>
-        </div>
-        <div class="feature-card-premium">
-            <div class="feature-icon-premium">📊</div>
-            <div class="feature-title-premium">Entrenado con IMDb</div>
-            <div class="feature-description-premium">
-                Modelo entrenado con miles de reseñas reales de IMDb, procesando 
-                hasta 20,000 palabras únicas especializadas en crítica cinematográfica
-            </div>
-        </div>
-        <div class="feature-card-premium">
-            <div class="feature-icon-premium">⚡</div>
-            <div class="feature-title-premium">Crítico IA Instantáneo</div>
-            <div class="feature-description-premium">
-                Análisis instantáneo de reseñas con la precisión de un crítico experto, 
-                optimizado para el lenguaje cinematográfico y narrativo
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+@st.cache_data
+def _leer_informe_evaluacion(ruta, modificado):
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
 
-    # Cargamos modelo y tokenizer
-    @st.cache_resource
-    def cargar_modelo_y_tokenizador():
-        modelo = tf.keras.models.load_model(MODEL_PATH)
-        tokenizer = crear_tokenizer()
-        analyzer_transformers = cargar_analizador_transformers()
-        return modelo, tokenizer, analyzer_transformers
+def resultado_evaluado(analisis):
+    """Fila del informe de evaluación para la configuración de este análisis (None si no hay)"""
+    try:
+        informe = _leer_informe_evaluacion(RUTA_EVALUACION, os.path.getmtime(RUTA_EVALUACION))
+    except (OSError, ValueError):
+        return None
+    if analisis.get('nivel') == 'rapido':
+        configuracion = "rapido"
+    else:
+        if informe.get('version_modelo') != analisis.get('version_modelo'):
+            # Informe de otros pesos: sus cifras no describen este modelo
+            return None
+        configuracion = f"completo/{nucleo.MODO_TRANSFORMERS}" if analisis.get('con_transformers') else "cnn+lexico"
+    filas = [r for r in informe.get('configuraciones', [])
+             if r.get('configuracion') == configuracion and r.get('exactitud') is not None]
+    if not filas:
+        return None
+    return min(filas, key=lambda r: PREFERENCIA_MOTORES.index(r['motor'])
+               if r['motor'] in PREFERENCIA_MOTORES else len(PREFERENCIA_MOTORES))
 
-    # Instrucciones
-    st.markdown("""
-    <div class="instructions-card fade-in-up">
-        <div class="instructions-title">🎯 ¿Cómo usar CinemaScope AI?</div>
-        <div class="instruction-step">
-            <div class="step-number">1</div>
-            <div class="step-text">🎬 Ingresa tu reseña de película en inglés: opiniones, críticas o comentarios cinematográficos</div>
-        </div>
-        <div class="instruction-step">
-            <div class="step-number">2</div>
-            <div class="step-text">🚀 Presiona "Analizar Reseña" para procesar con CNN+BiGRU especializado en cine</div>
-        </div>
-        <div class="instruction-step">
-            <div class="step-number">3</div>
-            <div class="step-text">📊 Obtén análisis detallado como un crítico profesional con métricas de confianza</div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+# 5. Análisis al confirmar: re-puntúa la reseña cada vez que se confirma el texto.
+# El on_change de st.text_area solo se dispara al salir del campo o con Ctrl+Enter,
+# no con cada tecla, así que no hay debounce; solo se sondea (cada
+# INTERVALO_SONDEO_VIVO s) mientras una inferencia está pendiente.
+INTERVALO_SONDEO_VIVO = 0.25
 
+def _notificar_cambio_vivo():
+    planificador = st.session_state.get('planificador_vivo')
+    if planificador is not None:
+        planificador.notificar(st.session_state.texto_input)
+
+def _puntuar_en_vivo(texto, gestor, analyzer_transformers):
     try:
-        modelo, tokenizer, analyzer_transformers = cargar_modelo_y_tokenizador()
-        
-        # Sección de Análisis
-        st.markdown("""
-        <div class="analysis-section fade-in-up">
-            <div class="section-title">🎬 Centro de Crítica Cinematográfica IA</div>
-            <div class="section-subtitle">
-                🔍 Tecnología CNN+BiGRU especializada en análisis de reseñas de películas
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2 = st.columns([4, 1])
-        
-        with col1:
-            texto_usuario = st.text_area(
-                "🎬 Reseña de Película",
-                height=140,
-                placeholder="✍️ Ejemplo: This movie is absolutely brilliant! The cinematography is stunning, the acting is superb, and the plot keeps you engaged from start to finish. The director created a masterpiece with incredible character development and a soundtrack that perfectly complements every scene. A must-watch film that deserves all the praise!",
-                help="💡 Ingresa tu reseña de película en inglés para analizar si es positiva o negativa",
-                key="texto_input"
+        # Versión vigente en cada inferencia: el planificador vive toda la sesión
+        with gestor.usar() as version:
+            return analizar_con_admision(texto, version.modelo, version.tokenizer, analyzer_transformers)
+    except AnalisisRechazado as e:
+        return {'texto': texto, 'descartado': {
+            'apta': False, 'idioma': None, 'motivo': 'saturacion',
+            'mensaje': f"Servicio saturado: reintenta en {e.reintentar_en:.0f} s al volver a confirmar el texto.",
+        }}
+
+@st.fragment(run_every=INTERVALO_SONDEO_VIVO)
+def _esperar_analisis_en_vivo(planificador):
+    """Sondeo activo solo mientras hay inferencia pendiente; al terminar, una
+    ejecución completa pinta el resultado y el fragmento deja de existir"""
+    planificador.sondear()
+    if not planificador.en_curso():
+        st.rerun()
+    st.caption("🔄 Analizando...")
+
+def seccion_analisis_en_vivo(gestor, analyzer_transformers):
+    """Muestra el último resultado del análisis al confirmar"""
+    if 'planificador_vivo' not in st.session_state:
+        st.session_state.planificador_vivo = PlanificadorEnVivo(
+            lambda texto: _puntuar_en_vivo(texto, gestor, analyzer_transformers),
+            espera=0,
+        )
+        texto_actual = st.session_state.get('texto_input', '')
+        if texto_actual.strip():
+            st.session_state.planificador_vivo.notificar(texto_actual)
+    planificador = st.session_state.planificador_vivo
+
+    resultado = planificador.sondear()
+    stats = planificador.estadisticas
+
+    if resultado is None:
+        if not planificador.en_curso():
+            st.caption("⚡ Escribe una reseña y sal del campo (o pulsa Ctrl+Enter): se analizará automáticamente.")
+    elif resultado.get('error'):
+        st.error(f"❌ **Error en el análisis automático:** {resultado['error']}")
+    elif resultado.get('descartado'):
+        st.markdown(f"**⚡ Análisis automático:** 🌐 {resultado['descartado']['mensaje']}")
+    else:
+        prob_pos = resultado['pred_ensemble'] * 100
+        veredicto = "🌟 POSITIVA" if prob_pos > 50 else "👎 NEGATIVA"
+        st.markdown(f"**⚡ Análisis automático:** {veredicto} — {prob_pos:.1f}% positivo")
+    if planificador.en_curso():
+        _esperar_analisis_en_vivo(planificador)
+
+    latencia = f"{stats['latencia_ms']:.0f} ms" if stats['latencia_ms'] is not None else "—"
+    st.caption(
+        f"🧮 Inferencias: {stats['inferencias']} · ⏭️ Omitidas: {stats['omitidas']} · "
+        f"🗑️ Descartadas: {stats['descartadas']} · ♻️ Reutilizadas: {stats['reutilizadas']} · "
+        f"❌ Errores: {stats['errores']} · ⏱️ Latencia extremo a extremo: {latencia}"
+    )
+
+# 5b. Desglose por oraciones (una sola pasada del modelo para todas)
+def mostrar_desglose_oraciones(texto, modelo, tokenizer):
+    try:
+        with obtener_controlador_admision().admitir():
+            oraciones = analizar_oraciones(texto, modelo, tokenizer)
+    except AnalisisRechazado:
+        st.caption("⏳ Desglose por oraciones omitido por alta carga.")
+        return
+    if len(oraciones) < 2:
+        return
+
+    st.markdown("##### 🧩 Sentimiento por Oración")
+    figura = go.Figure(go.Bar(
+        x=[o['indice'] + 1 for o in oraciones],
+        y=[(o['pred'] - 0.5) * 200 for o in oraciones],
+        marker_color=["#38ef7d" if o['pred'] > 0.5 else "#ff6b6b" for o in oraciones],
+        customdata=[[o['oracion'] if len(o['oracion']) <= 120 else o['oracion'][:117] + "...",
+                     ", ".join(o['palabras_encontradas']) or "—"] for o in oraciones],
+        hovertemplate="<b>Oración %{x}</b><br>%{customdata[0]}<br>Palabras clave: %{customdata[1]}<extra></extra>",
+    ))
+    figura.update_layout(
+        height=300, margin=dict(t=20, b=40),
+        xaxis=dict(title="Oración", dtick=1),
+        yaxis=dict(title="← Negativa · Positiva →", range=[-100, 100]),
+    )
+    st.plotly_chart(figura, use_container_width=True)
+
+# 5c. Sentimiento por aspecto (actuación, trama, música, ...)
+def mostrar_aspectos(texto, modelo, tokenizer):
+    try:
+        with obtener_controlador_admision().admitir():
+            aspectos = analizar_aspectos(texto, modelo, tokenizer)
+    except AnalisisRechazado:
+        st.caption("⏳ Análisis por aspectos omitido por alta carga.")
+        return
+    if not aspectos:
+        return
+
+    st.markdown("##### 🎯 Sentimiento por Aspecto")
+    emojis = {"positiva": "💚", "negativa": "🔴", "neutral": "⚪"}
+    columnas = st.columns(min(4, len(aspectos)))
+    for i, (aspecto, resumen) in enumerate(aspectos.items()):
+        with columnas[i % len(columnas)]:
+            n = len(resumen['menciones'])
+            st.metric(
+                label=f"{ICONOS_ASPECTO[aspecto]} {aspecto}",
+                value=f"{emojis[resumen['polaridad']]} {resumen['pred'] * 100:.0f}%",
+                help=f"{n} mención{'es' if n != 1 else ''}: " + " · ".join(f"“{m['ventana']}”" for m in resumen['menciones'][:3]),
             )
 
-        with col2:
-            st.markdown("<br><br>", unsafe_allow_html=True)
-            analizar_btn = st.button("🚀 Analizar Reseña", type="primary", key="analyze_btn")
-            
-            # Botón de prueba del modelo
-            st.markdown("<br>", unsafe_allow_html=True)
-            test_btn = st.button("🔧 Probar Modelo", help="Prueba el modelo con datos sintéticos", key="test_btn")
+# 5d. Varias reseñas a la vez: una sola llamada a analizar_lote() para todas
+def seccion_multiples(version, analyzer_transformers):
+    with st.expander("📚 Analizar varias reseñas a la vez"):
+        separador = st.selectbox("✂️ Separador entre reseñas", list(SEPARADORES), key="separador_multiples")
+        texto = st.text_area(
+            "📝 Reseñas",
+            height=180,
+            placeholder="Great acting and a moving story.\n\nBoring, predictable and far too long.",
+            help="💡 Pega varias reseñas separadas con el separador elegido",
+            key="texto_multiples",
+        )
+        archivo = st.file_uploader(
+            "📂 ...o sube un archivo", type=list(EXTENSIONES_MULTIPLES), key="archivo_multiples",
+            help="💡 .txt con el separador elegido, o CSV/Parquet/Arrow con una columna 'texto' o 'review' (y 'id' opcional)",
+        )
+        if st.button("🚀 Analizar Todas", key="analizar_multiples_btn"):
+            try:
+                if archivo is not None:
+                    textos, ids = leer_resenas_archivo(archivo.name, archivo.getvalue(), SEPARADORES[separador])
+                else:
+                    textos, ids = separar_resenas(texto, SEPARADORES[separador]), None
+            except (ValueError, OSError) as e:
+                st.error(f"❌ No se pudo leer el archivo: {e}")
+                return
+            if not textos:
+                st.warning("⚠️ No hay reseñas que analizar.")
+                return
+            if len(textos) > MAX_RESENAS_MULTIPLES:
+                st.warning(f"⚠️ Se analizan las primeras {MAX_RESENAS_MULTIPLES} de {len(textos)} reseñas.")
+                textos = textos[:MAX_RESENAS_MULTIPLES]
+                ids = ids[:MAX_RESENAS_MULTIPLES] if ids is not None else None
 
-        # Ejemplos Rápidos
-        st.markdown("#### 💡 Ejemplos de Reseñas Cinematográficas:")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if st.button("🌟 Reseña Positiva", help="Cargar ejemplo de reseña positiva de película", key="positive_example"):
-                st.session_state.ejemplo_texto = "This movie is absolutely brilliant! The cinematography is stunning, the acting is superb, and the plot keeps you engaged from start to finish. The director created a masterpiece with incredible character development and a soundtrack that perfectly complements every scene. A must-watch film that deserves all the praise!"
+            try:
+                # Con el nivel rápido activo, el modelo completo solo puntúa las dudosas
+                modelo_rapido = obtener_modelo_rapido() if st.session_state.get('nivel_rapido') else None
+                with st.spinner(f"Analizando {len(textos)} reseñas en un solo lote..."):
+                    with obtener_controlador_admision().admitir() as permiso:
+                        analyzer = None if permiso.degradado else analyzer_transformers
+                        def completo(pendientes):
+                            return analizar_lote(pendientes, version.modelo, version.tokenizer, analyzer)
+                        inicio = time.perf_counter()
+                        analisis = (analizar_lote_rapido(textos, modelo_rapido, completo) if modelo_rapido is not None
+                                    else completo(textos))
+                        duracion = time.perf_counter() - inicio
+            except AnalisisRechazado as e:
+                st.warning(f"⏳ Servicio saturado. Vuelve a intentarlo en unos {e.reintentar_en:.0f} s.")
+                return
+
+            calibrador = obtener_calibrador() if st.session_state.get('confianza_calibrada') else None
+            filas = filas_resultados(analisis, ids, calibrador)
+            pelicula_id = st.session_state.get('pelicula_id', '').strip()
+            for a, fila in zip(analisis, filas):
+                if not a.get('descartado'):
+                    a['version_modelo'] = version.version
+                    guardar_analisis(a, fila['confianza'], fila['nivel'], pelicula_id)
+            st.session_state.resultados_multiples = {'filas': filas, 'duracion_s': duracion}
+
+        resultados = st.session_state.get('resultados_multiples')
+        if resultados:
+            mostrar_resultados_multiples(resultados)
+
+def mostrar_resultados_multiples(resultados):
+    filas = resultados['filas']
+    resumen = resumen_multiples(filas)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("📝 Reseñas", f"{resumen['puntuadas']:,}")
+    col2.metric("💚 Positivas", f"{resumen['porcentaje_positivas']:.1f}%")
+    col3.metric("🎯 Media ensemble", f"{resumen['media']:.3f}" if resumen['media'] is not None else "—")
+    col4.metric("🔒 Confianza media", f"{resumen['confianza_media']:.1f}%" if resumen['confianza_media'] is not None else "—")
+    st.caption(
+        f"⏱️ {resumen['n']} reseñas en {resultados['duracion_s']:.2f} s "
+        f"({1000 * resultados['duracion_s'] / resumen['n']:.1f} ms por reseña, un solo lote) · "
+        f"🌐 Descartadas por idioma: {resumen['descartadas']} · "
+        + " · ".join(f"{nivel}: {n}" for nivel, n in resumen['niveles'].items() if n)
+    )
+    st.dataframe(
+        filas,
+        column_config={
+            'id': st.column_config.TextColumn("ID"),
+            'resena': st.column_config.TextColumn("Reseña", width="large"),
+            'sentimiento': st.column_config.TextColumn("Sentimiento"),
+            'positivo': st.column_config.ProgressColumn("Positivo", format="%.1f%%", min_value=0, max_value=100),
+            'pred_ensemble': None,
+            'confianza': st.column_config.NumberColumn("Confianza", format="%.1f%%"),
+            'nivel': st.column_config.TextColumn("Nivel"),
+            'palabras_clave': st.column_config.TextColumn("Palabras clave"),
+            'con_transformers': st.column_config.CheckboxColumn("Transformers"),
+            'nivel_rapido': st.column_config.CheckboxColumn("🏎️ Rápido"),
+        },
+        use_container_width=True,
+        hide_index=True,
+    )
+
+# 6. Sección de análisis: es un fragmento, así que los botones y el texto
+# solo vuelven a ejecutar esta zona (no las secciones estáticas ni la carga).
+# Cada ejecución fija la versión vigente del modelo: si se despliega otra a
+# mitad de un análisis, este termina con la suya
+@st.fragment
+def seccion_analisis(gestor, analyzer_transformers):
+    with gestor.usar() as version:
+        _seccion_analisis(gestor, version, analyzer_transformers)
+        seccion_multiples(version, analyzer_transformers)
+
+def _seccion_analisis(gestor, version, analyzer_transformers):
+    modelo, tokenizer = version.modelo, version.tokenizer
+    col1, col2 = st.columns([4, 1])
+    
+    with col1:
+        texto_usuario = st.text_area(
+            "🎬 Reseña de Película",
+            height=140,
+            placeholder="✍️ Ejemplo: This movie is absolutely brilliant! The cinematography is stunning, the acting is superb, and the plot keeps you engaged from start to finish. The director created a masterpiece with incredible character development and a soundtrack that perfectly complements every scene. A must-watch film that deserves all the praise!",
+            help="💡 Ingresa tu reseña de película en inglés para analizar si es positiva o negativa",
+            key="texto_input",
+            on_change=_notificar_cambio_vivo
+        )
+
+        st.text_input(
+            "🎞️ ID de Película (opcional)",
+            placeholder="Ej: tt0111161",
+            help="💡 Asocia la reseña a una película para ver su sentimiento agregado en la página de agregados",
+            key="pelicula_id"
+        )
+
+        calibrador = obtener_calibrador()
+        if calibrador is not None:
+            st.toggle(f"🎯 Confianza calibrada ({calibrador.metodo})",
+                      help="Usa la tasa de aciertos medida con datos etiquetados en lugar de la fórmula con boosts",
+                      key="confianza_calibrada")
+
+        if obtener_modelo_rapido() is not None:
+            st.toggle("🏎️ Nivel rápido (modelo destilado)",
+                      help="Responde con el modelo destilado cuando está seguro; si duda, usa el sistema completo",
+                      key="nivel_rapido")
+
+        modo_vivo = st.toggle("⚡ Análisis al confirmar",
+                              help="Re-analiza la reseña automáticamente al salir del campo o pulsar Ctrl+Enter (no tecla a tecla)",
+                              key="modo_vivo")
+        if modo_vivo:
+            seccion_analisis_en_vivo(gestor, analyzer_transformers)
+        elif 'planificador_vivo' in st.session_state:
+            st.session_state.pop('planificador_vivo').cerrar()
+
+    with col2:
+        st.markdown("<br><br>", unsafe_allow_html=True)
+        analizar_btn = st.button("🚀 Analizar Reseña", type="primary", key="analyze_btn")
         
-        with col2:
-            if st.button("👎 Reseña Negativa", help="Cargar ejemplo de reseña negativa de película", key="negative_example"):
-                st.session_state.ejemplo_texto = "This movie was a complete disaster! The plot was confusing and boring, the acting was terrible, and the dialogue felt forced and unnatural. The pacing was awful, dragging on for what felt like hours. Poor direction, weak characters, and a waste of talented actors. Definitely not worth watching - save your time and money!"
+        # Botón de prueba del modelo
+        st.markdown("<br>", unsafe_allow_html=True)
+        test_btn = st.button("🔧 Probar Modelo", help="Prueba el modelo con datos sintéticos", key="test_btn")
 
-        # Usar texto de ejemplo si se seleccionó
-        if hasattr(st.session_state, 'ejemplo_texto'):
-            st.text_area("📝 Reseña Cargada:", value=st.session_state.ejemplo_texto, height=100, disabled=True, key="loaded_text")
-            texto_usuario = st.session_state.ejemplo_texto
+    # Ejemplos Rápidos
+    st.markdown("#### 💡 Ejemplos de Reseñas Cinematográficas:")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("🌟 Reseña Positiva", help="Cargar ejemplo de reseña positiva de película", key="positive_example"):
+            st.session_state.ejemplo_texto = "This movie is absolutely brilliant! The cinematography is stunning, the acting is superb, and the plot keeps you engaged from start to finish. The director created a masterpiece with incredible character development and a soundtrack that perfectly complements every scene. A must-watch film that deserves all the praise!"
+    
+    with col2:
+        if st.button("👎 Reseña Negativa", help="Cargar ejemplo de reseña negativa de película", key="negative_example"):
+            st.session_state.ejemplo_texto = "This movie was a complete disaster! The plot was confusing and boring, the acting was terrible, and the dialogue felt forced and unnatural. The pacing was awful, dragging on for what felt like hours. Poor direction, weak characters, and a waste of talented actors. Definitely not worth watching - save your time and money!"
 
-        # Procesamiento y Resultados
-        if test_btn:
-            st.markdown("#### 🔧 Prueba del Modelo con Datos Sintéticos")
-            try:
-                # Crear secuencia de prueba con la forma correcta
-                secuencia_prueba = crear_secuencia_prueba()
-                st.write(f"🔍 **Secuencia de prueba creada:** Forma: {secuencia_prueba.shape}, Tipo: {secuencia_prueba.dtype}")
-                
-                # Probar predicción
-                pred_prueba = modelo.predict(secuencia_prueba, verbose=0)[0][0]
-                st.success(f"✅ **¡Modelo funcionando perfectamente!** Predicción de prueba: {pred_prueba:.4f}")
-                
-                # Mostrar información del modelo
+    # Usar texto de ejemplo si se seleccionó
+    if hasattr(st.session_state, 'ejemplo_texto'):
+        st.text_area("📝 Reseña Cargada:", value=st.session_state.ejemplo_texto, height=100, disabled=True, key="loaded_text")
+        texto_usuario = st.session_state.ejemplo_texto
+
+    # Procesamiento y Resultados
+    if test_btn:
+        st.markdown("#### 🔧 Autoprueba y Capacidad del Modelo")
+        try:
+            # Lotes sintéticos de varios tamaños y longitudes (ver sondeo.py)
+            with st.spinner("Sondeando el modelo con lotes sintéticos..."):
+                with obtener_controlador_admision().admitir():
+                    sondeo = sondear(modelo, tokenizer)
+            if sondeo['listo']:
+                st.success(f"✅ **¡Modelo listo para recibir tráfico!** Hasta {sondeo['resenas_por_segundo_max']:,.0f} reseñas/s "
+                           f"· Latencia p95 de una reseña: {sondeo['latencia_p95_individual_ms']:.0f} ms")
+            else:
+                st.error("❌ **El modelo no supera la autoprueba:** " + "; ".join(sondeo['problemas']))
+
+            if sondeo['curvas']:
+                figura = go.Figure()
+                for longitud in sorted({c['longitud'] for c in sondeo['curvas']}):
+                    puntos = [c for c in sondeo['curvas'] if c['longitud'] == longitud]
+                    figura.add_trace(go.Scatter(
+                        x=[c['tamano_lote'] for c in puntos], y=[c['resenas_por_segundo'] for c in puntos],
+                        mode="lines+markers", name=f"{longitud} tokens",
+                    ))
+                figura.update_layout(
+                    height=300, margin=dict(t=20, b=40),
+                    xaxis=dict(title="Tamaño de lote", type="log"),
+                    yaxis=dict(title="Reseñas/s"),
+                )
+                st.plotly_chart(figura, use_container_width=True)
+                st.dataframe([{
+                    'Lote': c['tamano_lote'], 'Tokens': c['longitud'],
+                    'Reseñas/s': round(c['resenas_por_segundo'], 1),
+                    'p50 ms': round(c['latencia_ms']['p50'], 1), 'p95 ms': round(c['latencia_ms']['p95'], 1),
+                    'p99 ms': round(c['latencia_ms']['p99'], 1),
+                } for c in sondeo['curvas']], use_container_width=True, hide_index=True)
+
+            salida = sondeo['salida']
+            if salida.get('determinista') is not None:
+                memoria = (f"+{sondeo['crecimiento_memoria_kib'] / 1024:.1f} MiB durante el sondeo"
+                           if sondeo['crecimiento_memoria_kib'] is not None else "no disponible")
                 st.info(f"""
-                📋 **Información del modelo:**
-                - Entrada esperada: {modelo.input_shape} ✅
-                - Salida: {modelo.output_shape} ✅
-                - Forma de datos correcta: **(1, 300, 1)** ✅
+                🎯 **Salida para entradas fijas:** {'determinista ✅' if salida['determinista'] else 'no determinista ❌'}
+                - Diferencia al repetir: {salida['diferencia_repeticion']:.1e} · Fila sola frente a lote: {salida['diferencia_lote_individual']:.1e}
+                - Rango de predicciones: [{salida['rango'][0]:.4f}, {salida['rango'][1]:.4f}]
+                - Memoria del proceso: {memoria}
                 """)
-                
-            except Exception as e:
-                st.error(f"❌ **Error inesperado en la prueba:** {str(e)}")
-                st.write("🔍 **Información de debug:**")
-                st.write(f"- Forma de secuencia de prueba: {secuencia_prueba.shape if 'secuencia_prueba' in locals() else 'No creada'}")
-                st.write(f"- Tipo de datos: {secuencia_prueba.dtype if 'secuencia_prueba' in locals() else 'No disponible'}")
-                st.info("💡 **Nota:** Si esto falla, puede haber un problema con el archivo del modelo.")
-
-        if analizar_btn:
-            if not texto_usuario.strip():
-                st.warning("⚠️ Por favor, ingresa una reseña de película para analizar su sentimiento.")
-                return
 
-            # Barra de progreso con animación
-            progress_container = st.empty()
-            status_container = st.empty()
-            
-            # Animación de carga
-            for i in range(101):
-                progress_html = f"""
-                <div style="text-align: center; margin: 2rem 0;">
-                    <div style="font-size: 1.2rem; font-weight: 600; margin-bottom: 1rem; color: #667eea;">
-                        🔄 Analizando reseña con CNN+BiGRU...
-                    </div>
-                    <div style="background: #e8eaf6; border-radius: 10px; overflow: hidden; margin: 0 auto; max-width: 400px;">
-                        <div style="height: 12px; background: linear-gradient(90deg, #667eea, #764ba2); width: {i}%; border-radius: 10px; transition: width 0.1s ease;"></div>
-                    </div>
-                    <div style="margin-top: 0.5rem; font-size: 0.9rem; color: #636e72;">
-                        {i}% Completado
-                    </div>
-                </div>
-                """
-                progress_container.markdown(progress_html, unsafe_allow_html=True)
-                
-                if i < 25:
-                    status_container.info('🔍 Procesando vocabulario cinematográfico...')
-                elif i < 50:
-                    status_container.info('🧠 Analizando con capas CNN especializadas...')
-                elif i < 75:
-                    status_container.info('🔄 Evaluando contexto con BiGRU...')
+            # Mostrar información del modelo
+            st.info(f"""
+            📋 **Información del modelo:**
+            - Entrada esperada: {modelo.input_shape} ✅
+            - Salida: {modelo.output_shape} ✅
+            - Forma de datos correcta: **(1, 300, 1)** ✅
+            """)
+
+            estado_modelo = gestor.instantanea()
+            st.info(f"""
+            🔄 **Versión del modelo:** `{version.version}`
+            - Cambios en caliente: {estado_modelo['cambios']} · Versiones liberadas: {estado_modelo['liberadas']}
+            - Peticiones con la versión vigente: {estado_modelo['en_uso']} · Con versiones retiradas: {sum(estado_modelo['retiradas_en_uso'].values())}
+            """)
+            if estado_modelo['ultimo_error']:
+                st.warning(f"⚠️ Último intento de cambio de modelo fallido: {estado_modelo['ultimo_error']}")
+
+            sombra = obtener_comparador_sombra()
+            if sombra is not None:
+                informe = sombra.informe()
+                if informe['comparadas']:
+                    st.info(f"""
+                    👥 **Modo sombra** (`{informe['candidato']}`, {100 * informe['fraccion']:.0f}% de los análisis):
+                    - Comparadas: {informe['comparadas']} · Descartadas por cola llena: {informe['descartadas']} · Errores: {informe['errores']}
+                    - Diferencia media (ensemble): {informe['delta_ensemble_medio']:+.4f} · |Δ| p95: {informe['delta_ensemble_abs_p95']:.4f}
+                    - Cambios de veredicto: {informe['cambios_veredicto']} ({100 * informe['tasa_cambio_veredicto']:.1f}%)
+                    - Latencia p50: vigente {informe['latencia_principal_p50_ms']:.0f} ms · candidato {informe['latencia_candidato_p50_ms']:.0f} ms
+                    """)
                 else:
-                    status_container.info('✨ Generando veredicto final del crítico IA...')
-                
-                time.sleep(0.02)
+                    st.info(f"👥 **Modo sombra** (`{informe['candidato']}`): aún sin comparaciones.")
+
+            configuracion_hilos = obtener_configuracion_hilos()
+            if configuracion_hilos:
+                st.info(f"""
+                🧵 **Hilos de TensorFlow (autoajuste):**
+                - Intra-op: {configuracion_hilos['intra']} · Inter-op: {configuracion_hilos['inter']}
+                - Latencia medida: {configuracion_hilos.get('latencia_ms', '—')} ms/reseña · Rendimiento: {configuracion_hilos['resenas_por_segundo']} reseñas/s (lotes {configuracion_hilos['tamanos_lote']})
+                - Aplicada en este proceso: {'✅' if configuracion_hilos.get('aplicada') else '❌ (TensorFlow ya estaba inicializado)'}
+                """)
+            else:
+                st.info("🧵 **Hilos de TensorFlow:** sin medir en este host (valores por defecto); ejecuta `python autoajuste_hilos.py`.")
+
+            admision = obtener_controlador_admision().instantanea()
+            st.info(f"""
+            🚦 **Control de admisión:**
+            - En curso: {admision['en_curso']}/{obtener_controlador_admision().max_concurrentes} · En espera: {admision['en_espera']} (máximo observado {admision['max_en_espera']})
+            - Admitidos: {admision['admitidos']} · Sin Transformers por carga: {admision['degradados']}
+            - Rechazados: {admision['rechazados']} ({100 * admision['tasa_rechazo']:.1f}%) · Espera media: {admision['espera_media_ms']:.0f} ms
+            """)
             
-            progress_container.empty()
-            status_container.empty()
+        except AnalisisRechazado as e:
+            st.warning(f"⏳ Autoprueba omitida por alta carga. Inténtalo de nuevo en {e.reintentar_en:.0f} s.")
+        except Exception as e:
+            st.error(f"❌ **Error inesperado en la prueba:** {str(e)}")
+            st.info("💡 **Nota:** Si esto falla, puede haber un problema con el archivo del modelo.")
 
-            # Realizamos predicción con SISTEMA ENSEMBLE AVANZADO
-            try:
-                secuencia = texto_a_secuencia(texto_usuario, tokenizer)
-                
-                # Debug: mostrar información sobre la secuencia
-                with st.expander("🔍 Información de Debug (Expandir para ver detalles)"):
-                    st.write(f"**Forma de la secuencia:** {secuencia.shape} ✅ (Forma correcta)")
-                    st.write(f"**Tipo de datos:** {secuencia.dtype} ✅")
-                    st.write(f"**Primeros 10 tokens:** {secuencia[0][:10, 0].tolist()}") # Ajustado para 3D
-                    st.write(f"**Últimos 10 tokens:** {secuencia[0][-10:, 0].tolist()}") # Ajustado para 3D
-                    st.write(f"**Número de tokens no-cero:** {np.count_nonzero(secuencia[0][:, 0])}") # Ajustado para 3D
-                    st.success("✅ **Secuencia procesada correctamente con forma (1, 300, 1)**")
-                
-                # Verificar que la secuencia tenga la forma correcta
-                if secuencia.shape != (1, SEQUENCE_LENGTH, 1):
-                    st.error(f"❌ Error: Forma incorrecta de secuencia. Esperado: (1, {SEQUENCE_LENGTH}, 1), Obtenido: {secuencia.shape}")
+    if analizar_btn:
+        if not texto_usuario.strip():
+            st.warning("⚠️ Por favor, ingresa una reseña de película para analizar su sentimiento.")
+            return
+
+        # Filtro de idioma: las reseñas que no están en inglés no llegan a los modelos
+        evaluacion = evaluar_entrada(texto_usuario)
+        if not evaluacion['apta']:
+            st.warning(f"🌐 {evaluacion['mensaje']}")
+            if evaluacion['motivo'] == 'idioma':
+                st.info("💡 CinemaScope AI fue entrenado con reseñas de IMDb en inglés: traduce la reseña para analizarla.")
+            return
+
+        # Barra de progreso con animación
+        progress_container = st.empty()
+        status_container = st.empty()
+        
+        # Animación de carga: la barra se anima en el navegador (CSS), así que
+        # solo se envía una vez y el servidor actualiza únicamente el estado
+        progress_container.markdown(cargar_plantilla("progreso"), unsafe_allow_html=True)
+        for mensaje in ETAPAS_PROGRESO:
+            status_container.info(mensaje)
+            time.sleep(DURACION_PROGRESO / len(ETAPAS_PROGRESO))
+        
+        progress_container.empty()
+        status_container.empty()
+
+        # Realizamos predicción con SISTEMA ENSEMBLE AVANZADO
+        try:
+            secuencia = texto_a_secuencia(texto_usuario, tokenizer)
+            
+            # Debug: mostrar información sobre la secuencia
+            with st.expander("🔍 Información de Debug (Expandir para ver detalles)"):
+                st.write(f"**Forma de la secuencia:** {secuencia.shape} ✅ (Forma correcta)")
+                st.write(f"**Tipo de datos:** {secuencia.dtype} ✅")
+                st.write(f"**Primeros 10 tokens:** {secuencia[0][:10, 0].tolist()}") # Ajustado para 3D
+                st.write(f"**Últimos 10 tokens:** {secuencia[0][-10:, 0].tolist()}") # Ajustado para 3D
+                st.write(f"**Número de tokens no-cero:** {np.count_nonzero(secuencia[0][:, 0])}") # Ajustado para 3D
+                st.success("✅ **Secuencia procesada correctamente con forma (1, 300, 1)**")
+            
+            # Verificar que la secuencia tenga la forma correcta
+            if secuencia.shape != (1, SEQUENCE_LENGTH, 1):
+                st.error(f"❌ Error: Forma incorrecta de secuencia. Esperado: (1, {SEQUENCE_LENGTH}, 1), Obtenido: {secuencia.shape}")
+                return
+            
+            # 🚀 PREDICCIÓN CNN+BiGRU + 🧠 SISTEMA ENSEMBLE AVANZADO CON IA
+            # (si este texto ya se analizó con el mismo modelo y léxico, se reutiliza)
+            # (con el nivel rápido activo, el modelo destilado responde si está seguro)
+            modelo_rapido = obtener_modelo_rapido() if st.session_state.get('nivel_rapido') else None
+            analisis = analizar_rapido(texto_usuario, modelo_rapido) if modelo_rapido is not None else None
+            if analisis is None:
+                try:
+                    analisis = analizar_con_almacen(texto_usuario, version, analyzer_transformers)
+                except AnalisisRechazado as e:
+                    st.warning(f"⏳ **Servicio saturado:** hay demasiados análisis en curso. "
+                               f"Vuelve a intentarlo en unos {e.reintentar_en:.0f} s.")
                     return
-                
-                # 🚀 PREDICCIÓN ORIGINAL DEL MODELO CNN+BiGRU
-                pred_original = modelo.predict(secuencia, verbose=0)[0][0]
-                
-                # 🧠 SISTEMA ENSEMBLE AVANZADO CON IA
-                pred_ensemble, boost_consenso, boost_palabras, boost_intensidad, palabras_encontradas = ensemble_prediccion_avanzada(
-                    pred_original, texto_usuario, analyzer_transformers
+            con_transformers = bool(analisis['con_transformers'])
+            pred_original = analisis['pred_original']
+            pred_ensemble = analisis['pred_ensemble']
+            boost_consenso = analisis['boost_consenso']
+            boost_palabras = analisis['boost_palabras']
+            boost_intensidad = analisis['boost_intensidad']
+            palabras_encontradas = analisis['palabras_encontradas']
+            
+            # 📊 CÁLCULO DE CONFIANZA 
+            prob_pos = pred_ensemble * 100
+            prob_neg = (1 - pred_ensemble) * 100
+            es_positivo = prob_pos > 50
+            
+            # Fórmula de confianza base + boosts de IA (confianza.py), o la tabla
+            # de calibración ajustada offline si el modo calibrado está activo
+            calibrador = obtener_calibrador() if st.session_state.get('confianza_calibrada') else None
+            if calibrador is not None:
+                confianza_mejorada, nivel_confianza, descripcion_confianza = calibrador.calcular(pred_ensemble)
+            else:
+                confianza_mejorada, nivel_confianza, descripcion_confianza = calcular_confianza(
+                    pred_ensemble, boost_consenso, boost_palabras, boost_intensidad,
+                    con_transformers, len(palabras_encontradas)
                 )
+
+            guardar_analisis(analisis, confianza_mejorada, nivel_confianza,
+                             st.session_state.get('pelicula_id', '').strip())
+            
+        except Exception as e:
+            st.error(f"❌ **Error en la predicción:** {str(e)}")
+            
+            # Información detallada del error
+            with st.expander("🔧 Información Técnica del Error"):
+                st.write(f"**Tipo de error:** {type(e).__name__}")
+                st.write(f"**Mensaje completo:** {str(e)}")
+                if 'secuencia' in locals():
+                    st.write(f"**Forma de secuencia:** {secuencia.shape}")
+                    st.write(f"**Tipo de secuencia:** {secuencia.dtype}")
                 
-                # 📊 CÁLCULO DE CONFIANZA 
-                prob_pos = pred_ensemble * 100
-                prob_neg = (1 - pred_ensemble) * 100
-                es_positivo = prob_pos > 50
-                
-                # Fórmula de confianza base 
-                distancia_del_neutral = abs(pred_ensemble - 0.5)
-                
-                if distancia_del_neutral < 0.05:
-                    confianza_base = 40 + distancia_del_neutral * 400
-                elif distancia_del_neutral < 0.15:
-                    confianza_base = 60 + (distancia_del_neutral - 0.05) * 300
-                else:
-                    confianza_base = 90 + (distancia_del_neutral - 0.15) * 29
-                
-                # 🔥 APLICAR BOOSTS DE IA
-                confianza_mejorada = confianza_base + boost_consenso + boost_palabras + boost_intensidad
-                
-                # Bonus adicional por usar múltiples sistemas de IA
-                if analyzer_transformers:
-                    confianza_mejorada += 10 # Bonus por tener transformers
-                
-                if len(palabras_encontradas) > 0:
-                    confianza_mejorada += 5 # Bonus por palabras clave detectadas
-                
-                # Asegurar que esté entre 60 y 100 (MÍNIMO 60% ahora)
-                confianza_mejorada = min(100, max(60, confianza_mejorada))
-                
-                # Clasificación de confianza 
-                if confianza_mejorada >= 95:
-                    nivel_confianza = "🌟 Excepcional"
-                    descripcion_confianza = "Predicción excepcional con IA"
-                elif confianza_mejorada >= 90:
-                    nivel_confianza = "🚀 Muy Alta"
-                    descripcion_confianza = "Predicción muy confiable con IA"
-                elif confianza_mejorada >= 80:
-                    nivel_confianza = "👍 Alta"
-                    descripcion_confianza = "Predicción confiable"
-                elif confianza_mejorada >= 70:
-                    nivel_confianza = "🔍 Media-Alta"
-                    descripcion_confianza = "Predicción moderada-alta"
-                else:
-                    nivel_confianza = "📊 Buena"
-                    descripcion_confianza = "Predicción buena"
-                
-            except Exception as e:
-                st.error(f"❌ **Error en la predicción:** {str(e)}")
-                
-                # Información detallada del error
-                with st.expander("🔧 Información Técnica del Error"):
-                    st.write(f"**Tipo de error:** {type(e).__name__}")
-                    st.write(f"**Mensaje completo:** {str(e)}")
-                    if 'secuencia' in locals():
-                        st.write(f"**Forma de secuencia:** {secuencia.shape}")
-                        st.write(f"**Tipo de secuencia:** {secuencia.dtype}")
-                    
-                st.info("""
-                💡 **Información técnica:**
-                1. **Forma de datos correcta:** El modelo requiere datos con forma **(1, 300, 1)**
-                2. **Compatibilidad:** Modelo CNN+BiGRU entrenado con TextVectorization
-                3. **Tokenización:** Se usa tokenizer de Keras con vocabulario de 20K palabras
-                4. **Verificación:** Usa el botón "🔧 Probar Modelo" para confirmar que el modelo funciona
-                
-                **✅ Solución implementada:** El código ya está configurado para usar la forma correcta de datos.
-                """)
-                return
+            st.info("""
+            💡 **Información técnica:**
+            1. **Forma de datos correcta:** El modelo requiere datos con forma **(1, 300, 1)**
+            2. **Compatibilidad:** Modelo CNN+BiGRU entrenado con TextVectorization
+            3. **Tokenización:** Se usa tokenizer de Keras con vocabulario de 20K palabras
+            4. **Verificación:** Usa el botón "🔧 Probar Modelo" para confirmar que el modelo funciona
             
-            # Resultados
-            if es_positivo:
-                st.markdown(f"""
-                <div class="result-card-positive fade-in-up pulse">
-                    <div class="result-title-premium">🌟 ¡RESEÑA POSITIVA!</div>
-                    <div class="result-description">
-                        💚 El crítico IA ha detectado una reseña favorable de la película. 
-                        ¡Esta película parece haber causado una excelente impresión!
+            **✅ Solución implementada:** El código ya está configurado para usar la forma correcta de datos.
+            """)
+            return
+        
+        # Resultados
+        if es_positivo:
+            st.markdown(f"""
+            <div class="result-card-positive fade-in-up pulse">
+                <div class="result-title-premium">🌟 ¡RESEÑA POSITIVA!</div>
+                <div class="result-description">
+                    💚 El crítico IA ha detectado una reseña favorable de la película. 
+                    ¡Esta película parece haber causado una excelente impresión!
+                </div>
+                <div class="metrics-grid">
+                    <div class="metric-card">
+                        <span class="metric-value">{prob_pos:.1f}%</span>
+                        <span class="metric-label">Positivo</span>
                     </div>
-                    <div class="metrics-grid">
-                        <div class="metric-card">
-                            <span class="metric-value">{prob_pos:.1f}%</span>
-                            <span class="metric-label">Positivo</span>
-                        </div>
-                        <div class="metric-card">
-                            <span class="metric-value">{prob_neg:.1f}%</span>
-                            <span class="metric-label">Negativo</span>
-                        </div>
-                        <div class="metric-card">
-                            <span class="metric-value">{confianza_mejorada:.1f}%</span>
-                            <span class="metric-label">{nivel_confianza}</span>
-                        </div>
+                    <div class="metric-card">
+                        <span class="metric-value">{prob_neg:.1f}%</span>
+                        <span class="metric-label">Negativo</span>
+                    </div>
+                    <div class="metric-card">
+                        <span class="metric-value">{confianza_mejorada:.1f}%</span>
+                        <span class="metric-label">{nivel_confianza}</span>
                     </div>
                 </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="result-card-negative fade-in-up pulse">
-                    <div class="result-title-premium">👎 RESEÑA NEGATIVA</div>
-                    <div class="result-description">
-                        🔴 El crítico IA ha identificado una reseña desfavorable de la película. 
-                        ¡Parece que esta película no logró convencer al espectador!
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="result-card-negative fade-in-up pulse">
+                <div class="result-title-premium">👎 RESEÑA NEGATIVA</div>
+                <div class="result-description">
+                    🔴 El crítico IA ha identificado una reseña desfavorable de la película. 
+                    ¡Parece que esta película no logró convencer al espectador!
+                </div>
+                <div class="metrics-grid">
+                    <div class="metric-card">
+                        <span class="metric-value">{prob_pos:.1f}%</span>
+                        <span class="metric-label">Positivo</span>
+                    </div>
+                    <div class="metric-card">
+                        <span class="metric-value">{prob_neg:.1f}%</span>
+                        <span class="metric-label">Negativo</span>
                     </div>
-                    <div class="metrics-grid">
-                        <div class="metric-card">
-                            <span class="metric-value">{prob_pos:.1f}%</span>
-                            <span class="metric-label">Positivo</span>
-                        </div>
-                        <div class="metric-card">
-                            <span class="metric-value">{prob_neg:.1f}%</span>
-                            <span class="metric-label">Negativo</span>
-                        </div>
-                        <div class="metric-card">
-                            <span class="metric-value">{confianza_mejorada:.1f}%</span>
-                            <span class="metric-label">{nivel_confianza}</span>
-                        </div>
+                    <div class="metric-card">
+                        <span class="metric-value">{confianza_mejorada:.1f}%</span>
+                        <span class="metric-label">{nivel_confianza}</span>
                     </div>
                 </div>
-                """, unsafe_allow_html=True)
+            </div>
+            """, unsafe_allow_html=True)
 
-            # Métricas del Análisis
-            st.markdown("#### 📊 Análisis Detallado de la Reseña")
-            
-            # Explicación de la nueva confianza
-            with st.expander("💡 ¿Cómo funciona el Sistema de IA Avanzado?"):
-                st.markdown(f"""
-                **🧠 Sistema Ensemble con Múltiples IAs:**
-                
-                **📊 Análisis Realizado:**
-                - **Predicción CNN+BiGRU:** {pred_original:.4f}
-                - **Predicción Ensemble:** {pred_ensemble:.4f}
-                - **Confianza Final:** {confianza_mejorada:.1f}%
-                
-                **🔥 Boosts de IA Aplicados:**
-                - **Boost Consenso:** +{boost_consenso:.1f}%
-                - **Boost Palabras Clave:** +{boost_palabras:.1f}%
-                - **Boost Intensidad:** +{boost_intensidad:.1f}%
-                - **Bonus Transformers:** +{10 if analyzer_transformers else 0}%
-                - **Bonus Palabras:** +{5 if len(palabras_encontradas) > 0 else 0}%
-                
-                **🎯 Palabras Clave Detectadas:**
-                {', '.join(palabras_encontradas) if palabras_encontradas else 'Ninguna palabra clave específica detectada'}
-                
-                **🚀 Tecnologías de IA Utilizadas:**
-                - ✅ **CNN+BiGRU:** Modelo principal entrenado
-                - {'✅' if analyzer_transformers else '❌'} **Transformers:** Modelo RoBERTa de Hugging Face
-                - ✅ **Análisis Léxico:** Sistema de palabras clave ponderadas
-                - ✅ **Análisis Emocional:** Detección de intensidad emocional
-                - ✅ **Sistema Ensemble:** Combinación inteligente de predicciones
-                
-                **📈 Rangos de Confianza Mejorados:**
-                - **95-100%:** 🌟 Excepcional (IA muy segura)
-                - **90-95%:** 🚀 Muy Alta (IA segura)
-                - **80-90%:** 👍 Alta (IA confiable)
-                - **70-80%:** 🔍 Media-Alta (IA moderada)
-                - **60-70%:** 📊 Buena (IA básica)
-                
-                ✅ **Garantía:** Mínimo 60% de confianza con sistema de IA múltiple
-                """)
+        # Métricas del Análisis
+        st.markdown("#### 📊 Análisis Detallado de la Reseña")
+        mostrar_desglose_oraciones(texto_usuario, modelo, tokenizer)
+        mostrar_aspectos(texto_usuario, modelo, tokenizer)
+        
+        # Explicación de la nueva confianza
+        lineas_niveles, nota_confianza = niveles_confianza_markdown(calibrador is not None)
+        tabla_niveles = "\n            ".join(lineas_niveles)
+        with st.expander("💡 ¿Cómo funciona el Sistema de IA Avanzado?"):
+            st.markdown(f"""
+            **🧠 Sistema Ensemble con Múltiples IAs:**
             
-            col1, col2, col3, col4 = st.columns(4)
+            **📊 Análisis Realizado:**
+            - **Nivel:** {'🏎️ Rápido (modelo destilado)' if analisis.get('nivel') == 'rapido' else '🧠 Completo'}
+            - **Predicción CNN+BiGRU:** {f'{pred_original:.4f}' if pred_original is not None else f"no calculada · Modelo rápido: {analisis['pred_rapido']:.4f}"}
+            - **Predicción Ensemble:** {pred_ensemble:.4f}
+            - **Confianza Final:** {confianza_mejorada:.1f}%
+            - **Modo de Confianza:** {f'Calibrada ({calibrador.metodo})' if calibrador is not None else 'Fórmula con boosts de IA'}
             
-            palabras_count = len(texto_usuario.split())
-            caracteres_count = len(texto_usuario)
-            intensidad_emocional = abs(prob_pos - 50) / 50 * 100
+            **🔥 Boosts de IA Aplicados:**
+            - **Boost Consenso:** +{boost_consenso:.1f}%
+            - **Boost Palabras Clave:** +{boost_palabras:.1f}%
+            - **Boost Intensidad:** +{boost_intensidad:.1f}%
+            - **Bonus Transformers:** +{10 if con_transformers else 0}%
+            - **Bonus Palabras:** +{5 if len(palabras_encontradas) > 0 else 0}%
             
-            with col1:
-                st.metric(
-                    label="🎭 Intensidad Crítica",
-                    value=f"{intensidad_emocional:.1f}%",
-                    help="Qué tan fuerte es la opinión expresada sobre la película"
-                )
+            **🎯 Palabras Clave Detectadas:**
+            {', '.join(palabras_encontradas) if palabras_encontradas else 'Ninguna palabra clave específica detectada'}
             
-            with col2:
-                st.metric(
-                    label="📝 Extensión de Reseña",
-                    value=f"{palabras_count} palabras",
-                    help="Número de palabras en la crítica cinematográfica"
-                )
+            **🚀 Tecnologías de IA Utilizadas:**
+            - {'⏭️' if analisis.get('nivel') == 'rapido' else '✅'} **CNN+BiGRU:** Modelo principal entrenado
+            - {'✅' if con_transformers else ('⏳' if analyzer_transformers else '❌')} **Transformers:** Modelo RoBERTa de Hugging Face{' (omitido por alta carga)' if analyzer_transformers and not con_transformers else ''}
+            - ✅ **Análisis Léxico:** Sistema de palabras clave ponderadas
+            - ✅ **Análisis Emocional:** Detección de intensidad emocional
+            - ✅ **Sistema Ensemble:** Combinación inteligente de predicciones
             
-            with col3:
-                complejidad = min(100, (caracteres_count / 20) + (palabras_count / 5))
-                st.metric(
-                    label="🔬 Complejidad Narrativa",
-                    value=f"{complejidad:.0f}/100",
-                    help="Nivel de detalle y complejidad de la reseña"
-                )
+            **📈 Niveles de Confianza:**
+            {tabla_niveles}
             
-            with col4:
-                st.metric(
-                    label="🎯 Descripción de Confianza",
-                    value=descripcion_confianza,
-                    help="Descripción del nivel de confianza en la predicción"
-                )
+            {nota_confianza}
+            """)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        palabras_count = len(texto_usuario.split())
+        caracteres_count = len(texto_usuario)
+        intensidad_emocional = abs(prob_pos - 50) / 50 * 100
+        
+        with col1:
+            st.metric(
+                label="🎭 Intensidad Crítica",
+                value=f"{intensidad_emocional:.1f}%",
+                help="Qué tan fuerte es la opinión expresada sobre la película"
+            )
+        
+        with col2:
+            st.metric(
+                label="📝 Extensión de Reseña",
+                value=f"{palabras_count} palabras",
+                help="Número de palabras en la crítica cinematográfica"
+            )
+        
+        with col3:
+            complejidad = min(100, (caracteres_count / 20) + (palabras_count / 5))
+            st.metric(
+                label="🔬 Complejidad Narrativa",
+                value=f"{complejidad:.0f}/100",
+                help="Nivel de detalle y complejidad de la reseña"
+            )
+        
+        with col4:
+            st.metric(
+                label="🎯 Descripción de Confianza",
+                value=descripcion_confianza,
+                help="Descripción del nivel de confianza en la predicción"
+            )
 
-            # Análisis Técnico
-            st.markdown("#### 🔬 Análisis Técnico CNN+BiGRU para Cine")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("""
-                **🧠 Procesamiento Cinematográfico:**
-                - ✅ Embedding especializado en vocabulario fílmico
-                - ✅ CNN para detectar patrones en críticas
-                - ✅ MaxPooling para características relevantes
-                - ✅ BiGRU para contexto narrativo bidireccional
-                - ✅ Regularización anti-sobreajuste en reseñas
+        # Análisis Técnico
+        st.markdown("#### 🔬 Análisis Técnico CNN+BiGRU para Cine")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("""
+            **🧠 Procesamiento Cinematográfico:**
+            - ✅ Embedding especializado en vocabulario fílmico
+            - ✅ CNN para detectar patrones en críticas
+            - ✅ MaxPooling para características relevantes
+            - ✅ BiGRU para contexto narrativo bidireccional
+            - ✅ Regularización anti-sobreajuste en reseñas
+            """)
+        
+        with col2:
+            tiempo_ms = analisis.get('tiempos_ms', {}).get('total')
+            if analisis.get('desde_almacen'):
+                texto_tiempo = "reutilizado del almacén"
+            else:
+                texto_tiempo = f"{tiempo_ms:.0f} ms" if tiempo_ms is not None else "—"
+            evaluado = resultado_evaluado(analisis)
+            if evaluado is not None:
+                texto_tiempo += f" (p50 evaluado: {evaluado['latencia_ms']['p50']:.0f} ms)"
+                texto_exactitud = (f"{100 * evaluado['exactitud']:.1f}% en {evaluado['n']:,} reseñas etiquetadas "
+                                   f"({evaluado['configuracion']}, {evaluado['motor']})")
+            else:
+                texto_exactitud = "sin informe para este modelo (ejecuta `python evaluacion.py --datos ...`)"
+            st.markdown(f"""
+            **📊 Estadísticas del Análisis Fílmico:**
+            - 🔢 Tokens procesados: {min(palabras_count, SEQUENCE_LENGTH)}
+            - 📏 Secuencia máxima: {SEQUENCE_LENGTH} palabras
+            - 📚 Vocabulario cinematográfico: {VOCAB_SIZE:,} términos
+            - ⚡ Tiempo de este análisis: {texto_tiempo}
+            - 🎬 Exactitud medida: {texto_exactitud}
+            """)
+
+        # Recomendaciones basadas en el análisis
+        st.markdown("#### 💡 Veredicto del Crítico IA")
+        
+        if es_positivo:
+            if confianza_mejorada >= 85:
+                st.success("""
+                🌟 **PELÍCULA ALTAMENTE RECOMENDADA:**
+                - ✅ Reseña con emociones muy positivas hacia la película
+                - ✅ Alta confianza en la recomendación cinematográfica
+                - ✅ Ideal para listas de "películas imperdibles"
+                - ✅ Refleja una experiencia cinematográfica muy satisfactoria
                 """)
-            
-            with col2:
-                st.markdown(f"""
-                **📊 Estadísticas del Análisis Fílmico:**
-                - 🔢 Tokens procesados: {min(palabras_count, SEQUENCE_LENGTH)}
-                - 📏 Secuencia máxima: {SEQUENCE_LENGTH} palabras
-                - 📚 Vocabulario cinematográfico: {VOCAB_SIZE:,} términos
-                - ⚡ Tiempo de crítica: ~0.1s
-                - 🎬 Precisión en reseñas IMDb: ~95%
+            elif confianza_mejorada >= 65:
+                st.info("""
+                👍 **PELÍCULA RECOMENDADA:**
+                - ✅ Opinión generalmente favorable de la película
+                - ✅ Confianza moderada-alta en la recomendación
+                - ✅ Película que vale la pena considerar
+                - ✅ Buena opción para ver
                 """)
-
-            # Recomendaciones basadas en el análisis
-            st.markdown("#### 💡 Veredicto del Crítico IA")
-            
-            if es_positivo:
-                if confianza_mejorada >= 85:
-                    st.success("""
-                    🌟 **PELÍCULA ALTAMENTE RECOMENDADA:**
-                    - ✅ Reseña con emociones muy positivas hacia la película
-                    - ✅ Alta confianza en la recomendación cinematográfica
-                    - ✅ Ideal para listas de "películas imperdibles"
-                    - ✅ Refleja una experiencia cinematográfica muy satisfactoria
-                    """)
-                elif confianza_mejorada >= 65:
-                    st.info("""
-                    👍 **PELÍCULA RECOMENDADA:**
-                    - ✅ Opinión generalmente favorable de la película
-                    - ✅ Confianza moderada-alta en la recomendación
-                    - ✅ Película que vale la pena considerar
-                    - ✅ Buena opción para ver
-                    """)
-                else:
-                    st.warning("""
-                    🤔 **OPINIÓN POSITIVA MODERADA:**
-                    - ✅ Tendencia positiva con confianza moderada
-                    - ✅ La película tiene aspectos favorables
-                    - ⚠️ Posible presencia de elementos mixtos
-                    - 💡 Considera tus preferencias personales
-                    """)
             else:
-                if confianza_mejorada >= 85:
-                    st.error("""
-                    👎 **PELÍCULA NO RECOMENDADA:**
-                    - ⚠️ Crítica claramente negativa hacia la película
-                    - ⚠️ Alta confianza en la evaluación desfavorable
-                    - ⚠️ Película que probablemente no satisfaga expectativas
-                    - ⚠️ Múltiples aspectos cinematográficos criticados
-                    """)
-                elif confianza_mejorada >= 65:
-                    st.warning("""
-                    🔍 **PELÍCULA CON ASPECTOS NEGATIVOS:**
-                    - ⚠️ Tendencia hacia crítica negativa
-                    - ⚠️ Confianza moderada-alta en la evaluación
-                    - ⚠️ Posibles problemas significativos en la película
-                    - 💡 Considera otras opciones antes de ver
-                    """)
-                else:
-                    st.info("""
-                    🤔 **OPINIÓN NEGATIVA MODERADA:**
-                    - ⚠️ Tendencia negativa con confianza moderada
-                    - ⚠️ La película tiene algunos aspectos criticables
-                    - 💡 Podría no ser tan mala como parece
-                    - 💡 Considera tus gustos personales
-                    """)
+                st.warning("""
+                🤔 **OPINIÓN POSITIVA MODERADA:**
+                - ✅ Tendencia positiva con confianza moderada
+                - ✅ La película tiene aspectos favorables
+                - ⚠️ Posible presencia de elementos mixtos
+                - 💡 Considera tus preferencias personales
+                """)
+        else:
+            if confianza_mejorada >= 85:
+                st.error("""
+                👎 **PELÍCULA NO RECOMENDADA:**
+                - ⚠️ Crítica claramente negativa hacia la película
+                - ⚠️ Alta confianza en la evaluación desfavorable
+                - ⚠️ Película que probablemente no satisfaga expectativas
+                - ⚠️ Múltiples aspectos cinematográficos criticados
+                """)
+            elif confianza_mejorada >= 65:
+                st.warning("""
+                🔍 **PELÍCULA CON ASPECTOS NEGATIVOS:**
+                - ⚠️ Tendencia hacia crítica negativa
+                - ⚠️ Confianza moderada-alta en la evaluación
+                - ⚠️ Posibles problemas significativos en la película
+                - 💡 Considera otras opciones antes de ver
+                """)
+            else:
+                st.info("""
+                🤔 **OPINIÓN NEGATIVA MODERADA:**
+                - ⚠️ Tendencia negativa con confianza moderada
+                - ⚠️ La película tiene algunos aspectos criticables
+                - 💡 Podría no ser tan mala como parece
+                - 💡 Considera tus gustos personales
+                """)
+
+# 7. Función principal de la app
+def main():
+    # Hero Section 
+    mostrar_plantilla("hero")
+
+    # Features Showcase
+    mostrar_plantilla("caracteristicas")
+
+    # Instrucciones
+    mostrar_plantilla("instrucciones")
+
+    try:
+        gestor, analyzer_transformers = cargar_modelos()
+        # El candidato en sombra se carga al arrancar, no en el primer análisis
+        obtener_comparador_sombra()
+        
+        # Sección de Análisis
+        mostrar_plantilla("seccion_analisis")
+        seccion_analisis(gestor, analyzer_transformers)
 
     except Exception as e:
         st.error(f"❌ **Error del Sistema:** {str(e)}")
@@ -1281,37 +992,8 @@ def main():
         """, unsafe_allow_html=True)
 
     # Footer 
-    st.markdown("""
-    <div class="footer-premium fade-in-up">
-        <div class="footer-title">🚀 Potenciado por Arquitectura CNN+BiGRU Cinematográfica</div>
-        <div class="footer-description">
-            CinemaScope AI utiliza la combinación más avanzada de Redes Neuronales especializadas 
-            en análisis de reseñas de películas, entrenado con el prestigioso dataset de IMDb
-        </div>
-        <div class="tech-stack">
-            <div class="tech-item">
-                <span>🎯</span>
-                <span>Streamlit</span>
-            </div>
-            <div class="tech-item">
-                <span>🧠</span>
-                <span>TensorFlow</span>
-            </div>
-            <div class="tech-item">
-                <span>🔬</span>
-                <span>CNN+BiGRU</span>
-            </div>
-            <div class="tech-item">
-                <span>🎬</span>
-                <span>IMDb Dataset</span>
-            </div>
-        </div>
-        <div style="margin-top: 2rem; font-size: 0.9rem; opacity: 0.8;">
-            💡 Crítico IA especializado en análisis cinematográfico con vocabulario de 20K términos fílmicos
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    mostrar_plantilla("pie")
 
-# 7. Ejecutamos
+# 8. Ejecutamos
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,132 @@
+# Caché de artefactos del modelo: el .h5 se convierte una sola vez en un
+# SavedModel con la función de inferencia ya trazada, guardado en disco bajo la
+# huella del contenido del .h5. Los arranques siguientes cargan el SavedModel
+# sin reconstruir el modelo Keras ni volver a trazar funciones.
+#
+# Uso: python artefactos.py [--modelo sentiment_cnn_bigru.h5]   (conversión anticipada)
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import tensorflow as tf
+
+from nucleo import MODEL_PATH, cargar_modelo, crear_tokenizer, version_modelo
+
+DIRECTORIO_ARTEFACTOS = os.environ.get(
+    "CINEMASCOPE_ARTEFACTOS",
+    os.path.join(os.path.expanduser("~"), ".cache", "cinemascope", "modelos"),
+)
+# Diferencia máxima admitida entre el SavedModel y el modelo Keras al convertir
+TOLERANCIA_CONVERSION = 1e-4
+
+class ModeloExportado:
+    """SavedModel cargado con la interfaz que usa la app (predict, formas)"""
+
+    def __init__(self, cargado, input_shape, output_shape, input_dtype="int32"):
+        self._cargado = cargado
+        self.input_shape = input_shape
+        self.output_shape = output_shape
+        # Tipo de la firma exportada: la entrada se convierte a él antes de servir
+        self.input_dtype = tf.as_dtype(input_dtype)
+
+    def predict(self, x, verbose=0):
+        return self._cargado.serve(tf.constant(np.asarray(x), dtype=self.input_dtype)).numpy()
+
+def ruta_artefacto(ruta_modelo=MODEL_PATH, directorio=DIRECTORIO_ARTEFACTOS):
+    return os.path.join(directorio, version_modelo(ruta_modelo))
+
+def tipo_entrada(cargado):
+    """dtype de la entrada en la firma de inferencia del SavedModel"""
+    return tf.nest.flatten(cargado.signatures['serving_default'].structured_input_signature)[0].dtype.name
+
+def comprobar_conversion(modelo, exportado):
+    """Predicción de prueba: el SavedModel debe servir y coincidir con el modelo Keras"""
+    entrada = np.zeros((2,) + tuple(modelo.input_shape[1:]), dtype=exportado.input_dtype.as_numpy_dtype)
+    entrada[1] = 1
+    try:
+        diferencia = float(np.max(np.abs(exportado.predict(entrada) - np.asarray(modelo.predict(entrada, verbose=0)))))
+    except Exception as e:
+        raise ValueError(f"El artefacto exportado no sirve: {type(e).__name__}: {e}") from e
+    if not diferencia <= TOLERANCIA_CONVERSION:
+        raise ValueError(f"El artefacto exportado difiere del modelo Keras (|Δ| {diferencia:.2e})")
+
+def convertir(modelo, destino):
+    """Exporta el modelo Keras a 'destino' (escritura atómica: directorio temporal + rename).
+    ValueError si el artefacto no pasa la predicción de prueba."""
+    padre = os.path.dirname(destino)
+    os.makedirs(padre, exist_ok=True)
+    temporal = tempfile.mkdtemp(prefix=".convirtiendo-", dir=padre)
+    try:
+        modelo.export(os.path.join(temporal, "saved_model"), format="tf_saved_model", verbose=False)
+        cargado = tf.saved_model.load(os.path.join(temporal, "saved_model"))
+        formas = {
+            'input_shape': list(modelo.input_shape),
+            'output_shape': list(modelo.output_shape),
+            'input_dtype': tipo_entrada(cargado),
+        }
+        comprobar_conversion(modelo, ModeloExportado(cargado, **formas))
+        with open(os.path.join(temporal, "formas.json"), "w", encoding="utf-8") as f:
+            json.dump(formas, f)
+        os.rename(temporal, destino)
+    except OSError:
+        # Otro proceso terminó la conversión antes: se conserva la suya
+        if not os.path.isdir(destino):
+            raise
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+def cargar_artefacto(destino):
+    with open(os.path.join(destino, "formas.json"), encoding="utf-8") as f:
+        formas = json.load(f)
+    return ModeloExportado(
+        tf.saved_model.load(os.path.join(destino, "saved_model")),
+        tuple(formas['input_shape']), tuple(formas['output_shape']),
+        # Artefactos anteriores sin el campo: se exportaron desde el modelo int32
+        formas.get('input_dtype', "int32"),
+    )
+
+def cargar_modelo_cacheado(ruta_modelo=MODEL_PATH, directorio=DIRECTORIO_ARTEFACTOS):
+    """Carga desde la caché; si no existe, carga el .h5, lo convierte y lo devuelve"""
+    destino = ruta_artefacto(ruta_modelo, directorio)
+    if os.path.isdir(destino):
+        try:
+            return cargar_artefacto(destino)
+        except (OSError, ValueError, KeyError):
+            # Artefacto dañado: se vuelve a convertir
+            shutil.rmtree(destino, ignore_errors=True)
+
+    modelo = cargar_modelo(ruta_modelo)
+    try:
+        convertir(modelo, destino)
+    except (OSError, ValueError):
+        # Sin caché (disco de solo lectura, artefacto que no pasa la prueba, etc.):
+        # el modelo Keras sigue sirviendo
+        pass
+    return modelo
+
+def cargar_modelo_y_tokenizer(ruta_modelo=MODEL_PATH):
+    """Modelo más rápido disponible: compacto si está vigente, si no el de la caché"""
+    from compactacion import RUTA_MODELO_COMPACTO, compacto_vigente, cargar_modelo_compacto
+    if compacto_vigente(RUTA_MODELO_COMPACTO, ruta_modelo):
+        return cargar_modelo_compacto(RUTA_MODELO_COMPACTO)
+    return cargar_modelo_cacheado(ruta_modelo), crear_tokenizer()
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte el modelo .h5 en un artefacto de carga rápida")
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    parser.add_argument("--directorio", default=DIRECTORIO_ARTEFACTOS)
+    args = parser.parse_args()
+
+    destino = ruta_artefacto(args.modelo, args.directorio)
+    if os.path.isdir(destino):
+        print(f"✅ Ya convertido: {destino}")
+        return
+    convertir(cargar_modelo(args.modelo), destino)
+    print(f"✅ Artefacto creado: {destino}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Sentimiento por aspecto de la película (actuación, trama, música, ...).
+# Una sola pasada sobre los tokens encuentra las menciones de cada aspecto y
+# su ventana de contexto (sin cruzar el final de la cláusula); todas las
+# ventanas se puntúan en una misma llamada por lotes al CNN+BiGRU y se
+# combinan con el léxico ponderado de nucleo.py.
+
+import bisect
+import re
+
+import numpy as np
+
+from nucleo import codificar_lote, analizar_palabras_clave_avanzado, TAM_LOTE_ORACIONES
+
+# Palabras que mencionan cada aspecto (vocabulario fílmico de crear_tokenizer)
+ASPECTOS = {
+    'Actuación': ('acting', 'performance', 'performances', 'actor', 'actors', 'actress', 'cast'),
+    'Trama': ('plot', 'story', 'storyline', 'script', 'screenplay', 'writing', 'ending'),
+    'Música': ('music', 'soundtrack', 'score', 'sound', 'songs'),
+    'Dirección': ('direction', 'director', 'directing', 'directed'),
+    'Fotografía': ('cinematography', 'visual', 'visuals', 'effects', 'camera', 'photography'),
+    'Diálogos': ('dialogue', 'dialogues', 'dialog', 'lines'),
+    'Ritmo': ('pacing', 'pace', 'rhythm', 'tempo', 'editing'),
+}
+ICONOS_ASPECTO = {
+    'Actuación': "🎭", 'Trama': "📖", 'Música': "🎵", 'Dirección': "🎬",
+    'Fotografía': "📷", 'Diálogos': "💬", 'Ritmo': "⏱️",
+}
+_ASPECTO_DE_PALABRA = {palabra: aspecto for aspecto, palabras in ASPECTOS.items() for palabra in palabras}
+
+# Tokens a cada lado de la mención
+VENTANA_ASPECTO = 6
+# Peso del léxico frente al modelo cuando la ventana tiene palabras clave
+PESO_LEXICO_ASPECTO = 0.5
+# Por debajo de esta distancia a 0.5 el aspecto se considera neutral
+MARGEN_NEUTRAL = 0.05
+
+_TOKENS = re.compile(r"[^\W_]+(?:'[^\W_]+)*|[.!?;,]")
+# Las comas también cortan la ventana: "great acting, awful script" son dos opiniones
+_FIN_CLAUSULA = frozenset(".!?;,")
+
+def menciones_aspectos(texto, ventana=VENTANA_ASPECTO):
+    """Lista de (aspecto, palabra, texto de la ventana) en orden de aparición"""
+    tokens = _TOKENS.findall(texto.lower())
+    fines = []      # posiciones de los signos de fin de cláusula
+    menciones = []  # (aspecto, palabra, posición)
+    for i, token in enumerate(tokens):
+        if token in _FIN_CLAUSULA:
+            fines.append(i)
+        else:
+            aspecto = _ASPECTO_DE_PALABRA.get(token)
+            if aspecto is not None:
+                menciones.append((aspecto, token, i))
+
+    resultado = []
+    for aspecto, palabra, i in menciones:
+        # Límites de la cláusula de la mención: fin anterior y fin siguiente
+        k = bisect.bisect_left(fines, i)
+        inicio = max(i - ventana, fines[k - 1] + 1 if k > 0 else 0)
+        fin = min(i + ventana + 1, fines[k] if k < len(fines) else len(tokens))
+        resultado.append((aspecto, palabra, " ".join(tokens[inicio:fin])))
+    return resultado
+
+def puntuar_ventanas(ventanas, modelo, tokenizer, tam_lote=TAM_LOTE_ORACIONES):
+    """Predicción del modelo combinada con el léxico para cada ventana"""
+    secuencias = codificar_lote(ventanas, tokenizer)
+    pred_modelo = np.concatenate([
+        modelo.predict(secuencias[i:i + tam_lote], verbose=0)[:, 0]
+        for i in range(0, len(ventanas), tam_lote)
+    ])
+    puntuaciones = []
+    for ventana, pred in zip(ventanas, pred_modelo):
+        puntuacion_palabras, palabras = analizar_palabras_clave_avanzado(ventana)
+        if palabras:
+            pred_palabras = max(0, min(1, (puntuacion_palabras + 10) / 20))
+            pred = (1 - PESO_LEXICO_ASPECTO) * pred + PESO_LEXICO_ASPECTO * pred_palabras
+        puntuaciones.append((float(pred), palabras))
+    return puntuaciones
+
+def analizar_aspectos(texto, modelo, tokenizer):
+    """Polaridad de cada aspecto mencionado: {aspecto: resumen}, en el orden de ASPECTOS"""
+    menciones = menciones_aspectos(texto)
+    if not menciones:
+        return {}
+    puntuaciones = puntuar_ventanas([ventana for _, _, ventana in menciones], modelo, tokenizer)
+
+    por_aspecto = {}
+    for (aspecto, palabra, ventana), (pred, palabras) in zip(menciones, puntuaciones):
+        por_aspecto.setdefault(aspecto, []).append({
+            'palabra': palabra, 'ventana': ventana, 'pred': pred, 'palabras_encontradas': palabras,
+        })
+
+    resumen = {}
+    for aspecto in ASPECTOS:
+        lista = por_aspecto.get(aspecto)
+        if not lista:
+            continue
+        pred = float(np.mean([m['pred'] for m in lista]))
+        if abs(pred - 0.5) < MARGEN_NEUTRAL:
+            polaridad = "neutral"
+        else:
+            polaridad = "positiva" if pred > 0.5 else "negativa"
+        resumen[aspecto] = {'pred': pred, 'polaridad': polaridad, 'menciones': lista}
+    return resumen
@@ -0,0 +1,221 @@
+# Autoajuste de los hilos de TensorFlow (intra-op / inter-op) por host.
+# TensorFlow solo acepta la configuración de hilos antes de ejecutar la primera
+# operación, así que cada candidato se mide en un subproceso propio; la mejor
+# configuración se guarda en disco y se aplica al arrancar, antes de cargar el modelo.
+# Si falta, se mide de forma síncrona antes de cargar el modelo (nada más compite
+# por la CPU en este proceso) bajo un cerrojo de fichero entre procesos: un solo
+# worker mide y los demás esperan y reutilizan su resultado.
+# El criterio principal es la latencia de una reseña sola (lo que hace la app);
+# el rendimiento en lotes solo desempata configuraciones de latencia parecida.
+#
+# Se mide un único proceso con la máquina en reposo: no refleja la contención
+# entre varios workers (réplicas de servicio.py, sesiones de Streamlit, lotes.py)
+# que comparten las mismas CPU. Con varios procesos por host, cada uno debería
+# usar como mucho CPU / procesos hilos intra-op, aunque aquí gane un valor mayor.
+#
+# Uso: python autoajuste_hilos.py [--modelo sentiment_cnn_bigru.h5] [--forzar]
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin cerrojo entre procesos
+    fcntl = None
+
+RUTA_CONFIG_HILOS = os.environ.get(
+    "CINEMASCOPE_HILOS",
+    os.path.join(os.path.expanduser("~"), ".cache", "cinemascope", "hilos.json"),
+)
+
+# Lotes del desempate por rendimiento (procesos masivos) y predicciones medidas por lote
+TAMANOS_LOTE = (8, 32)
+REPETICIONES = 5
+# Predicciones de una reseña sola para la latencia (criterio principal)
+REPETICIONES_LATENCIA = 20
+# Latencias dentro de este margen relativo de la mejor cuentan como empate
+TOLERANCIA_LATENCIA = 0.05
+
+def clave_host():
+    """Identifica el host: la mejor configuración depende de la máquina"""
+    return f"{socket.gethostname()}|{os.cpu_count()}"
+
+def candidatos(n_cpu=None):
+    """Combinaciones (intra, inter) a medir"""
+    n_cpu = n_cpu or os.cpu_count() or 1
+    intra = sorted({n for n in (1, 2, 4, 8, 16, 32, n_cpu) if n <= n_cpu})
+    inter = (1, 2) if n_cpu > 1 else (1,)
+    return [(i, j) for i in intra for j in inter]
+
+def leer_configuraciones(ruta=RUTA_CONFIG_HILOS):
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def guardar_configuracion(configuracion, ruta=RUTA_CONFIG_HILOS):
+    configuraciones = leer_configuraciones(ruta)
+    configuraciones[clave_host()] = configuracion
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(configuraciones, f, indent=2)
+    os.replace(temporal, ruta)
+
+def configuracion_guardada(ruta=RUTA_CONFIG_HILOS):
+    """Mejor configuración medida en este host (None si nunca se midió)"""
+    return leer_configuraciones(ruta).get(clave_host())
+
+def aplicar_configuracion_hilos(configuracion):
+    """Aplica la configuración a TensorFlow; debe llamarse antes de la primera operación"""
+    import tensorflow as tf
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(configuracion['intra'])
+        tf.config.threading.set_inter_op_parallelism_threads(configuracion['inter'])
+        return True
+    except RuntimeError:
+        # TensorFlow ya estaba inicializado en este proceso
+        return False
+
+def medir_en_proceso(intra, inter, ruta_modelo, tamanos_lote=TAMANOS_LOTE, repeticiones=REPETICIONES):
+    """Latencia mediana de una reseña (ms) y reseñas/s en lotes, en el proceso actual (recién iniciado)"""
+    import numpy as np
+    aplicar_configuracion_hilos({'intra': intra, 'inter': inter})
+    from nucleo import cargar_modelo, SEQUENCE_LENGTH
+
+    modelo = cargar_modelo(ruta_modelo)
+    rng = np.random.default_rng(0)
+    individual = rng.integers(1, 1000, size=(1, SEQUENCE_LENGTH, 1), dtype=np.int32)
+    modelo.predict(individual, verbose=0) # calentamiento (trazado de la función)
+    latencias = []
+    for _ in range(REPETICIONES_LATENCIA):
+        inicio = time.perf_counter()
+        modelo.predict(individual, verbose=0)
+        latencias.append(time.perf_counter() - inicio)
+
+    resenas = 0
+    tiempo = 0.0
+    for tamano in tamanos_lote:
+        lote = rng.integers(1, 1000, size=(tamano, SEQUENCE_LENGTH, 1), dtype=np.int32)
+        modelo.predict(lote, verbose=0) # calentamiento (trazado de la función)
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            modelo.predict(lote, verbose=0)
+        tiempo += time.perf_counter() - inicio
+        resenas += tamano * repeticiones
+    return {'latencia_ms': float(np.median(latencias)) * 1000, 'resenas_por_segundo': resenas / tiempo}
+
+def medir_candidato(intra, inter, ruta_modelo, timeout=300):
+    """Lanza un subproceso que mide una configuración; {'latencia_ms', 'resenas_por_segundo'} o None si falla"""
+    comando = [sys.executable, os.path.abspath(__file__), "--modelo", ruta_modelo,
+               "--medir", str(intra), str(inter)]
+    try:
+        salida = subprocess.run(comando, capture_output=True, text=True, timeout=timeout, check=True)
+        medida = json.loads(salida.stdout.strip().splitlines()[-1])
+        return {'latencia_ms': medida['latencia_ms'], 'resenas_por_segundo': medida['resenas_por_segundo']}
+    except (subprocess.SubprocessError, ValueError, IndexError, KeyError):
+        return None
+
+def elegir(resultados):
+    """Menor latencia individual; entre las empatadas (TOLERANCIA_LATENCIA), mayor rendimiento"""
+    mejor_latencia = min(medida['latencia_ms'] for _, _, medida in resultados)
+    empatadas = [r for r in resultados if r[2]['latencia_ms'] <= mejor_latencia * (1 + TOLERANCIA_LATENCIA)]
+    return max(empatadas, key=lambda r: r[2]['resenas_por_segundo'])
+
+def autoajustar(ruta_modelo, informar=None):
+    """Mide todos los candidatos, guarda el mejor para este host y lo devuelve"""
+    resultados = []
+    for intra, inter in candidatos():
+        medida = medir_candidato(intra, inter, ruta_modelo)
+        if informar:
+            informar(intra, inter, medida)
+        if medida is not None:
+            resultados.append((intra, inter, medida))
+    if not resultados:
+        return None
+
+    intra, inter, medida = elegir(resultados)
+    configuracion = {
+        'intra': intra,
+        'inter': inter,
+        'latencia_ms': round(medida['latencia_ms'], 2),
+        'resenas_por_segundo': round(medida['resenas_por_segundo'], 1),
+        'tamanos_lote': list(TAMANOS_LOTE),
+        'medido_en': time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    guardar_configuracion(configuracion)
+    return configuracion
+
+@contextlib.contextmanager
+def bloqueo_configuracion(ruta=RUTA_CONFIG_HILOS):
+    """Cerrojo exclusivo entre procesos (flock sobre ruta + '.lock') mientras se mide"""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    with open(ruta + ".lock", "w") as cerrojo:
+        fcntl.flock(cerrojo, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(cerrojo, fcntl.LOCK_UN)
+
+def autoajustar_si_no_existe(ruta_modelo, forzar=False, informar=None):
+    """Mide bajo el cerrojo salvo que otro proceso ya lo haya hecho mientras se esperaba.
+    Devuelve (configuración, medida_aqui)."""
+    with bloqueo_configuracion():
+        configuracion = None if forzar else configuracion_guardada()
+        if configuracion is not None:
+            return configuracion, False
+        return autoajustar(ruta_modelo, informar), True
+
+def preparar_hilos(ruta_modelo, autoajustar_si_falta=False):
+    """Paso de arranque: aplica la configuración guardada. Si no existe y
+    'autoajustar_si_falta', la mide antes (bloquea el arranque la primera vez)."""
+    configuracion = configuracion_guardada()
+    if configuracion is None and autoajustar_si_falta:
+        configuracion, _ = autoajustar_si_no_existe(ruta_modelo)
+    if configuracion is None:
+        return None
+    return dict(configuracion, aplicada=aplicar_configuracion_hilos(configuracion))
+
+def main():
+    from nucleo import MODEL_PATH
+    parser = argparse.ArgumentParser(description="Autoajuste de hilos de TensorFlow")
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    parser.add_argument("--forzar", action="store_true", help="Volver a medir aunque exista configuración")
+    parser.add_argument("--medir", nargs=2, type=int, metavar=("INTRA", "INTER"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        print(json.dumps(medir_en_proceso(args.medir[0], args.medir[1], args.modelo)))
+        return
+
+    def informar(intra, inter, medida):
+        if medida is None:
+            print(f"intra={intra:<3} inter={inter:<3}      error", flush=True)
+        else:
+            print(f"intra={intra:<3} inter={inter:<3} {medida['latencia_ms']:8.1f} ms/reseña "
+                  f"{medida['resenas_por_segundo']:10.1f} reseñas/s en lotes", flush=True)
+
+    configuracion, medida_aqui = autoajustar_si_no_existe(args.modelo, args.forzar, informar)
+    if configuracion is None:
+        print("❌ No se pudo medir ninguna configuración")
+        sys.exit(1)
+    if not medida_aqui:
+        print(f"Configuración guardada para {clave_host()}: intra={configuracion['intra']} "
+              f"inter={configuracion['inter']} ({configuracion['resenas_por_segundo']} reseñas/s). Usa --forzar para volver a medir.")
+        return
+    print(f"✅ Elegido para {clave_host()}: intra={configuracion['intra']} inter={configuracion['inter']} "
+          f"({configuracion['latencia_ms']} ms/reseña, {configuracion['resenas_por_segundo']} reseñas/s) -> {RUTA_CONFIG_HILOS}")
+    print("ℹ️ Medido con un solo proceso: con varios workers por host, limita intra-op a CPU / workers.")
+
+if __name__ == "__main__":
+    main()
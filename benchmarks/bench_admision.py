@@ -0,0 +1,119 @@
+# Prueba de carga del control de admisión: llegadas a un ritmo superior a la
+# capacidad (sobrecarga) con y sin ControladorAdmision. El modelo es un
+# sustituto que reparte N núcleos entre los análisis activos (como la CPU real):
+# sin límite, cada análisis nuevo ralentiza a todos y la latencia crece sin
+# tope; con el controlador la latencia de los admitidos se mantiene acotada.
+#
+# Uso: python benchmarks/bench_admision.py [--segundos 10] [--sobrecarga 2.0]
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from admision import ControladorAdmision, AnalisisRechazado
+
+# Coste simulado de cada etapa (segundos de CPU)
+COSTE_CNN = 0.02
+COSTE_TRANSFORMERS = 0.06
+PASO = 0.002
+
+class CPUCompartida:
+    """Reparte 'nucleos' entre los trabajos activos (procesador compartido)"""
+
+    def __init__(self, nucleos):
+        self.nucleos = nucleos
+        self.activos = 0
+        self._lock = threading.Lock()
+
+    def trabajar(self, coste):
+        with self._lock:
+            self.activos += 1
+        try:
+            hecho = 0.0
+            while hecho < coste:
+                time.sleep(PASO)
+                with self._lock:
+                    hecho += PASO * min(1.0, self.nucleos / self.activos)
+        finally:
+            with self._lock:
+                self.activos -= 1
+
+def analizar_sustituto(cpu, con_transformers):
+    cpu.trabajar(COSTE_CNN + (COSTE_TRANSFORMERS if con_transformers else 0.0))
+
+def ejecutar(cpu, controlador, tasa, segundos):
+    """Llegadas de Poisson a 'tasa' por segundo durante 'segundos'"""
+    latencias = []
+    resultado = {'rechazados': 0, 'degradados': 0}
+    lock = threading.Lock()
+
+    def peticion():
+        inicio = time.perf_counter()
+        if controlador is None:
+            analizar_sustituto(cpu, True)
+        else:
+            try:
+                with controlador.admitir() as permiso:
+                    analizar_sustituto(cpu, not permiso.degradado)
+            except AnalisisRechazado:
+                with lock:
+                    resultado['rechazados'] += 1
+                return
+            if permiso.degradado:
+                with lock:
+                    resultado['degradados'] += 1
+        with lock:
+            latencias.append((time.perf_counter() - inicio) * 1000)
+
+    rng = np.random.default_rng(0)
+    hilos = []
+    fin = time.perf_counter() + segundos
+    while time.perf_counter() < fin:
+        hilo = threading.Thread(target=peticion, daemon=True)
+        hilo.start()
+        hilos.append(hilo)
+        time.sleep(rng.exponential(1 / tasa))
+    for hilo in hilos:
+        hilo.join()
+
+    resultado['completados'] = len(latencias)
+    resultado['p50'] = np.percentile(latencias, 50) if latencias else float('nan')
+    resultado['p99'] = np.percentile(latencias, 99) if latencias else float('nan')
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del control de admisión")
+    parser.add_argument("--segundos", type=float, default=10.0)
+    parser.add_argument("--nucleos", type=int, default=4)
+    parser.add_argument("--sobrecarga", type=float, default=2.0, help="Llegadas / capacidad completa")
+    args = parser.parse_args()
+
+    capacidad = args.nucleos / (COSTE_CNN + COSTE_TRANSFORMERS)
+    tasa = capacidad * args.sobrecarga
+    print(f"Capacidad con Transformers: {capacidad:.0f} análisis/s · llegadas: {tasa:.0f}/s "
+          f"durante {args.segundos:.0f} s ({args.nucleos} núcleos)\n")
+
+    sin_control = ejecutar(CPUCompartida(args.nucleos), None, tasa, args.segundos)
+    controlador = ControladorAdmision(max_concurrentes=args.nucleos, max_en_espera=4 * args.nucleos,
+                                      tiempo_max_espera=1.0)
+    con_control = ejecutar(CPUCompartida(args.nucleos), controlador, tasa, args.segundos)
+
+    print(f"{'':22}{'completados':>12}{'degradados':>12}{'rechazados':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for nombre, r in (("Sin control", sin_control), ("Con admisión", con_control)):
+        print(f"{nombre:22}{r['completados']:>12}{r['degradados']:>12}{r['rechazados']:>12}"
+              f"{r['p50']:>10.0f}{r['p99']:>10.0f}")
+
+    metricas = controlador.instantanea()
+    print(f"\nMétricas del controlador: máximo en espera {metricas['max_en_espera']}, "
+          f"espera media {metricas['espera_media_ms']:.0f} ms, "
+          f"rechazo {100 * metricas['tasa_rechazo']:.1f}% "
+          f"(cola llena {metricas['rechazados_cola_llena']}, tiempo {metricas['rechazados_tiempo']})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Benchmark de los agregados por película: coste de actualización por reseña
+# y de consulta sobre la tabla precalculada tras millones de reseñas.
+#
+# Uso: python benchmarks/bench_agregados.py [--resenas 10000000] [--peliculas 100000]
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agregados
+from almacen import abrir_conexion
+
+def lote_sintetico(tamano, peliculas):
+    return [{
+        'pelicula_id': f"tt{random.randrange(peliculas):07d}",
+        'pred_ensemble': random.random(),
+        'confianza': random.uniform(60, 100),
+    } for _ in range(tamano)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de agregados por película")
+    parser.add_argument("--resenas", type=int, default=10_000_000)
+    parser.add_argument("--peliculas", type=int, default=100_000)
+    parser.add_argument("--lote", type=int, default=10_000, help="Reseñas por transacción (como el almacén)")
+    parser.add_argument("--consultas", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        conexion = abrir_conexion(os.path.join(directorio, "bench.db"))
+        agregados.crear_esquema(conexion)
+
+        t_actualizacion = 0.0
+        procesadas = 0
+        while procesadas < args.resenas:
+            lote = lote_sintetico(min(args.lote, args.resenas - procesadas), args.peliculas)
+            inicio = time.perf_counter()
+            with conexion:
+                agregados.aplicar_lote(conexion, lote)
+            t_actualizacion += time.perf_counter() - inicio
+            procesadas += len(lote)
+            if procesadas % (args.lote * 100) == 0:
+                print(f"  {procesadas:,} reseñas...", flush=True)
+
+        inicio = time.perf_counter()
+        for _ in range(args.consultas):
+            agregados.consultar_pelicula(conexion, f"tt{random.randrange(args.peliculas):07d}")
+        t_consulta = (time.perf_counter() - inicio) / args.consultas
+
+        inicio = time.perf_counter()
+        for _ in range(100):
+            agregados.listar_peliculas(conexion, limite=50)
+        t_top = (time.perf_counter() - inicio) / 100
+
+        n_total = conexion.execute("SELECT SUM(n) FROM agregados_pelicula").fetchone()[0]
+        conexion.close()
+
+    print(f"Reseñas agregadas:            {n_total:,} en {args.peliculas:,} películas")
+    print(f"Actualización total (s):      {t_actualizacion:.1f}")
+    print(f"Actualización por reseña (µs): {t_actualizacion / args.resenas * 1e6:.2f}")
+    print(f"Consulta por película (µs):   {t_consulta * 1e6:.1f}")
+    print(f"Top 50 por reseñas (ms):      {t_top * 1000:.2f}")
+
+if __name__ == "__main__":
+    main()
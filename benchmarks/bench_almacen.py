@@ -0,0 +1,89 @@
+# Benchmark de escritura del almacén persistente con sesiones concurrentes:
+# mide cuánto tarda guardar() en la petición (debe ser casi nulo gracias a la
+# cola) y el rendimiento de escritura del hilo en segundo plano (WAL).
+#
+# Uso: python benchmarks/bench_almacen.py [--sesiones 16] [--analisis 2000]
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from almacen import AlmacenAnalisis, MAX_COLA
+
+def registro_sintetico(i, sesion):
+    return {
+        'creado_en': time.time(),
+        'texto_hash': f"{sesion:04d}{i:060d}",
+        'longitud': 420,
+        'pred_original': 0.73,
+        'pred_ensemble': 0.81,
+        'boost_consenso': 18.0,
+        'boost_palabras': 9.0,
+        'boost_intensidad': 4.0,
+        'palabras_encontradas': '["+brilliant(4)", "+great(2)"]',
+        'confianza': 93.5,
+        'nivel_confianza': "🚀 Muy Alta",
+        'con_transformers': 1,
+        't_tokenizacion_ms': 0.4,
+        't_modelo_ms': 35.0,
+        't_ensemble_ms': 60.0,
+        't_total_ms': 95.4,
+        'version_modelo': "abcdef012345",
+        'version_lexico': "012345abcdef",
+    }
+
+def percentil(ordenados, p):
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escritura del almacén")
+    parser.add_argument("--sesiones", type=int, default=16)
+    parser.add_argument("--analisis", type=int, default=2000, help="Análisis por sesión")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        # Cola suficiente para que la ráfaga completa no se descarte
+        almacen = AlmacenAnalisis(os.path.join(directorio, "bench.db"),
+                                  max_cola=max(MAX_COLA, args.sesiones * args.analisis))
+        latencias = [[] for _ in range(args.sesiones)]
+
+        def sesion(n):
+            for i in range(args.analisis):
+                inicio = time.perf_counter()
+                almacen.guardar(registro_sintetico(i, n))
+                latencias[n].append((time.perf_counter() - inicio) * 1e6)
+
+        inicio = time.perf_counter()
+        hilos = [threading.Thread(target=sesion, args=(n,)) for n in range(args.sesiones)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        t_encolado = time.perf_counter() - inicio
+        almacen.vaciar(espera=600)
+        t_total = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for i in range(1000):
+            almacen.buscar(f"{i % args.sesiones:04d}{i:060d}", "abcdef012345", "012345abcdef", True)
+        t_busqueda = (time.perf_counter() - inicio) / 1000 * 1e6
+
+        almacen.cerrar()
+
+    todas = sorted(t for l in latencias for t in l)
+    total = args.sesiones * args.analisis
+    print(f"Sesiones concurrentes:        {args.sesiones}")
+    print(f"Análisis guardados:           {almacen.metricas['escritos']:,} de {total:,} "
+          f"({almacen.metricas['lotes']} transacciones, {almacen.metricas['descartados']} descartados)")
+    print(f"guardar() p50 / p99 (µs):     {percentil(todas, 50):.1f} / {percentil(todas, 99):.1f}")
+    print(f"Encolado (s):                 {t_encolado:.2f}")
+    print(f"Escritura completa (s):       {t_total:.2f}  -> {total / t_total:,.0f} filas/s")
+    print(f"buscar() por hash (µs):       {t_busqueda:.1f}")
+
+if __name__ == "__main__":
+    main()
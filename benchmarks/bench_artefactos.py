@@ -0,0 +1,76 @@
+# Benchmark de la caché de artefactos: tiempo de carga del modelo (hasta la
+# primera predicción) con el .h5 directo, en el primer arranque (conversión)
+# y con la caché ya creada. Cada medida corre en un proceso nuevo, como un
+# arranque en frío. Sin el .h5 real se usa el sustituto de bench_compactacion.
+#
+# Uso: python benchmarks/bench_artefactos.py [--modelo sentiment_cnn_bigru.h5] [--repeticiones 3]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+def medir_variante(variante, ruta_modelo, directorio):
+    """Se ejecuta en un subproceso: TensorFlow ya importado, solo se mide la carga"""
+    import numpy as np
+    import artefactos
+    from nucleo import SEQUENCE_LENGTH, cargar_modelo
+
+    entrada = np.ones((1, SEQUENCE_LENGTH, 1), dtype=np.int32)
+    inicio = time.perf_counter()
+    if variante == "h5":
+        modelo = cargar_modelo(ruta_modelo)
+    else:
+        modelo = artefactos.cargar_modelo_cacheado(ruta_modelo, directorio)
+    carga = time.perf_counter() - inicio
+    modelo.predict(entrada, verbose=0)
+    print(json.dumps({'carga': carga, 'primera_prediccion': time.perf_counter() - inicio}))
+
+def ejecutar(variante, ruta_modelo, directorio):
+    salida = subprocess.run([sys.executable, os.path.abspath(__file__), "--medir", variante, ruta_modelo, directorio],
+                            capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga en frío y en caliente de la caché de artefactos")
+    parser.add_argument("--modelo", help="Modelo .h5 real (por defecto, un sustituto)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--medir", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        medir_variante(*args.medir)
+        return
+
+    from bench_compactacion import crear_sustituto
+
+    with tempfile.TemporaryDirectory() as temporal:
+        ruta_modelo = args.modelo or os.path.join(temporal, "sustituto.h5")
+        if not args.modelo:
+            crear_sustituto(ruta_modelo, 128)
+        directorio = os.path.join(temporal, "artefactos")
+
+        h5 = [ejecutar("h5", ruta_modelo, directorio) for _ in range(args.repeticiones)]
+        conversion = ejecutar("cache", ruta_modelo, directorio) # caché vacía: convierte
+        caliente = [ejecutar("cache", ruta_modelo, directorio) for _ in range(args.repeticiones)]
+
+    print(f"{'':34}{'carga s':>10}{'hasta 1ª predicción s':>24}")
+    filas = (
+        ("Sin caché (.h5)", h5),
+        ("Caché vacía (carga + conversión)", [conversion]),
+        ("Caché creada (SavedModel)", caliente),
+    )
+    for nombre, medidas in filas:
+        print(f"{nombre:34}{statistics.median(m['carga'] for m in medidas):>10.2f}"
+              f"{statistics.median(m['primera_prediccion'] for m in medidas):>24.2f}")
+
+if __name__ == "__main__":
+    main()
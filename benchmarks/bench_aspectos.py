@@ -0,0 +1,79 @@
+# Benchmark del análisis por aspectos en reseñas largas: tiempo de la pasada
+# de tokens y de la puntuación de todas las ventanas por lotes, frente a una
+# llamada al modelo por mención. Usa el modelo Keras sustituto de
+# bench_compactacion (sin necesitar el .h5).
+#
+# Uso: python benchmarks/bench_aspectos.py [--repeticiones 3]
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+import numpy as np
+
+import nucleo
+from aspectos import analizar_aspectos, menciones_aspectos
+from bench_compactacion import crear_sustituto
+
+FRASES = [
+    "The acting was superb and the cast had real chemistry",
+    "but the plot was predictable and the ending felt rushed",
+    "the soundtrack is stunning, a wonderful score",
+    "the director shows impressive control of tone",
+    "cinematography and visual effects are breathtaking",
+    "the dialogue felt forced in several scenes",
+    "pacing is slow in the middle act",
+    "we watched it on a rainy evening with friends",
+]
+
+def resena_larga(n_palabras, rng):
+    frases, total = [], 0
+    while total < n_palabras:
+        frase = FRASES[int(rng.integers(len(FRASES)))]
+        frases.append(frase)
+        total += len(frase.split())
+    return ". ".join(frases) + "."
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        nucleo._secuencia_cacheada.cache_clear()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+def por_mencion(texto, modelo, tokenizer):
+    return [float(modelo.predict(nucleo.texto_a_secuencia(v, tokenizer), verbose=0)[0, 0])
+            for _, _, v in menciones_aspectos(texto)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del análisis por aspectos")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporal:
+        ruta = os.path.join(temporal, "sustituto.h5")
+        crear_sustituto(ruta, 128)
+        modelo = nucleo.cargar_modelo(ruta)
+    tokenizer = nucleo.crear_tokenizer()
+    modelo.predict(np.ones((1, nucleo.SEQUENCE_LENGTH, 1), dtype=np.int32), verbose=0)
+
+    rng = np.random.default_rng(0)
+    print(f"{'palabras':>9}{'menciones':>11}{'pasada ms':>11}{'por lotes ms':>14}{'por mención ms':>16}")
+    for n_palabras in (300, 1000, 3000):
+        texto = resena_larga(n_palabras, rng)
+        menciones = len(menciones_aspectos(texto))
+        pasada = medir(lambda: menciones_aspectos(texto), args.repeticiones * 10)
+        lotes = medir(lambda: analizar_aspectos(texto, modelo, tokenizer), args.repeticiones)
+        individual = medir(lambda: por_mencion(texto, modelo, tokenizer), 1)
+        print(f"{len(texto.split()):>9}{menciones:>11}{pasada:>11.2f}{lotes:>14.1f}{individual:>16.1f}")
+
+if __name__ == "__main__":
+    main()
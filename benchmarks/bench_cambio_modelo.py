@@ -0,0 +1,203 @@
+# Prueba de cambio del modelo en caliente (versiones.py).
+# Varios hilos puntúan reseñas sin parar con nucleo.analizar_resena() mientras
+# se despliega una versión nueva del .h5 (copia + os.replace) y el gestor la
+# detecta, la carga, la calienta y la publica. Comprueba que ninguna petición
+# falla, que las que estaban en curso terminan con la versión anterior, que esta
+# se libera después y compara la latencia antes, durante y después del cambio.
+# Cada petición puntúa además una secuencia fija al empezar y al terminar: las
+# dos predicciones deben ser las de una sola versión (sin mezclar versiones).
+# Sin el .h5 real se usan dos sustitutos de bench_compactacion con pesos distintos.
+# Las mismas comprobaciones, con un sustituto diminuto, están en
+# tests/test_versiones.py (python -m pytest tests).
+#
+# Uso: python benchmarks/bench_cambio_modelo.py [--hilos 4] [--segundos 12] [--dim 64]
+
+import argparse
+import atexit
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import weakref
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+TEMPORAL = tempfile.mkdtemp(prefix="bench-cambio-")
+# Artefactos convertidos en un directorio propio, no en la caché del usuario
+os.environ["CINEMASCOPE_ARTEFACTOS"] = os.path.join(TEMPORAL, "artefactos")
+atexit.register(shutil.rmtree, TEMPORAL, True)
+
+import numpy as np
+
+import nucleo
+from versiones import GestorModelos
+from bench_compactacion import crear_sustituto
+from bench_carga import generar_resena
+
+# Entrada fija que identifica la versión por su predicción
+SECUENCIA_FIJA = np.arange(1, nucleo.SEQUENCE_LENGTH + 1, dtype=np.int32).reshape(1, -1, 1)
+# Diferencia máxima entre predicciones de la misma versión
+TOLERANCIA_VERSION = 1e-6
+
+def percentiles(latencias):
+    if not latencias:
+        return "—"
+    p50, p99 = np.percentile(latencias, [50, 99])
+    return f"p50 {p50:7.1f} ms · p99 {p99:7.1f} ms · {len(latencias):5d} peticiones"
+
+def prediccion_fija(modelo):
+    return float(np.asarray(modelo.predict(SECUENCIA_FIJA, verbose=0))[0, 0])
+
+def ejecutar_cambio(hilos=4, segundos=12.0, dim=64, intervalo=0.2):
+    """Puntúa sin parar con 'hilos' sesiones mientras se despliega otra versión"""
+    directorio = tempfile.mkdtemp(dir=TEMPORAL)
+    ruta = os.path.join(directorio, "sentiment_cnn_bigru.h5")
+    nueva = os.path.join(directorio, "nueva.h5")
+    crear_sustituto(ruta, dim)
+    crear_sustituto(nueva, dim)
+
+    gestor = GestorModelos(ruta, intervalo=intervalo).cargar().vigilar()
+    version_a = gestor.version
+    modelo_a = weakref.ref(gestor._vigente.modelo)
+    referencias = {version_a: prediccion_fija(gestor._vigente.modelo)}
+
+    rng = np.random.default_rng(0)
+    textos = [generar_resena(int(n), rng) for n in rng.choice([15, 80, 200], size=200)]
+    registros = []  # (inicio, fin, versión, error, pred. fija al empezar, pred. fija al terminar)
+    lock = threading.Lock()
+    parar = threading.Event()
+
+    def sesion(indice):
+        i = indice
+        propios = []
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            error = pred_inicio = pred_fin = None
+            try:
+                with gestor.usar() as version:
+                    etiqueta = version.version
+                    pred_inicio = prediccion_fija(version.modelo)
+                    nucleo.analizar_resena(textos[i % len(textos)], version.modelo, version.tokenizer)
+                    pred_fin = prediccion_fija(version.modelo)
+            except Exception as e:
+                etiqueta, error = None, f"{type(e).__name__}: {e}"
+            propios.append((inicio, time.perf_counter(), etiqueta, error, pred_inicio, pred_fin))
+            i += hilos
+        with lock:
+            registros.extend(propios)
+
+    # Una petición larga que empieza antes del despliegue y acaba después
+    larga = {}
+    def peticion_larga():
+        with gestor.usar() as version:
+            larga['version'] = version.version
+            while gestor.version == version_a and not parar.is_set():
+                time.sleep(0.05)
+            time.sleep(0.5)
+            larga['pred'] = prediccion_fija(version.modelo)
+            larga['liberadas_antes'] = gestor.liberadas
+
+    sesiones = [threading.Thread(target=sesion, args=(i,)) for i in range(hilos)]
+    sesiones.append(threading.Thread(target=peticion_larga))
+    for hilo in sesiones:
+        hilo.start()
+
+    # Despliegue a un tercio de la prueba: copia junto al actual y rename atómico
+    time.sleep(segundos / 3)
+    copia = ruta + ".nueva"
+    shutil.copyfile(nueva, copia)
+    despliegue = time.perf_counter()
+    os.replace(copia, ruta)
+    while gestor.version == version_a and time.perf_counter() - despliegue < 120:
+        time.sleep(0.01)
+    publicacion = time.perf_counter()
+    version_b = gestor.version
+    if version_b != version_a:
+        with gestor.usar() as version:
+            referencias[version_b] = prediccion_fija(version.modelo)
+
+    # Mismo tiempo de carga tras el cambio que antes del despliegue
+    time.sleep(segundos / 3)
+    parar.set()
+    for hilo in sesiones:
+        hilo.join()
+    instantanea = gestor.instantanea()
+    gestor.detener()
+    gc.collect()
+
+    return {
+        'registros': registros, 'despliegue': despliegue, 'publicacion': publicacion,
+        'version_a': version_a, 'version_b': version_b, 'referencias': referencias,
+        'larga': larga, 'anterior_liberada': modelo_a() is None,
+        'vigilando': instantanea['vigilando'], 'instantanea': instantanea,
+    }
+
+def invariantes(resultado):
+    """Fallos de las garantías del cambio en caliente (lista vacía si todo se cumple)"""
+    registros, publicacion = resultado['registros'], resultado['publicacion']
+    version_a, referencias = resultado['version_a'], resultado['referencias']
+    fallos = [f"Petición fallida: {r[3]}" for r in registros if r[3]][:5]
+    if resultado['version_b'] == version_a:
+        fallos.append("La versión nueva no llegó a publicarse")
+    elif abs(referencias[version_a] - referencias[resultado['version_b']]) <= TOLERANCIA_VERSION:
+        fallos.append("Las dos versiones predicen lo mismo: no se pueden distinguir")
+    mezcladas = [r for r in registros if not r[3] and (
+        r[2] not in referencias
+        or abs(r[4] - referencias[r[2]]) > TOLERANCIA_VERSION
+        or abs(r[5] - referencias[r[2]]) > TOLERANCIA_VERSION)]
+    if mezcladas:
+        fallos.append(f"{len(mezcladas)} peticiones no usaron una sola versión de principio a fin")
+    if any(r[2] != version_a for r in registros if r[0] < publicacion <= r[1] and not r[3]):
+        fallos.append("Peticiones en curso al publicar terminaron con la versión nueva")
+    if any(r[2] == version_a for r in registros if r[0] >= publicacion):
+        fallos.append("Peticiones empezadas tras publicar usaron la versión anterior")
+    if resultado['larga'].get('version') != version_a or resultado['larga'].get('liberadas_antes') != 0:
+        fallos.append("La petición larga perdió su versión antes de terminar")
+    if not resultado['anterior_liberada']:
+        fallos.append("La versión anterior no se liberó")
+    if not resultado['vigilando']:
+        fallos.append("El hilo de vigilancia se detuvo")
+    return fallos
+
+def main():
+    parser = argparse.ArgumentParser(description="Puntuación continua durante un cambio de modelo")
+    parser.add_argument("--hilos", type=int, default=4)
+    parser.add_argument("--segundos", type=float, default=12.0, help="Duración de referencia: un tercio antes del despliegue y otro tras el cambio")
+    parser.add_argument("--dim", type=int, default=64, help="Dimensión del embedding de los sustitutos")
+    parser.add_argument("--intervalo", type=float, default=0.2, help="Intervalo de vigilancia del gestor")
+    args = parser.parse_args()
+
+    print(f"{args.hilos} hilos · {args.segundos:.0f} s")
+    resultado = ejecutar_cambio(args.hilos, args.segundos, args.dim, args.intervalo)
+    registros, despliegue, publicacion = resultado['registros'], resultado['despliegue'], resultado['publicacion']
+    version_a, larga = resultado['version_a'], resultado['larga']
+
+    antes = [(f - i) * 1000 for i, f, *_ in registros if f < despliegue]
+    durante = [(f - i) * 1000 for i, f, *_ in registros if i < publicacion and f >= despliegue]
+    despues = [(f - i) * 1000 for i, f, *_ in registros if i >= publicacion]
+    cruzadas = [r for r in registros if r[0] < publicacion <= r[1]]
+
+    print(f"Versión {version_a} -> {resultado['version_b']} publicada en {publicacion - despliegue:.2f} s "
+          f"(carga, conversión y calentamiento en segundo plano)\n")
+    print(f"  antes del despliegue    {percentiles(antes)}")
+    print(f"  durante la carga        {percentiles(durante)}")
+    print(f"  después del cambio      {percentiles(despues)}\n")
+    print(f"Peticiones: {len(registros)} · errores: {sum(1 for r in registros if r[3])} · "
+          f"en curso al publicar: {len(cruzadas)}")
+    print(f"Petición larga: versión {larga.get('version')} hasta el final (pred {larga.get('pred', float('nan')):.4f})")
+    print(f"Gestor: {resultado['instantanea']}")
+
+    fallos = invariantes(resultado)
+    for fallo in fallos:
+        print(f"  ❌ {fallo}")
+    if not fallos:
+        print("✅ Sin peticiones fallidas ni versiones mezcladas")
+    sys.exit(0 if not fallos else 1)
+
+if __name__ == "__main__":
+    main()
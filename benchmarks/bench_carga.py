@@ -0,0 +1,182 @@
+# Prueba de carga del núcleo de análisis sin la interfaz de Streamlit.
+# Simula N sesiones concurrentes que llaman a nucleo.analizar_resena(), el
+# mismo camino que sigue la app (texto_a_secuencia, modelo.predict,
+# ensemble_prediccion_avanzada y confianza), con una mezcla configurable de
+# longitudes de reseña y de textos repetidos. Informa rendimiento, latencias
+# p50/p95/p99 y pico de RSS. Funciona sin conexión con un modelo sustituto.
+#
+# Uso:
+#   python benchmarks/bench_carga.py --sesiones 16 --analisis 50 \
+#       --mezcla corta:0.5,media:0.3,larga:0.2 --duplicados 0.2 [--modelo sustituto|keras|ruta.h5]
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+import numpy as np
+
+import nucleo
+
+# Palabras por reseña de cada longitud
+LONGITUDES = {'corta': 15, 'media': 80, 'larga': 400}
+
+RELLENO = ("the movie film story plot acting cast director scene characters script music "
+           "ending it was is and but with of to in this that i felt watched time").split()
+
+class ModeloSustituto:
+    """Coste parecido a un CNN+BiGRU pequeño en NumPy: embedding, convolución y
+    una recurrencia de SEQUENCE_LENGTH pasos en cada sentido (secuencial, como la GRU)"""
+
+    input_shape = (None, nucleo.SEQUENCE_LENGTH, 1)
+    output_shape = (None, 1)
+
+    def __init__(self, dim=64):
+        rng = np.random.default_rng(0)
+        self.embedding = rng.normal(0, 0.1, (nucleo.VOCAB_SIZE, dim)).astype(np.float32)
+        self.convolucion = rng.normal(0, 0.1, (dim, dim)).astype(np.float32)
+        self.recurrente = rng.normal(0, 0.1, (dim, dim)).astype(np.float32)
+        self.salida = rng.normal(0, 0.1, 2 * dim).astype(np.float32)
+
+    def _recurrencia(self, x):
+        h = np.zeros((x.shape[0], x.shape[2]), dtype=np.float32)
+        for t in range(x.shape[1]):
+            h = np.tanh(x[:, t] + h @ self.recurrente)
+        return h
+
+    def predict(self, x, verbose=0):
+        h = np.maximum(self.embedding[x[:, :, 0]] @ self.convolucion, 0)
+        h = np.concatenate([self._recurrencia(h), self._recurrencia(h[:, ::-1])], axis=1)
+        return (1 / (1 + np.exp(-(h @ self.salida))))[:, None]
+
+def cargar_modelo(opcion):
+    if opcion == "sustituto":
+        return ModeloSustituto()
+    if opcion == "keras":
+        from bench_compactacion import crear_sustituto
+        with tempfile.TemporaryDirectory() as temporal:
+            ruta = os.path.join(temporal, "sustituto.h5")
+            crear_sustituto(ruta, 128)
+            return nucleo.cargar_modelo(ruta)
+    return nucleo.cargar_modelo(opcion)
+
+def leer_mezcla(texto):
+    mezcla = {}
+    for parte in texto.split(","):
+        nombre, peso = parte.split(":")
+        if nombre not in LONGITUDES:
+            raise SystemExit(f"Longitud desconocida '{nombre}' (usa {', '.join(LONGITUDES)})")
+        mezcla[nombre] = float(peso)
+    total = sum(mezcla.values())
+    return {nombre: peso / total for nombre, peso in mezcla.items()}
+
+def generar_resena(n_palabras, rng):
+    lexico = list(nucleo.PESOS_POSITIVOS) + list(nucleo.PESOS_NEGATIVOS)
+    palabras = [str(p) for p in rng.choice(RELLENO, size=n_palabras)]
+    for _ in range(max(1, n_palabras // 10)):
+        palabras[int(rng.integers(n_palabras))] = str(rng.choice(lexico))
+    return " ".join(palabras) + "."
+
+def generar_carga(n, mezcla, duplicados, rng):
+    """Lista de n reseñas; una fracción 'duplicados' repite textos anteriores"""
+    nombres = list(mezcla)
+    textos = []
+    for _ in range(n):
+        if textos and rng.random() < duplicados:
+            textos.append(textos[int(rng.integers(len(textos)))])
+        else:
+            longitud = LONGITUDES[nombres[int(rng.choice(len(nombres), p=[mezcla[m] for m in nombres]))]]
+            textos.append(generar_resena(longitud, rng))
+    return textos
+
+def pico_rss_mib():
+    # ru_maxrss está en KiB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def ejecutar(modelo, tokenizer, cargas, pausa):
+    latencias = []
+    descartadas = [0]
+    lock = threading.Lock()
+    barrera = threading.Barrier(len(cargas))
+
+    def sesion(textos):
+        propias = []
+        barrera.wait()
+        for texto in textos:
+            inicio = time.perf_counter()
+            resultado = nucleo.analizar_resena(texto, modelo, tokenizer)
+            propias.append((time.perf_counter() - inicio) * 1000)
+            if resultado.get('descartado'):
+                with lock:
+                    descartadas[0] += 1
+            if pausa:
+                time.sleep(pausa)
+        with lock:
+            latencias.extend(propias)
+
+    hilos = [threading.Thread(target=sesion, args=(textos,)) for textos in cargas]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+
+    latencias = np.array(latencias)
+    return {
+        'sesiones': len(cargas),
+        'analisis': len(latencias),
+        'descartados_idioma': descartadas[0],
+        'duracion_s': round(duracion, 3),
+        'analisis_por_segundo': round(len(latencias) / duracion, 1),
+        'p50_ms': round(float(np.percentile(latencias, 50)), 2),
+        'p95_ms': round(float(np.percentile(latencias, 95)), 2),
+        'p99_ms': round(float(np.percentile(latencias, 99)), 2),
+        'pico_rss_mib': round(pico_rss_mib(), 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del núcleo de análisis")
+    parser.add_argument("--sesiones", type=int, nargs="+", default=[1, 4, 16],
+                        help="Sesiones concurrentes (se puede dar una lista)")
+    parser.add_argument("--analisis", type=int, default=50, help="Análisis por sesión")
+    parser.add_argument("--mezcla", default="corta:0.5,media:0.3,larga:0.2")
+    parser.add_argument("--duplicados", type=float, default=0.2, help="Fracción de textos repetidos")
+    parser.add_argument("--pausa", type=float, default=0.0, help="Segundos entre análisis de una sesión")
+    parser.add_argument("--modelo", default="sustituto", help="sustituto, keras o ruta a un .h5")
+    parser.add_argument("--json", action="store_true", help="Una línea JSON por configuración")
+    args = parser.parse_args()
+
+    mezcla = leer_mezcla(args.mezcla)
+    modelo = cargar_modelo(args.modelo)
+    tokenizer = nucleo.crear_tokenizer()
+    nucleo.analizar_resena("a short warm-up review of the film", modelo, tokenizer)
+
+    if not args.json:
+        print(f"Modelo: {args.modelo} · mezcla {args.mezcla} · duplicados {args.duplicados:.0%} · "
+              f"{args.analisis} análisis por sesión\n")
+        print(f"{'sesiones':>9}{'análisis/s':>12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'pico RSS MiB':>14}")
+    for n in args.sesiones:
+        # Cachés vacías en cada configuración: los duplicados son los de la carga
+        nucleo._secuencia_cacheada.cache_clear()
+        nucleo.analizar_palabras_clave_avanzado.cache_clear()
+        nucleo.analizar_intensidad_emocional.cache_clear()
+        rng = np.random.default_rng(n)
+        textos = generar_carga(n * args.analisis, mezcla, args.duplicados, rng)
+        cargas = [textos[i::n] for i in range(n)]
+        r = ejecutar(modelo, tokenizer, cargas, args.pausa)
+        if args.json:
+            print(json.dumps(dict(r, modelo=args.modelo, mezcla=mezcla, duplicados=args.duplicados)))
+        else:
+            print(f"{n:>9}{r['analisis_por_segundo']:>12,.1f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+                  f"{r['p99_ms']:>9.2f}{r['pico_rss_mib']:>14.1f}")
+
+if __name__ == "__main__":
+    main()
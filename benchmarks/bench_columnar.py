@@ -0,0 +1,168 @@
+# Benchmark de la E/S de la puntuación masiva (lotes.py): CSV fila a fila con
+# el módulo csv frente a Parquet/Arrow por lotes de registros, para 1M de reseñas.
+# Mide por separado lo que no depende del modelo: leer los textos en lotes,
+# escribir los resultados y volver a cargarlos (lo que hará el almacén de
+# datos), más el tamaño de cada archivo. Los resultados son análisis reales de
+# una muestra (analizar_lote con el sustituto NumPy de bench_carga) repetidos
+# hasta completar las filas.
+#
+# Uso: python benchmarks/bench_columnar.py [--filas 1000000]
+
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import nucleo
+import lotes
+from bench_carga import ModeloSustituto, RELLENO
+
+def generar_textos(n, rng):
+    """n reseñas de 8 a 60 palabras (vocabulario de relleno + léxico)"""
+    vocabulario = np.array(RELLENO + list(nucleo.PESOS_POSITIVOS) + list(nucleo.PESOS_NEGATIVOS))
+    longitudes = rng.integers(8, 61, n)
+    palabras = vocabulario[rng.integers(0, len(vocabulario), int(longitudes.sum()))].tolist()
+    textos, inicio = [], 0
+    for longitud in longitudes.tolist():
+        textos.append(" ".join(palabras[inicio:inicio + longitud]) + ".")
+        inicio += longitud
+    return textos
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - inicio, resultado
+
+# --- Línea base: CSV fila a fila ---
+def leer_csv_filas(ruta, tam_lote):
+    n = 0
+    with open(ruta, newline="", encoding="utf-8") as f:
+        lote = []
+        for fila in csv.DictReader(f):
+            lote.append(fila['texto'])
+            if len(lote) == tam_lote:
+                n += len(lote)
+                lote = []
+        return n + len(lote)
+
+def fila_csv(identificador, a):
+    if a.get('descartado'):
+        fila = {'id': identificador, 'texto_hash': a['texto_hash'], 'descartado': a['descartado']['motivo']}
+    else:
+        fila = {
+            'id': identificador, 'texto_hash': a['texto_hash'], 'descartado': "", 'nivel': a.get('nivel', "completo"),
+            **{nombre: float(a[nombre]) for nombre in lotes._NUMERICAS},
+            'palabras_encontradas': json.dumps(list(a['palabras_encontradas']), ensure_ascii=False),
+            'nivel_confianza': a['nivel_confianza'], 'con_transformers': int(a['con_transformers']),
+        }
+    fila.update({f't_{clave}_ms': a['tiempos_ms'].get(clave) for clave in lotes._TIEMPOS})
+    return fila
+
+def escribir_csv_filas(ruta, muestra, filas):
+    campos = ['id'] + [nombre for nombre, _ in lotes.COLUMNAS_RESULTADO]
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, campos)
+        escritor.writeheader()
+        for i in range(filas):
+            escritor.writerow(fila_csv(i, muestra[i % len(muestra)]))
+
+def cargar_csv_filas(ruta):
+    """Lo que haría un cargador sin esquema: parsear cada campo de cada fila"""
+    n = 0
+    with open(ruta, newline="", encoding="utf-8") as f:
+        for fila in csv.DictReader(f):
+            if not fila['descartado']:
+                float(fila['pred_ensemble'])
+                json.loads(fila['palabras_encontradas'])
+            n += 1
+    return n
+
+# --- Columnar: lotes.py ---
+def leer_columnar(ruta, tam_lote):
+    return sum(len(lote.column('texto').to_pylist()) for lote in lotes.leer_lotes(ruta, ['texto'], tam_lote=tam_lote))
+
+def escribir_columnar(ruta, muestra, filas, tam_lote):
+    lote_muestra = None
+    esquema = lotes.esquema_resultados(pa.int64())
+    with lotes.EscritorResultados(ruta, esquema) as escritor:
+        for inicio in range(0, filas, tam_lote):
+            n = min(tam_lote, filas - inicio)
+            if lote_muestra is None or n != len(lote_muestra):
+                lote_muestra = [muestra[i % len(muestra)] for i in range(n)]
+            escritor.escribir(lotes.lote_resultados(lote_muestra, esquema, pa.array(np.arange(inicio, inicio + n))))
+
+def cargar_columnar(ruta):
+    if ruta.endswith(".parquet"):
+        return pq.read_table(ruta).num_rows
+    with pa.memory_map(ruta) as origen:
+        return pa.ipc.open_file(origen).read_all().num_rows
+
+def mib(ruta):
+    return os.path.getsize(ruta) / 2**20
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV fila a fila frente a Parquet/Arrow por lotes")
+    parser.add_argument("--filas", type=int, default=1_000_000)
+    parser.add_argument("--tam-lote", type=int, default=lotes.TAM_LOTE_REGISTROS)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    textos = generar_textos(args.filas, rng)
+    # Resultados reales de una muestra (incluye algunos descartados por el filtro)
+    muestra_textos = textos[:args.tam_lote - 64] + ["ok"] * 32 + ["película aburrida y muy mala de verdad"] * 32
+    muestra = nucleo.analizar_lote(muestra_textos, ModeloSustituto(), nucleo.crear_tokenizer())
+    print(f"{args.filas:,} reseñas · lotes de {args.tam_lote:,} filas\n")
+
+    with tempfile.TemporaryDirectory() as temporal:
+        entrada_csv = os.path.join(temporal, "resenas.csv")
+        entrada_parquet = os.path.join(temporal, "resenas.parquet")
+        with open(entrada_csv, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(["id", "texto"])
+            escritor.writerows(enumerate(textos))
+        pq.write_table(pa.table({'id': np.arange(args.filas), 'texto': textos}), entrada_parquet,
+                       row_group_size=args.tam_lote * 8, compression='zstd')
+        del textos
+
+        print("Lectura de los textos por lotes")
+        t, n = medir(lambda: leer_csv_filas(entrada_csv, args.tam_lote))
+        print(f"  CSV (csv.DictReader)      {t:7.2f} s  {n / t:>12,.0f} filas/s  {mib(entrada_csv):8.1f} MiB")
+        t, n = medir(lambda: leer_columnar(entrada_csv, args.tam_lote))
+        print(f"  CSV (lector Arrow)        {t:7.2f} s  {n / t:>12,.0f} filas/s  {mib(entrada_csv):8.1f} MiB")
+        t, n = medir(lambda: leer_columnar(entrada_parquet, args.tam_lote))
+        print(f"  Parquet                   {t:7.2f} s  {n / t:>12,.0f} filas/s  {mib(entrada_parquet):8.1f} MiB")
+
+        print("\nEscritura de los resultados")
+        salidas = {}
+        for nombre, ruta, funcion in (
+            ("CSV (csv.DictWriter)", os.path.join(temporal, "resultados.csv"), escribir_csv_filas),
+            ("Parquet (row groups)", os.path.join(temporal, "resultados.parquet"), None),
+            ("Arrow IPC", os.path.join(temporal, "resultados.arrow"), None),
+        ):
+            if funcion is not None:
+                t, _ = medir(lambda: funcion(ruta, muestra, args.filas))
+            else:
+                t, _ = medir(lambda: escribir_columnar(ruta, muestra, args.filas, args.tam_lote))
+            salidas[nombre] = ruta
+            print(f"  {nombre:<24}  {t:7.2f} s  {args.filas / t:>12,.0f} filas/s  {mib(ruta):8.1f} MiB")
+
+        print("\nCarga completa de los resultados")
+        for nombre, ruta in salidas.items():
+            funcion = cargar_csv_filas if ruta.endswith(".csv") else cargar_columnar
+            t, n = medir(lambda: funcion(ruta))
+            print(f"  {nombre:<24}  {t:7.2f} s  {n / t:>12,.0f} filas/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Benchmark de la compactación del modelo: RSS por proceso con el .h5 original
+# y con el modelo compacto (embedding recortado, pesos .npy con mmap).
+# Sin el .h5 real se crea un modelo sustituto con la misma entrada (1, 300, 1),
+# Embedding(VOCAB_SIZE, --dim) y bloque CNN+BiGRU; cada variante se mide en un
+# proceso nuevo, como un worker recién arrancado.
+#
+# Uso: python benchmarks/bench_compactacion.py [--modelo sentiment_cnn_bigru.h5] [--dim 128]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+def memoria_kib():
+    """RSS actual y pico del proceso (KiB), leídos de /proc"""
+    valores = {}
+    with open("/proc/self/status") as f:
+        for linea in f:
+            if linea.startswith(("VmRSS:", "VmHWM:")):
+                clave, valor = linea.split(":")
+                valores[clave] = int(valor.split()[0])
+    return valores['VmRSS'], valores['VmHWM']
+
+def crear_sustituto(ruta, dim):
+    import tensorflow as tf
+    from nucleo import VOCAB_SIZE, SEQUENCE_LENGTH
+    entrada = tf.keras.Input(shape=(SEQUENCE_LENGTH, 1), dtype="int32")
+    x = tf.keras.layers.Reshape((SEQUENCE_LENGTH,))(entrada)
+    x = tf.keras.layers.Embedding(VOCAB_SIZE, dim)(x)
+    x = tf.keras.layers.Conv1D(64, 5, activation="relu")(x)
+    x = tf.keras.layers.Bidirectional(tf.keras.layers.GRU(32))(x)
+    salida = tf.keras.layers.Dense(1, activation="sigmoid")(x)
+    tf.keras.Model(entrada, salida).save(ruta)
+
+def medir_variante(variante, ruta):
+    """Se ejecuta en un subproceso: carga, predice una vez e informa la memoria"""
+    from nucleo import crear_tokenizer, cargar_modelo, texto_a_secuencia
+    base = memoria_kib()[0]
+    if variante == "original":
+        modelo, tokenizer = cargar_modelo(ruta), crear_tokenizer()
+    else:
+        from compactacion import cargar_modelo_compacto
+        modelo, tokenizer = cargar_modelo_compacto(ruta)
+    modelo.predict(texto_a_secuencia("a brilliant and moving film", tokenizer), verbose=0)
+    rss, pico = memoria_kib()
+    print(json.dumps({'rss': rss, 'pico': pico, 'base': base}))
+
+def ejecutar(variante, ruta):
+    salida = subprocess.run([sys.executable, os.path.abspath(__file__), "--medir", variante, ruta],
+                            capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS por worker antes y después de compactar")
+    parser.add_argument("--modelo", help="Modelo .h5 real (por defecto, un sustituto)")
+    parser.add_argument("--dim", type=int, default=128, help="Dimensión del embedding del sustituto")
+    parser.add_argument("--medir", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        medir_variante(*args.medir)
+        return
+
+    with tempfile.TemporaryDirectory() as temporal:
+        ruta_modelo = args.modelo or os.path.join(temporal, "sustituto.h5")
+        if not args.modelo:
+            crear_sustituto(ruta_modelo, args.dim)
+        ruta_compacto = os.path.join(temporal, "compacto")
+        subprocess.run([sys.executable, os.path.join(RAIZ, "compactacion.py"), "--modelo", ruta_modelo,
+                        "--salida", ruta_compacto], check=True)
+
+        antes = ejecutar("original", ruta_modelo)
+        despues = ejecutar("compacto", ruta_compacto)
+        print(f"\n{'':24}{'RSS MiB':>10}{'pico MiB':>10}{'sobre TF MiB':>14}")
+        for nombre, m in (("Original (.h5)", antes), ("Compacto (.npy mmap)", despues)):
+            print(f"{nombre:24}{m['rss'] / 1024:>10.1f}{m['pico'] / 1024:>10.1f}{(m['rss'] - m['base']) / 1024:>14.1f}")
+        print(f"Ahorro por worker: {(antes['rss'] - despues['rss']) / 1024:.1f} MiB de RSS, "
+              f"{(antes['pico'] - despues['pico']) / 1024:.1f} MiB de pico")
+
+if __name__ == "__main__":
+    main()
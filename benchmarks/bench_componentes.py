@@ -0,0 +1,87 @@
+# Benchmark de la búsqueda de pesos del ensemble (componentes.py).
+# Calcula una vez los componentes de un corpus sintético etiquetado (modelo
+# sustituto NumPy de bench_carga; la mitad de las reseñas con una puntuación de
+# Transformers simulada, correlada con la etiqueta), comprueba que la
+# combinación vectorizada coincide con nucleo.combinar_ensemble() y mide
+# configuraciones evaluadas por segundo frente a recombinar reseña a reseña.
+#
+# Uso: python benchmarks/bench_componentes.py [--resenas 10000] [--paso 0.1]
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+import numpy as np
+
+import nucleo
+import componentes
+from bench_carga import ModeloSustituto, RELLENO
+
+def generar_corpus(n, rng):
+    """Reseñas cuyo léxico se inclina hacia su etiqueta (con ruido)"""
+    positivas = list(nucleo.PESOS_POSITIVOS)
+    negativas = list(nucleo.PESOS_NEGATIVOS)
+    etiquetas = rng.integers(0, 2, n)
+    textos = []
+    for etiqueta in etiquetas:
+        palabras = [str(p) for p in rng.choice(RELLENO, size=int(rng.integers(10, 50)))]
+        for _ in range(int(rng.integers(1, 4))):
+            a_favor = rng.random() < 0.75
+            lexico = positivas if (etiqueta == 1) == a_favor else negativas
+            palabras[int(rng.integers(len(palabras)))] = str(rng.choice(lexico))
+        if rng.random() < 0.2:
+            palabras.append("!!")
+        textos.append(" ".join(palabras) + ".")
+    return textos, etiquetas
+
+def main():
+    parser = argparse.ArgumentParser(description="Búsqueda vectorizada de pesos del ensemble")
+    parser.add_argument("--resenas", type=int, default=10000)
+    parser.add_argument("--paso", type=float, default=0.1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    textos, etiquetas = generar_corpus(args.resenas, rng)
+    inicio = time.perf_counter()
+    comp = componentes.calcular_componentes(textos, ModeloSustituto(), nucleo.crear_tokenizer())
+    duracion_componentes = time.perf_counter() - inicio
+    mitad = rng.random(args.resenas) < 0.5
+    simulada = np.clip(etiquetas * 0.6 + 0.2 + rng.normal(0, 0.25, args.resenas), 0, 1)
+    comp['pred_transformers'][mitad] = simulada[mitad]
+    print(f"{args.resenas:,} reseñas · componentes calculados una vez en {duracion_componentes:.1f} s")
+
+    # Equivalencia con la combinación escalar de nucleo.py (configuración actual)
+    escalar = np.array([
+        nucleo.combinar_ensemble(float(o), float(p), float(i), None if np.isnan(t) else float(t))[0]
+        for o, p, i, t in zip(comp['pred_original'], comp['puntuacion_palabras'], comp['intensidad'],
+                              comp['pred_transformers'])
+    ])
+    vectorizada = componentes.combinar_rejilla(comp, [nucleo.PESOS_ENSEMBLE[:2]], [nucleo.PESOS_ENSEMBLE_TRANSFORMERS],
+                                               [nucleo.ESCALA_INTENSIDAD])[0]
+    print(f"Diferencia máxima con combinar_ensemble(): {np.max(np.abs(escalar - vectorizada)):.1e}")
+
+    # Recombinar reseña a reseña en Python, para una configuración
+    inicio = time.perf_counter()
+    for o, p, i, t in zip(comp['pred_original'], comp['puntuacion_palabras'], comp['intensidad'], comp['pred_transformers']):
+        nucleo.combinar_ensemble(float(o), float(p), float(i), None if np.isnan(t) else float(t), (0.5, 0.5, 0), (0.4, 0.3, 0.3), 30)
+    por_configuracion = time.perf_counter() - inicio
+
+    resultado = componentes.buscar_pesos(comp, etiquetas, args.paso, top=5)
+    print(f"\nBucle Python: {1 / por_configuracion:,.1f} configuraciones/s")
+    print(f"Rejilla NumPy: {resultado['configuraciones_por_segundo']:,.0f} configuraciones/s "
+          f"({resultado['configuraciones']:,} configuraciones, "
+          f"{resultado['configuraciones_por_segundo'] * por_configuracion:,.0f}× más rápido)\n")
+    actual = resultado['actual']
+    print(f"Actual:  exactitud {100 * actual['exactitud']:.2f}% · Brier {actual['brier']:.4f}")
+    for i, c in enumerate(resultado['mejores'], 1):
+        print(f"#{i}:      exactitud {100 * c['exactitud']:.2f}% · Brier {c['brier']:.4f} · "
+              f"{c['pesos']} / {c['pesos_transformers']} · escala {c['escala_intensidad']:g}")
+
+if __name__ == "__main__":
+    main()
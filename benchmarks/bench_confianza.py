@@ -0,0 +1,53 @@
+# Benchmark del cálculo de confianza: versión escalar (la de la app) frente a
+# la vectorizada con NumPy y la tabla de calibración.
+#
+# Uso: python benchmarks/bench_confianza.py [--filas 1000000]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from confianza import calcular_confianza, calcular_confianza_lote, ajustar_histograma
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del cálculo de confianza")
+    parser.add_argument("--filas", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pred = rng.random(args.filas)
+    boost_consenso = rng.uniform(10, 20, args.filas)
+    boost_palabras = rng.uniform(0, 15, args.filas)
+    boost_intensidad = rng.uniform(0, 10, args.filas)
+    con_transformers = rng.random(args.filas) > 0.5
+    n_palabras = rng.integers(0, 4, args.filas)
+
+    inicio = time.perf_counter()
+    escalar = [calcular_confianza(*fila)[0] for fila in zip(
+        pred.tolist(), boost_consenso.tolist(), boost_palabras.tolist(),
+        boost_intensidad.tolist(), con_transformers.tolist(), n_palabras.tolist())]
+    t_escalar = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    confianza, _ = calcular_confianza_lote(pred, boost_consenso, boost_palabras,
+                                           boost_intensidad, con_transformers, n_palabras)
+    t_lote = time.perf_counter() - inicio
+    assert np.allclose(confianza, escalar)
+
+    etiquetas = rng.random(args.filas) < pred
+    calibrador = ajustar_histograma(pred, etiquetas)
+    inicio = time.perf_counter()
+    calibrador.transformar(pred)
+    t_calibrada = time.perf_counter() - inicio
+
+    print(f"Filas:                     {args.filas:,}")
+    print(f"Escalar (filas/s):         {args.filas / t_escalar:,.0f}")
+    print(f"Vectorizada (filas/s):     {args.filas / t_lote:,.0f}  ({t_escalar / t_lote:.0f}x)")
+    print(f"Calibrada (filas/s):       {args.filas / t_calibrada:,.0f}")
+
+if __name__ == "__main__":
+    main()
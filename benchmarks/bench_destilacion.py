@@ -0,0 +1,78 @@
+# Benchmark del modelo rápido destilado: acuerdo con el ensemble y reseñas/s
+# por núcleo. Sin el archivo .h5, el corpus y la salida del CNN+BiGRU son
+# sustitutos sintéticos: cada reseña tiene una polaridad oculta que decide sus
+# palabras y la predicción del "CNN"; los objetivos sí salen del ensemble real
+# (ensemble_prediccion_avanzada, sin Transformers).
+#
+# Uso: python benchmarks/bench_destilacion.py [--resenas 20000]
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import nucleo
+from destilacion import caracteristicas, entrenar, evaluar
+
+RELLENO = ("the movie film story plot acting cast director scene scenes character characters "
+           "script music ending camera it was is and but with a of to in this that i we they "
+           "felt seemed looked watched saw time hour minutes moments performance lead actor").split()
+
+def corpus_sintetico(n, rng):
+    positivas = list(nucleo.PESOS_POSITIVOS)
+    negativas = list(nucleo.PESOS_NEGATIVOS)
+    textos, preds_cnn = [], []
+    for _ in range(n):
+        polaridad = rng.normal()
+        n_palabras = int(rng.integers(20, 120))
+        palabras = list(rng.choice(RELLENO, size=n_palabras))
+        n_clave = int(rng.poisson(2 + abs(polaridad)))
+        for _ in range(n_clave):
+            lista = positivas if rng.random() < 1 / (1 + np.exp(-2 * polaridad)) else negativas
+            palabras.insert(int(rng.integers(0, len(palabras))), str(rng.choice(lista)))
+        if rng.random() < 0.3:
+            palabras.insert(0, str(rng.choice(nucleo.INTENSIFICADORES)))
+        textos.append(" ".join(palabras) + ("!" if rng.random() < 0.3 else "."))
+        preds_cnn.append(1 / (1 + np.exp(-(2 * polaridad + rng.normal(0, 0.5)))))
+    return textos, preds_cnn
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del modelo rápido destilado")
+    parser.add_argument("--resenas", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    textos, preds_cnn = corpus_sintetico(args.resenas, rng)
+
+    inicio = time.perf_counter()
+    objetivos = np.array([nucleo.ensemble_prediccion_avanzada(p, t)[0] for t, p in zip(textos, preds_cnn)])
+    tiempo_ensemble = time.perf_counter() - inicio
+
+    corte = int(0.9 * len(textos))
+    inicio = time.perf_counter()
+    modelo_rapido = entrenar(caracteristicas(textos[:corte]), objetivos[:corte])
+    tiempo_entrenamiento = time.perf_counter() - inicio
+
+    metricas = evaluar(modelo_rapido, textos[corte:], objetivos[corte:])
+    inicio = time.perf_counter()
+    for texto in textos[corte:]:
+        modelo_rapido.predecir(texto)
+    individual = (len(textos) - corte) / (time.perf_counter() - inicio)
+
+    print(f"Reseñas: {len(textos):,} ({corte:,} entrenamiento, {len(textos) - corte:,} validación)")
+    print(f"Entrenamiento: {tiempo_entrenamiento:.1f} s")
+    print(f"Acuerdo con el ensemble:       {100 * metricas['acuerdo']:.1f}% (error medio {metricas['error_medio']:.3f})")
+    print(f"Primer nivel seguro:           cubre {100 * metricas['cobertura_nivel_rapido']:.1f}% "
+          f"con {100 * metricas['acuerdo_nivel_rapido']:.1f}% de acuerdo")
+    print(f"Modelo rápido, por lotes:      {metricas['resenas_por_segundo']:>10,.0f} reseñas/s por núcleo")
+    print(f"Modelo rápido, de una en una:  {individual:>10,.0f} reseñas/s por núcleo")
+    print(f"Solo léxico del ensemble:      {len(textos) / tiempo_ensemble:>10,.0f} reseñas/s "
+          f"(sin contar CNN+BiGRU ni RoBERTa)")
+
+if __name__ == "__main__":
+    main()
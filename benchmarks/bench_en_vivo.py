@@ -0,0 +1,58 @@
+# Benchmark del modo en vivo: simula ráfagas de escritura contra el
+# PlanificadorEnVivo y reporta inferencias omitidas y latencia extremo a extremo.
+#
+# Uso: python benchmarks/bench_en_vivo.py [--rafagas 20] [--latencia-modelo 0.15]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from en_vivo import PlanificadorEnVivo, ESPERA_DEBOUNCE
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del modo en vivo")
+    parser.add_argument("--rafagas", type=int, default=20, help="Ráfagas de escritura simuladas")
+    parser.add_argument("--cambios-por-rafaga", type=int, default=8)
+    parser.add_argument("--intervalo-teclas", type=float, default=0.08, help="Segundos entre cambios dentro de una ráfaga")
+    parser.add_argument("--latencia-modelo", type=float, default=0.15, help="Duración simulada de una inferencia")
+    parser.add_argument("--espera", type=float, default=ESPERA_DEBOUNCE)
+    args = parser.parse_args()
+
+    def puntuar(texto):
+        time.sleep(args.latencia_modelo)
+        return {'texto': texto, 'pred_ensemble': random.random()}
+
+    planificador = PlanificadorEnVivo(puntuar, espera=args.espera)
+    texto = "this movie"
+    inicio = time.perf_counter()
+
+    for _ in range(args.rafagas):
+        for _ in range(args.cambios_por_rafaga):
+            texto += random.choice([" great", " boring", " acting", " plot", "!"])
+            planificador.notificar(texto)
+            planificador.sondear()
+            time.sleep(args.intervalo_teclas)
+        # Pausa del usuario: se espera a que el resultado se estabilice
+        while planificador.en_curso():
+            planificador.sondear()
+            time.sleep(0.01)
+
+    total = time.perf_counter() - inicio
+    planificador.cerrar()
+
+    stats = planificador.estadisticas
+    sin_debounce = stats['cambios']
+    print(f"Cambios de texto:           {stats['cambios']}")
+    print(f"Inferencias ejecutadas:     {stats['inferencias'] + stats['descartadas']} (sin debounce: {sin_debounce})")
+    print(f"Inferencias omitidas:       {stats['omitidas']}")
+    print(f"Resultados descartados:     {stats['descartadas']}")
+    print(f"Latencia última (ms):       {stats['latencia_ms']:.1f}")
+    print(f"Latencia media (ms):        {stats['latencia_media_ms']:.1f}")
+    print(f"Tiempo total simulado (s):  {total:.2f}")
+
+if __name__ == "__main__":
+    main()
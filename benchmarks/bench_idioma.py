@@ -0,0 +1,66 @@
+# Benchmark del filtro de idioma: latencia por reseña y proporción de
+# inferencias evitadas sobre una mezcla de reseñas.
+#
+# Uso: python benchmarks/bench_idioma.py [--archivo resenas.txt] [--repeticiones 200]
+# (sin --archivo se usa una mezcla de ejemplo en inglés, español y textos vacíos)
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from idioma import evaluar_entrada
+
+MEZCLA_EJEMPLO = [
+    "This movie is absolutely brilliant! The cinematography is stunning, the acting is superb, and the plot keeps you engaged from start to finish.",
+    "This movie was a complete disaster! The plot was confusing and boring, the acting was terrible, and the dialogue felt forced and unnatural.",
+    "Great acting, awful script. I wanted to like it but the last hour drags on forever.",
+    "Masterpiece. Loved every minute!",
+    "Great movie!",
+    "Loved it",
+    "Brilliant film, la la land vibes",
+    "Me encantó la película, los actores son increíbles y la historia te atrapa desde el principio.",
+    "Una película aburrida y predecible, no la recomiendo para nada.",
+    "La fotografía es preciosa pero el guion no tiene ningún sentido.",
+    "ok",
+    "",
+]
+
+def percentil(ordenados, p):
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del filtro de idioma")
+    parser.add_argument("--archivo", help="Una reseña por línea")
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.archivo:
+        with open(args.archivo, encoding="utf-8") as f:
+            resenas = [linea.rstrip("\n") for linea in f]
+    else:
+        resenas = MEZCLA_EJEMPLO
+
+    motivos = Counter()
+    latencias = []
+    for _ in range(args.repeticiones):
+        for resena in resenas:
+            inicio = time.perf_counter()
+            evaluacion = evaluar_entrada(resena)
+            latencias.append((time.perf_counter() - inicio) * 1e6)
+            motivos[evaluacion['motivo'] or 'apta'] += 1
+    latencias.sort()
+
+    total = sum(motivos.values())
+    evitadas = total - motivos['apta']
+    print(f"Reseñas evaluadas:             {total:,}")
+    print(f"Latencia p50 / p99 (µs):       {percentil(latencias, 50):.1f} / {percentil(latencias, 99):.1f}")
+    print(f"Descartadas por idioma:        {motivos['idioma']:,}")
+    print(f"Descartadas por texto vacío:   {motivos['vacia']:,}")
+    print(f"Inferencias evitadas:          {100 * evitadas / total:.1f}%")
+
+if __name__ == "__main__":
+    main()
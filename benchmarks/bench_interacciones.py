@@ -0,0 +1,59 @@
+# Benchmark del tiempo de servidor por interacción: con la estructura anterior
+# cada clic ejecutaba main() completo; ahora solo se ejecuta el fragmento
+# seccion_analisis(). Se ejecuta en el modo "bare" de Streamlit (sin servidor),
+# con un modelo sustituto para no depender del archivo .h5. El trabajo de la
+# inferencia es el mismo en ambas estructuras y no se incluye.
+#
+# Uso: python benchmarks/bench_interacciones.py [--repeticiones 200]
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Streamlit avisa en cada llamada cuando no hay servidor; no aporta aquí
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+import numpy as np
+import app
+
+class ModeloSustituto:
+    input_shape = (None, app.SEQUENCE_LENGTH, 1)
+    output_shape = (None, 1)
+
+    def predict(self, x, verbose=0):
+        return np.full((len(x), 1), 0.5, dtype=np.float32)
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos), np.percentile(tiempos, 95)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del tiempo de servidor por interacción")
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    recursos = (ModeloSustituto(), app.crear_tokenizer(), None)
+    app.cargar_modelo_y_tokenizador = lambda: recursos
+
+    # Calentamiento de cachés (plantillas, estilos, tokenizer)
+    app.main()
+
+    anterior = medir(app.main, args.repeticiones)
+    nuevo = medir(lambda: app.seccion_analisis(*recursos), args.repeticiones)
+
+    print(f"{'':40}{'mediana ms':>12}{'p95 ms':>10}")
+    print(f"{'Página completa (estructura anterior)':40}{anterior[0]:>12.3f}{anterior[1]:>10.3f}")
+    print(f"{'Solo fragmento de análisis':40}{nuevo[0]:>12.3f}{nuevo[1]:>10.3f}")
+    print(f"Ahorro por interacción: {anterior[0] - nuevo[0]:.3f} ms ({100 * (1 - nuevo[0] / anterior[0]):.1f}%)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Benchmark del análisis de varias reseñas a la vez (multiples.py / app.py 5d):
+# una sola llamada a analizar_lote() (un predict y una pasada de Transformers
+# para todas) frente a analizar_resena() reseña a reseña, que es lo que costaba
+# pegar cada reseña en el cuadro individual (sin contar la animación de
+# progreso de la app por cada análisis). Usa un modelo Keras sustituto con la
+# arquitectura CNN+BiGRU (bench_compactacion) y, si está instalado,
+# el analizador de Transformers. Comprueba que los resultados coinciden.
+#
+# Uso: python benchmarks/bench_multiples.py [--resenas 50] [--sin-transformers]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+import numpy as np
+
+import nucleo
+from bench_carga import generar_resena
+from bench_compactacion import crear_sustituto
+from multiples import filas_resultados, resumen_multiples
+
+def limpiar_caches():
+    nucleo._secuencia_cacheada.cache_clear()
+    nucleo.analizar_palabras_clave_avanzado.cache_clear()
+    nucleo.analizar_intensidad_emocional.cache_clear()
+
+def medir(funcion, repeticiones):
+    duraciones = []
+    for _ in range(repeticiones):
+        limpiar_caches()
+        inicio = time.perf_counter()
+        resultado = funcion()
+        duraciones.append(time.perf_counter() - inicio)
+    return float(np.median(duraciones)), resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Varias reseñas: un lote frente a análisis sucesivos")
+    parser.add_argument("--resenas", type=int, default=50)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--sin-transformers", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    textos = [generar_resena(int(longitud), rng) for longitud in rng.choice([20, 60, 150], size=args.resenas)]
+    analyzer = None if args.sin_transformers else nucleo.cargar_analizador_transformers()
+
+    with tempfile.TemporaryDirectory() as temporal:
+        ruta = os.path.join(temporal, "sustituto.h5")
+        crear_sustituto(ruta, 64)
+        modelo, tokenizer = nucleo.cargar_modelo(ruta), nucleo.crear_tokenizer()
+        # Calentamiento de las dos formas de llamada
+        nucleo.analizar_resena(textos[0], modelo, tokenizer, analyzer)
+        nucleo.analizar_lote(textos[:8], modelo, tokenizer, analyzer)
+
+        secuencial, uno_a_uno = medir(
+            lambda: [nucleo.analizar_resena(t, modelo, tokenizer, analyzer) for t in textos], args.repeticiones)
+        lote, en_lote = medir(lambda: nucleo.analizar_lote(textos, modelo, tokenizer, analyzer), args.repeticiones)
+
+    diferencia = max(abs(float(a['pred_ensemble']) - float(b['pred_ensemble']))
+                     for a, b in zip(uno_a_uno, en_lote) if not a.get('descartado'))
+    resumen = resumen_multiples(filas_resultados(en_lote))
+    print(f"{args.resenas} reseñas · Transformers: {'sí' if analyzer else 'no'} · "
+          f"{resumen['puntuadas']} puntuadas, {resumen['porcentaje_positivas']:.0f}% positivas\n")
+    print(f"{'camino':<36}{'total s':>9}{'ms/reseña':>11}")
+    print(f"{'analizar_resena() una a una':<36}{secuencial:>9.2f}{1000 * secuencial / args.resenas:>11.1f}")
+    print(f"{'analizar_lote() en un solo lote':<36}{lote:>9.2f}{1000 * lote / args.resenas:>11.1f}")
+    print(f"\nAceleración: {secuencial / lote:.1f}× · |Δ pred_ensemble| máxima: {diferencia:.1e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Benchmark del desglose por oraciones: una llamada al modelo por oración
+# frente a analizar_oraciones(), que puntúa todas en lotes. Usa un modelo
+# Keras sustituto con la arquitectura de bench_compactacion (mismo coste de
+# llamada que un CNN+BiGRU real, sin necesitar el .h5).
+#
+# Uso: python benchmarks/bench_oraciones.py [--repeticiones 5]
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+import numpy as np
+
+import nucleo
+from bench_compactacion import crear_sustituto
+
+ORACIONES = [
+    "Great acting from the whole cast.",
+    "The script is awful and predictable.",
+    "The music is stunning!",
+    "Some scenes drag on far too long.",
+    "I would still recommend it to fans of the genre.",
+]
+
+def una_por_oracion(texto, modelo, tokenizer):
+    return [float(modelo.predict(nucleo.texto_a_secuencia(o, tokenizer), verbose=0)[0, 0])
+            for o in nucleo.segmentar_oraciones(texto)]
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        nucleo._secuencia_cacheada.cache_clear()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+def main():
+    parser = argparse.ArgumentParser(description="Desglose por oraciones: por oración frente a por lotes")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporal:
+        ruta = os.path.join(temporal, "sustituto.h5")
+        crear_sustituto(ruta, 128)
+        modelo = nucleo.cargar_modelo(ruta)
+    tokenizer = nucleo.crear_tokenizer()
+    modelo.predict(np.ones((1, nucleo.SEQUENCE_LENGTH, 1), dtype=np.int32), verbose=0)
+
+    print(f"{'oraciones':>10}{'por oración ms':>16}{'en lotes ms':>13}{'aceleración':>13}")
+    for n in (5, 20, 60, 150):
+        # Pares (oración de ejemplo, marcador único) + las oraciones de ejemplo
+        texto = " ".join(ORACIONES[i % len(ORACIONES)] + f" Point {i}." for i in range(n // 2))
+        texto = " ".join((texto, *ORACIONES))
+        n_real = len(nucleo.segmentar_oraciones(texto))
+        individual = medir(lambda: una_por_oracion(texto, modelo, tokenizer), args.repeticiones)
+        lotes = medir(lambda: nucleo.analizar_oraciones(texto, modelo, tokenizer), args.repeticiones)
+        print(f"{n_real:>10}{individual:>16.1f}{lotes:>13.1f}{individual / lotes:>12.1f}x")
+
+if __name__ == "__main__":
+    main()
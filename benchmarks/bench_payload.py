@@ -0,0 +1,68 @@
+# Benchmark del contenido enviado por ejecución de la app: compara el CSS y el
+# HTML estático en línea (estructura anterior) con el CSS servido como archivo
+# estático y las plantillas minificadas.
+#
+# Uso: python benchmarks/bench_payload.py
+
+import os
+import re
+
+DIRECTORIO_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLANTILLAS_ESTATICAS = ["hero", "caracteristicas", "instrucciones", "seccion_analisis", "pie"]
+ETAPAS_PROGRESO = 4
+
+def leer(*partes):
+    with open(os.path.join(DIRECTORIO_APP, *partes), encoding="utf-8") as f:
+        return f.read()
+
+def minificar_html(html):
+    return re.sub(r"\s+", " ", html).strip()
+
+def cuadro_progreso_anterior(i):
+    # Reproduce el HTML que la versión anterior enviaba en cada paso (101 pasos)
+    return f"""
+                <div style="text-align: center; margin: 2rem 0;">
+                    <div style="font-size: 1.2rem; font-weight: 600; margin-bottom: 1rem; color: #667eea;">
+                        🔄 Analizando reseña con CNN+BiGRU...
+                    </div>
+                    <div style="background: #e8eaf6; border-radius: 10px; overflow: hidden; margin: 0 auto; max-width: 400px;">
+                        <div style="height: 12px; background: linear-gradient(90deg, #667eea, #764ba2); width: {i}%; border-radius: 10px; transition: width 0.1s ease;"></div>
+                    </div>
+                    <div style="margin-top: 0.5rem; font-size: 0.9rem; color: #636e72;">
+                        {i}% Completado
+                    </div>
+                </div>
+                """
+
+def contenido_anterior():
+    partes = ["<style>\n" + leer("static", "estilos.css") + "</style>"]
+    partes += [leer("plantillas", f"{nombre}.html") for nombre in PLANTILLAS_ESTATICAS]
+    return partes
+
+def contenido_nuevo(cache):
+    partes = ['<link rel="stylesheet" href="app/static/estilos.css?v=000000000000">']
+    for nombre in PLANTILLAS_ESTATICAS:
+        if nombre not in cache:
+            cache[nombre] = minificar_html(leer("plantillas", f"{nombre}.html"))
+        partes.append(cache[nombre])
+    return partes
+
+def bytes_de(partes):
+    return sum(len(p.encode("utf-8")) for p in partes)
+
+def main():
+    cache = {}
+    antes = bytes_de(contenido_anterior())
+    despues = bytes_de(contenido_nuevo(cache))
+
+    progreso_antes = bytes_de(cuadro_progreso_anterior(i) for i in range(101))
+    progreso_despues = bytes_de([leer("plantillas", "progreso.html")])
+
+    print(f"{'':32}{'antes':>12}{'después':>12}")
+    print(f"{'Bytes estáticos por ejecución':32}{antes:>12,}{despues:>12,}")
+    print(f"{'Bytes de animación por análisis':32}{progreso_antes:>12,}{progreso_despues:>12,}")
+    print(f"{'Mensajes de animación':32}{101 * 2:>12}{1 + ETAPAS_PROGRESO:>12}")
+    print(f"Reducción por ejecución: {100 * (1 - despues / antes):.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# Prueba de carga local del servicio NDJSON (servicio.py): varios clientes
+# con conexiones keep-alive envían lotes de reseñas y se mide el rendimiento y
+# la latencia hasta la primera línea y hasta el final de la respuesta.
+# El modelo es un sustituto cuyo coste imita al CNN+BiGRU en CPU: un coste fijo
+# por llamada más un coste por reseña, así se ve el efecto de los lotes internos.
+#
+# Uso: python benchmarks/bench_servicio.py [--clientes 8] [--peticiones 20] [--resenas 100]
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+import numpy as np
+
+from admision import ControladorAdmision
+from nucleo import SEQUENCE_LENGTH, crear_tokenizer
+from servicio import ServicioPuntuacion, crear_servidor
+
+COSTE_LLAMADA = 0.008
+COSTE_RESENA = 0.0005
+
+RESENAS = [
+    "This movie is absolutely brilliant! The acting is superb and the plot keeps you engaged.",
+    "A complete disaster, boring and predictable with terrible dialogue and awful pacing.",
+    "Solid performances and a captivating story, although the ending felt a bit slow.",
+    "Weak script, bland characters and a forgettable soundtrack. Not worth watching.",
+]
+
+class ModeloSustituto:
+    input_shape = (None, SEQUENCE_LENGTH, 1)
+    output_shape = (None, 1)
+
+    def predict(self, x, verbose=0):
+        time.sleep(COSTE_LLAMADA + COSTE_RESENA * len(x))
+        return np.full((len(x), 1), 0.5, dtype=np.float32)
+
+def cliente(puerto, peticiones, resenas, latencias, errores):
+    conexion = http.client.HTTPConnection("127.0.0.1", puerto)
+    cuerpo = "".join(json.dumps({'id': i, 'texto': RESENAS[i % len(RESENAS)]}) + "\n"
+                     for i in range(resenas)).encode('utf-8')
+    for _ in range(peticiones):
+        inicio = time.perf_counter()
+        conexion.request("POST", "/puntuar", body=cuerpo, headers={"Content-Type": "application/x-ndjson"})
+        respuesta = conexion.getresponse()
+        if respuesta.status != 200:
+            respuesta.read()
+            errores.append(respuesta.status)
+            continue
+        primera = None
+        lineas = 0
+        for linea in respuesta:
+            if primera is None:
+                primera = time.perf_counter() - inicio
+            lineas += 1
+        latencias.append((primera, time.perf_counter() - inicio, lineas))
+    conexion.close()
+
+def ejecutar(tam_lote, args):
+    servicio = ServicioPuntuacion(ModeloSustituto(), crear_tokenizer(), None, tam_lote,
+                                  ControladorAdmision(max_concurrentes=4, max_en_espera=64, tiempo_max_espera=30))
+    servidor = crear_servidor(servicio, puerto=0)
+    hilo_servidor = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo_servidor.start()
+
+    latencias, errores = [], []
+    inicio = time.perf_counter()
+    hilos = [threading.Thread(target=cliente, args=(servidor.server_address[1], args.peticiones, args.resenas,
+                                                    latencias, errores))
+             for _ in range(args.clientes)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+    servidor.shutdown()
+    servidor.server_close()
+
+    primeras = np.array([l[0] for l in latencias]) * 1000
+    totales = np.array([l[1] for l in latencias]) * 1000
+    return {
+        'resenas_s': sum(l[2] for l in latencias) / duracion,
+        'primera_p50': np.percentile(primeras, 50), 'total_p50': np.percentile(totales, 50),
+        'total_p99': np.percentile(totales, 99), 'errores': len(errores),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio NDJSON")
+    parser.add_argument("--clientes", type=int, default=8)
+    parser.add_argument("--peticiones", type=int, default=20, help="Peticiones por cliente (misma conexión)")
+    parser.add_argument("--resenas", type=int, default=100, help="Reseñas por petición")
+    args = parser.parse_args()
+
+    print(f"{args.clientes} clientes keep-alive × {args.peticiones} peticiones × {args.resenas} reseñas\n")
+    print(f"{'lote interno':>12}{'reseñas/s':>12}{'1ª línea p50 ms':>18}{'total p50 ms':>15}{'total p99 ms':>15}{'errores':>9}")
+    for tam_lote in (1, 8, 32):
+        r = ejecutar(tam_lote, args)
+        print(f"{tam_lote:>12}{r['resenas_s']:>12,.0f}{r['primera_p50']:>18.1f}{r['total_p50']:>15.1f}"
+              f"{r['total_p99']:>15.1f}{r['errores']:>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# Benchmark del modo sombra: latencia que ve el usuario sin sombra y con una
+# fracción creciente de peticiones copiadas al candidato, más el informe de la
+# comparación. Las sesiones pasan por el control de admisión como en la app.
+# Sin los .h5 reales se usan dos sustitutos de bench_compactacion con pesos
+# distintos (vigente y candidato), convertidos a SavedModel como en la app.
+#
+# Uso: python benchmarks/bench_sombra.py [--sesiones 4] [--analisis 60] [--fracciones 0 0.1 1]
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+import numpy as np
+
+import nucleo
+from admision import ControladorAdmision
+from artefactos import cargar_modelo_cacheado
+from sombra import ComparadorSombra
+from bench_compactacion import crear_sustituto
+from bench_carga import generar_resena
+
+def cargar_sustituto(temporal, nombre, dim):
+    ruta = os.path.join(temporal, f"{nombre}.h5")
+    crear_sustituto(ruta, dim)
+    directorio = os.path.join(temporal, "artefactos")
+    cargar_modelo_cacheado(ruta, directorio)
+    return cargar_modelo_cacheado(ruta, directorio)
+
+def ejecutar(modelo, tokenizer, cargas, controlador, sombra):
+    latencias = []
+    lock = threading.Lock()
+    barrera = threading.Barrier(len(cargas))
+
+    def sesion(textos):
+        propias = []
+        barrera.wait()
+        for texto in textos:
+            inicio = time.perf_counter()
+            with controlador.admitir():
+                analisis = nucleo.analizar_resena(texto, modelo, tokenizer)
+            if sombra is not None:
+                sombra.observar(texto, analisis)
+            propias.append((time.perf_counter() - inicio) * 1000)
+        with lock:
+            latencias.extend(propias)
+
+    hilos = [threading.Thread(target=sesion, args=(textos,)) for textos in cargas]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return np.array(latencias)
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia del usuario con y sin modo sombra")
+    parser.add_argument("--sesiones", type=int, default=4)
+    parser.add_argument("--analisis", type=int, default=60, help="Análisis por sesión")
+    parser.add_argument("--fracciones", type=float, nargs="+", default=[0.0, 0.1, 1.0])
+    parser.add_argument("--dim", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporal:
+        vigente = cargar_sustituto(temporal, "vigente", args.dim)
+        candidato = cargar_sustituto(temporal, "candidato", args.dim)
+    tokenizer = nucleo.crear_tokenizer()
+    rng = np.random.default_rng(0)
+    textos = [generar_resena(int(n), rng) for n in rng.choice([15, 80, 200], size=args.sesiones * args.analisis)]
+    cargas = [textos[i::args.sesiones] for i in range(args.sesiones)]
+    for texto in textos[:8]:
+        nucleo.analizar_resena(texto, vigente, tokenizer)
+        nucleo.analizar_resena(texto, candidato, tokenizer)
+
+    print(f"{args.sesiones} sesiones × {args.analisis} análisis · "
+          f"{os.cpu_count()} CPU (admisión: {ControladorAdmision().max_concurrentes} concurrentes)\n")
+    print(f"{'sombra':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'comparadas':>12}{'descartadas':>13}")
+    informe = None
+    for fraccion in args.fracciones:
+        nucleo._secuencia_cacheada.cache_clear()
+        controlador = ControladorAdmision()
+        sombra = ComparadorSombra(candidato, tokenizer, fraccion, controlador=controlador) if fraccion else None
+        latencias = ejecutar(vigente, tokenizer, cargas, controlador, sombra)
+        comparadas = descartadas = "—"
+        if sombra is not None:
+            sombra.cerrar()
+            informe = sombra.informe()
+            comparadas, descartadas = informe['comparadas'], informe['descartadas']
+        p50, p95, p99 = np.percentile(latencias, [50, 95, 99])
+        print(f"{fraccion:>8.0%}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}{comparadas:>12}{descartadas:>13}")
+
+    if informe is not None:
+        print("\nInforme de la última configuración:")
+        print(json.dumps(informe, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
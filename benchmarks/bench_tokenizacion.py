@@ -0,0 +1,101 @@
+# Benchmark de la codificación en lote (nucleo.CodificadorLote): el camino
+# anterior por reseña (texts_to_sequences + pad_sequences + expand_dims +
+# astype, y np.concatenate del lote) frente a codificar_lote() escribiendo en
+# un buffer int32 reutilizado. Comprueba que las secuencias son idénticas
+# (también con el tokenizer renumerado del modelo compacto y sin OOV) y mide,
+# por cada 10k reseñas, el tiempo y la memoria reservada con tracemalloc.
+#
+# Uso: python benchmarks/bench_tokenizacion.py [--resenas 10000] [--tam-lote 64]
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+import numpy as np
+from tensorflow.keras.preprocessing.sequence import pad_sequences
+from tensorflow.keras.preprocessing.text import Tokenizer
+
+import nucleo
+from bench_carga import generar_resena
+from compactacion import ids_alcanzables, renumerar_tokenizer
+
+def secuencia_anterior(texto, tokenizer):
+    """texto_a_secuencia() antes de CodificadorLote (sin la caché)"""
+    texto = texto.lower().strip()
+    secuencia = tokenizer.texts_to_sequences([texto])
+    if not secuencia or not secuencia[0]:
+        palabras = texto.split()
+        secuencia = [[min(i+1, nucleo.VOCAB_SIZE-1) for i in range(len(palabras))]]
+    secuencia_padded = pad_sequences(secuencia, maxlen=nucleo.SEQUENCE_LENGTH, padding='post', truncating='post')
+    return np.expand_dims(secuencia_padded, axis=-1).astype('int32')
+
+def lotes_anterior(textos, tokenizer, tam_lote):
+    for i in range(0, len(textos), tam_lote):
+        yield np.concatenate([secuencia_anterior(t, tokenizer) for t in textos[i:i + tam_lote]])
+
+def lotes_codificador(textos, tokenizer, tam_lote):
+    buffer = nucleo.buffer_secuencias(tam_lote)
+    for i in range(0, len(textos), tam_lote):
+        yield nucleo.codificar_lote(textos[i:i + tam_lote], tokenizer, buffer)
+
+def generar_textos(n, rng):
+    textos = [generar_resena(int(longitud), rng) for longitud in rng.choice([15, 60, 200, 400], size=n)]
+    # Casos límite: vacío, solo filtros, sin vocabulario, tabuladores, más de 300 palabras, no ASCII
+    textos[:7] = ["", "!!! ???", "zzz qqq", "GREAT\tfilm\nbut\r\nslow", "   ", "a " * 500, "Café “great”, naïve—BAD!"]
+    return textos
+
+def comprobar(textos, tokenizer, tam_lote):
+    for anterior, nuevo in zip(lotes_anterior(textos, tokenizer, tam_lote), lotes_codificador(textos, tokenizer, tam_lote)):
+        if not np.array_equal(anterior, nuevo) or nuevo.dtype != anterior.dtype:
+            return False
+    return True
+
+def medir(generador, textos, tokenizer, tam_lote):
+    inicio = time.perf_counter()
+    for _ in generador(textos, tokenizer, tam_lote):
+        pass
+    duracion = time.perf_counter() - inicio
+
+    # Memoria reservada (pico) mientras se produce cada lote
+    tracemalloc.start()
+    pico_lote = 0
+    for _ in generador(textos, tokenizer, tam_lote):
+        pico_lote = max(pico_lote, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+    tracemalloc.stop()
+    return duracion, pico_lote
+
+def main():
+    parser = argparse.ArgumentParser(description="Codificación por reseña frente a buffer int32 reutilizado")
+    parser.add_argument("--resenas", type=int, default=10000)
+    parser.add_argument("--tam-lote", type=int, default=64)
+    args = parser.parse_args()
+
+    textos = generar_textos(args.resenas, np.random.default_rng(0))
+    tokenizer = nucleo.crear_tokenizer()
+    renumerado = renumerar_tokenizer(nucleo.crear_tokenizer(), ids_alcanzables(nucleo.crear_tokenizer()))
+    sin_oov = Tokenizer(num_words=50, filters='!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n')
+    sin_oov.fit_on_texts(textos[:200])
+    for nombre, t in (("crear_tokenizer()", tokenizer), ("renumerado (compacto)", renumerado), ("sin OOV, num_words=50", sin_oov)):
+        print(f"Secuencias idénticas con {nombre}: {'sí' if comprobar(textos, t, args.tam_lote) else 'NO'}")
+
+    por_10k = 10000 / args.resenas
+    print(f"\n{args.resenas:,} reseñas en lotes de {args.tam_lote}")
+    print(f"{'camino':<34}{'s / 10k':>9}{'reseñas/s':>12}{'pico por lote':>15}")
+    base = None
+    for nombre, generador in (("por reseña + np.concatenate", lotes_anterior),
+                              ("codificar_lote() con buffer", lotes_codificador)):
+        duracion, pico = medir(generador, textos, tokenizer, args.tam_lote)
+        base = base or duracion
+        print(f"{nombre:<34}{duracion * por_10k:>9.3f}{args.resenas / duracion:>12,.0f}{pico / 1024:>12,.0f} KiB"
+              f"   ({base / duracion:.1f}×)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Benchmark del camino RoBERTa optimizado para CPU (roberta_cpu.py): reseñas/s
+# del pipeline de Hugging Face llamado texto a texto (el camino anterior)
+# frente a AnalizadorRoberta en lotes con padding dinámico, a precisión completa
+# y con cuantización dinámica int8. Informa también la diferencia de puntuación
+# y de veredicto del int8 frente a la precisión completa y, con --datos, la
+# exactitud de cada variante frente a etiquetas.
+#
+# Sin red: usa el checkpoint de cardiffnlp si está en la caché local de
+# Hugging Face; si no, crea un RoBERTa pequeño sustituto (tokenizer BPE
+# entrenado sobre las reseñas sintéticas y pesos aleatorios).
+#
+# Uso: python benchmarks/bench_transformers.py [--textos 256] [--hilos 4] [--modelo dir] [--datos etiquetados.csv]
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+import numpy as np
+
+from roberta_cpu import MODELO_TRANSFORMERS, HILOS_TORCH, AnalizadorRoberta, preparar_entorno_torch
+
+ETIQUETAS = {0: "negative", 1: "neutral", 2: "positive"}
+
+def crear_sustituto(directorio, textos):
+    """RoBERTa de 4 capas con tokenizer BPE propio, guardado como checkpoint local"""
+    from tokenizers import ByteLevelBPETokenizer
+    from transformers import RobertaConfig, RobertaForSequenceClassification, RobertaTokenizerFast
+
+    bpe = ByteLevelBPETokenizer()
+    bpe.train_from_iterator(textos, vocab_size=4000, special_tokens=["<s>", "<pad>", "</s>", "<unk>", "<mask>"])
+    bpe.save_model(directorio)
+    tokenizer = RobertaTokenizerFast(os.path.join(directorio, "vocab.json"), os.path.join(directorio, "merges.txt"),
+                                     model_max_length=512)
+    tokenizer.save_pretrained(directorio)
+    configuracion = RobertaConfig(
+        vocab_size=tokenizer.vocab_size, hidden_size=256, num_hidden_layers=4, num_attention_heads=4,
+        intermediate_size=1024, max_position_embeddings=514, pad_token_id=1, bos_token_id=0, eos_token_id=2,
+        id2label=ETIQUETAS, label2id={v: k for k, v in ETIQUETAS.items()},
+    )
+    RobertaForSequenceClassification(configuracion).save_pretrained(directorio)
+    return directorio
+
+def en_cache_local(nombre):
+    from transformers import AutoConfig
+    try:
+        AutoConfig.from_pretrained(nombre, local_files_only=True)
+        return True
+    except OSError:
+        return False
+
+def generar_textos(n, rng):
+    from bench_carga import generar_resena
+    return [generar_resena(int(longitud), rng) for longitud in rng.choice([15, 40, 120], size=n)]
+
+def leer_datos(ruta):
+    with open(ruta, newline="", encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    return [fila['texto'] for fila in filas], np.array([int(fila['etiqueta']) for fila in filas])
+
+def medir(funcion, textos):
+    inicio = time.perf_counter()
+    puntuaciones = np.asarray(funcion(textos), dtype=np.float64)
+    return len(textos) / (time.perf_counter() - inicio), puntuaciones
+
+def main():
+    parser = argparse.ArgumentParser(description="RoBERTa en CPU: pipeline texto a texto frente a lotes e int8")
+    parser.add_argument("--textos", type=int, default=256)
+    parser.add_argument("--hilos", type=int, default=HILOS_TORCH)
+    parser.add_argument("--modelo", default=None, help="Checkpoint local (por defecto cardiffnlp en caché o el sustituto)")
+    parser.add_argument("--datos", default=None, help="CSV con columnas texto y etiqueta (1 = positiva)")
+    args = parser.parse_args()
+
+    preparar_entorno_torch(args.hilos)
+    from transformers import pipeline
+
+    rng = np.random.default_rng(0)
+    if args.datos:
+        textos, etiquetas = leer_datos(args.datos)
+    else:
+        textos, etiquetas = generar_textos(args.textos, rng), None
+
+    with tempfile.TemporaryDirectory() as temporal:
+        nombre = args.modelo
+        if nombre is None:
+            nombre = MODELO_TRANSFORMERS if en_cache_local(MODELO_TRANSFORMERS) else crear_sustituto(
+                temporal, generar_textos(2000, np.random.default_rng(1)))
+        print(f"Checkpoint: {nombre} · {len(textos)} textos · {args.hilos} hilos de torch\n")
+
+        referencia = pipeline("sentiment-analysis", model=nombre, top_k=None)
+        completo = AnalizadorRoberta.cargar(nombre, cuantizar=False, hilos=args.hilos)
+        cuantizado = AnalizadorRoberta.cargar(nombre, cuantizar=True, hilos=args.hilos)
+
+        def pipeline_uno_a_uno(lista):
+            puntuaciones = []
+            for texto in lista:
+                scores = {item['label'].lower(): item['score'] for item in referencia([texto[:512]])[0]}
+                puntuaciones.append(scores['positive'])
+            return puntuaciones
+
+        variantes = (
+            ("pipeline, texto a texto (fp32)", pipeline_uno_a_uno),
+            ("lotes con padding dinámico (fp32)", completo.puntuar),
+            ("lotes con padding dinámico (int8)", cuantizado.puntuar),
+        )
+        # Calentamiento
+        for _, funcion in variantes:
+            funcion(textos[:4])
+
+        resultados = {}
+        base = None
+        print(f"{'variante':<36}{'reseñas/s':>11}{'aceleración':>13}{'exactitud':>11}")
+        for nombre_variante, funcion in variantes:
+            velocidad, puntuaciones = medir(funcion, textos)
+            resultados[nombre_variante] = puntuaciones
+            base = base or velocidad
+            exactitud = f"{100 * np.mean((puntuaciones > 0.5) == (etiquetas == 1)):.1f}%" if etiquetas is not None else "—"
+            print(f"{nombre_variante:<36}{velocidad:>11.1f}{velocidad / base:>12.1f}×{exactitud:>11}")
+
+    fp32 = resultados["lotes con padding dinámico (fp32)"]
+    int8 = resultados["lotes con padding dinámico (int8)"]
+    pipeline_fp32 = resultados["pipeline, texto a texto (fp32)"]
+    print(f"\nLotes fp32 frente al pipeline: |Δp| máxima {np.max(np.abs(fp32 - pipeline_fp32)):.2e}")
+    print(f"int8 frente a fp32: |Δp| media {np.mean(np.abs(int8 - fp32)):.4f} · máxima {np.max(np.abs(int8 - fp32)):.4f} · "
+          f"veredictos distintos {np.mean((int8 > 0.5) != (fp32 > 0.5)):.2%}")
+
+if __name__ == "__main__":
+    main()
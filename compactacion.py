@@ -0,0 +1,140 @@
+# Compactación del modelo CNN+BiGRU.
+# La capa Embedding reserva VOCAB_SIZE filas, pero con el tokenizer de
+# crear_tokenizer() solo se alcanzan unos cientos de ids: las palabras del
+# vocabulario, el id OOV y los ids 1..SEQUENCE_LENGTH que usa la secuencia de
+# respaldo de texto_a_secuencia(). Esta herramienta recorta la tabla a esos ids,
+# renumera el tokenizer para que coincida y guarda cada array de pesos en un
+# .npy que se carga con mmap (sin copias intermedias al leer el .h5).
+#
+# Uso: python compactacion.py [--modelo sentiment_cnn_bigru.h5] [--salida modelo_compacto]
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from nucleo import (VOCAB_SIZE, SEQUENCE_LENGTH, MODEL_PATH, cargar_modelo, crear_tokenizer,
+                    codificar_lote, version_modelo)
+
+RUTA_MODELO_COMPACTO = os.environ.get("CINEMASCOPE_MODELO_COMPACTO", "modelo_compacto")
+
+def ids_alcanzables(tokenizer):
+    """Ids que texto_a_secuencia() puede producir, en orden creciente
+
+    Los ids 0..SEQUENCE_LENGTH quedan siempre al principio (relleno y secuencia
+    de respaldo), así que conservan su número tras renumerar.
+    """
+    ids = set(range(min(SEQUENCE_LENGTH + 1, VOCAB_SIZE)))
+    ids.update(i for i in tokenizer.word_index.values() if i < VOCAB_SIZE)
+    return np.array(sorted(ids), dtype=np.int64)
+
+def renumerar_tokenizer(tokenizer, alcanzables):
+    """Tokenizer con los ids de la tabla recortada (id original -> posición)"""
+    nuevo_id = {int(original): i for i, original in enumerate(alcanzables)}
+    tokenizer.word_index = {palabra: nuevo_id[i] for palabra, i in tokenizer.word_index.items() if i in nuevo_id}
+    tokenizer.index_word = {i: palabra for palabra, i in tokenizer.word_index.items()}
+    tokenizer.num_words = len(alcanzables)
+    return tokenizer
+
+def _capas_embedding(modelo):
+    return [capa for capa in modelo.layers
+            if capa.__class__.__name__ == "Embedding" and capa.input_dim == VOCAB_SIZE]
+
+def compactar(modelo, alcanzables):
+    """Nuevo modelo con las tablas de embedding recortadas a 'alcanzables'"""
+    recortar = {capa.name for capa in _capas_embedding(modelo)}
+    if not recortar:
+        raise ValueError(f"El modelo no tiene capas Embedding con {VOCAB_SIZE} filas")
+
+    configuracion = modelo.get_config()
+    for capa in configuracion['layers']:
+        if capa['config'].get('name') in recortar:
+            capa['config']['input_dim'] = len(alcanzables)
+    compacto = modelo.__class__.from_config(configuracion)
+
+    for capa in modelo.layers:
+        pesos = capa.get_weights()
+        if capa.name in recortar:
+            pesos = [pesos[0][alcanzables]]
+        compacto.get_layer(capa.name).set_weights(pesos)
+    return compacto
+
+def guardar_compacto(modelo, tokenizer, directorio, manifiesto):
+    """Arquitectura JSON + un .npy por array de pesos + tokenizer renumerado"""
+    os.makedirs(os.path.join(directorio, "pesos"), exist_ok=True)
+    pesos = modelo.get_weights()
+    for i, array in enumerate(pesos):
+        np.save(os.path.join(directorio, "pesos", f"{i:03d}.npy"), np.ascontiguousarray(array))
+    with open(os.path.join(directorio, "arquitectura.json"), "w", encoding="utf-8") as f:
+        f.write(modelo.to_json())
+    with open(os.path.join(directorio, "tokenizer.json"), "w", encoding="utf-8") as f:
+        f.write(tokenizer.to_json())
+    with open(os.path.join(directorio, "manifiesto.json"), "w", encoding="utf-8") as f:
+        json.dump(dict(manifiesto, n_pesos=len(pesos)), f, indent=2)
+
+def leer_manifiesto(directorio=RUTA_MODELO_COMPACTO):
+    try:
+        with open(os.path.join(directorio, "manifiesto.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def cargar_modelo_compacto(directorio=RUTA_MODELO_COMPACTO):
+    """Devuelve (modelo, tokenizer) desde un directorio creado por esta herramienta"""
+    import tensorflow as tf
+    from tensorflow.keras.preprocessing.text import tokenizer_from_json
+
+    manifiesto = leer_manifiesto(directorio)
+    with open(os.path.join(directorio, "arquitectura.json"), encoding="utf-8") as f:
+        modelo = tf.keras.models.model_from_json(f.read())
+    modelo.set_weights([
+        np.load(os.path.join(directorio, "pesos", f"{i:03d}.npy"), mmap_mode='r')
+        for i in range(manifiesto['n_pesos'])
+    ])
+    with open(os.path.join(directorio, "tokenizer.json"), encoding="utf-8") as f:
+        tokenizer = tokenizer_from_json(f.read())
+    return modelo, tokenizer
+
+def compacto_vigente(directorio=RUTA_MODELO_COMPACTO, ruta_modelo=MODEL_PATH):
+    """True si existe un modelo compacto generado a partir de este .h5"""
+    manifiesto = leer_manifiesto(directorio)
+    return (manifiesto is not None and os.path.exists(ruta_modelo)
+            and manifiesto.get('version_modelo') == version_modelo(ruta_modelo))
+
+def main():
+    parser = argparse.ArgumentParser(description="Recorta la tabla de embedding a los ids alcanzables")
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    parser.add_argument("--salida", default=RUTA_MODELO_COMPACTO)
+    args = parser.parse_args()
+
+    modelo = cargar_modelo(args.modelo)
+    tokenizer = crear_tokenizer()
+    alcanzables = ids_alcanzables(tokenizer)
+    compacto = compactar(modelo, alcanzables)
+
+    # Comprobación: mismas predicciones con el tokenizer renumerado
+    textos = ["This movie is absolutely brilliant!", "boring predictable waste of time", "!!! ???"]
+    originales = codificar_lote(textos, tokenizer)
+    # Tokenizer nuevo: la caché de secuencias se indexa por objeto tokenizer
+    tokenizer = renumerar_tokenizer(crear_tokenizer(), alcanzables)
+    renumeradas = codificar_lote(textos, tokenizer)
+    diferencia = np.max(np.abs(modelo.predict(originales, verbose=0) - compacto.predict(renumeradas, verbose=0)))
+    if diferencia > 1e-5:
+        print(f"❌ Las predicciones difieren ({diferencia:.2e}); no se guarda el modelo compacto")
+        sys.exit(1)
+
+    bytes_antes = sum(w.nbytes for w in modelo.get_weights())
+    bytes_despues = sum(w.nbytes for w in compacto.get_weights())
+    guardar_compacto(compacto, tokenizer, args.salida, {
+        'version_modelo': version_modelo(args.modelo),
+        'filas_embedding': len(alcanzables),
+        'filas_originales': VOCAB_SIZE,
+    })
+    print(f"✅ Embedding: {VOCAB_SIZE:,} -> {len(alcanzables):,} filas")
+    print(f"   Pesos: {bytes_antes / 2**20:.1f} MiB -> {bytes_despues / 2**20:.1f} MiB "
+          f"(diferencia máxima en predicciones {diferencia:.1e}) -> {args.salida}")
+
+if __name__ == "__main__":
+    main()
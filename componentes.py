@@ -0,0 +1,192 @@
+# Almacén de puntuaciones por componente y búsqueda de pesos del ensemble.
+# Las redes (CNN+BiGRU y Transformers) se ejecutan una sola vez sobre un corpus
+# etiquetado y se guardan, por reseña, pred_original, la puntuación de
+# Transformers, la del léxico y la intensidad. A partir de esos arrays,
+# combinar_rejilla() reproduce combinar_ensemble() de nucleo.py vectorizado con
+# NumPy para miles de configuraciones de pesos a la vez, sin volver a ejecutar
+# ningún modelo.
+#
+# Uso:
+#   python componentes.py calcular --datos etiquetados.csv --salida componentes.npz [--con-transformers]
+#   python componentes.py buscar --componentes componentes.npz [--paso 0.1] [--top 10]
+# (CSV con columnas texto y etiqueta, 1 = positiva)
+
+import argparse
+import csv
+import itertools
+import time
+
+import numpy as np
+
+from nucleo import (MODEL_PATH, VERSION_LEXICO, PESOS_ENSEMBLE, PESOS_ENSEMBLE_TRANSFORMERS, ESCALA_INTENSIDAD,
+                    analizar_palabras_clave_avanzado, analizar_intensidad_emocional, codificar_lote,
+                    buffer_secuencias, puntuar_transformers, version_modelo)
+
+RUTA_COMPONENTES = "componentes.npz"
+# Reseñas por llamada a los modelos al calcular los componentes
+TAM_LOTE_COMPONENTES = 256
+# Configuraciones evaluadas a la vez (memoria: configuraciones × reseñas float32)
+TAM_BLOQUE_REJILLA = 512
+ESCALAS_INTENSIDAD = (10, 15, 20, 30, 40, 80)
+
+def calcular_componentes(textos, modelo, tokenizer, analyzer_transformers=None, tam_lote=TAM_LOTE_COMPONENTES):
+    """Puntuación de cada componente para cada texto (NaN en Transformers si no hay)"""
+    n = len(textos)
+    componentes = {
+        'pred_original': np.empty(n, dtype=np.float32),
+        'pred_transformers': np.full(n, np.nan, dtype=np.float32),
+        'puntuacion_palabras': np.empty(n, dtype=np.float32),
+        'intensidad': np.empty(n, dtype=np.float32),
+    }
+    buffer = buffer_secuencias(tam_lote)
+    for inicio in range(0, n, tam_lote):
+        lote = textos[inicio:inicio + tam_lote]
+        fin = inicio + len(lote)
+        secuencias = codificar_lote(lote, tokenizer, buffer)
+        componentes['pred_original'][inicio:fin] = modelo.predict(secuencias, verbose=0)[:, 0]
+        if analyzer_transformers:
+            componentes['pred_transformers'][inicio:fin] = [
+                np.nan if p is None else p for p in puntuar_transformers(lote, analyzer_transformers)
+            ]
+        componentes['puntuacion_palabras'][inicio:fin] = [analizar_palabras_clave_avanzado(t)[0] for t in lote]
+        componentes['intensidad'][inicio:fin] = [analizar_intensidad_emocional(t) for t in lote]
+    return componentes
+
+def guardar_componentes(ruta, componentes, etiquetas, metadatos):
+    np.savez_compressed(ruta, etiquetas=np.asarray(etiquetas, dtype=np.int8),
+                        **componentes, **{f"meta_{clave}": valor for clave, valor in metadatos.items()})
+
+def cargar_componentes(ruta=RUTA_COMPONENTES):
+    """(componentes, etiquetas, metadatos) de un archivo creado con guardar_componentes()"""
+    with np.load(ruta) as datos:
+        metadatos = {clave[5:]: str(datos[clave]) for clave in datos.files if clave.startswith("meta_")}
+        etiquetas = datos['etiquetas']
+        componentes = {clave: datos[clave] for clave in datos.files if clave != 'etiquetas' and not clave.startswith("meta_")}
+    return componentes, etiquetas, metadatos
+
+def combinar_rejilla(componentes, pesos, pesos_transformers, escalas):
+    """pred_ensemble de cada configuración: matriz (configuraciones, reseñas)
+
+    'pesos' (C, 2), 'pesos_transformers' (C, 3) y 'escalas' (C,) son las mismas
+    magnitudes que los argumentos de nucleo.combinar_ensemble().
+    """
+    original = componentes['pred_original'].astype(np.float32)[None, :]
+    transformers = componentes['pred_transformers'].astype(np.float32)
+    hay_transformers = ~np.isnan(transformers)[None, :]
+    transformers = np.where(np.isnan(transformers), 0.5, transformers)[None, :]
+    palabras = np.clip((componentes['puntuacion_palabras'].astype(np.float32) + 10) / 20, 0, 1)[None, :]
+    intensidad = componentes['intensidad'].astype(np.float32)[None, :]
+
+    pesos = np.asarray(pesos, dtype=np.float32)
+    pesos_t = np.asarray(pesos_transformers, dtype=np.float32)
+    escalas = np.asarray(escalas, dtype=np.float32)[:, None]
+
+    peso_original = np.where(hay_transformers, pesos_t[:, 0:1], pesos[:, 0:1])
+    peso_palabras = np.where(hay_transformers, pesos_t[:, 1:2], pesos[:, 1:2])
+    peso_transformers = np.where(hay_transformers, pesos_t[:, 2:3], 0)
+    total = peso_original + peso_palabras + peso_transformers
+    pred = original * peso_original + palabras * peso_palabras + transformers * peso_transformers
+    pred = np.where(total > 0, pred / np.where(total > 0, total, 1), pred)
+
+    # Factor de intensidad: aleja la predicción de 0.5 sin cambiar la dirección
+    factor = 1 + intensidad / escalas
+    return np.where(pred > 0.5, np.minimum(1.0, 0.5 + (pred - 0.5) * factor),
+                    np.maximum(0.0, 0.5 - (0.5 - pred) * factor))
+
+def rejilla_pesos(paso=0.1, escalas=ESCALAS_INTENSIDAD):
+    """Todas las configuraciones con pesos en múltiplos de 'paso'
+
+    Los pesos se normalizan en el ensemble, así que solo importan sus
+    proporciones: basta recorrer el símplex (pesos que suman 1).
+    """
+    n = int(round(1 / paso))
+    dobles = [(i / n, (n - i) / n) for i in range(n + 1)]
+    triples = [(i / n, j / n, (n - i - j) / n) for i in range(n + 1) for j in range(n + 1 - i)]
+    configuraciones = list(itertools.product(dobles, triples, escalas))
+    return (np.array([c[0] for c in configuraciones]), np.array([c[1] for c in configuraciones]),
+            np.array([c[2] for c in configuraciones], dtype=np.float64))
+
+def evaluar_rejilla(componentes, etiquetas, pesos, pesos_transformers, escalas, tam_bloque=TAM_BLOQUE_REJILLA):
+    """Exactitud y Brier de cada configuración frente a las etiquetas"""
+    etiquetas = np.asarray(etiquetas, dtype=np.float32)[None, :]
+    exactitud = np.empty(len(escalas))
+    brier = np.empty(len(escalas))
+    for inicio in range(0, len(escalas), tam_bloque):
+        fin = inicio + tam_bloque
+        pred = combinar_rejilla(componentes, pesos[inicio:fin], pesos_transformers[inicio:fin], escalas[inicio:fin])
+        exactitud[inicio:fin] = ((pred > 0.5) == (etiquetas == 1)).mean(axis=1)
+        brier[inicio:fin] = ((pred - etiquetas) ** 2).mean(axis=1)
+    return exactitud, brier
+
+def buscar_pesos(componentes, etiquetas, paso=0.1, escalas=ESCALAS_INTENSIDAD, top=10):
+    """Mejores configuraciones (exactitud, y Brier para desempatar) y la actual"""
+    pesos, pesos_transformers, escalas_rejilla = rejilla_pesos(paso, escalas)
+    # La configuración actual va primero para compararla con las demás
+    pesos = np.vstack([PESOS_ENSEMBLE[:2], pesos])
+    pesos_transformers = np.vstack([PESOS_ENSEMBLE_TRANSFORMERS, pesos_transformers])
+    escalas_rejilla = np.concatenate([[ESCALA_INTENSIDAD], escalas_rejilla])
+
+    inicio = time.perf_counter()
+    exactitud, brier = evaluar_rejilla(componentes, etiquetas, pesos, pesos_transformers, escalas_rejilla)
+    duracion = time.perf_counter() - inicio
+
+    def configuracion(i):
+        return {
+            'pesos': [round(float(p), 4) for p in pesos[i]],
+            'pesos_transformers': [round(float(p), 4) for p in pesos_transformers[i]],
+            'escala_intensidad': float(escalas_rejilla[i]),
+            'exactitud': float(exactitud[i]),
+            'brier': float(brier[i]),
+        }
+
+    orden = np.lexsort((brier, -exactitud))
+    return {
+        'actual': configuracion(0),
+        'mejores': [configuracion(i) for i in orden[:top]],
+        'configuraciones': len(escalas_rejilla),
+        'configuraciones_por_segundo': len(escalas_rejilla) / duracion,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Componentes del ensemble y búsqueda de pesos")
+    subparsers = parser.add_subparsers(dest="orden", required=True)
+    calcular = subparsers.add_parser("calcular", help="Ejecuta los modelos una vez y guarda los componentes")
+    calcular.add_argument("--datos", required=True, help="CSV con columnas texto y etiqueta")
+    calcular.add_argument("--salida", default=RUTA_COMPONENTES)
+    calcular.add_argument("--modelo", default=MODEL_PATH)
+    calcular.add_argument("--con-transformers", action="store_true")
+    buscar = subparsers.add_parser("buscar", help="Busca pesos del ensemble sobre componentes guardados")
+    buscar.add_argument("--componentes", default=RUTA_COMPONENTES)
+    buscar.add_argument("--paso", type=float, default=0.1)
+    buscar.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.orden == "calcular":
+        from artefactos import cargar_modelo_y_tokenizer
+        from nucleo import cargar_analizador_transformers
+        with open(args.datos, newline="", encoding="utf-8") as f:
+            filas = list(csv.DictReader(f))
+        textos = [fila['texto'] for fila in filas]
+        modelo, tokenizer = cargar_modelo_y_tokenizer(args.modelo)
+        analyzer = cargar_analizador_transformers() if args.con_transformers else None
+        componentes = calcular_componentes(textos, modelo, tokenizer, analyzer)
+        guardar_componentes(args.salida, componentes, [int(fila['etiqueta']) for fila in filas], {
+            'version_modelo': version_modelo(args.modelo), 'version_lexico': VERSION_LEXICO,
+        })
+        print(f"✅ Componentes de {len(textos):,} reseñas -> {args.salida}")
+        return
+
+    componentes, etiquetas, metadatos = cargar_componentes(args.componentes)
+    if metadatos.get('version_lexico') != VERSION_LEXICO:
+        print(f"⚠️ Componentes calculados con otro léxico ({metadatos.get('version_lexico')}); "
+              f"vuelve a ejecutar 'calcular'")
+    resultado = buscar_pesos(componentes, etiquetas, args.paso, top=args.top)
+    print(f"{resultado['configuraciones']:,} configuraciones sobre {len(etiquetas):,} reseñas "
+          f"({resultado['configuraciones_por_segundo']:,.0f} configuraciones/s)\n")
+    print(f"{'':>8}{'exactitud':>11}{'Brier':>9}  pesos (sin / con Transformers) · escala intensidad")
+    for nombre, c in [("actual", resultado['actual'])] + [(f"#{i}", c) for i, c in enumerate(resultado['mejores'], 1)]:
+        print(f"{nombre:>8}{100 * c['exactitud']:>10.2f}%{c['brier']:>9.4f}  "
+              f"{c['pesos']} / {c['pesos_transformers']} · {c['escala_intensidad']:g}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# Cálculo de confianza de CinemaScope AI, separado de la interfaz.
+# calcular_confianza() es la versión escalar que usa la app;
+# calcular_confianza_lote() aplica la misma fórmula a arrays NumPy completos.
+# CalibradorConfianza mapea la puntuación ensemble a una confianza calibrada
+# mediante una tabla precalculada offline con datos etiquetados.
+#
+# Ajustar una calibración:
+#   python confianza.py --datos etiquetados.csv --salida calibracion.npz [--metodo isotonica]
+# (CSV con columnas pred_ensemble y etiqueta, 1 = positiva)
+
+import argparse
+import csv
+
+import numpy as np
+
+# Bonus adicionales por usar múltiples sistemas de IA
+BONUS_TRANSFORMERS = 10
+BONUS_PALABRAS = 5
+
+# Rango garantizado de la confianza final
+CONFIANZA_MINIMA = 60
+CONFIANZA_MAXIMA = 100
+
+# Niveles de confianza: (umbral mínimo, nivel, descripción), de mayor a menor
+NIVELES_CONFIANZA = (
+    (95, "🌟 Excepcional", "Predicción excepcional con IA"),
+    (90, "🚀 Muy Alta", "Predicción muy confiable con IA"),
+    (80, "👍 Alta", "Predicción confiable"),
+    (70, "🔍 Media-Alta", "Predicción moderada-alta"),
+    (0, "📊 Buena", "Predicción buena"),
+)
+
+# Umbrales en orden creciente para np.searchsorted
+_UMBRALES_CRECIENTES = np.array([umbral for umbral, _, _ in NIVELES_CONFIANZA[-2::-1]], dtype=np.float64)
+
+def confianza_base(pred_ensemble):
+    """Fórmula de confianza base según la distancia a la neutralidad"""
+    distancia_del_neutral = abs(pred_ensemble - 0.5)
+
+    if distancia_del_neutral < 0.05:
+        return 40 + distancia_del_neutral * 400
+    elif distancia_del_neutral < 0.15:
+        return 60 + (distancia_del_neutral - 0.05) * 300
+    else:
+        return 90 + (distancia_del_neutral - 0.15) * 29
+
+def indice_nivel(confianza):
+    """Posición en NIVELES_CONFIANZA del nivel que corresponde a la confianza"""
+    for i, (umbral, _, _) in enumerate(NIVELES_CONFIANZA):
+        if confianza >= umbral:
+            return i
+    return len(NIVELES_CONFIANZA) - 1
+
+def nivel_confianza(confianza):
+    """Nivel y descripción de una confianza (0-100)"""
+    _, nivel, descripcion = NIVELES_CONFIANZA[indice_nivel(confianza)]
+    return nivel, descripcion
+
+def calcular_confianza(pred_ensemble, boost_consenso, boost_palabras, boost_intensidad,
+                       con_transformers, n_palabras_clave):
+    """Confianza final (60-100), nivel y descripción de una predicción"""
+    confianza = confianza_base(pred_ensemble) + boost_consenso + boost_palabras + boost_intensidad
+
+    if con_transformers:
+        confianza += BONUS_TRANSFORMERS
+    if n_palabras_clave > 0:
+        confianza += BONUS_PALABRAS
+
+    confianza = min(CONFIANZA_MAXIMA, max(CONFIANZA_MINIMA, confianza))
+    nivel, descripcion = nivel_confianza(confianza)
+    return confianza, nivel, descripcion
+
+def confianza_base_lote(pred_ensemble):
+    """confianza_base() sobre un array completo"""
+    distancia = np.abs(np.asarray(pred_ensemble, dtype=np.float64) - 0.5)
+    return np.where(
+        distancia < 0.05, 40 + distancia * 400,
+        np.where(distancia < 0.15, 60 + (distancia - 0.05) * 300, 90 + (distancia - 0.15) * 29),
+    )
+
+def indices_nivel_lote(confianza):
+    """indice_nivel() sobre un array completo (0 = nivel más alto)"""
+    superados = np.searchsorted(_UMBRALES_CRECIENTES, np.asarray(confianza), side='right')
+    return (len(NIVELES_CONFIANZA) - 1 - superados).astype(np.int8)
+
+def calcular_confianza_lote(pred_ensemble, boost_consenso, boost_palabras, boost_intensidad,
+                            con_transformers, n_palabras_clave):
+    """calcular_confianza() vectorizada: devuelve (confianza, índices de nivel)
+
+    Todos los argumentos aceptan arrays (o escalares que se difunden); los
+    niveles se obtienen con NIVELES_CONFIANZA[i] para cada índice.
+    """
+    confianza = (confianza_base_lote(pred_ensemble)
+                 + boost_consenso + boost_palabras + boost_intensidad
+                 + np.where(con_transformers, BONUS_TRANSFORMERS, 0)
+                 + np.where(np.asarray(n_palabras_clave) > 0, BONUS_PALABRAS, 0))
+    confianza = np.clip(confianza, CONFIANZA_MINIMA, CONFIANZA_MAXIMA)
+    return confianza, indices_nivel_lote(confianza)
+
+# Calibración: tabla de consulta ajustada offline
+class CalibradorConfianza:
+    """Mapea pred_ensemble a confianza calibrada (probabilidad de acierto, 0-100)
+
+    La tabla se indexa por la distancia a la neutralidad |pred - 0.5|: cada
+    intervalo de 'bordes' tiene el porcentaje de aciertos observado.
+    """
+
+    def __init__(self, bordes, valores, metodo):
+        self.bordes = np.asarray(bordes, dtype=np.float64)
+        self.valores = np.asarray(valores, dtype=np.float64)
+        self.metodo = metodo
+
+    @classmethod
+    def cargar(cls, ruta):
+        datos = np.load(ruta)
+        return cls(datos['bordes'], datos['valores'], str(datos['metodo']))
+
+    def guardar(self, ruta):
+        np.savez(ruta, bordes=self.bordes, valores=self.valores, metodo=self.metodo)
+
+    def transformar(self, pred_ensemble):
+        """Confianza calibrada para un valor o un array de predicciones"""
+        distancia = np.abs(np.asarray(pred_ensemble, dtype=np.float64) - 0.5)
+        indices = np.clip(np.searchsorted(self.bordes, distancia, side='right') - 1, 0, len(self.valores) - 1)
+        return self.valores[indices]
+
+    def calcular(self, pred_ensemble):
+        """Equivalente calibrado de calcular_confianza() para una predicción"""
+        confianza = float(self.transformar(pred_ensemble))
+        nivel, descripcion = nivel_confianza(confianza)
+        return confianza, nivel, descripcion
+
+def _aciertos(pred_ensemble, etiquetas):
+    pred_ensemble = np.asarray(pred_ensemble, dtype=np.float64)
+    etiquetas = np.asarray(etiquetas).astype(bool)
+    return np.abs(pred_ensemble - 0.5), ((pred_ensemble > 0.5) == etiquetas).astype(np.float64)
+
+def ajustar_histograma(pred_ensemble, etiquetas, n_intervalos=20):
+    """Calibración por histograma: tasa de aciertos por intervalo de distancia"""
+    distancia, aciertos = _aciertos(pred_ensemble, etiquetas)
+    bordes = np.linspace(0.0, 0.5, n_intervalos + 1)
+    indices = np.clip(np.searchsorted(bordes, distancia, side='right') - 1, 0, n_intervalos - 1)
+    conteos = np.bincount(indices, minlength=n_intervalos)
+    sumas = np.bincount(indices, weights=aciertos, minlength=n_intervalos)
+    # Intervalos vacíos: se usa la tasa global
+    tasa_global = aciertos.mean() if len(aciertos) else 0.5
+    valores = np.where(conteos > 0, sumas / np.maximum(conteos, 1), tasa_global)
+    # Más distancia a la neutralidad nunca debe significar menos confianza
+    valores = np.maximum.accumulate(valores)
+    return CalibradorConfianza(bordes[:-1], valores * 100, "histograma")
+
+def ajustar_isotonica(pred_ensemble, etiquetas):
+    """Calibración isotónica (pool adjacent violators) sobre la distancia"""
+    distancia, aciertos = _aciertos(pred_ensemble, etiquetas)
+    if len(distancia) == 0:
+        raise ValueError("La calibración isotónica necesita al menos un ejemplo etiquetado")
+    orden = np.argsort(distancia, kind='stable')
+    x = distancia[orden]
+    y = aciertos[orden]
+
+    # Bloques [inicio, suma, peso]; se fusionan mientras violen la monotonía
+    bloques = []
+    for i in range(len(y)):
+        bloques.append([x[i], y[i], 1.0])
+        while len(bloques) > 1 and bloques[-2][1] / bloques[-2][2] > bloques[-1][1] / bloques[-1][2]:
+            _, suma, peso = bloques.pop()
+            bloques[-1][1] += suma
+            bloques[-1][2] += peso
+    bordes = np.array([b[0] for b in bloques])
+    valores = np.array([b[1] / b[2] for b in bloques])
+    bordes[0] = 0.0
+    return CalibradorConfianza(bordes, valores * 100, "isotonica")
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajusta una tabla de calibración de confianza")
+    parser.add_argument("--datos", required=True, help="CSV con columnas pred_ensemble y etiqueta")
+    parser.add_argument("--salida", default="calibracion.npz")
+    parser.add_argument("--metodo", choices=("histograma", "isotonica"), default="histograma")
+    parser.add_argument("--intervalos", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.datos, newline="", encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    pred = np.array([float(fila['pred_ensemble']) for fila in filas])
+    etiquetas = np.array([int(fila['etiqueta']) for fila in filas])
+
+    if args.metodo == "isotonica":
+        calibrador = ajustar_isotonica(pred, etiquetas)
+    else:
+        calibrador = ajustar_histograma(pred, etiquetas, args.intervalos)
+    calibrador.guardar(args.salida)
+
+    _, aciertos = _aciertos(pred, etiquetas)
+    print(f"✅ Calibración '{calibrador.metodo}' con {len(filas):,} ejemplos ({len(calibrador.valores)} intervalos) -> {args.salida}")
+    print(f"   Exactitud global: {100 * aciertos.mean():.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+# Modelo rápido destilado del sistema ensemble.
+# Una regresión logística sobre palabras y bigramas con hashing (crc32) imita
+# las predicciones de ensemble_prediccion_avanzada(): se entrena offline con
+# un corpus local sin etiquetar y predice con un producto disperso NumPy/SciPy,
+# sin TensorFlow ni Transformers. La app, el análisis de varias reseñas,
+# servicio.py y lotes.py pueden usarlo como primer nivel y recurrir al modelo
+# completo solo para las reseñas en las que el modelo rápido duda.
+#
+# Entrenar:
+#   python destilacion.py --corpus resenas.txt --salida modelo_rapido.npz [--sin-transformers]
+# (una reseña por línea)
+
+import argparse
+import hashlib
+import os
+import re
+import time
+import zlib
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import minimize
+
+from confianza import calcular_confianza
+from idioma import evaluar_entrada
+
+RUTA_MODELO_RAPIDO = os.environ.get("CINEMASCOPE_MODELO_RAPIDO", "modelo_rapido.npz")
+
+# 2^BITS_HASH columnas de características
+BITS_HASH = 18
+# Regularización L2 del entrenamiento
+L2 = 1e-5
+# Distancia mínima a 0.5 para aceptar la predicción del modelo rápido
+MARGEN_NIVEL_RAPIDO = 0.3
+# Reseñas por lote al generar los objetivos con el modelo completo
+TAM_LOTE_OBJETIVOS = 64
+
+_TOKENS = re.compile(r"[a-z0-9']+")
+
+def _indices_texto(texto, bits=BITS_HASH):
+    """Columnas y signos de las palabras y bigramas de un texto"""
+    tokens = _TOKENS.findall(texto.lower())
+    terminos = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    mascara = (1 << bits) - 1
+    hashes = np.fromiter((zlib.crc32(t.encode('utf-8')) for t in terminos), dtype=np.uint32, count=len(terminos))
+    # El bit siguiente a la máscara da el signo: las colisiones tienden a cancelarse
+    signos = np.where((hashes >> bits) & 1, 1.0, -1.0).astype(np.float32)
+    return (hashes & mascara).astype(np.int32), signos
+
+def caracteristicas(textos, bits=BITS_HASH):
+    """Matriz CSR (n_textos, 2^bits): cada término pesa ±1/sqrt(n.º de términos)
+
+    Es la norma L2 unidad solo si no hay términos repetidos ni colisiones; si
+    se repiten, sum_duplicates() los acumula y la fila queda por encima de 1.
+    ModeloRapido.predecir() usa la misma escala, y los modelos entrenados también.
+    """
+    columnas, valores, punteros = [], [], [0]
+    for texto in textos:
+        indices, signos = _indices_texto(texto, bits)
+        if len(indices):
+            signos = signos / np.sqrt(len(indices))
+        columnas.append(indices)
+        valores.append(signos)
+        punteros.append(punteros[-1] + len(indices))
+    matriz = sp.csr_matrix(
+        (np.concatenate(valores) if valores else np.zeros(0, np.float32),
+         np.concatenate(columnas) if columnas else np.zeros(0, np.int32),
+         np.array(punteros, dtype=np.int64)),
+        shape=(len(punteros) - 1, 1 << bits),
+    )
+    matriz.sum_duplicates()
+    return matriz
+
+def _sigmoide(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+class ModeloRapido:
+    """Regresión logística dispersa sobre características con hashing"""
+
+    def __init__(self, pesos, sesgo, bits=BITS_HASH):
+        self.pesos = np.asarray(pesos, dtype=np.float32)
+        self.sesgo = float(sesgo)
+        self.bits = bits
+
+    @classmethod
+    def cargar(cls, ruta=RUTA_MODELO_RAPIDO):
+        datos = np.load(ruta)
+        return cls(datos['pesos'], datos['sesgo'], int(datos['bits']))
+
+    def guardar(self, ruta=RUTA_MODELO_RAPIDO):
+        np.savez(ruta, pesos=self.pesos, sesgo=self.sesgo, bits=self.bits)
+
+    def predecir_lote(self, textos):
+        """Probabilidad positiva de cada texto"""
+        return _sigmoide(caracteristicas(textos, self.bits) @ self.pesos + self.sesgo)
+
+    def predecir(self, texto):
+        indices, signos = _indices_texto(texto, self.bits)
+        if not len(indices):
+            return float(_sigmoide(self.sesgo))
+        z = np.dot(self.pesos[indices], signos) / np.sqrt(len(indices)) + self.sesgo
+        return float(_sigmoide(z))
+
+def entrenar(X, objetivos, l2=L2, max_iter=200):
+    """Ajusta pesos y sesgo minimizando la entropía cruzada con objetivos blandos"""
+    n, d = X.shape
+    y = np.asarray(objetivos, dtype=np.float64)
+    Xt = X.T.tocsr()
+
+    def perdida(parametros):
+        w, b = parametros[:-1], parametros[-1]
+        p = _sigmoide(X @ w + b)
+        eps = 1e-12
+        valor = -np.mean(y * np.log(p + eps) + (1 - y) * np.log(1 - p + eps)) + 0.5 * l2 * w.dot(w)
+        error = (p - y) / n
+        gradiente = np.empty_like(parametros)
+        gradiente[:-1] = Xt @ error + l2 * w
+        gradiente[-1] = error.sum()
+        return valor, gradiente
+
+    resultado = minimize(perdida, np.zeros(d + 1), jac=True, method="L-BFGS-B",
+                         options={'maxiter': max_iter})
+    return ModeloRapido(resultado.x[:-1], resultado.x[-1], int(np.log2(d)))
+
+def _resultado_rapido(texto, prediccion, total_ms):
+    """Resultado con la forma de nucleo.analizar_resena(); 'pred_original' (la
+    predicción del CNN+BiGRU) es None porque ese modelo no se ha ejecutado"""
+    confianza, nivel, descripcion = calcular_confianza(prediccion, 0.0, 0.0, 0.0, False, 0)
+    return {
+        'texto': texto,
+        # Misma huella que nucleo.huella_texto(), sin importar TensorFlow
+        'texto_hash': hashlib.sha256(texto.encode('utf-8')).hexdigest(),
+        'nivel': 'rapido',
+        'pred_original': None,
+        'pred_rapido': prediccion,
+        'pred_ensemble': prediccion,
+        'boost_consenso': 0.0,
+        'boost_palabras': 0.0,
+        'boost_intensidad': 0.0,
+        'palabras_encontradas': (),
+        'confianza': confianza,
+        'nivel_confianza': nivel,
+        'descripcion_confianza': descripcion,
+        'con_transformers': False,
+        'tiempos_ms': {'total': total_ms},
+    }
+
+def analizar_rapido(texto, modelo_rapido, margen=MARGEN_NIVEL_RAPIDO):
+    """Resultado con la forma de nucleo.analizar_resena, o None si el modelo rápido duda"""
+    inicio = time.perf_counter()
+    prediccion = modelo_rapido.predecir(texto)
+    if abs(prediccion - 0.5) < margen:
+        return None
+    return _resultado_rapido(texto, prediccion, (time.perf_counter() - inicio) * 1000)
+
+def analizar_lote_rapido(textos, modelo_rapido, analizar_completo, margen=MARGEN_NIVEL_RAPIDO):
+    """analizar_rapido() para una lista, con un solo producto disperso
+
+    Las reseñas en las que el modelo rápido duda, y las que descarta el filtro
+    de idioma, se pasan juntas a analizar_completo(textos) (p. ej. una llamada
+    a nucleo.analizar_lote); el resultado mantiene el orden de 'textos'.
+    """
+    inicio = time.perf_counter()
+    resultados = [None] * len(textos)
+    aptas = [i for i, texto in enumerate(textos) if evaluar_entrada(texto)['apta']]
+    if aptas:
+        predicciones = modelo_rapido.predecir_lote([textos[i] for i in aptas])
+        total_ms = (time.perf_counter() - inicio) * 1000 / len(aptas)
+        for i, prediccion in zip(aptas, predicciones):
+            if abs(prediccion - 0.5) >= margen:
+                resultados[i] = _resultado_rapido(textos[i], float(prediccion), total_ms)
+
+    pendientes = [i for i, resultado in enumerate(resultados) if resultado is None]
+    if pendientes:
+        for i, analisis in zip(pendientes, analizar_completo([textos[i] for i in pendientes])):
+            resultados[i] = analisis
+    return resultados
+
+def generar_objetivos(textos, ruta_modelo, con_transformers=True):
+    """pred_ensemble del sistema completo para cada texto (lotes en el modelo)"""
+    from nucleo import (cargar_modelo, crear_tokenizer, codificar_lote, buffer_secuencias, ensemble_prediccion_avanzada,
+                        cargar_analizador_transformers, puntuar_transformers)
+    modelo = cargar_modelo(ruta_modelo)
+    tokenizer = crear_tokenizer()
+    analyzer = cargar_analizador_transformers() if con_transformers else None
+
+    objetivos = np.empty(len(textos), dtype=np.float64)
+    buffer = buffer_secuencias(TAM_LOTE_OBJETIVOS)
+    for inicio in range(0, len(textos), TAM_LOTE_OBJETIVOS):
+        lote = textos[inicio:inicio + TAM_LOTE_OBJETIVOS]
+        secuencias = codificar_lote(lote, tokenizer, buffer)
+        predicciones = modelo.predict(secuencias, verbose=0)[:, 0]
+        preds_transformers = puntuar_transformers(lote, analyzer) if analyzer else [None] * len(lote)
+        for i, (texto, pred, pred_transformers) in enumerate(zip(lote, predicciones, preds_transformers)):
+            objetivos[inicio + i] = ensemble_prediccion_avanzada(pred, texto, analyzer, pred_transformers)[0]
+    return objetivos
+
+def evaluar(modelo_rapido, textos, objetivos, margen=MARGEN_NIVEL_RAPIDO):
+    """Acuerdo con el ensemble, error medio y reseñas/s en un núcleo"""
+    inicio = time.perf_counter()
+    predicciones = modelo_rapido.predecir_lote(textos)
+    duracion = time.perf_counter() - inicio
+    objetivos = np.asarray(objetivos)
+    seguras = np.abs(predicciones - 0.5) >= margen
+    return {
+        'acuerdo': float(np.mean((predicciones > 0.5) == (objetivos > 0.5))),
+        'error_medio': float(np.mean(np.abs(predicciones - objetivos))),
+        'cobertura_nivel_rapido': float(seguras.mean()),
+        'acuerdo_nivel_rapido': float(np.mean((predicciones[seguras] > 0.5) == (objetivos[seguras] > 0.5))) if seguras.any() else float('nan'),
+        'resenas_por_segundo': len(textos) / duracion if duracion > 0 else float('inf'),
+    }
+
+def main():
+    from nucleo import MODEL_PATH
+
+    parser = argparse.ArgumentParser(description="Destila el sistema ensemble en un modelo lineal rápido")
+    parser.add_argument("--corpus", required=True, help="Archivo con una reseña por línea")
+    parser.add_argument("--salida", default=RUTA_MODELO_RAPIDO)
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    parser.add_argument("--sin-transformers", action="store_true")
+    parser.add_argument("--validacion", type=float, default=0.1, help="Fracción reservada para evaluar")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        textos = [linea.strip() for linea in f if linea.strip()]
+    # Solo reseñas que el sistema completo analizaría
+    textos = [t for t in textos if evaluar_entrada(t)['apta']]
+    print(f"📚 {len(textos):,} reseñas aptas; generando objetivos con el modelo completo...")
+
+    inicio = time.perf_counter()
+    objetivos = generar_objetivos(textos, args.modelo, not args.sin_transformers)
+    tiempo_completo = time.perf_counter() - inicio
+
+    orden = np.random.default_rng(0).permutation(len(textos))
+    n_validacion = int(len(textos) * args.validacion)
+    validacion, entrenamiento = orden[:n_validacion], orden[n_validacion:]
+
+    modelo_rapido = entrenar(caracteristicas([textos[i] for i in entrenamiento]), objetivos[entrenamiento])
+    modelo_rapido.guardar(args.salida)
+
+    evaluados = validacion if n_validacion else entrenamiento
+    metricas = evaluar(modelo_rapido, [textos[i] for i in evaluados], objetivos[evaluados])
+    print(f"✅ Modelo rápido -> {args.salida}")
+    print(f"   Acuerdo con el ensemble: {100 * metricas['acuerdo']:.1f}% (error medio {metricas['error_medio']:.3f})")
+    print(f"   Primer nivel (|p - 0.5| >= {MARGEN_NIVEL_RAPIDO}): cubre {100 * metricas['cobertura_nivel_rapido']:.1f}% "
+          f"con {100 * metricas['acuerdo_nivel_rapido']:.1f}% de acuerdo")
+    print(f"   Rendimiento: {metricas['resenas_por_segundo']:,.0f} reseñas/s por núcleo "
+          f"(sistema completo: {len(textos) / tiempo_completo:,.1f} reseñas/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Análisis automático: puntúa el texto más reciente (tras un debounce opcional)
+# y descarta las puntuaciones obsoletas para no acumular inferencias. La app lo
+# usa al confirmar el texto (espera=0); el debounce sirve a fuentes de cambios
+# más frecuentes, como la simulación de tecleo de benchmarks/bench_en_vivo.py.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Tiempo sin cambios (segundos) antes de lanzar una inferencia
+ESPERA_DEBOUNCE = 0.6
+
+class PlanificadorEnVivo:
+    """Coordina las puntuaciones en vivo de una sesión.
+
+    Solo hay como máximo una inferencia en curso y una en cola: cada texto
+    nuevo cancela la que estaba en cola y deja obsoleta la que está en curso.
+    La inferencia en curso no se interrumpe (una predicción de TensorFlow no
+    se puede cancelar): sigue ocupando CPU hasta terminar y solo entonces se
+    descarta su resultado. Si la puntuación falla, el resultado es
+    {'texto', 'error'} para que la interfaz lo muestre.
+    """
+
+    def __init__(self, funcion_puntuar, espera=ESPERA_DEBOUNCE):
+        self._puntuar = funcion_puntuar
+        self.espera = espera
+        self._ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cinemascope-vivo")
+        self._lock = threading.Lock()
+        self._generacion = 0
+        self._pendiente = None # (texto, instante del último cambio)
+        self._futuro = None
+        self._ultimo_texto = None
+        self.resultado = None
+        self.estadisticas = {
+            'cambios': 0,       # textos recibidos desde la interfaz
+            'inferencias': 0,   # inferencias completadas y mostradas
+            'omitidas': 0,      # textos reemplazados antes de puntuarse
+            'descartadas': 0,   # inferencias terminadas con un texto obsoleto
+            'reutilizadas': 0,  # textos idénticos al último puntuado
+            'errores': 0,       # puntuaciones que lanzaron una excepción
+            'latencia_ms': None,
+            'latencia_media_ms': None,
+        }
+
+    def notificar(self, texto):
+        """Registra un cambio del texto; la puntuación espera al debounce"""
+        with self._lock:
+            self.estadisticas['cambios'] += 1
+            if self._pendiente is not None:
+                self.estadisticas['omitidas'] += 1
+            self._generacion += 1
+            self._pendiente = (texto, time.monotonic())
+            # Una inferencia en cola todavía no ha empezado: se cancela sin coste
+            if self._futuro is not None and self._futuro.cancel():
+                self.estadisticas['omitidas'] += 1
+                self._futuro = None
+
+    def sondear(self):
+        """Lanza la inferencia si el debounce venció y devuelve el último resultado"""
+        with self._lock:
+            if self._pendiente is None:
+                return self.resultado
+
+            texto, instante = self._pendiente
+            if time.monotonic() - instante < self.espera:
+                return self.resultado
+
+            self._pendiente = None
+            if texto == self._ultimo_texto:
+                self.estadisticas['reutilizadas'] += 1
+                return self.resultado
+
+            generacion = self._generacion
+            self._futuro = self._ejecutor.submit(self._ejecutar, texto, instante, generacion)
+            return self.resultado
+
+    def en_curso(self):
+        """Indica si hay texto esperando el debounce o una inferencia sin terminar"""
+        with self._lock:
+            return self._pendiente is not None or (self._futuro is not None and not self._futuro.done())
+
+    def _ejecutar(self, texto, instante, generacion):
+        try:
+            resultado = self._puntuar(texto)
+        except Exception as e:
+            resultado = {'texto': texto, 'error': f"{type(e).__name__}: {e}"}
+        latencia_ms = (time.monotonic() - instante) * 1000
+        with self._lock:
+            if generacion != self._generacion:
+                # Llegó texto nuevo mientras se puntuaba: el resultado ya no sirve
+                self.estadisticas['descartadas'] += 1
+                return
+            self.resultado = resultado
+            if 'error' in resultado:
+                # El mismo texto se vuelve a intentar en el siguiente cambio
+                self.estadisticas['errores'] += 1
+                self._ultimo_texto = None
+                return
+            self._ultimo_texto = texto
+            n = self.estadisticas['inferencias'] + 1
+            media = self.estadisticas['latencia_media_ms'] or 0.0
+            self.estadisticas['inferencias'] = n
+            self.estadisticas['latencia_ms'] = latencia_ms
+            self.estadisticas['latencia_media_ms'] = media + (latencia_ms - media) / n
+
+    def cerrar(self):
+        self._ejecutor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,289 @@
+# Evaluación offline: exactitud frente a rendimiento de cada configuración.
+# Pasa un conjunto etiquetado local en formato IMDb por cada configuración
+# disponible: solo el CNN+BiGRU, CNN+BiGRU con léxico, el ensemble completo con
+# Transformers (cada modo y padding disponible) y, para cada motor del CNN
+# (.h5 Keras, SavedModel de la caché, modelo compacto), lo mismo; más el modelo
+# rápido destilado si existe. Para cada una informa exactitud, F1, error de
+# calibración, reseñas/s y latencia por reseña en un único informe JSON.
+#
+# Formatos de datos:
+#   - directorio aclImdb (pos/ y neg/ con un .txt por reseña, o test/ y train/ con ellos)
+#   - CSV con columnas texto,etiqueta (1 = positiva) o review,sentiment (IMDb de Kaggle)
+#
+# Uso: python evaluacion.py --datos aclImdb/test [--limite 2000] [--salida evaluacion.json]
+
+import argparse
+import csv
+import json
+import os
+import platform
+import time
+
+import numpy as np
+
+import nucleo
+from confianza import _aciertos
+from nucleo import (MODEL_PATH, TRANSFORMERS_AVAILABLE, VERSION_LEXICO, analizar_lote, analizar_resena,
+                    buffer_secuencias, cargar_analizador_transformers, codificar_lote, crear_tokenizer,
+                    texto_a_secuencia, version_modelo)
+
+RUTA_INFORME = "evaluacion.json"
+# Reseñas por llamada al medir el rendimiento (el tamaño de lote de lotes.py/servicio.py)
+TAM_LOTE_EVALUACION = 64
+# Reseñas puntuadas una a una para los percentiles de latencia
+MUESTRA_LATENCIA = 200
+# Intervalos del error de calibración esperado (ECE)
+INTERVALOS_CALIBRACION = 10
+
+# 1. Conjunto de datos
+def _leer_directorio_imdb(ruta):
+    if not os.path.isdir(os.path.join(ruta, "pos")):
+        # Raíz de aclImdb: se usa la partición de test si existe
+        for particion in ("test", "train"):
+            if os.path.isdir(os.path.join(ruta, particion, "pos")):
+                return _leer_directorio_imdb(os.path.join(ruta, particion))
+        raise ValueError(f"{ruta} no tiene subdirectorios pos/ y neg/")
+    textos, etiquetas = [], []
+    for carpeta, etiqueta in (("pos", 1), ("neg", 0)):
+        directorio = os.path.join(ruta, carpeta)
+        for nombre in sorted(os.listdir(directorio)):
+            if nombre.endswith(".txt"):
+                with open(os.path.join(directorio, nombre), encoding="utf-8") as f:
+                    textos.append(f.read())
+                etiquetas.append(etiqueta)
+    return textos, etiquetas
+
+def _leer_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    if filas and 'review' in filas[0]:
+        return [fila['review'] for fila in filas], [int(fila['sentiment'].strip().lower() == "positive") for fila in filas]
+    return [fila['texto'] for fila in filas], [int(fila['etiqueta']) for fila in filas]
+
+def cargar_dataset(ruta, limite=None, semilla=0):
+    """(textos, etiquetas) de un directorio aclImdb o un CSV; muestra fija si hay límite"""
+    textos, etiquetas = _leer_directorio_imdb(ruta) if os.path.isdir(ruta) else _leer_csv(ruta)
+    etiquetas = np.asarray(etiquetas, dtype=np.int8)
+    if limite and limite < len(textos):
+        indices = np.sort(np.random.default_rng(semilla).choice(len(textos), limite, replace=False))
+        textos, etiquetas = [textos[i] for i in indices], etiquetas[indices]
+    return textos, etiquetas
+
+# 2. Métricas
+def error_calibracion(probabilidad, aciertos, n_intervalos=INTERVALOS_CALIBRACION):
+    """ECE: |confianza media - tasa de aciertos| por intervalo, ponderado por tamaño"""
+    probabilidad = np.asarray(probabilidad, dtype=np.float64)
+    indices = np.minimum((probabilidad * n_intervalos).astype(int), n_intervalos - 1)
+    diferencias = np.abs(np.bincount(indices, weights=probabilidad, minlength=n_intervalos)
+                         - np.bincount(indices, weights=aciertos, minlength=n_intervalos))
+    return float(diferencias.sum() / max(len(probabilidad), 1))
+
+def metricas(pred, etiquetas, confianza=None):
+    """Exactitud, F1 (clase positiva), Brier y ECE de las predicciones P(positiva)"""
+    pred = np.asarray(pred, dtype=np.float64)
+    etiquetas = np.asarray(etiquetas).astype(bool)
+    distancia, aciertos = _aciertos(pred, etiquetas)
+    positivas = pred > 0.5
+    verdaderos = np.sum(positivas & etiquetas)
+    precision = verdaderos / max(positivas.sum(), 1)
+    exhaustividad = verdaderos / max(etiquetas.sum(), 1)
+    resultado = {
+        'exactitud': float(aciertos.mean()) if len(aciertos) else None,
+        'f1': float(2 * precision * exhaustividad / (precision + exhaustividad)) if verdaderos else 0.0,
+        'precision': float(precision),
+        'exhaustividad': float(exhaustividad),
+        'brier': float(np.mean((pred - etiquetas) ** 2)) if len(pred) else None,
+        # Probabilidad de la clase elegida frente a la tasa de aciertos
+        'ece': error_calibracion(0.5 + distancia, aciertos),
+    }
+    if confianza is not None:
+        # La confianza que muestra la app (0-100) leída como probabilidad de acierto
+        resultado['ece_confianza'] = error_calibracion(np.asarray(confianza, dtype=np.float64) / 100, aciertos)
+    return resultado
+
+def percentiles_ms(duraciones):
+    p50, p95, p99 = np.percentile(np.asarray(duraciones) * 1000, [50, 95, 99])
+    return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99)}
+
+def _limpiar_caches():
+    """Cada medición empieza en frío: sin secuencias ni léxico recordados"""
+    nucleo._secuencia_cacheada.cache_clear()
+    nucleo.analizar_palabras_clave_avanzado.cache_clear()
+    nucleo.analizar_intensidad_emocional.cache_clear()
+
+# 3. Configuraciones
+class Configuracion:
+    """Una forma de puntuar: lote de textos -> (pred, confianza o None, descartados)"""
+
+    def __init__(self, nombre, motor, puntuar_lote, puntuar_uno):
+        self.nombre = nombre
+        self.motor = motor
+        self.puntuar_lote = puntuar_lote
+        self.puntuar_uno = puntuar_uno
+
+def _solo_cnn(modelo, tokenizer, tam_lote=TAM_LOTE_EVALUACION):
+    buffer = buffer_secuencias(tam_lote)
+
+    def lote(textos):
+        secuencias = codificar_lote(textos, tokenizer, buffer)
+        return modelo.predict(secuencias, verbose=0)[:, 0], None, np.zeros(len(textos), dtype=bool)
+
+    def uno(texto):
+        modelo.predict(texto_a_secuencia(texto, tokenizer), verbose=0)
+    return lote, uno
+
+def _ensemble(modelo, tokenizer, analyzer=None):
+    def lote(textos):
+        resultados = analizar_lote(textos, modelo, tokenizer, analyzer)
+        descartados = np.array([bool(r.get('descartado')) for r in resultados])
+        pred = np.array([0.5 if r.get('descartado') else float(r['pred_ensemble']) for r in resultados])
+        confianza = np.array([0.0 if r.get('descartado') else float(r['confianza']) for r in resultados])
+        return pred, confianza, descartados
+
+    def uno(texto):
+        analizar_resena(texto, modelo, tokenizer, analyzer)
+    return lote, uno
+
+def _rapido(modelo_rapido):
+    def lote(textos):
+        return modelo_rapido.predecir_lote(textos), None, np.zeros(len(textos), dtype=bool)
+
+    def uno(texto):
+        modelo_rapido.predecir(texto)
+    return lote, uno
+
+def motores_disponibles(ruta_modelo=MODEL_PATH, motores=None):
+    """(nombre, cargador) de cada motor del CNN+BiGRU que se puede cargar aquí"""
+    from artefactos import cargar_modelo_cacheado
+    from compactacion import RUTA_MODELO_COMPACTO, compacto_vigente, cargar_modelo_compacto
+    candidatos = [
+        ("keras", lambda: (nucleo.cargar_modelo(ruta_modelo), crear_tokenizer())),
+        ("savedmodel", lambda: (cargar_modelo_cacheado(ruta_modelo), crear_tokenizer())),
+    ]
+    if compacto_vigente(RUTA_MODELO_COMPACTO, ruta_modelo):
+        candidatos.append(("compacto", lambda: cargar_modelo_compacto(RUTA_MODELO_COMPACTO)))
+    return [(nombre, cargador) for nombre, cargador in candidatos if motores is None or nombre in motores]
+
+def variantes_transformers():
+    """(nombre, cargador) de cada modo de Transformers disponible"""
+    if not TRANSFORMERS_AVAILABLE:
+        return []
+
+    def optimizado(relleno):
+        def cargar():
+            analyzer = cargar_analizador_transformers("optimizado")
+            if analyzer is not None:
+                analyzer.relleno = relleno
+            return analyzer
+        return cargar
+    return [
+        ("optimizado", optimizado("longest")),
+        ("optimizado/relleno-fijo", optimizado("max_length")),
+        ("pipeline", lambda: cargar_analizador_transformers("pipeline")),
+    ]
+
+# 4. Evaluación
+def evaluar_configuracion(configuracion, textos, etiquetas, tam_lote=TAM_LOTE_EVALUACION,
+                          muestra_latencia=MUESTRA_LATENCIA):
+    # Calentamiento: trazado de funciones, asignación de buffers
+    configuracion.puntuar_lote(textos[:tam_lote])
+    configuracion.puntuar_uno(textos[0])
+
+    _limpiar_caches()
+    partes = []
+    inicio = time.perf_counter()
+    for i in range(0, len(textos), tam_lote):
+        partes.append(configuracion.puntuar_lote(textos[i:i + tam_lote]))
+    duracion = time.perf_counter() - inicio
+    pred = np.concatenate([p for p, _, _ in partes])
+    descartados = np.concatenate([d for _, _, d in partes])
+    confianza = None if partes[0][1] is None else np.concatenate([c for _, c, _ in partes])
+
+    _limpiar_caches()
+    duraciones = []
+    for texto in textos[:muestra_latencia]:
+        inicio = time.perf_counter()
+        configuracion.puntuar_uno(texto)
+        duraciones.append(time.perf_counter() - inicio)
+
+    validos = ~descartados
+    return {
+        'configuracion': configuracion.nombre,
+        'motor': configuracion.motor,
+        'n': int(validos.sum()),
+        # Reseñas que el filtro de idioma descarta (no cuentan en las métricas)
+        'descartadas': int(descartados.sum()),
+        **metricas(pred[validos], etiquetas[validos], None if confianza is None else confianza[validos]),
+        'resenas_por_segundo': len(textos) / duracion,
+        'latencia_ms': percentiles_ms(duraciones),
+    }
+
+def configuraciones(ruta_modelo=MODEL_PATH, motores=None, con_transformers=True, modelo_rapido=None,
+                    tam_lote=TAM_LOTE_EVALUACION):
+    """Genera las configuraciones disponibles, cargando cada modelo una sola vez"""
+    transformers = variantes_transformers() if con_transformers else []
+    analizadores = {}
+    for motor, cargador in motores_disponibles(ruta_modelo, motores):
+        modelo, tokenizer = cargador()
+        yield Configuracion("cnn", motor, *_solo_cnn(modelo, tokenizer, tam_lote))
+        yield Configuracion("cnn+lexico", motor, *_ensemble(modelo, tokenizer))
+        for nombre, cargar in transformers:
+            if nombre not in analizadores:
+                analizadores[nombre] = cargar()
+            if analizadores[nombre] is not None:
+                yield Configuracion(f"completo/{nombre}", motor, *_ensemble(modelo, tokenizer, analizadores[nombre]))
+    if modelo_rapido is not None:
+        yield Configuracion("rapido", "destilado", *_rapido(modelo_rapido))
+
+def evaluar(textos, etiquetas, ruta_modelo=MODEL_PATH, motores=None, con_transformers=True, modelo_rapido=None,
+            tam_lote=TAM_LOTE_EVALUACION, muestra_latencia=MUESTRA_LATENCIA, progreso=None):
+    """Informe con las métricas de cada configuración sobre el mismo conjunto"""
+    resultados = []
+    for configuracion in configuraciones(ruta_modelo, motores, con_transformers, modelo_rapido, tam_lote):
+        resultados.append(evaluar_configuracion(configuracion, textos, etiquetas, tam_lote, muestra_latencia))
+        if progreso:
+            progreso(resultados[-1])
+    return {
+        'n': len(textos),
+        'positivas': int(np.sum(etiquetas)),
+        'version_modelo': version_modelo(ruta_modelo),
+        'version_lexico': VERSION_LEXICO,
+        'transformers': TRANSFORMERS_AVAILABLE,
+        'cpus': os.cpu_count(),
+        'plataforma': platform.platform(),
+        'tam_lote': tam_lote,
+        'configuraciones': resultados,
+    }
+
+def _fila(r):
+    return (f"{r['motor']:<12}{r['configuracion']:<32}{100 * r['exactitud']:>9.2f}%{r['f1']:>7.3f}{r['ece']:>7.3f}"
+            f"{r.get('ece_confianza', float('nan')):>9.3f}{r['resenas_por_segundo']:>11.1f}"
+            f"{r['latencia_ms']['p50']:>9.1f}{r['latencia_ms']['p95']:>9.1f}{r['descartadas']:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Exactitud y rendimiento de cada configuración sobre datos etiquetados")
+    parser.add_argument("--datos", required=True, help="Directorio aclImdb (pos/, neg/) o CSV etiquetado")
+    parser.add_argument("--limite", type=int, default=None, help="Muestra fija de N reseñas")
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    parser.add_argument("--motores", nargs="*", default=None, help="keras, savedmodel, compacto (por defecto todos)")
+    parser.add_argument("--sin-transformers", action="store_true")
+    parser.add_argument("--tam-lote", type=int, default=TAM_LOTE_EVALUACION)
+    parser.add_argument("--muestra-latencia", type=int, default=MUESTRA_LATENCIA)
+    parser.add_argument("--salida", default=RUTA_INFORME)
+    args = parser.parse_args()
+
+    from destilacion import ModeloRapido, RUTA_MODELO_RAPIDO
+    textos, etiquetas = cargar_dataset(args.datos, args.limite)
+    modelo_rapido = ModeloRapido.cargar(RUTA_MODELO_RAPIDO) if os.path.exists(RUTA_MODELO_RAPIDO) else None
+    print(f"{len(textos):,} reseñas ({int(etiquetas.sum()):,} positivas) · {os.cpu_count()} CPU\n")
+    print(f"{'motor':<12}{'configuración':<32}{'exactitud':>10}{'F1':>7}{'ECE':>7}{'ECE conf':>9}"
+          f"{'reseñas/s':>11}{'p50 ms':>9}{'p95 ms':>9}{'desc.':>7}")
+    informe = evaluar(textos, etiquetas, args.modelo, args.motores, not args.sin_transformers, modelo_rapido,
+                      args.tam_lote, args.muestra_latencia, progreso=lambda r: print(_fila(r), flush=True))
+    informe['datos'] = os.path.abspath(args.datos)
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ Informe -> {args.salida}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# Filtro rápido de idioma antes de la inferencia.
+# El modelo CNN+BiGRU, el léxico y RoBERTa solo entienden inglés: este filtro
+# identifica el idioma con un modelo de trigramas de caracteres (Naive Bayes)
+# y palabras vacías, todo en memoria, y evita llamar a los modelos cuando la
+# reseña no está en inglés o casi no tiene texto.
+
+import math
+import re
+from collections import Counter
+
+# Mínimo de palabras para considerar que hay una reseña que analizar: una
+# reseña de una o dos palabras ("Masterpiece.", "Loved it") también es válida
+MIN_PALABRAS = 1
+# Solo se examina el comienzo del texto: basta para decidir y acota el coste
+MAX_CARACTERES = 1000
+# Ventaja (log-verosimilitud por trigrama) que necesita otro idioma sobre el
+# inglés para descartar la reseña: ante la duda se prefiere analizarla
+MARGEN_RECHAZO = 0.25
+# Con pocos trigramas la estimación es ruidosa (nombres propios, "la la land"):
+# por debajo de MIN_TRIGRAMAS_RECHAZO se da por inglés, y hasta
+# TRIGRAMAS_TEXTO_LARGO se exige el margen mayor
+MIN_TRIGRAMAS_RECHAZO = 15
+TRIGRAMAS_TEXTO_LARGO = 60
+MARGEN_RECHAZO_CORTO = 0.5
+
+NOMBRES_IDIOMA = {
+    'en': "Inglés", 'es': "Español", 'pt': "Portugués",
+    'fr': "Francés", 'de': "Alemán", 'it': "Italiano",
+}
+
+# Textos semilla para los perfiles de trigramas de cada idioma
+TEXTOS_SEMILLA = {
+    'en': """
+        this movie was one of the best films i have seen in years and the acting was
+        great from start to finish. the story is simple but the characters feel real and
+        the director knows exactly what he wants to show. i would not recommend it to
+        everyone because the pacing is slow and some scenes are too long, but it is worth
+        watching. the music and the photography are beautiful, while the dialogue could
+        have been better. what a waste of time, the plot made no sense and the ending was
+        terrible. they should have spent more money on the script than on special effects.
+        it was the kind of film that you will remember for a long time, with performances
+        that are honest and moving. there is nothing new here and the jokes are not funny.
+        i loved every minute of it. a masterpiece with brilliant, outstanding, magnificent
+        and breathtaking visuals; an amazing, fantastic, excellent and wonderful experience.
+        good, great, enjoyable, entertaining, solid, decent, impressive and engaging work,
+        but also a terrible, awful, horrible, dreadful, boring, stupid and disappointing
+        disaster. just awful: weak story, bland and forgettable characters, predictable
+        and confusing screenplay, overrated cast, generic soundtrack, worst sequel ever.
+    """,
+    'es': """
+        esta película fue una de las mejores que he visto en años y la actuación fue
+        excelente de principio a fin. la historia es sencilla pero los personajes se
+        sienten reales y el director sabe exactamente lo que quiere mostrar. no la
+        recomendaría a todos porque el ritmo es lento y algunas escenas son demasiado
+        largas, pero vale la pena verla. la música y la fotografía son hermosas, aunque
+        los diálogos podrían haber sido mejores. qué pérdida de tiempo, la trama no tenía
+        sentido y el final fue terrible. deberían haber gastado más dinero en el guion que
+        en los efectos especiales. no hay nada nuevo aquí y los chistes no son graciosos.
+    """,
+    'pt': """
+        este filme foi um dos melhores que eu vi nos últimos anos e a atuação foi ótima
+        do começo ao fim. a história é simples mas os personagens parecem reais e o
+        diretor sabe exatamente o que quer mostrar. não recomendaria para todos porque o
+        ritmo é lento e algumas cenas são longas demais, mas vale a pena assistir. a música
+        e a fotografia são lindas, embora os diálogos pudessem ser melhores. que perda de
+        tempo, o enredo não fazia sentido e o final foi horrível. não há nada de novo aqui.
+    """,
+    'fr': """
+        ce film était l'un des meilleurs que j'ai vus depuis des années et le jeu des
+        acteurs était excellent du début à la fin. l'histoire est simple mais les
+        personnages semblent réels et le réalisateur sait exactement ce qu'il veut montrer.
+        je ne le recommanderais pas à tout le monde parce que le rythme est lent et que
+        certaines scènes sont trop longues, mais il vaut la peine d'être vu. quelle perte
+        de temps, l'intrigue n'avait aucun sens et la fin était terrible. il n'y a rien de
+        nouveau ici et les blagues ne sont pas drôles.
+    """,
+    'de': """
+        dieser film war einer der besten, die ich seit jahren gesehen habe, und die
+        schauspieler waren von anfang bis ende großartig. die geschichte ist einfach, aber
+        die figuren wirken echt und der regisseur weiß genau, was er zeigen will. ich
+        würde ihn nicht jedem empfehlen, weil das tempo langsam ist und einige szenen zu
+        lang sind, aber er ist sehenswert. was für eine zeitverschwendung, die handlung
+        ergab keinen sinn und das ende war schrecklich. es gibt hier nichts neues und die
+        witze sind nicht lustig.
+    """,
+    'it': """
+        questo film è stato uno dei migliori che ho visto negli ultimi anni e la
+        recitazione è stata ottima dall'inizio alla fine. la storia è semplice ma i
+        personaggi sembrano reali e il regista sa esattamente cosa vuole mostrare. non lo
+        consiglierei a tutti perché il ritmo è lento e alcune scene sono troppo lunghe, ma
+        vale la pena vederlo. che perdita di tempo, la trama non aveva senso e il finale è
+        stato terribile. non c'è niente di nuovo qui e le battute non sono divertenti.
+    """,
+}
+
+# Palabras vacías muy frecuentes: decisivas en textos cortos
+PALABRAS_VACIAS = {
+    'en': {'the', 'and', 'is', 'was', 'of', 'to', 'it', 'this', 'that', 'in', 'with', 'for',
+           'but', 'not', 'are', 'be', 'have', 'you', 'i', 'movie', 'film', 'very', 'its'},
+    'es': {'el', 'la', 'los', 'las', 'de', 'que', 'y', 'es', 'un', 'una', 'por', 'con', 'para',
+           'pero', 'muy', 'película', 'fue', 'del', 'se', 'lo', 'mi', 'más', 'está'},
+    'pt': {'o', 'a', 'os', 'as', 'de', 'que', 'e', 'é', 'um', 'uma', 'por', 'com', 'para',
+           'mas', 'muito', 'filme', 'foi', 'do', 'da', 'não', 'eu', 'mais', 'está'},
+    'fr': {'le', 'la', 'les', 'de', 'des', 'que', 'et', 'est', 'un', 'une', 'pour', 'avec',
+           'mais', 'très', 'film', 'était', 'du', 'ce', 'pas', 'je', 'plus', 'il'},
+    'de': {'der', 'die', 'das', 'und', 'ist', 'ein', 'eine', 'nicht', 'mit', 'für', 'aber',
+           'sehr', 'film', 'war', 'ich', 'es', 'zu', 'den', 'von', 'auf', 'auch'},
+    'it': {'il', 'lo', 'la', 'gli', 'le', 'di', 'che', 'e', 'è', 'un', 'una', 'per', 'con',
+           'ma', 'molto', 'film', 'stato', 'del', 'della', 'non', 'più', 'questo'},
+}
+# Peso de cada palabra vacía frente a la log-verosimilitud de los trigramas
+PESO_PALABRA_VACIA = 1.5
+
+_PALABRAS = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+
+def _trigramas(texto):
+    for palabra in _PALABRAS.findall(texto):
+        palabra = f" {palabra} "
+        for i in range(len(palabra) - 2):
+            yield palabra[i:i + 3]
+
+def _construir_perfiles():
+    """Log-probabilidades de trigramas por idioma (suavizado de Laplace)"""
+    conteos = {codigo: Counter(_trigramas(texto.lower())) for codigo, texto in TEXTOS_SEMILLA.items()}
+    vocabulario = set().union(*conteos.values())
+    perfiles = {}
+    for codigo, conteo in conteos.items():
+        total = sum(conteo.values()) + len(vocabulario) + 1
+        perfiles[codigo] = (
+            {trigrama: math.log((n + 1) / total) for trigrama, n in conteo.items()},
+            math.log(1 / total), # trigrama nunca visto en este idioma
+        )
+    return perfiles
+
+_PERFILES = _construir_perfiles()
+
+def detectar_idioma(texto):
+    """Idioma más probable, puntuación media por trigrama de cada idioma y número de trigramas"""
+    texto = texto[:MAX_CARACTERES].lower()
+    trigramas = Counter(_trigramas(texto))
+    n = sum(trigramas.values())
+    if n == 0:
+        return None, {}, 0
+
+    palabras = _PALABRAS.findall(texto)
+    puntuaciones = {}
+    for codigo, (log_probs, log_desconocido) in _PERFILES.items():
+        log_verosimilitud = sum(log_probs.get(t, log_desconocido) * c for t, c in trigramas.items())
+        vacias = sum(1 for palabra in palabras if palabra in PALABRAS_VACIAS[codigo])
+        puntuaciones[codigo] = (log_verosimilitud + PESO_PALABRA_VACIA * vacias * math.log(len(_PERFILES))) / n
+    return max(puntuaciones, key=puntuaciones.get), puntuaciones, n
+
+def evaluar_entrada(texto):
+    """Decide si una reseña debe pasar a los modelos
+
+    Devuelve un diccionario con 'apta' (bool), 'idioma', 'motivo'
+    ('vacia' o 'idioma' cuando no es apta) y un 'mensaje' para el usuario.
+    """
+    palabras = _PALABRAS.findall(texto[:MAX_CARACTERES])
+    if len(palabras) < MIN_PALABRAS:
+        return {
+            'apta': False, 'idioma': None, 'motivo': 'vacia',
+            'mensaje': "La reseña no tiene texto: escribe una reseña en inglés.",
+        }
+
+    idioma, puntuaciones, n = detectar_idioma(texto)
+    if n < MIN_TRIGRAMAS_RECHAZO:
+        # Demasiado corta para descartarla por idioma: se analiza como inglés
+        return {'apta': True, 'idioma': 'en', 'motivo': None, 'mensaje': None}
+    margen = MARGEN_RECHAZO if n >= TRIGRAMAS_TEXTO_LARGO else MARGEN_RECHAZO_CORTO
+    rival = max((p for codigo, p in puntuaciones.items() if codigo != 'en'), default=float('-inf'))
+    if rival - puntuaciones.get('en', float('-inf')) > margen:
+        nombre = NOMBRES_IDIOMA.get(idioma, idioma)
+        return {
+            'apta': False, 'idioma': idioma, 'motivo': 'idioma',
+            'mensaje': f"La reseña parece estar en {nombre}. El modelo solo analiza reseñas en inglés.",
+        }
+
+    return {'apta': True, 'idioma': 'en', 'motivo': None, 'mensaje': None}
@@ -0,0 +1,250 @@
+# Puntuación masiva offline con entrada y salida columnar.
+# Lee las reseñas de Parquet, Arrow IPC o CSV por lotes de registros (sin
+# cargar el archivo entero: Parquet por row groups, Arrow con mmap), las puntúa
+# con analizar_lote() y escribe cada lote de resultados en cuanto termina: un
+# row group de Parquet, un record batch de Arrow o un bloque de CSV. Los
+# resultados se construyen columna a columna con tipos fijos (float32, listas
+# de palabras, nivel de confianza) para que el almacén de datos los cargue tal cual.
+# Con --rapido, el modelo destilado (destilacion.py) puntúa las reseñas en las
+# que está seguro (columna nivel = 'rapido', pred_original nulo) y solo el
+# resto pasa por el modelo completo.
+#
+# Uso: python lotes.py resenas.parquet resultados.parquet [--columna-texto texto] [--columna-id id] [--rapido]
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from destilacion import RUTA_MODELO_RAPIDO, ModeloRapido, analizar_lote_rapido
+from nucleo import MODEL_PATH, VERSION_LEXICO, analizar_lote, version_modelo
+
+# Filas por lote de lectura y por row group de salida
+TAM_LOTE_REGISTROS = 8192
+# Reseñas por llamada al modelo dentro de un lote
+TAM_LOTE_PREDICCION = 256
+
+FORMATOS = {'.parquet': 'parquet', '.pq': 'parquet', '.arrow': 'arrow', '.feather': 'arrow',
+            '.ipc': 'arrow', '.csv': 'csv'}
+
+# Columnas de resultados (además del id, si la entrada lo trae)
+COLUMNAS_RESULTADO = [
+    ('texto_hash', pa.string()),
+    ('descartado', pa.string()),          # motivo del filtro de idioma; nulo si se puntuó
+    ('nivel', pa.string()),               # 'rapido' (modelo destilado) o 'completo'; nulo si se descartó
+    ('pred_original', pa.float32()),
+    ('pred_ensemble', pa.float32()),
+    ('boost_consenso', pa.float32()),
+    ('boost_palabras', pa.float32()),
+    ('boost_intensidad', pa.float32()),
+    ('palabras_encontradas', pa.list_(pa.string())),
+    ('confianza', pa.float32()),
+    ('nivel_confianza', pa.string()),
+    ('con_transformers', pa.bool_()),
+    ('t_idioma_ms', pa.float32()),
+    ('t_tokenizacion_ms', pa.float32()),
+    ('t_modelo_ms', pa.float32()),
+    ('t_ensemble_ms', pa.float32()),
+    ('t_total_ms', pa.float32()),
+]
+_NUMERICAS = ('pred_original', 'pred_ensemble', 'boost_consenso', 'boost_palabras',
+              'boost_intensidad', 'confianza')
+_TIEMPOS = ('idioma', 'tokenizacion', 'modelo', 'ensemble', 'total')
+
+def formato_de(ruta, formato=None):
+    if formato:
+        return formato
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in FORMATOS:
+        raise ValueError(f"Formato desconocido para '{ruta}' (usa {', '.join(sorted(FORMATOS))})")
+    return FORMATOS[extension]
+
+def esquema_resultados(tipo_id=None, metadatos=None):
+    campos = ([pa.field('id', tipo_id)] if tipo_id is not None else []) + [pa.field(n, t) for n, t in COLUMNAS_RESULTADO]
+    return pa.schema(campos, metadata=metadatos)
+
+def leer_lotes(ruta, columnas, formato=None, tam_lote=TAM_LOTE_REGISTROS):
+    """Genera RecordBatch con solo 'columnas', de como mucho tam_lote filas"""
+    formato = formato_de(ruta, formato)
+    if formato == 'parquet':
+        yield from pq.ParquetFile(ruta).iter_batches(batch_size=tam_lote, columns=columnas)
+    elif formato == 'arrow':
+        with pa.memory_map(ruta) as origen:
+            try:
+                lector = pa.ipc.open_file(origen)
+                lotes = (lector.get_batch(i) for i in range(lector.num_record_batches))
+            except pa.ArrowInvalid:
+                origen.seek(0)
+                lotes = pa.ipc.open_stream(origen)
+            for lote in lotes:
+                lote = lote.select(columnas)
+                for inicio in range(0, lote.num_rows, tam_lote):
+                    yield lote.slice(inicio, tam_lote)
+    else:
+        lector = pacsv.open_csv(
+            ruta,
+            read_options=pacsv.ReadOptions(block_size=1 << 22),
+            convert_options=pacsv.ConvertOptions(include_columns=columnas),
+        )
+        for lote in lector:
+            for inicio in range(0, lote.num_rows, tam_lote):
+                yield lote.slice(inicio, tam_lote)
+
+def lote_resultados(analisis, esquema, ids=None):
+    """RecordBatch de resultados construido por columnas"""
+    n = len(analisis)
+    puntuados = np.array([not a.get('descartado') for a in analisis])
+    columnas = {'texto_hash': pa.array([a['texto_hash'] for a in analisis], pa.string())}
+    columnas['descartado'] = pa.array(
+        [None if p else a['descartado']['motivo'] for p, a in zip(puntuados, analisis)], pa.string())
+    columnas['nivel'] = pa.array(
+        [a.get('nivel', 'completo') if p else None for p, a in zip(puntuados, analisis)], pa.string())
+    for nombre in _NUMERICAS:
+        # Nulo si se descartó o si el valor no existe (pred_original en el nivel rápido)
+        presentes = np.array([p and a[nombre] is not None for p, a in zip(puntuados, analisis)], dtype=bool)
+        valores = np.zeros(n, dtype=np.float32)
+        valores[presentes] = [a[nombre] for p, a in zip(presentes, analisis) if p]
+        columnas[nombre] = pa.array(valores, pa.float32(), mask=~presentes)
+    columnas['palabras_encontradas'] = pa.array(
+        [list(a['palabras_encontradas']) if p else None for p, a in zip(puntuados, analisis)],
+        pa.list_(pa.string()))
+    columnas['nivel_confianza'] = pa.array(
+        [a['nivel_confianza'] if p else None for p, a in zip(puntuados, analisis)], pa.string())
+    columnas['con_transformers'] = pa.array(
+        [bool(a['con_transformers']) if p else None for p, a in zip(puntuados, analisis)], pa.bool_())
+    for clave in _TIEMPOS:
+        columnas[f't_{clave}_ms'] = pa.array(
+            [a['tiempos_ms'].get(clave) for a in analisis], pa.float32())
+    if ids is not None:
+        columnas['id'] = ids
+    return pa.RecordBatch.from_arrays([columnas[nombre] for nombre in esquema.names], schema=esquema)
+
+class EscritorResultados:
+    """Escribe lotes de resultados a medida que llegan (Parquet, Arrow IPC o CSV)"""
+
+    def __init__(self, ruta, esquema, formato=None, compresion='zstd'):
+        self.formato = formato_de(ruta, formato)
+        self.esquema = esquema
+        if self.formato == 'parquet':
+            self._escritor = pq.ParquetWriter(ruta, esquema, compression=compresion)
+        elif self.formato == 'arrow':
+            self._escritor = pa.ipc.new_file(ruta, esquema)
+        else:
+            # CSV no admite listas: las palabras van unidas por '|'
+            self._esquema_csv = pa.schema([
+                pa.field(c.name, pa.string()) if c.name == 'palabras_encontradas' else c for c in esquema
+            ])
+            self._escritor = pacsv.CSVWriter(ruta, self._esquema_csv)
+        self.filas = 0
+
+    def escribir(self, lote):
+        if self.formato == 'parquet':
+            # Un row group por lote: el almacén puede leerlos en paralelo
+            self._escritor.write_batch(lote, row_group_size=lote.num_rows)
+        elif self.formato == 'arrow':
+            self._escritor.write_batch(lote)
+        else:
+            i = lote.schema.get_field_index('palabras_encontradas')
+            palabras = pc.binary_join(lote.column(i), '|')
+            self._escritor.write_batch(pa.RecordBatch.from_arrays(
+                [palabras if j == i else c for j, c in enumerate(lote.columns)], schema=self._esquema_csv))
+        self.filas += lote.num_rows
+
+    def cerrar(self):
+        self._escritor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+def puntuar_archivo(entrada, salida, modelo, tokenizer, analyzer_transformers=None,
+                    columna_texto='texto', columna_id=None, tam_lote=TAM_LOTE_REGISTROS,
+                    tam_lote_prediccion=TAM_LOTE_PREDICCION, metadatos=None, formato_entrada=None,
+                    formato_salida=None, modelo_rapido=None):
+    """Puntúa todas las reseñas de 'entrada' y escribe los resultados en 'salida'
+
+    Con 'modelo_rapido' (destilacion.ModeloRapido), el modelo completo solo
+    puntúa las reseñas en las que el modelo rápido duda.
+    """
+    columnas = [columna_texto] + ([columna_id] if columna_id else [])
+    estadisticas = {'filas': 0, 'descartadas': 0, 'nivel_rapido': 0, 'lotes': 0, 's_lectura': 0.0,
+                    's_puntuacion': 0.0, 's_escritura': 0.0}
+
+    def puntuar(textos):
+        return analizar_lote(textos, modelo, tokenizer, analyzer_transformers)
+    escritor = None
+    inicio = time.perf_counter()
+    try:
+        for lote in leer_lotes(entrada, columnas, formato_entrada, tam_lote):
+            t_leido = time.perf_counter()
+            estadisticas['s_lectura'] += t_leido - inicio
+            # Nulos como texto vacío: el filtro de idioma los descarta sin llamar al modelo
+            textos = lote.column(columna_texto).fill_null("").to_pylist()
+            analisis = []
+            for i in range(0, len(textos), tam_lote_prediccion):
+                parte = textos[i:i + tam_lote_prediccion]
+                analisis.extend(analizar_lote_rapido(parte, modelo_rapido, puntuar) if modelo_rapido is not None
+                                else puntuar(parte))
+            t_puntuado = time.perf_counter()
+
+            ids = lote.column(columna_id) if columna_id else None
+            if escritor is None:
+                esquema = esquema_resultados(ids.type if ids is not None else None, metadatos)
+                escritor = EscritorResultados(salida, esquema, formato_salida)
+            escritor.escribir(lote_resultados(analisis, escritor.esquema, ids))
+            inicio = time.perf_counter()
+
+            estadisticas['s_puntuacion'] += t_puntuado - t_leido
+            estadisticas['s_escritura'] += inicio - t_puntuado
+            estadisticas['filas'] += len(analisis)
+            estadisticas['descartadas'] += sum(1 for a in analisis if a.get('descartado'))
+            estadisticas['nivel_rapido'] += sum(1 for a in analisis if a.get('nivel') == 'rapido')
+            estadisticas['lotes'] += 1
+    finally:
+        if escritor is not None:
+            escritor.cerrar()
+    return estadisticas
+
+def main():
+    parser = argparse.ArgumentParser(description="Puntúa un archivo de reseñas con salida columnar")
+    parser.add_argument("entrada", help="Parquet, Arrow IPC (.arrow/.feather) o CSV")
+    parser.add_argument("salida", help="Parquet, Arrow IPC o CSV (según la extensión)")
+    parser.add_argument("--columna-texto", default="texto")
+    parser.add_argument("--columna-id", default=None)
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    parser.add_argument("--tam-lote", type=int, default=TAM_LOTE_REGISTROS)
+    parser.add_argument("--con-transformers", action="store_true")
+    parser.add_argument("--rapido", action="store_true",
+                        help=f"Primer nivel con el modelo destilado ({RUTA_MODELO_RAPIDO})")
+    args = parser.parse_args()
+
+    from autoajuste_hilos import preparar_hilos
+    from artefactos import cargar_modelo_y_tokenizer
+    from nucleo import cargar_analizador_transformers
+    preparar_hilos(args.modelo, autoajustar_si_falta=False)
+    modelo, tokenizer = cargar_modelo_y_tokenizer(args.modelo)
+    analyzer = cargar_analizador_transformers() if args.con_transformers else None
+    modelo_rapido = ModeloRapido.cargar(RUTA_MODELO_RAPIDO) if args.rapido else None
+
+    inicio = time.perf_counter()
+    estadisticas = puntuar_archivo(
+        args.entrada, args.salida, modelo, tokenizer, analyzer, args.columna_texto, args.columna_id,
+        args.tam_lote, metadatos={'version_modelo': version_modelo(args.modelo), 'version_lexico': VERSION_LEXICO},
+        modelo_rapido=modelo_rapido,
+    )
+    duracion = time.perf_counter() - inicio
+    print(f"✅ {estadisticas['filas']:,} reseñas ({estadisticas['descartadas']:,} descartadas, "
+          f"{estadisticas['nivel_rapido']:,} con el nivel rápido) en "
+          f"{estadisticas['lotes']} lotes · {estadisticas['filas'] / duracion:,.0f} reseñas/s -> {args.salida}")
+    print(f"   Lectura {estadisticas['s_lectura']:.1f} s · puntuación {estadisticas['s_puntuacion']:.1f} s · "
+          f"escritura {estadisticas['s_escritura']:.1f} s")
+
+if __name__ == "__main__":
+    main()
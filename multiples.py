@@ -0,0 +1,110 @@
+# Varias reseñas a la vez (p. ej. todas las de una película): separa el texto
+# pegado o el archivo subido en reseñas sueltas, prepara la tabla de
+# resultados y su resumen. La puntuación es una sola llamada a
+# nucleo.analizar_lote() para todas (un predict y una pasada de Transformers),
+# en lugar de un análisis completo por reseña.
+
+import csv
+import io
+import os
+import re
+
+import numpy as np
+
+from confianza import NIVELES_CONFIANZA
+
+# Separadores del texto pegado (expresiones regulares)
+SEPARADORES = {
+    "Línea en blanco": r"\n\s*\n",
+    "Una por línea": r"\n",
+    "Línea con ---": r"\n\s*-{3,}\s*\n",
+}
+# Reseñas por análisis (una sola llamada al modelo para todas)
+MAX_RESENAS_MULTIPLES = int(os.environ.get("CINEMASCOPE_MAX_RESENAS_MULTIPLES", 500))
+EXTENSIONES_MULTIPLES = ("txt", "csv", "parquet", "arrow", "feather")
+# Columna del texto en CSV/Parquet/Arrow, por orden de preferencia
+COLUMNAS_TEXTO = ("texto", "review", "text", "resena")
+
+def separar_resenas(texto, separador=SEPARADORES["Línea en blanco"]):
+    """Reseñas no vacías del texto pegado"""
+    return [r.strip() for r in re.split(separador, texto.replace("\r\n", "\n")) if r.strip()]
+
+def _columna_texto(nombres):
+    for nombre in COLUMNAS_TEXTO:
+        if nombre in nombres:
+            return nombre
+    raise ValueError(f"No hay columna de texto (se busca una de: {', '.join(COLUMNAS_TEXTO)})")
+
+def leer_resenas_archivo(nombre, datos, separador=SEPARADORES["Línea en blanco"]):
+    """(textos, ids o None) de un archivo subido: .txt separado, o CSV/Parquet/Arrow con columna de texto"""
+    extension = os.path.splitext(nombre)[1].lower()
+    if extension in ("", ".txt"):
+        return separar_resenas(datos.decode("utf-8", errors="replace"), separador), None
+    if extension == ".csv":
+        filas = list(csv.DictReader(io.StringIO(datos.decode("utf-8", errors="replace"))))
+        columna = _columna_texto(filas[0].keys() if filas else ())
+        ids = [fila['id'] for fila in filas] if filas and 'id' in filas[0] else None
+        return [fila[columna] or "" for fila in filas], ids
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from lotes import formato_de
+    origen = pa.BufferReader(datos)
+    if formato_de(nombre) == 'parquet':
+        tabla = pq.read_table(origen)
+    else:
+        try:
+            tabla = pa.ipc.open_file(origen).read_all()
+        except pa.ArrowInvalid:
+            tabla = pa.ipc.open_stream(pa.BufferReader(datos)).read_all()
+    columna = _columna_texto(tabla.column_names)
+    textos = [t or "" for t in tabla.column(columna).to_pylist()]
+    ids = tabla.column('id').to_pylist() if 'id' in tabla.column_names else None
+    return textos, ids
+
+def filas_resultados(analisis, ids=None, calibrador=None):
+    """Una fila por reseña para la tabla; confianza calibrada si se da un calibrador
+    (salvo en las del nivel rápido: la calibración es del ensemble completo)"""
+    filas = []
+    for i, a in enumerate(analisis):
+        fila = {'id': ids[i] if ids is not None else i + 1, 'resena': a['texto']}
+        if a.get('descartado'):
+            fila.update(sentimiento="🌐 Descartada", positivo=None, pred_ensemble=None, confianza=None,
+                        nivel=a['descartado']['motivo'], palabras_clave="", con_transformers=False,
+                        nivel_rapido=False)
+        else:
+            if calibrador is not None and a.get('nivel') != 'rapido':
+                confianza, nivel, _ = calibrador.calcular(a['pred_ensemble'])
+            else:
+                confianza, nivel = a['confianza'], a['nivel_confianza']
+            fila.update(
+                sentimiento="🌟 Positiva" if a['pred_ensemble'] > 0.5 else "👎 Negativa",
+                positivo=round(float(a['pred_ensemble']) * 100, 1),
+                # Sin redondear: el recuento de positivas debe coincidir con 'sentimiento'
+                pred_ensemble=float(a['pred_ensemble']),
+                confianza=round(float(confianza), 1),
+                nivel=nivel,
+                palabras_clave=", ".join(a['palabras_encontradas']),
+                con_transformers=bool(a['con_transformers']),
+                nivel_rapido=a.get('nivel') == 'rapido',
+            )
+        filas.append(fila)
+    return filas
+
+def resumen_multiples(filas):
+    """Estadísticas del conjunto (las reseñas descartadas no cuentan)"""
+    puntuadas = [f for f in filas if f['pred_ensemble'] is not None]
+    pred = np.array([f['pred_ensemble'] for f in puntuadas], dtype=np.float64)
+    confianza = np.array([f['confianza'] for f in puntuadas], dtype=np.float64)
+    niveles = [nivel for _, nivel, _ in NIVELES_CONFIANZA]
+    return {
+        'n': len(filas),
+        'puntuadas': len(puntuadas),
+        'descartadas': len(filas) - len(puntuadas),
+        'positivas': int(np.sum(pred > 0.5)),
+        'porcentaje_positivas': float(np.mean(pred > 0.5) * 100) if len(puntuadas) else 0.0,
+        'media': float(pred.mean()) if len(puntuadas) else None,
+        'desviacion': float(pred.std()) if len(puntuadas) else None,
+        'confianza_media': float(confianza.mean()) if len(puntuadas) else None,
+        'niveles': {nivel: sum(f['nivel'] == nivel for f in puntuadas) for nivel in niveles},
+    }
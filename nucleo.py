@@ -0,0 +1,506 @@
+# Núcleo de análisis de CinemaScope AI: tokenización, modelo CNN+BiGRU,
+# léxico ponderado y sistema ensemble, sin dependencias de Streamlit.
+# Lo usan la app (app.py) y cualquier proceso que necesite puntuar reseñas.
+
+import tensorflow as tf
+from tensorflow.keras.preprocessing.text import Tokenizer
+import numpy as np
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+
+from confianza import calcular_confianza
+from idioma import evaluar_entrada
+from roberta_cpu import (MODELO_TRANSFORMERS, TAM_LOTE_TRANSFORMERS, AnalizadorRoberta,
+                         preparar_entorno_torch)
+
+# Modo de Transformers: 'optimizado' (int8, hilos acotados, lotes; ver roberta_cpu.py),
+# 'pipeline' (pipeline de Hugging Face a precisión completa) o 'desactivado'
+MODO_TRANSFORMERS = os.environ.get("CINEMASCOPE_TRANSFORMERS", "optimizado")
+if MODO_TRANSFORMERS == "optimizado" and importlib.util.find_spec("transformers") is not None:
+    # Antes de importar torch (lo importa transformers)
+    preparar_entorno_torch()
+
+# Intentamos importar transformers para análisis adicional
+try:
+    from transformers import pipeline
+    TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    TRANSFORMERS_AVAILABLE = False
+
+# 1. Parámetros clave actualizados para CNN+BiGRU
+VOCAB_SIZE = 20000
+SEQUENCE_LENGTH = 300
+MODEL_PATH = "sentiment_cnn_bigru.h5"
+
+# Tamaño de las cachés de tokenización y léxico (textos distintos recordados)
+TAMANO_CACHE_TEXTOS = 1024
+# Oraciones por llamada al modelo en el desglose por oraciones
+TAM_LOTE_ORACIONES = 64
+
+# 2. Carga de modelos
+def cargar_modelo(ruta=MODEL_PATH):
+    """Carga el modelo CNN+BiGRU entrenado"""
+    return tf.keras.models.load_model(ruta)
+
+def version_modelo(ruta=MODEL_PATH):
+    """Huella del archivo del modelo (identifica la versión de los pesos)"""
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloque)
+    return sha.hexdigest()[:12]
+
+def huella_texto(texto):
+    """Identificador estable de un texto para cachés y almacenes persistentes"""
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+def cargar_analizador_transformers(modo=None):
+    """Carga un modelo de transformers para análisis adicional"""
+    modo = modo or MODO_TRANSFORMERS
+    if TRANSFORMERS_AVAILABLE and modo != "desactivado":
+        try:
+            if modo == "optimizado":
+                return AnalizadorRoberta.cargar(MODELO_TRANSFORMERS)
+            # Usamos un modelo pre-entrenado de Hugging Face
+            analyzer = pipeline("sentiment-analysis",
+                              model=MODELO_TRANSFORMERS,
+                              top_k=None)
+            return analyzer
+        except:
+            return None
+    return None
+
+def puntuar_transformers(textos, analyzer_transformers):
+    """P(positiva) según Transformers para cada texto (None si no hay resultado)
+
+    Una sola llamada para toda la lista: el analizador optimizado hace una
+    pasada por lote y el pipeline agrupa en lotes de TAM_LOTE_TRANSFORMERS.
+    """
+    textos = [texto[:512] for texto in textos] # Limitar longitud
+    try:
+        if isinstance(analyzer_transformers, AnalizadorRoberta):
+            return [float(p) for p in analyzer_transformers.puntuar(textos)]
+        resultados = analyzer_transformers(textos, batch_size=TAM_LOTE_TRANSFORMERS)
+    except:
+        return [None] * len(textos)
+    puntuaciones = []
+    for resultado in resultados:
+        # Buscar scores de positivo y negativo
+        scores = {item['label'].lower(): item['score'] for item in resultado}
+        puntuaciones.append(scores['positive'] if 'positive' in scores and 'negative' in scores else None)
+    return puntuaciones
+
+# 3. Funciones de Análisis Avanzado con IA
+
+# Palabras clave con pesos específicos para películas
+PALABRAS_MUY_POSITIVAS = {
+    'masterpiece': 5, 'brilliant': 4, 'outstanding': 4, 'exceptional': 4,
+    'magnificent': 4, 'phenomenal': 4, 'incredible': 3, 'amazing': 3,
+    'fantastic': 3, 'excellent': 3, 'superb': 3, 'wonderful': 3,
+    'perfect': 3, 'flawless': 4, 'stunning': 3, 'breathtaking': 4
+}
+
+PALABRAS_POSITIVAS = {
+    'good': 2, 'great': 2, 'nice': 1, 'enjoyable': 2, 'entertaining': 2,
+    'solid': 2, 'decent': 1, 'satisfying': 2, 'impressive': 2,
+    'compelling': 2, 'engaging': 2, 'captivating': 3, 'recommend': 2
+}
+
+PALABRAS_MUY_NEGATIVAS = {
+    'terrible': -4, 'awful': -4, 'horrible': -4, 'disaster': -5,
+    'pathetic': -4, 'dreadful': -4, 'abysmal': -5, 'atrocious': -5,
+    'unwatchable': -5, 'waste': -3, 'boring': -3, 'stupid': -3,
+    'ridiculous': -3, 'disappointing': -3, 'worst': -4
+}
+
+PALABRAS_NEGATIVAS = {
+    'bad': -2, 'poor': -2, 'weak': -2, 'mediocre': -2, 'bland': -2,
+    'forgettable': -2, 'predictable': -2, 'slow': -1, 'confusing': -2,
+    'overrated': -2, 'cliché': -2, 'generic': -2
+}
+
+PESOS_POSITIVOS = {**PALABRAS_MUY_POSITIVAS, **PALABRAS_POSITIVAS}
+PESOS_NEGATIVOS = {**PALABRAS_MUY_NEGATIVAS, **PALABRAS_NEGATIVAS}
+
+# Indicadores de intensidad
+INTENSIFICADORES = ['very', 'extremely', 'incredibly', 'absolutely', 'totally',
+                   'completely', 'utterly', 'really', 'truly', 'definitely']
+
+# Versión del léxico: cambia si cambia cualquier peso o intensificador
+VERSION_LEXICO = hashlib.sha256(json.dumps(
+    [PESOS_POSITIVOS, PESOS_NEGATIVOS, INTENSIFICADORES], sort_keys=True
+).encode('utf-8')).hexdigest()[:12]
+
+@lru_cache(maxsize=TAMANO_CACHE_TEXTOS)
+def analizar_palabras_clave_avanzado(texto):
+    """Análisis avanzado de palabras clave con pesos específicos"""
+    texto_lower = texto.lower()
+
+    # Calculamos puntuación
+    puntuacion = 0
+    palabras_encontradas = []
+
+    for palabra, peso in PESOS_POSITIVOS.items():
+        if palabra in texto_lower:
+            puntuacion += peso
+            palabras_encontradas.append(f"+{palabra}({peso})")
+
+    for palabra, peso in PESOS_NEGATIVOS.items():
+        if palabra in texto_lower:
+            puntuacion += peso # peso ya es negativo
+            palabras_encontradas.append(f"{palabra}({peso})")
+
+    # Tupla: el resultado se comparte entre llamadas a través de la caché
+    return puntuacion, tuple(palabras_encontradas)
+
+@lru_cache(maxsize=TAMANO_CACHE_TEXTOS)
+def analizar_intensidad_emocional(texto):
+    """Analiza la intensidad emocional del texto"""
+    texto_lower = texto.lower()
+
+    signos_exclamacion = texto.count('!')
+    mayusculas = sum(1 for c in texto if c.isupper())
+    palabras_repetidas = len([word for word, count in Counter(texto_lower.split()).items() if count > 1])
+
+    intensidad = 0
+    intensidad += sum(2 for intensificador in INTENSIFICADORES if intensificador in texto_lower)
+    intensidad += signos_exclamacion * 1.5
+    intensidad += min(mayusculas / 10, 3) # Máximo 3 puntos por mayúsculas
+    intensidad += palabras_repetidas * 0.5
+
+    return min(intensidad, 10) # Máximo 10
+
+# Pesos del ensemble (modelo CNN+BiGRU, palabras clave, Transformers) sin y con
+# Transformers, y escala de la intensidad (factor 1 + intensidad / escala)
+PESOS_ENSEMBLE = (0.4, 0.3, 0.0)
+PESOS_ENSEMBLE_TRANSFORMERS = (0.3, 0.2, 0.3)
+ESCALA_INTENSIDAD = 20
+
+def combinar_ensemble(pred_original, puntuacion_palabras, intensidad, pred_transformers=None,
+                      pesos=PESOS_ENSEMBLE, pesos_transformers=PESOS_ENSEMBLE_TRANSFORMERS,
+                      escala_intensidad=ESCALA_INTENSIDAD):
+    """Combinación pura de las puntuaciones de cada componente
+
+    Devuelve (pred_ensemble, boost_consenso, boost_palabras, boost_intensidad).
+    componentes.py reproduce esta misma cuenta vectorizada para buscar pesos.
+    """
+    # Normalizar puntuación de palabras (-10 a +10) a (0 a 1)
+    pred_palabras = max(0, min(1, (puntuacion_palabras + 10) / 20))
+    # La intensidad amplifica la confianza pero no cambia la dirección
+    factor_intensidad = 1 + (intensidad / escala_intensidad) # 1.0 a 1.5
+
+    if pred_transformers is not None:
+        peso_original, peso_palabras, peso_transformers = pesos_transformers
+    else:
+        peso_original, peso_palabras, peso_transformers = pesos[0], pesos[1], 0.0
+        pred_transformers = 0.5 # neutral por defecto
+
+    # Combinar predicciones con ensemble ponderado
+    pred_ensemble = (pred_original * peso_original +
+                    pred_palabras * peso_palabras +
+                    pred_transformers * peso_transformers)
+
+    # Normalizar pesos
+    peso_total = peso_original + peso_palabras + peso_transformers
+    if peso_total > 0:
+        pred_ensemble = pred_ensemble / peso_total
+
+    # Aplicar factor de intensidad
+    if pred_ensemble > 0.5:
+        pred_ensemble = min(1.0, 0.5 + (pred_ensemble - 0.5) * factor_intensidad)
+    else:
+        pred_ensemble = max(0.0, 0.5 - (0.5 - pred_ensemble) * factor_intensidad)
+
+    # Confianza mejorada basada en consenso
+    consenso = 1.0
+    if peso_transformers > 0:
+        # Si tenemos transformers, calcular consenso
+        diferencia_modelos = abs(pred_original - pred_transformers)
+        consenso = max(0.5, 1.0 - diferencia_modelos)
+
+    # Boost de confianza por consenso y análisis múltiple
+    boost_consenso = consenso * 20 # Hasta 20% de boost
+    boost_palabras = min(15, abs(puntuacion_palabras) * 3) # Hasta 15% por palabras clave
+    boost_intensidad = min(10, intensidad * 2) # Hasta 10% por intensidad
+
+    return pred_ensemble, boost_consenso, boost_palabras, boost_intensidad
+
+def ensemble_prediccion_avanzada(pred_original, texto, analyzer_transformers=None, pred_transformers=None):
+    """Sistema ensemble que combina múltiples análisis para mejorar confianza
+
+    'pred_transformers' permite pasar la puntuación ya calculada en lote con
+    puntuar_transformers(); si no se da, se calcula aquí con el analizador.
+    """
+    # 1. Análisis de palabras clave
+    puntuacion_palabras, palabras_encontradas = analizar_palabras_clave_avanzado(texto)
+
+    # 2. Análisis de intensidad emocional
+    intensidad = analizar_intensidad_emocional(texto)
+
+    # 3. Análisis con Transformers
+    if pred_transformers is None and analyzer_transformers and TRANSFORMERS_AVAILABLE:
+        pred_transformers = puntuar_transformers([texto], analyzer_transformers)[0]
+
+    # 4. Combinación con el modelo CNN+BiGRU
+    return (*combinar_ensemble(pred_original, puntuacion_palabras, intensidad, pred_transformers),
+            palabras_encontradas)
+
+# 4. Función para crear un tokenizer simple (compatible con el modelo CNN+BiGRU)
+def crear_tokenizer():
+    # Creamos un tokenizer básico que simule el comportamiento del TextVectorization
+    # En un caso real, tenemos que guardar y cargar el tokenizer usado durante el entrenamiento
+    tokenizer = Tokenizer(num_words=VOCAB_SIZE, oov_token="<OOV>", filters='!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n')
+
+    # Vocabulario más extenso para reseñas de películas
+    sample_texts = [
+        "this movie film is great amazing excellent wonderful fantastic brilliant masterpiece outstanding superb",
+        "terrible awful horrible bad worst disappointing boring stupid waste pathetic dreadful",
+        "good nice decent okay fine entertaining watchable enjoyable pleasant satisfying",
+        "love like enjoy recommend must watch see definitely worth viewing",
+        "hate dislike boring predictable disappointing avoid skip terrible",
+        "the and or but with for of in at on by from to as",
+        "movie film cinema story plot acting performance direction screenplay",
+        "characters dialogue script writing cinematography editing sound music",
+        "effects visual special makeup costume design production values",
+        "director producer cast actor actress star lead supporting role",
+        "drama comedy action thriller horror romance adventure fantasy",
+        "scene sequence moment part chapter episode beginning middle end",
+        "watch watching watched viewer audience experience entertainment",
+        "time long short duration pacing rhythm flow tempo",
+        "quality high low budget expensive cheap production value"
+    ]
+
+    tokenizer.fit_on_texts(sample_texts)
+    return tokenizer
+
+# 5. Convertimos el texto en secuencia de índices para la red CNN+BiGRU
+class CodificadorLote:
+    """Tokenizer de Keras escrito directamente en un array int32 (lote, SEQUENCE_LENGTH, 1)
+
+    Mismo resultado que texts_to_sequences() + pad_sequences(padding='post',
+    truncating='post'), sin listas intermedias ni copias: los caracteres de
+    'filters' se sustituyen con una tabla de str.translate precompilada (o una
+    expresión regular precompilada si el texto no es ASCII, donde translate no
+    tiene camino rápido), y cada palabra se busca en un diccionario que ya
+    aplica num_words y el id de OOV.
+    """
+
+    def __init__(self, tokenizer, longitud=SEQUENCE_LENGTH):
+        self.longitud = longitud
+        self._separador = tokenizer.split
+        self._tabla = str.maketrans({c: tokenizer.split for c in tokenizer.filters})
+        self._filtros = re.compile(f"[{re.escape(tokenizer.filters)}]") if tokenizer.filters else None
+        self._reemplazo = tokenizer.split.replace("\\", "\\\\")
+        self._oov = tokenizer.word_index.get(tokenizer.oov_token) if tokenizer.oov_token is not None else None
+        limite = tokenizer.num_words
+        self._ids = {
+            palabra: indice if not limite or indice < limite else self._oov
+            for palabra, indice in tokenizer.word_index.items()
+        }
+
+    def ids_texto(self, texto):
+        """Ids de un texto (ya en minúsculas), como mucho 'longitud'"""
+        if texto.isascii() or self._filtros is None:
+            texto_filtrado = texto.translate(self._tabla)
+        else:
+            texto_filtrado = self._filtros.sub(self._reemplazo, texto)
+        palabras = texto_filtrado.split(self._separador)
+        if self._oov is not None:
+            ids = [self._ids.get(p, self._oov) for p in palabras if p][:self.longitud]
+        else:
+            ids = [i for i in map(self._ids.get, palabras) if i is not None][:self.longitud]
+        if not ids:
+            # Si no hay tokens reconocidos, creamos una secuencia con tokens desconocidos
+            ids = [min(i + 1, VOCAB_SIZE - 1) for i in range(min(len(texto.split()), self.longitud))]
+        return ids
+
+    def codificar(self, textos, salida=None):
+        """Secuencias (n, longitud, 1) int32 de 'textos'
+
+        Con 'salida' (un array (m >= n, longitud, 1) int32 que el llamador
+        reutiliza entre lotes) se escribe en sus primeras n filas y se devuelve
+        esa vista; sin ella se reserva un único array para todo el lote.
+        """
+        n = len(textos)
+        if salida is None:
+            salida = np.zeros((n, self.longitud, 1), dtype=np.int32)
+        else:
+            salida = salida[:n]
+            salida.fill(0)
+        filas = salida.reshape(n, self.longitud)
+        for fila, texto in enumerate(textos):
+            ids = self.ids_texto(texto.lower().strip())
+            filas[fila, :len(ids)] = ids
+        return salida
+
+@lru_cache(maxsize=8)
+def codificador(tokenizer):
+    """CodificadorLote de un tokenizer (se construye una vez por tokenizer)"""
+    return CodificadorLote(tokenizer)
+
+def codificar_lote(textos, tokenizer, salida=None):
+    """texto_a_secuencia() para una lista, en un solo array (o en 'salida')"""
+    return codificador(tokenizer).codificar(textos, salida)
+
+def buffer_secuencias(tam_lote):
+    """Array reutilizable para codificar_lote(..., salida=buffer)"""
+    return np.zeros((tam_lote, SEQUENCE_LENGTH, 1), dtype=np.int32)
+
+def texto_a_secuencia(texto, tokenizer):
+    return _secuencia_cacheada(texto.lower().strip(), tokenizer)
+
+@lru_cache(maxsize=TAMANO_CACHE_TEXTOS)
+def _secuencia_cacheada(texto, tokenizer):
+    # ✅ FORMA CORRECTA CONFIRMADA: (1, 300, 1) - 3D con última dimensión 1
+    secuencia_3d = codificar_lote([texto], tokenizer)
+    # Solo lectura: el mismo array se devuelve a todas las llamadas con este texto
+    secuencia_3d.flags.writeable = False
+    return secuencia_3d
+
+# 5b. Función para crear datos de prueba con la forma correcta
+def crear_secuencia_prueba():
+    """Crea una secuencia de prueba con la forma correcta (1, 300, 1)"""
+    # ✅ Usar la forma que sabemos que funciona: (1, 300, 1)
+    secuencia_3d = np.random.randint(1, min(1000, VOCAB_SIZE), size=(1, SEQUENCE_LENGTH, 1))
+    return secuencia_3d.astype('int32')
+
+# 6. Análisis completo de una reseña (el mismo camino que sigue la app)
+def _resultado_descartado(texto, evaluacion, tiempos_ms):
+    return {
+        'texto': texto,
+        'texto_hash': huella_texto(texto),
+        'descartado': evaluacion,
+        'tiempos_ms': tiempos_ms,
+    }
+
+def _resultado_analisis(texto, secuencia, pred_original, analyzer_transformers, pred_transformers=None):
+    """Ensemble y confianza a partir de la predicción del CNN+BiGRU"""
+    pred_ensemble, boost_consenso, boost_palabras, boost_intensidad, palabras_encontradas = ensemble_prediccion_avanzada(
+        pred_original, texto, analyzer_transformers, pred_transformers
+    )
+    confianza, nivel, descripcion = calcular_confianza(
+        pred_ensemble, boost_consenso, boost_palabras, boost_intensidad,
+        bool(analyzer_transformers), len(palabras_encontradas)
+    )
+    return {
+        'texto': texto,
+        'texto_hash': huella_texto(texto),
+        'secuencia': secuencia,
+        'pred_original': pred_original,
+        'pred_ensemble': pred_ensemble,
+        'boost_consenso': boost_consenso,
+        'boost_palabras': boost_palabras,
+        'boost_intensidad': boost_intensidad,
+        'palabras_encontradas': palabras_encontradas,
+        'confianza': confianza,
+        'nivel_confianza': nivel,
+        'descripcion_confianza': descripcion,
+        'con_transformers': bool(analyzer_transformers),
+    }
+
+def analizar_resena(texto, modelo, tokenizer, analyzer_transformers=None):
+    """Tokeniza, predice con CNN+BiGRU y combina con el ensemble avanzado
+
+    Si el filtro de idioma descarta el texto (no está en inglés o es casi
+    vacío) no se llama a ningún modelo: el resultado solo trae 'descartado'.
+    """
+    inicio = time.perf_counter()
+    evaluacion = evaluar_entrada(texto)
+    if not evaluacion['apta']:
+        return _resultado_descartado(texto, evaluacion, {'idioma': (time.perf_counter() - inicio) * 1000})
+    t_idioma = time.perf_counter()
+
+    secuencia = texto_a_secuencia(texto, tokenizer)
+    t_tokenizacion = time.perf_counter()
+
+    pred_original = modelo.predict(secuencia, verbose=0)[0][0]
+    t_modelo = time.perf_counter()
+
+    resultado = _resultado_analisis(texto, secuencia, pred_original, analyzer_transformers)
+    t_ensemble = time.perf_counter()
+
+    resultado['tiempos_ms'] = {
+        'idioma': (t_idioma - inicio) * 1000,
+        'tokenizacion': (t_tokenizacion - t_idioma) * 1000,
+        'modelo': (t_modelo - t_tokenizacion) * 1000,
+        'ensemble': (t_ensemble - t_modelo) * 1000,
+        'total': (t_ensemble - inicio) * 1000,
+    }
+    return resultado
+
+# 6b. Análisis de varias reseñas con una sola llamada al modelo
+def analizar_lote(textos, modelo, tokenizer, analyzer_transformers=None):
+    """analizar_resena() para una lista: mismo resultado por reseña, un solo predict
+
+    Los tiempos de cada resultado son la parte proporcional del lote.
+    """
+    inicio = time.perf_counter()
+    resultados = [None] * len(textos)
+    aptos = []
+    for i, texto in enumerate(textos):
+        evaluacion = evaluar_entrada(texto)
+        if evaluacion['apta']:
+            aptos.append(i)
+        else:
+            resultados[i] = _resultado_descartado(texto, evaluacion, {})
+    t_idioma = time.perf_counter()
+    if not aptos:
+        return resultados
+
+    secuencias = codificar_lote([textos[i] for i in aptos], tokenizer)
+    t_tokenizacion = time.perf_counter()
+
+    predicciones = modelo.predict(secuencias, verbose=0)[:, 0]
+    t_modelo = time.perf_counter()
+
+    # Transformers también en lote: una pasada por lote en lugar de una por reseña
+    preds_transformers = [None] * len(aptos)
+    if analyzer_transformers and TRANSFORMERS_AVAILABLE:
+        preds_transformers = puntuar_transformers([textos[i] for i in aptos], analyzer_transformers)
+    for posicion, (i, pred_original) in enumerate(zip(aptos, predicciones)):
+        resultados[i] = _resultado_analisis(textos[i], secuencias[posicion:posicion + 1], pred_original,
+                                            analyzer_transformers, preds_transformers[posicion])
+    t_ensemble = time.perf_counter()
+
+    n = len(aptos)
+    tiempos = {
+        'idioma': (t_idioma - inicio) * 1000 / len(textos),
+        'tokenizacion': (t_tokenizacion - t_idioma) * 1000 / n,
+        'modelo': (t_modelo - t_tokenizacion) * 1000 / n,
+        'ensemble': (t_ensemble - t_modelo) * 1000 / n,
+    }
+    tiempos['total'] = sum(tiempos.values())
+    for i in aptos:
+        resultados[i]['tiempos_ms'] = dict(tiempos)
+    return resultados
+
+# 6c. Desglose por oraciones: todas las oraciones en un mismo lote
+_ORACIONES = re.compile(r"[^.!?;\n]+[.!?;]*")
+
+def segmentar_oraciones(texto):
+    """Oraciones (y cláusulas separadas por ';' o saltos de línea) con texto"""
+    oraciones = (m.group().strip() for m in _ORACIONES.finditer(texto))
+    return [o for o in oraciones if any(c.isalnum() for c in o)]
+
+def analizar_oraciones(texto, modelo, tokenizer, tam_lote=TAM_LOTE_ORACIONES):
+    """Predicción CNN+BiGRU de cada oración: una llamada al modelo por cada tam_lote oraciones"""
+    oraciones = segmentar_oraciones(texto)
+    if not oraciones:
+        return []
+    secuencias = codificar_lote(oraciones, tokenizer)
+    predicciones = np.concatenate([
+        modelo.predict(secuencias[i:i + tam_lote], verbose=0)[:, 0]
+        for i in range(0, len(oraciones), tam_lote)
+    ])
+    return [{
+        'indice': i,
+        'oracion': oracion,
+        'pred': float(pred),
+        'palabras_encontradas': analizar_palabras_clave_avanzado(oracion)[1],
+    } for i, (oracion, pred) in enumerate(zip(oraciones, predicciones))]
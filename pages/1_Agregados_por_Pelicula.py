@@ -0,0 +1,86 @@
+# Panel de sentimiento agregado por película. Solo lee la tabla de agregados
+# precalculada (agregados.py): el coste no depende del número de reseñas.
+
+import os
+import sqlite3
+import threading
+
+import plotly.graph_objects as go
+import streamlit as st
+
+import agregados
+from almacen import RUTA_ALMACEN, abrir_conexion
+from confianza import NIVELES_CONFIANZA
+
+st.set_page_config(
+    page_title="📈 CinemaScope AI | Sentimiento por Película",
+    page_icon="🎬",
+    layout="wide",
+)
+
+# Nombre visible de cada columna del histograma (mismo orden que los niveles)
+ETIQUETAS_NIVEL = dict(zip(agregados.COLUMNAS_NIVEL, (nivel for _, nivel, _ in NIVELES_CONFIANZA)))
+
+@st.cache_resource
+def conexion_agregados():
+    """Conexión compartida por todas las sesiones: cada consulta va bajo su cerrojo"""
+    conexion = abrir_conexion(RUTA_ALMACEN)
+    agregados.crear_esquema(conexion)
+    return conexion, threading.Lock()
+
+def mostrar_resumen(resumen):
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("📝 Reseñas", f"{resumen['n']:,}")
+    col2.metric("💚 Positivas", f"{resumen['porcentaje_positivas']:.1f}%")
+    col3.metric("🎯 Media ensemble", f"{resumen['media']:.3f}")
+    col4.metric("📏 Desviación", f"{resumen['desviacion']:.3f}")
+
+    figura = go.Figure(go.Bar(
+        x=[ETIQUETAS_NIVEL[c] for c in agregados.COLUMNAS_NIVEL],
+        y=[resumen['histograma'][c] for c in agregados.COLUMNAS_NIVEL],
+        marker_color="#667eea",
+    ))
+    figura.update_layout(title="Niveles de confianza", height=320, margin=dict(t=40, b=20))
+    st.plotly_chart(figura, use_container_width=True)
+
+st.title("📈 Sentimiento Agregado por Película")
+st.caption("Resúmenes incrementales de todas las reseñas analizadas con un ID de película.")
+
+if not os.path.exists(RUTA_ALMACEN):
+    st.info("💡 Todavía no hay análisis guardados. Analiza reseñas con un ID de película en la página principal.")
+    st.stop()
+
+try:
+    conexion, cerrojo = conexion_agregados()
+    pelicula_id = st.text_input("🎞️ Buscar película por ID", placeholder="Ej: tt0111161").strip()
+
+    if pelicula_id:
+        with cerrojo:
+            resumen = agregados.consultar_pelicula(conexion, pelicula_id)
+        if resumen is None:
+            st.warning(f"⚠️ No hay reseñas agregadas para '{pelicula_id}'.")
+        else:
+            st.markdown(f"#### 🎬 {pelicula_id}")
+            mostrar_resumen(resumen)
+
+    st.markdown("#### 🏆 Películas con más reseñas")
+    minimo = st.number_input("Mínimo de reseñas", min_value=1, value=1, step=1)
+    with cerrojo:
+        peliculas = agregados.listar_peliculas(conexion, limite=100, minimo_resenas=int(minimo))
+    if not peliculas:
+        st.info("💡 Aún no hay películas con reseñas suficientes.")
+    else:
+        st.dataframe(
+            [{
+                "Película": p['pelicula_id'],
+                "Reseñas": p['n'],
+                "% Positivas": round(p['porcentaje_positivas'], 1),
+                "Media": round(p['media'], 4),
+                "Desviación": round(p['desviacion'], 4),
+                **{ETIQUETAS_NIVEL[c]: p['histograma'][c] for c in agregados.COLUMNAS_NIVEL},
+            } for p in peliculas],
+            use_container_width=True,
+            hide_index=True,
+        )
+except sqlite3.Error as e:
+    st.error(f"❌ **Error al leer los agregados:** {str(e)}")
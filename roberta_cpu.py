@@ -0,0 +1,87 @@
+# RoBERTa de sentimiento optimizado para CPU.
+# En lugar del pipeline de Hugging Face a precisión completa y un texto por
+# llamada: cuantización dinámica int8 de las capas Linear, hilos de torch
+# acotados y fijados a núcleos, y lotes con padding dinámico (cada lote se
+# rellena hasta su texto más largo; los textos se ordenan por longitud para que
+# los lotes sean parejos), con una sola pasada hacia delante por lote.
+#
+# El resultado es P(positiva) con softmax sobre todas las etiquetas, lo mismo
+# que el pipeline con top_k=None.
+
+import os
+
+import numpy as np
+
+MODELO_TRANSFORMERS = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+# Hilos de torch por proceso (TensorFlow y el resto de la app usan los demás)
+HILOS_TORCH = int(os.environ.get("CINEMASCOPE_HILOS_TORCH", min(4, os.cpu_count() or 1)))
+# Textos por pasada del modelo
+TAM_LOTE_TRANSFORMERS = 16
+# Longitud máxima en tokens (límite de posiciones de RoBERTa)
+MAX_TOKENS_TRANSFORMERS = 512
+
+def preparar_entorno_torch(hilos=HILOS_TORCH):
+    """Hilos de OpenMP acotados y fijados a núcleos
+
+    OpenMP lee estas variables al arrancar, así que solo surten efecto si se
+    llama antes de importar torch (nucleo.py lo hace antes de importar transformers).
+    """
+    os.environ.setdefault("OMP_NUM_THREADS", str(hilos))
+    os.environ.setdefault("OMP_PROC_BIND", "close")
+    os.environ.setdefault("OMP_PLACES", "cores")
+
+def configurar_hilos_torch(hilos=HILOS_TORCH):
+    import torch
+    torch.set_num_threads(hilos)
+    try:
+        # Un solo hilo entre operadores: el paralelismo está dentro de cada matmul
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Ya se había ejecutado trabajo en paralelo: solo se puede fijar una vez
+        pass
+    return torch
+
+class AnalizadorRoberta:
+    """Clasificador de sentimiento Transformers que puntúa listas de textos en lotes"""
+
+    def __init__(self, modelo, tokenizer, tam_lote=TAM_LOTE_TRANSFORMERS, max_tokens=MAX_TOKENS_TRANSFORMERS,
+                 cuantizado=False, relleno="longest"):
+        etiquetas = {nombre.lower(): indice for indice, nombre in modelo.config.id2label.items()}
+        if 'positive' not in etiquetas or 'negative' not in etiquetas:
+            raise ValueError(f"El modelo no tiene etiquetas positive/negative: {sorted(etiquetas)}")
+        self.modelo = modelo
+        self.tokenizer = tokenizer
+        self.tam_lote = tam_lote
+        self.max_tokens = min(max_tokens, tokenizer.model_max_length)
+        self.cuantizado = cuantizado
+        # 'longest': padding dinámico; 'max_length': siempre max_tokens (para comparar)
+        self.relleno = relleno
+        self._indice_positivo = int(etiquetas['positive'])
+
+    @classmethod
+    def cargar(cls, nombre=MODELO_TRANSFORMERS, cuantizar=True, hilos=HILOS_TORCH, **opciones):
+        """Carga el checkpoint (nombre del Hub o directorio local) y lo cuantiza a int8"""
+        torch = configurar_hilos_torch(hilos)
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(nombre)
+        modelo = AutoModelForSequenceClassification.from_pretrained(nombre).eval()
+        if cuantizar:
+            # Pesos int8 y activaciones cuantizadas al vuelo en cada Linear
+            modelo = torch.ao.quantization.quantize_dynamic(modelo, {torch.nn.Linear}, dtype=torch.qint8)
+        return cls(modelo, tokenizer, cuantizado=cuantizar, **opciones)
+
+    def puntuar(self, textos):
+        """P(positiva) para cada texto, en el orden de entrada"""
+        import torch
+        resultado = np.empty(len(textos), dtype=np.float32)
+        orden = np.argsort([len(t) for t in textos], kind="stable")
+        with torch.inference_mode():
+            for inicio in range(0, len(textos), self.tam_lote):
+                indices = orden[inicio:inicio + self.tam_lote]
+                entradas = self.tokenizer(
+                    [textos[i] for i in indices], padding=self.relleno, truncation=True,
+                    max_length=self.max_tokens, return_tensors="pt",
+                )
+                probabilidades = torch.softmax(self.modelo(**entradas).logits.float(), dim=-1)
+                resultado[indices] = probabilidades[:, self._indice_positivo].numpy()
+        return resultado
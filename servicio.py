@@ -0,0 +1,347 @@
+# Servicio HTTP local de puntuación masiva para otros servicios.
+# POST /puntuar recibe NDJSON (una reseña por línea: {"id": ..., "texto": ...}
+# o simplemente una cadena JSON) y devuelve NDJSON en streaming (chunked):
+# las reseñas se agrupan en lotes internos que pasan por el mismo camino que la
+# app (filtro de idioma, tokenizer, CNN+BiGRU, ensemble, confianza) y cada
+# lote se envía en cuanto termina. Las conexiones son HTTP/1.1 keep-alive.
+# GET /salud devuelve el estado y las métricas de admisión (proceso vivo);
+# GET /listo responde 200 solo cuando el sondeo de arranque (sondeo.py) ha
+# validado el modelo, y 503 mientras sondea o si falló (disponibilidad).
+# Con --rapido, el modelo destilado (destilacion.py) responde las reseñas en
+# las que está seguro y solo el resto pasa por el modelo completo.
+#
+# Uso: python servicio.py [--puerto 8600] [--sin-transformers] [--rapido] [--max-p95-ms 50]
+
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from admision import ControladorAdmision, AnalisisRechazado
+from destilacion import RUTA_MODELO_RAPIDO, ModeloRapido, analizar_lote_rapido
+from nucleo import MODEL_PATH, analizar_lote, cargar_analizador_transformers
+
+PUERTO = int(os.environ.get("CINEMASCOPE_PUERTO", 8600))
+# Reseñas por llamada al modelo
+TAM_LOTE_SERVICIO = 32
+# Tamaño máximo de una línea NDJSON (bytes); las más largas se rechazan enteras
+MAX_LINEA = 1 << 20
+
+class CuerpoInvalido(ValueError):
+    """El cuerpo de la petición no respeta el formato HTTP (p. ej. chunked mal formado)"""
+
+class ServicioPuntuacion:
+    """Puntúa flujos de reseñas en lotes; compartido por todas las conexiones"""
+
+    def __init__(self, modelo, tokenizer, analyzer_transformers=None, tam_lote=TAM_LOTE_SERVICIO,
+                 controlador=None, modelo_rapido=None):
+        self.modelo = modelo
+        self.tokenizer = tokenizer
+        self.analyzer_transformers = analyzer_transformers
+        self.tam_lote = tam_lote
+        self.controlador = controlador or ControladorAdmision()
+        # Primer nivel opcional (destilacion.ModeloRapido)
+        self.modelo_rapido = modelo_rapido
+        # Informe de sondeo.sondear_listo(); None mientras no ha terminado
+        self.sondeo = None
+
+    def sondear(self, **umbrales):
+        """Autoprueba del modelo antes de aceptar tráfico (ver GET /listo)"""
+        from sondeo import sondear_listo
+        self.sondeo = sondear_listo(self.modelo, self.tokenizer, **umbrales)
+        return self.sondeo
+
+    def puntuar_lote(self, entradas):
+        """Lista de (id, texto) -> lista de resultados serializables"""
+        textos = [texto for _, texto in entradas]
+        with self.controlador.admitir() as permiso:
+            analyzer = None if permiso.degradado else self.analyzer_transformers
+            def completo(pendientes):
+                return analizar_lote(pendientes, self.modelo, self.tokenizer, analyzer)
+            if self.modelo_rapido is not None:
+                analisis = analizar_lote_rapido(textos, self.modelo_rapido, completo)
+            else:
+                analisis = completo(textos)
+        return [resultado_publico(identificador, a) for (identificador, _), a in zip(entradas, analisis)]
+
+    def puntuar_flujo(self, lineas):
+        """Genera lotes de resultados a medida que llegan líneas NDJSON"""
+        lote = []
+        for numero, linea in enumerate(lineas, 1):
+            if linea is None:
+                yield [{'linea': numero, 'error': f"Línea de más de {MAX_LINEA} bytes"}]
+                continue
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                entrada = json.loads(linea)
+                if isinstance(entrada, str):
+                    entrada = {'texto': entrada}
+                texto = entrada['texto']
+                if not isinstance(texto, str):
+                    raise TypeError("'texto' debe ser una cadena")
+            except (ValueError, KeyError, TypeError) as e:
+                yield [{'linea': numero, 'error': f"Entrada inválida: {e}"}]
+                continue
+            lote.append((entrada.get('id', numero), texto))
+            if len(lote) >= self.tam_lote:
+                yield self.puntuar_lote(lote)
+                lote = []
+        if lote:
+            yield self.puntuar_lote(lote)
+
+def resultado_publico(identificador, analisis):
+    """Campos del análisis que se exponen por HTTP"""
+    if analisis.get('descartado'):
+        return {
+            'id': identificador,
+            'descartado': analisis['descartado']['motivo'],
+            'mensaje': analisis['descartado']['mensaje'],
+        }
+    return {
+        'id': identificador,
+        'sentimiento': "positiva" if analisis['pred_ensemble'] > 0.5 else "negativa",
+        # 'rapido' (modelo destilado, sin CNN+BiGRU: pred_original nulo) o 'completo'
+        'nivel': analisis.get('nivel', "completo"),
+        'pred_original': None if analisis['pred_original'] is None else round(float(analisis['pred_original']), 6),
+        'pred_ensemble': round(float(analisis['pred_ensemble']), 6),
+        'confianza': round(float(analisis['confianza']), 2),
+        'nivel_confianza': analisis['nivel_confianza'],
+        'palabras_encontradas': list(analisis['palabras_encontradas']),
+        'con_transformers': analisis['con_transformers'],
+    }
+
+class ManejadorPuntuacion(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "CinemaScope/1.0"
+
+    def log_message(self, formato, *args):
+        pass
+
+    def _responder_json(self, estado, cuerpo, cabeceras=None):
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(datos)))
+        for nombre, valor in (cabeceras or {}).items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def _enviar_trozo(self, datos):
+        self.wfile.write(f"{len(datos):X}\r\n".encode('ascii') + datos + b"\r\n")
+        self.wfile.flush()
+
+    def _lineas_cuerpo(self):
+        """Líneas del cuerpo a medida que llegan (Content-Length o chunked)
+
+        Una línea de más de MAX_LINEA bytes se descarta entera y en su lugar se
+        genera None; CuerpoInvalido si el framing chunked está mal formado.
+        """
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            pendiente = b""
+            descartando = False  # dentro de una línea demasiado larga ya rechazada
+            while True:
+                cabecera = self.rfile.readline(MAX_LINEA)
+                try:
+                    tamano = int(cabecera.split(b";")[0].strip() or b"0", 16)
+                except ValueError:
+                    raise CuerpoInvalido(f"Tamaño de trozo inválido: {cabecera[:40]!r}") from None
+                if tamano < 0:
+                    raise CuerpoInvalido(f"Tamaño de trozo inválido: {cabecera[:40]!r}")
+                if tamano == 0:
+                    # Trailers opcionales hasta la línea vacía
+                    while self.rfile.readline(MAX_LINEA) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                # El trozo se lee por partes: ni él ni la línea pendiente superan MAX_LINEA
+                while tamano > 0:
+                    datos = self.rfile.read(min(tamano, MAX_LINEA))
+                    if not datos:
+                        raise CuerpoInvalido("Cuerpo chunked truncado")
+                    tamano -= len(datos)
+                    *lineas, pendiente = (pendiente + datos).split(b"\n")
+                    for linea in lineas:
+                        if descartando:
+                            # Final de la línea larga ya rechazada
+                            descartando = False
+                        else:
+                            yield None if len(linea) > MAX_LINEA else linea.decode('utf-8', errors='replace')
+                    if len(pendiente) > MAX_LINEA:
+                        if not descartando:
+                            yield None
+                            descartando = True
+                        pendiente = b""
+                self.rfile.readline(MAX_LINEA)
+            if pendiente and not descartando:
+                yield pendiente.decode('utf-8', errors='replace')
+        else:
+            restante = int(self.headers.get("Content-Length") or 0)
+            while restante > 0:
+                linea = self.rfile.readline(min(restante, MAX_LINEA + 1))
+                if not linea:
+                    break
+                restante -= len(linea)
+                if len(linea.rstrip(b"\r\n")) <= MAX_LINEA:
+                    yield linea.decode('utf-8', errors='replace')
+                    continue
+                # Demasiado larga: se descarta hasta el salto de línea
+                while restante > 0 and not linea.endswith(b"\n"):
+                    linea = self.rfile.readline(min(restante, MAX_LINEA))
+                    if not linea:
+                        break
+                    restante -= len(linea)
+                yield None
+
+    def _descartar_cuerpo(self, cuerpo):
+        """Consume el resto del cuerpo para reutilizar la conexión (o la cierra si no se puede)"""
+        try:
+            for _ in cuerpo:
+                pass
+        except CuerpoInvalido:
+            self.close_connection = True
+
+    def do_GET(self):
+        if self.path == "/listo":
+            self._responder_listo()
+            return
+        if self.path != "/salud":
+            self._responder_json(404, {'error': "Ruta no encontrada"})
+            return
+        servicio = self.server.servicio
+        self._responder_json(200, {
+            'estado': "ok",
+            'con_transformers': servicio.analyzer_transformers is not None,
+            'tam_lote': servicio.tam_lote,
+            'nivel_rapido': servicio.modelo_rapido is not None,
+            'admision': servicio.controlador.instantanea(),
+        })
+
+    def _responder_listo(self):
+        sondeo = self.server.servicio.sondeo
+        if sondeo is None:
+            self._responder_json(503, {'estado': "sondeando"}, {"Retry-After": "1"})
+            return
+        self._responder_json(200 if sondeo['listo'] else 503, {
+            'estado': "listo" if sondeo['listo'] else "no_listo",
+            'problemas': sondeo['problemas'],
+            'resenas_por_segundo_max': sondeo.get('resenas_por_segundo_max'),
+            'latencia_p95_individual_ms': sondeo.get('latencia_p95_individual_ms'),
+            'crecimiento_memoria_kib': sondeo.get('crecimiento_memoria_kib'),
+        })
+
+    def do_POST(self):
+        if self.path != "/puntuar":
+            # El cuerpo no se lee: la conexión no puede reutilizarse
+            self.close_connection = True
+            self._responder_json(404, {'error': "Ruta no encontrada"})
+            return
+
+        cuerpo = self._lineas_cuerpo()
+        flujo = self.server.servicio.puntuar_flujo(cuerpo)
+        # El primer lote se calcula antes de responder: si no se admite, 503 limpio
+        try:
+            primero = next(flujo, [])
+        except AnalisisRechazado as e:
+            # Se consume el resto del cuerpo para mantener viva la conexión
+            self._descartar_cuerpo(cuerpo)
+            self._responder_json(503, {'error': str(e), 'reintentar_en': e.reintentar_en},
+                                 {"Retry-After": str(int(e.reintentar_en + 0.999))})
+            return
+        except CuerpoInvalido as e:
+            self.close_connection = True
+            self._responder_json(400, {'error': f"Cuerpo inválido: {e}"})
+            return
+        except Exception as e:
+            # Estado del cuerpo desconocido: la conexión no se reutiliza
+            self.close_connection = True
+            self._responder_json(500, {'error': f"Error interno: {type(e).__name__}: {e}"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            lote = primero
+            while True:
+                if lote:
+                    self._enviar_trozo("".join(
+                        json.dumps(r, ensure_ascii=False) + "\n" for r in lote
+                    ).encode('utf-8'))
+                try:
+                    lote = next(flujo)
+                except StopIteration:
+                    break
+                except AnalisisRechazado as e:
+                    # A mitad de respuesta ya no se puede cambiar el estado HTTP:
+                    # el rechazo va como última línea y se descarta el resto
+                    error = {'error': str(e), 'reintentar_en': e.reintentar_en}
+                    self._enviar_trozo((json.dumps(error, ensure_ascii=False) + "\n").encode('utf-8'))
+                    self._descartar_cuerpo(cuerpo)
+                    break
+                except Exception as e:
+                    # Cualquier otro error (cuerpo mal formado, fallo del modelo): última
+                    # línea con el error y respuesta terminada; la conexión se cierra
+                    prefijo = "Cuerpo inválido" if isinstance(e, CuerpoInvalido) else "Error interno"
+                    error = {'error': f"{prefijo}: {type(e).__name__}: {e}"}
+                    self._enviar_trozo((json.dumps(error, ensure_ascii=False) + "\n").encode('utf-8'))
+                    self.close_connection = True
+                    break
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+def crear_servidor(servicio, host="127.0.0.1", puerto=PUERTO):
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorPuntuacion)
+    servidor.daemon_threads = True
+    servidor.servicio = servicio
+    return servidor
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio HTTP de puntuación NDJSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    parser.add_argument("--tam-lote", type=int, default=TAM_LOTE_SERVICIO)
+    parser.add_argument("--sin-transformers", action="store_true")
+    parser.add_argument("--rapido", action="store_true",
+                        help=f"Primer nivel con el modelo destilado ({RUTA_MODELO_RAPIDO})")
+    parser.add_argument("--min-resenas-s", type=float, default=None, help="Umbral de rendimiento para /listo")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="Umbral de latencia p95 para /listo")
+    args = parser.parse_args()
+
+    from autoajuste_hilos import preparar_hilos
+    from artefactos import cargar_modelo_y_tokenizer
+    preparar_hilos(args.modelo, autoajustar_si_falta=False)
+    inicio = time.perf_counter()
+    modelo, tokenizer = cargar_modelo_y_tokenizer(args.modelo)
+    analyzer = None if args.sin_transformers else cargar_analizador_transformers()
+    modelo_rapido = ModeloRapido.cargar(RUTA_MODELO_RAPIDO) if args.rapido else None
+
+    servicio = ServicioPuntuacion(modelo, tokenizer, analyzer, args.tam_lote, modelo_rapido=modelo_rapido)
+    servidor = crear_servidor(servicio, args.host, args.puerto)
+    print(f"✅ Modelo cargado en {time.perf_counter() - inicio:.1f} s · "
+          f"escuchando en http://{args.host}:{args.puerto} (POST /puntuar, GET /salud, GET /listo)")
+    # El sondeo corre con el servidor ya escuchando: /salud responde y /listo da 503 hasta que termine
+    umbrales = {nombre: valor for nombre, valor in
+                (('min_resenas_s', args.min_resenas_s), ('max_p95_ms', args.max_p95_ms)) if valor is not None}
+
+    def sondear():
+        sondeo = servicio.sondear(**umbrales)
+        print(f"✅ Listo para recibir tráfico (sondeo en {sondeo['duracion_s']:.1f} s)" if sondeo['listo']
+              else "❌ No listo: " + "; ".join(sondeo['problemas']), flush=True)
+    threading.Thread(target=sondear, daemon=True, name="sondeo").start()
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# Modo sombra: compara un motor candidato (otro .h5, un modelo compacto o
+# cuantizado...) con el vigente sobre el tráfico real sin tocar la respuesta.
+# Una muestra de las peticiones se copia a una cola acotada; un único hilo en
+# segundo plano las puntúa con el candidato y registra la diferencia de
+# puntuación, los cambios de veredicto y la latencia de los dos caminos.
+# El camino del usuario solo hace un sorteo y un put sin espera: si la cola está
+# llena la muestra se descarta, y el hilo se aparta mientras el control de
+# admisión tenga peticiones esperando.
+#
+# Uso: python sombra.py --candidato nuevo.h5 --textos resenas.txt [--modelo sentiment_cnn_bigru.h5]
+
+import argparse
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from nucleo import MODEL_PATH, analizar_resena, huella_texto
+
+# Ruta del modelo candidato (vacía: modo sombra desactivado)
+RUTA_MODELO_SOMBRA = os.environ.get("CINEMASCOPE_MODELO_SOMBRA", "")
+# Fracción de peticiones que se copian al candidato
+FRACCION_SOMBRA = float(os.environ.get("CINEMASCOPE_FRACCION_SOMBRA", 0.1))
+# Muestras pendientes como máximo (las que no caben se descartan)
+MAX_COLA_SOMBRA = 64
+# Comparaciones que se conservan para el informe
+MAX_REGISTROS_SOMBRA = 10000
+# Espera del hilo en segundo plano mientras la app está saturada (s)
+PAUSA_SATURACION = 0.05
+
+def _percentil(valores, p):
+    return round(float(np.percentile(valores, p)), 4) if len(valores) else None
+
+class ComparadorSombra:
+    """Puntúa en segundo plano una muestra de peticiones con el motor candidato"""
+
+    def __init__(self, modelo, tokenizer, fraccion=FRACCION_SOMBRA, analyzer_transformers=None,
+                 controlador=None, max_cola=MAX_COLA_SOMBRA, nombre="candidato"):
+        self.modelo = modelo
+        self.tokenizer = tokenizer
+        self.fraccion = fraccion
+        self.analyzer_transformers = analyzer_transformers
+        self.controlador = controlador
+        self.nombre = nombre
+        self._cola = queue.Queue(maxsize=max_cola)
+        self._registros = deque(maxlen=MAX_REGISTROS_SOMBRA)
+        self._lock = threading.Lock()
+        self.contadores = {'observadas': 0, 'muestreadas': 0, 'descartadas': 0, 'errores': 0}
+        self._hilo = threading.Thread(target=self._trabajar, name="modo-sombra", daemon=True)
+        self._hilo.start()
+
+    def _contar(self, contador):
+        with self._lock:
+            self.contadores[contador] += 1
+
+    def observar(self, texto, analisis, esperar=False):
+        """Camino del usuario: sortea la petición y, si toca, la encola sin esperar
+
+        'esperar' bloquea con la cola llena en lugar de descartar (reproducciones offline).
+        """
+        self._contar('observadas')
+        if analisis.get('descartado') or random.random() >= self.fraccion:
+            return False
+        try:
+            self._cola.put((texto, analisis), block=esperar)
+        except queue.Full:
+            self._contar('descartadas')
+            return False
+        self._contar('muestreadas')
+        return True
+
+    def _saturado(self):
+        if self.controlador is None:
+            return False
+        metricas = self.controlador.instantanea()
+        return metricas['en_espera'] > 0 or metricas['en_curso'] >= self.controlador.max_concurrentes
+
+    def _trabajar(self):
+        while True:
+            elemento = self._cola.get()
+            if elemento is None:
+                break
+            texto, principal = elemento
+            while self._saturado():
+                time.sleep(PAUSA_SATURACION)
+            # Mismas condiciones que el principal: con Transformers solo si él lo usó
+            analyzer = self.analyzer_transformers if principal['con_transformers'] else None
+            try:
+                inicio = time.perf_counter()
+                candidato = analizar_resena(texto, self.modelo, self.tokenizer, analyzer)
+                latencia = (time.perf_counter() - inicio) * 1000
+            except Exception:
+                self._contar('errores')
+                continue
+            if candidato.get('descartado'):
+                continue
+            self.registrar(principal, candidato, latencia)
+
+    def registrar(self, principal, candidato, latencia_candidato_ms):
+        with self._lock:
+            self._registros.append({
+                'texto_hash': principal.get('texto_hash') or huella_texto(principal['texto']),
+                'pred_principal': float(principal['pred_ensemble']),
+                'pred_candidato': float(candidato['pred_ensemble']),
+                'delta_modelo': float(candidato['pred_original']) - float(principal['pred_original']),
+                'delta_ensemble': float(candidato['pred_ensemble']) - float(principal['pred_ensemble']),
+                'cambio_veredicto': (principal['pred_ensemble'] > 0.5) != (candidato['pred_ensemble'] > 0.5),
+                'latencia_principal_ms': principal.get('tiempos_ms', {}).get('total'),
+                'latencia_candidato_ms': latencia_candidato_ms,
+            })
+
+    def registros(self):
+        with self._lock:
+            return list(self._registros)
+
+    def informe(self):
+        """Resumen de la comparación: diferencias, cambios de veredicto y latencias"""
+        registros = self.registros()
+        delta_modelo = np.array([r['delta_modelo'] for r in registros])
+        delta_ensemble = np.array([r['delta_ensemble'] for r in registros])
+        cambios = [r for r in registros if r['cambio_veredicto']]
+        principal = [r['latencia_principal_ms'] for r in registros if r['latencia_principal_ms'] is not None]
+        candidato = [r['latencia_candidato_ms'] for r in registros]
+        return {
+            'candidato': self.nombre,
+            'fraccion': self.fraccion,
+            **dict(self.contadores),
+            'pendientes': self._cola.qsize(),
+            'comparadas': len(registros),
+            'delta_modelo_medio': round(float(delta_modelo.mean()), 4) if len(registros) else None,
+            'delta_modelo_abs_p95': _percentil(np.abs(delta_modelo), 95),
+            'delta_ensemble_medio': round(float(delta_ensemble.mean()), 4) if len(registros) else None,
+            'delta_ensemble_abs_p95': _percentil(np.abs(delta_ensemble), 95),
+            'cambios_veredicto': len(cambios),
+            'tasa_cambio_veredicto': round(len(cambios) / len(registros), 4) if registros else None,
+            'a_positiva': sum(r['pred_candidato'] > 0.5 for r in cambios),
+            'a_negativa': sum(r['pred_candidato'] <= 0.5 for r in cambios),
+            'latencia_principal_p50_ms': _percentil(principal, 50),
+            'latencia_principal_p95_ms': _percentil(principal, 95),
+            'latencia_candidato_p50_ms': _percentil(candidato, 50),
+            'latencia_candidato_p95_ms': _percentil(candidato, 95),
+        }
+
+    def cerrar(self):
+        """Termina las muestras pendientes y detiene el hilo"""
+        self._cola.put(None)
+        self._hilo.join()
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduce reseñas con el modelo vigente y un candidato en sombra")
+    parser.add_argument("--candidato", required=True, help="Ruta al .h5 candidato")
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    parser.add_argument("--textos", required=True, help="Archivo con una reseña por línea")
+    parser.add_argument("--fraccion", type=float, default=1.0)
+    args = parser.parse_args()
+
+    from artefactos import cargar_modelo_y_tokenizer
+    modelo, tokenizer = cargar_modelo_y_tokenizer(args.modelo)
+    modelo_candidato, tokenizer_candidato = cargar_modelo_y_tokenizer(args.candidato)
+    sombra = ComparadorSombra(modelo_candidato, tokenizer_candidato, args.fraccion,
+                              nombre=os.path.basename(args.candidato))
+    with open(args.textos, encoding="utf-8") as f:
+        for linea in f:
+            if linea.strip():
+                sombra.observar(linea, analizar_resena(linea, modelo, tokenizer), esperar=True)
+    sombra.cerrar()
+    print(json.dumps(sombra.informe(), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
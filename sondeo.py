@@ -0,0 +1,200 @@
+# Autoprueba y sondeo de capacidad del modelo CNN+BiGRU.
+# Ejecuta lotes sintéticos de varios tamaños y longitudes (tokens reales antes
+# del relleno, con ids que el tokenizer puede producir) y mide reseñas/s y
+# percentiles de latencia por lote, el crecimiento de memoria del proceso
+# durante el sondeo, y que la salida sea válida y determinista para entradas
+# fijas (la misma predicción al repetir y al puntuar cada fila sola o en lote).
+# El resultado decide si el proceso está listo para recibir tráfico: la app lo
+# muestra con "🔧 Probar Modelo", servicio.py lo expone en GET /listo y la CLI
+# termina con código 0 (listo) o 1 (no listo) para la orquestación.
+#
+# Uso: python sondeo.py [--modelo sentiment_cnn_bigru.h5] [--completo] [--min-resenas-s N] [--max-p95-ms MS] [--json]
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from nucleo import MODEL_PATH, SEQUENCE_LENGTH, VOCAB_SIZE
+
+# Barrido completo (app y --completo)
+TAMANOS_SONDEO = (1, 8, 32, 128)
+LONGITUDES_SONDEO = (20, 100, SEQUENCE_LENGTH)
+REPETICIONES_SONDEO = 5
+# Comprobación de disponibilidad: lo mínimo para validar el modelo y su rendimiento
+TAMANOS_LISTO = (1, 32)
+LONGITUDES_LISTO = (SEQUENCE_LENGTH,)
+REPETICIONES_LISTO = 3
+# Filas de la comprobación de determinismo
+TAM_LOTE_DETERMINISMO = 8
+# Diferencia máxima al repetir la misma entrada, y entre una fila sola y en lote
+TOLERANCIA_REPETICION = 1e-6
+TOLERANCIA_LOTE = 1e-4
+# Umbrales de disponibilidad (0 = sin límite)
+MIN_RESENAS_S = float(os.environ.get("CINEMASCOPE_LISTO_MIN_RESENAS_S", 0))
+MAX_P95_MS = float(os.environ.get("CINEMASCOPE_LISTO_MAX_P95_MS", 0))
+
+def memoria_kib():
+    """RSS actual del proceso (KiB), o None si /proc no está disponible"""
+    try:
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith("VmRSS:"):
+                    return int(linea.split()[1])
+    except OSError:
+        pass
+    return None
+
+def ids_sinteticos(tokenizer):
+    """Ids de palabra que el tokenizer puede producir (válidos también para el modelo compacto)"""
+    limite = tokenizer.num_words or VOCAB_SIZE
+    ids = np.array(sorted(i for i in tokenizer.word_index.values() if i < limite), dtype=np.int32)
+    return ids if len(ids) else np.arange(1, SEQUENCE_LENGTH + 1, dtype=np.int32)
+
+def lote_sintetico(tamano, longitud, ids, rng):
+    """(tamano, SEQUENCE_LENGTH, 1) int32 con 'longitud' tokens y relleno al final"""
+    lote = np.zeros((tamano, SEQUENCE_LENGTH, 1), dtype=np.int32)
+    lote[:, :longitud, 0] = rng.choice(ids, size=(tamano, longitud))
+    return lote
+
+def comprobar_salida(modelo, ids, tamano=TAM_LOTE_DETERMINISMO, semilla=0):
+    """Forma, rango y determinismo de la salida para un lote fijo de longitudes variadas"""
+    rng = np.random.default_rng(semilla)
+    lote = np.zeros((tamano, SEQUENCE_LENGTH, 1), dtype=np.int32)
+    for fila, longitud in enumerate(np.linspace(1, SEQUENCE_LENGTH, tamano).astype(int)):
+        lote[fila, :longitud, 0] = rng.choice(ids, size=longitud)
+
+    primera = np.asarray(modelo.predict(lote, verbose=0))
+    segunda = np.asarray(modelo.predict(lote, verbose=0))
+    individuales = np.concatenate([np.asarray(modelo.predict(lote[i:i + 1], verbose=0)) for i in range(tamano)])
+
+    problemas = []
+    if primera.shape != (tamano, 1):
+        problemas.append(f"Salida con forma {primera.shape}, se esperaba {(tamano, 1)}")
+        return {'forma': list(primera.shape), 'problemas': problemas}
+    if not np.all(np.isfinite(primera)) or not np.all((primera >= 0) & (primera <= 1)):
+        problemas.append("Salida fuera de [0, 1] o no finita")
+    diferencia_repeticion = float(np.max(np.abs(primera - segunda)))
+    diferencia_lote = float(np.max(np.abs(primera - individuales)))
+    if diferencia_repeticion > TOLERANCIA_REPETICION:
+        problemas.append(f"Salida no determinista: |Δ| {diferencia_repeticion:.2e} al repetir la misma entrada")
+    if diferencia_lote > TOLERANCIA_LOTE:
+        problemas.append(f"La predicción depende del lote: |Δ| {diferencia_lote:.2e} entre fila sola y en lote")
+    return {
+        'forma': list(primera.shape),
+        'rango': [float(primera.min()), float(primera.max())],
+        'diferencia_repeticion': diferencia_repeticion,
+        'diferencia_lote_individual': diferencia_lote,
+        'determinista': diferencia_repeticion <= TOLERANCIA_REPETICION and diferencia_lote <= TOLERANCIA_LOTE,
+        'problemas': problemas,
+    }
+
+def medir_curvas(modelo, ids, tamanos, longitudes, repeticiones, semilla=0):
+    """Reseñas/s y latencia por lote para cada (longitud, tamaño de lote)"""
+    rng = np.random.default_rng(semilla)
+    curvas = []
+    for longitud in longitudes:
+        for tamano in tamanos:
+            lote = lote_sintetico(tamano, longitud, ids, rng)
+            # Calentamiento: la primera llamada con una forma nueva traza la función
+            modelo.predict(lote, verbose=0)
+            duraciones = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                modelo.predict(lote, verbose=0)
+                duraciones.append(time.perf_counter() - inicio)
+            p50, p95, p99 = np.percentile(np.array(duraciones) * 1000, [50, 95, 99])
+            curvas.append({
+                'tamano_lote': tamano,
+                'longitud': longitud,
+                'resenas_por_segundo': tamano * 1000 / p50,
+                'latencia_ms': {'p50': float(p50), 'p95': float(p95), 'p99': float(p99)},
+            })
+    return curvas
+
+def sondear(modelo, tokenizer, tamanos=TAMANOS_SONDEO, longitudes=LONGITUDES_SONDEO,
+            repeticiones=REPETICIONES_SONDEO, min_resenas_s=MIN_RESENAS_S, max_p95_ms=MAX_P95_MS):
+    """Informe de capacidad; 'listo' es False si algo falla o no alcanza los umbrales"""
+    from versiones import calentar
+    inicio = time.perf_counter()
+    memoria_inicial = memoria_kib()
+    problemas = []
+    curvas, salida = [], {}
+    try:
+        # Camino completo texto -> tokenizer -> modelo
+        calentar(modelo, tokenizer)
+        ids = ids_sinteticos(tokenizer)
+        curvas = medir_curvas(modelo, ids, tamanos, longitudes, repeticiones)
+        salida = comprobar_salida(modelo, ids)
+        problemas.extend(salida['problemas'])
+    except Exception as e:
+        problemas.append(f"{type(e).__name__}: {e}")
+    memoria_final = memoria_kib()
+
+    informe = {
+        'curvas': curvas,
+        'salida': salida,
+        'memoria_inicial_kib': memoria_inicial,
+        'memoria_final_kib': memoria_final,
+        'crecimiento_memoria_kib': (memoria_final - memoria_inicial) if memoria_inicial and memoria_final else None,
+    }
+    if curvas:
+        informe['resenas_por_segundo_max'] = max(c['resenas_por_segundo'] for c in curvas)
+        # Lo que ve una petición interactiva: el lote más pequeño
+        informe['latencia_p95_individual_ms'] = max(
+            c['latencia_ms']['p95'] for c in curvas if c['tamano_lote'] == min(tamanos))
+        if min_resenas_s and informe['resenas_por_segundo_max'] < min_resenas_s:
+            problemas.append(f"Rendimiento {informe['resenas_por_segundo_max']:.1f} reseñas/s < {min_resenas_s:g}")
+        if max_p95_ms and informe['latencia_p95_individual_ms'] > max_p95_ms:
+            problemas.append(f"Latencia p95 {informe['latencia_p95_individual_ms']:.1f} ms > {max_p95_ms:g} ms")
+    informe['listo'] = not problemas
+    informe['problemas'] = problemas
+    informe['duracion_s'] = time.perf_counter() - inicio
+    return informe
+
+def sondear_listo(modelo, tokenizer, **umbrales):
+    """sondear() reducido para comprobaciones de disponibilidad (unos segundos)"""
+    return sondear(modelo, tokenizer, TAMANOS_LISTO, LONGITUDES_LISTO, REPETICIONES_LISTO, **umbrales)
+
+def main():
+    parser = argparse.ArgumentParser(description="Autoprueba y capacidad del modelo; código 0 si está listo")
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    parser.add_argument("--completo", action="store_true", help="Barrido completo de tamaños y longitudes")
+    parser.add_argument("--min-resenas-s", type=float, default=MIN_RESENAS_S)
+    parser.add_argument("--max-p95-ms", type=float, default=MAX_P95_MS)
+    parser.add_argument("--json", action="store_true", help="Informe JSON en la salida estándar")
+    args = parser.parse_args()
+
+    from artefactos import cargar_modelo_y_tokenizer
+    umbrales = {'min_resenas_s': args.min_resenas_s, 'max_p95_ms': args.max_p95_ms}
+    try:
+        modelo, tokenizer = cargar_modelo_y_tokenizer(args.modelo)
+    except Exception as e:
+        informe = {'listo': False, 'problemas': [f"No se pudo cargar el modelo: {type(e).__name__}: {e}"]}
+    else:
+        informe = (sondear(modelo, tokenizer, **umbrales) if args.completo
+                   else sondear_listo(modelo, tokenizer, **umbrales))
+
+    if args.json:
+        print(json.dumps(informe, ensure_ascii=False, indent=2))
+    else:
+        if informe.get('curvas'):
+            print(f"{'lote':>6}{'longitud':>10}{'reseñas/s':>12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+            for c in informe['curvas']:
+                print(f"{c['tamano_lote']:>6}{c['longitud']:>10}{c['resenas_por_segundo']:>12.1f}"
+                      f"{c['latencia_ms']['p50']:>9.1f}{c['latencia_ms']['p95']:>9.1f}{c['latencia_ms']['p99']:>9.1f}")
+        if informe.get('salida', {}).get('forma'):
+            salida = informe['salida']
+            print(f"\nDeterminismo: |Δ| al repetir {salida.get('diferencia_repeticion', float('nan')):.1e} · "
+                  f"fila sola frente a lote {salida.get('diferencia_lote_individual', float('nan')):.1e}")
+        if informe.get('crecimiento_memoria_kib') is not None:
+            print(f"Memoria: {informe['memoria_inicial_kib'] / 1024:.0f} -> {informe['memoria_final_kib'] / 1024:.0f} MiB "
+                  f"(+{informe['crecimiento_memoria_kib'] / 1024:.1f} MiB)")
+        print("✅ Listo" if informe['listo'] else "❌ No listo: " + "; ".join(informe['problemas']))
+    sys.exit(0 if informe['listo'] else 1)
+
+if __name__ == "__main__":
+    main()
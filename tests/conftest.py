@@ -0,0 +1,8 @@
+# Las pruebas importan los módulos de la raíz y los sustitutos de benchmarks/
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "benchmarks"))
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
@@ -0,0 +1,102 @@
+# Pruebas de admision.ControladorAdmision: turnos FIFO, degradación y rechazo
+import threading
+import time
+
+import pytest
+
+from admision import ControladorAdmision, AnalisisRechazado
+
+def esperar(condicion, limite=5.0):
+    fin = time.monotonic() + limite
+    while not condicion():
+        assert time.monotonic() < fin, "la condición no se cumplió a tiempo"
+        time.sleep(0.005)
+
+def en_espera(controlador):
+    return controlador.instantanea()['en_espera']
+
+def lanzar_en_cola(controlador, resultados, etiqueta):
+    """Hilo que espera turno, anota el permiso y libera; vuelve cuando ya está en la cola"""
+    antes = en_espera(controlador)
+
+    def trabajador():
+        try:
+            permiso = controlador.adquirir()
+        except AnalisisRechazado as e:
+            resultados.append((etiqueta, e))
+            return
+        resultados.append((etiqueta, permiso))
+        controlador.liberar()
+
+    hilo = threading.Thread(target=trabajador)
+    hilo.start()
+    esperar(lambda: en_espera(controlador) > antes)
+    return hilo
+
+def test_turnos_por_orden_de_llegada():
+    controlador = ControladorAdmision(max_concurrentes=1, max_en_espera=10, tiempo_max_espera=5.0)
+    ocupado = controlador.adquirir()
+    resultados = []
+    hilos = [lanzar_en_cola(controlador, resultados, i) for i in range(6)]
+    controlador.liberar()
+    for hilo in hilos:
+        hilo.join()
+    assert [etiqueta for etiqueta, _ in resultados] == list(range(6))
+    assert not ocupado.degradado
+
+def test_recien_llegado_no_se_cuela():
+    controlador = ControladorAdmision(max_concurrentes=1, max_en_espera=10, tiempo_max_espera=5.0)
+    controlador.adquirir()
+    resultados = []
+    hilo = lanzar_en_cola(controlador, resultados, "en cola")
+    controlador.liberar()
+    # Con alguien esperando, un recién llegado va detrás aunque haya hueco
+    hilo.join()
+    with controlador.admitir():
+        resultados.append(("recien llegado", None))
+    assert [etiqueta for etiqueta, _ in resultados] == ["en cola", "recien llegado"]
+
+def test_degrada_segun_la_cola_al_llegar():
+    controlador = ControladorAdmision(max_concurrentes=1, max_en_espera=4, tiempo_max_espera=5.0,
+                                      fraccion_degradacion=0.25)
+    assert controlador.umbral_degradacion == 1
+    controlador.adquirir()
+    resultados = []
+    hilos = [lanzar_en_cola(controlador, resultados, i) for i in range(3)]
+    controlador.liberar()
+    for hilo in hilos:
+        hilo.join()
+    assert [permiso.degradado for _, permiso in resultados] == [False, True, True]
+    assert controlador.instantanea()['degradados'] == 2
+
+def test_rechaza_con_la_cola_llena():
+    controlador = ControladorAdmision(max_concurrentes=1, max_en_espera=1, tiempo_max_espera=5.0)
+    controlador.adquirir()
+    resultados = []
+    hilo = lanzar_en_cola(controlador, resultados, "en cola")
+    with pytest.raises(AnalisisRechazado) as rechazo:
+        controlador.adquirir()
+    assert rechazo.value.motivo == "cola llena"
+    assert rechazo.value.reintentar_en >= 1.0
+    controlador.liberar()
+    hilo.join()
+    metricas = controlador.instantanea()
+    assert metricas['rechazados_cola_llena'] == 1
+    assert metricas['admitidos'] == 2
+
+def test_rechaza_por_tiempo_y_cede_el_turno():
+    controlador = ControladorAdmision(max_concurrentes=1, max_en_espera=4, tiempo_max_espera=0.5)
+    controlador.adquirir()
+    resultados = []
+    primero = lanzar_en_cola(controlador, resultados, "primero")
+    time.sleep(0.25)
+    segundo = lanzar_en_cola(controlador, resultados, "segundo")
+    # El primero agota su espera; su turno abandonado no bloquea al segundo
+    primero.join()
+    controlador.liberar()
+    segundo.join()
+    etiqueta, error = resultados[0]
+    assert etiqueta == "primero" and isinstance(error, AnalisisRechazado)
+    assert error.motivo == "tiempo de espera agotado"
+    assert resultados[1][0] == "segundo" and not isinstance(resultados[1][1], AnalisisRechazado)
+    assert controlador.instantanea()['rechazados_tiempo'] == 1
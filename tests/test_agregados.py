@@ -0,0 +1,60 @@
+# Pruebas de los agregados incrementales: la fusión Welford/Chan del UPSERT
+# debe coincidir con el cálculo directo sobre todas las reseñas
+import sqlite3
+
+import numpy as np
+import pytest
+
+import agregados
+from confianza import indice_nivel
+
+@pytest.fixture
+def conexion():
+    conexion = sqlite3.connect(":memory:")
+    conexion.row_factory = sqlite3.Row
+    agregados.crear_esquema(conexion)
+    yield conexion
+    conexion.close()
+
+def registros(preds, pelicula_id="tt1", confianzas=None):
+    confianzas = confianzas if confianzas is not None else [None] * len(preds)
+    return [{'pelicula_id': pelicula_id, 'pred_ensemble': float(p), 'confianza': c}
+            for p, c in zip(preds, confianzas)]
+
+def test_resumir_lote_welford():
+    preds = [0.9, 0.2, 0.7, 0.51, 0.5]
+    resumen = agregados.resumir_lote(registros(preds) + [{'pelicula_id': None, 'pred_ensemble': 0.9}])
+    n, positivas, negativas, media, m2 = resumen["tt1"][:5]
+    assert (n, positivas, negativas) == (5, 3, 2)
+    assert media == pytest.approx(np.mean(preds))
+    assert m2 == pytest.approx(np.var(preds) * len(preds))
+    assert list(resumen) == ["tt1"]
+
+def test_lotes_sucesivos_igual_que_todo_junto(conexion):
+    rng = np.random.default_rng(0)
+    preds = rng.random(500)
+    confianzas = rng.uniform(60, 100, len(preds))
+    # Lotes de tamaños desiguales, incluido uno de una sola reseña
+    cortes = [0, 1, 7, 120, 121, 380, 500]
+    for inicio, fin in zip(cortes, cortes[1:]):
+        agregados.aplicar_lote(conexion, registros(preds[inicio:fin], confianzas=confianzas[inicio:fin]))
+
+    resumen = agregados.consultar_pelicula(conexion, "tt1")
+    assert resumen['n'] == len(preds)
+    assert resumen['positivas'] == int((preds > 0.5).sum())
+    assert resumen['negativas'] == int((preds <= 0.5).sum())
+    assert resumen['media'] == pytest.approx(preds.mean(), rel=1e-12)
+    assert resumen['varianza'] == pytest.approx(preds.var(ddof=1), rel=1e-9)
+    assert resumen['porcentaje_positivas'] == pytest.approx(100 * (preds > 0.5).mean())
+    histograma = np.bincount([indice_nivel(c) for c in confianzas], minlength=len(agregados.COLUMNAS_NIVEL))
+    assert list(resumen['histograma'].values()) == histograma.tolist()
+
+def test_peliculas_independientes(conexion):
+    agregados.aplicar_lote(conexion, registros([0.9, 0.8], "a") + registros([0.1], "b"))
+    agregados.aplicar_lote(conexion, registros([0.2], "a"))
+    a = agregados.consultar_pelicula(conexion, "a")
+    b = agregados.consultar_pelicula(conexion, "b")
+    assert (a['n'], a['positivas'], a['negativas']) == (3, 2, 1)
+    assert (b['n'], b['varianza']) == (1, 0.0)
+    assert agregados.consultar_pelicula(conexion, "c") is None
+    assert [r['pelicula_id'] for r in agregados.listar_peliculas(conexion, minimo_resenas=2)] == ["a"]
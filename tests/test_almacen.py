@@ -0,0 +1,69 @@
+# Pruebas del almacén: lecturas tras la cola de escritura y reutilización de
+# las conexiones de lectura entre hilos (cada ejecución de Streamlit usa uno nuevo)
+import threading
+
+import pytest
+
+import almacen
+from almacen import AlmacenAnalisis
+
+def registro(i):
+    return {
+        'creado_en': float(i), 'texto_hash': f"{i:064d}", 'longitud': 10, 'pred_original': 0.9,
+        'pred_ensemble': 0.8, 'boost_consenso': 0.0, 'boost_palabras': 0.0, 'boost_intensidad': 0.0,
+        'palabras_encontradas': '["great"]', 'confianza': 90.0, 'nivel_confianza': "🚀 Muy Alta",
+        'con_transformers': 0, 'version_modelo': "m1", 'version_lexico': "l1",
+    }
+
+@pytest.fixture
+def almacen_temporal(tmp_path, monkeypatch):
+    aperturas = []
+    abrir = almacen.abrir_conexion
+
+    def abrir_contando(ruta, lectura=False):
+        aperturas.append(lectura)
+        return abrir(ruta, lectura)
+
+    monkeypatch.setattr(almacen, "abrir_conexion", abrir_contando)
+    instancia = AlmacenAnalisis(str(tmp_path / "almacen.db"), intervalo=0.05)
+    yield instancia, aperturas
+    instancia.cerrar()
+
+def test_guardar_y_buscar(almacen_temporal):
+    instancia, _ = almacen_temporal
+    for i in range(5):
+        assert instancia.guardar(registro(i))
+    assert instancia.vaciar()
+    encontrado = instancia.buscar(f"{3:064d}", "m1", "l1", False)
+    assert encontrado['pred_ensemble'] == 0.8 and encontrado['palabras_encontradas'] == ("great",)
+    assert instancia.buscar(f"{3:064d}", "m2", "l1", False) is None
+    assert [r['creado_en'] for r in instancia.recientes(limite=2)] == [4.0, 3.0]
+
+def test_lecturas_reutilizan_conexiones(almacen_temporal):
+    instancia, aperturas = almacen_temporal
+    instancia.guardar(registro(0))
+    instancia.vaciar()
+
+    # Hilos de corta vida uno tras otro, como las ejecuciones de Streamlit
+    for _ in range(20):
+        hilo = threading.Thread(target=instancia.buscar, args=(f"{0:064d}", "m1", "l1", False))
+        hilo.start()
+        hilo.join()
+    assert aperturas.count(True) == 1
+
+    # En paralelo se abren las que hagan falta, pero solo se conservan unas pocas
+    barrera = threading.Barrier(8)
+    encontrados = []
+
+    def consultar():
+        barrera.wait()
+        for _ in range(20):
+            encontrados.append(instancia.buscar(f"{0:064d}", "m1", "l1", False) is not None)
+
+    hilos = [threading.Thread(target=consultar) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(encontrados) == 160 and all(encontrados)
+    assert instancia._lectores.qsize() <= almacen.MAX_CONEXIONES_LECTURA
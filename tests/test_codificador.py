@@ -0,0 +1,57 @@
+# Pruebas de nucleo.CodificadorLote: mismas secuencias que texts_to_sequences
+# + pad_sequences del tokenizer de Keras, también escribiendo en un buffer
+import numpy as np
+import pytest
+from tensorflow.keras.preprocessing.sequence import pad_sequences
+from tensorflow.keras.preprocessing.text import Tokenizer
+
+import nucleo
+from bench_carga import generar_resena
+
+CASOS_LIMITE = ["", "!!! ???", "zzz qqq", "GREAT\tfilm\nbut\r\nslow", "   ", "a " * 500,
+                "Café “great”, naïve—BAD!", "  The movie, the PLOT... the end  "]
+
+def secuencia_keras(texto, tokenizer):
+    """Camino de referencia por reseña (el anterior a CodificadorLote)"""
+    texto = texto.lower().strip()
+    secuencia = tokenizer.texts_to_sequences([texto])
+    if not secuencia or not secuencia[0]:
+        palabras = texto.split()
+        secuencia = [[min(i + 1, nucleo.VOCAB_SIZE - 1) for i in range(len(palabras))]]
+    secuencia = pad_sequences(secuencia, maxlen=nucleo.SEQUENCE_LENGTH, padding='post', truncating='post')
+    return np.expand_dims(secuencia, axis=-1).astype('int32')
+
+def textos_prueba(n=200):
+    rng = np.random.default_rng(0)
+    return CASOS_LIMITE + [generar_resena(int(k), rng) for k in rng.choice([15, 60, 400], size=n)]
+
+def tokenizer_sin_oov():
+    tokenizer = Tokenizer(num_words=20, filters='!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n')
+    tokenizer.fit_on_texts(["the movie film great awful plot acting story the the movie"] * 3
+                           + ["boring wonderful cast director music scene ending"])
+    return tokenizer
+
+@pytest.mark.parametrize("tokenizer", [nucleo.crear_tokenizer(), tokenizer_sin_oov()], ids=["oov", "sin_oov"])
+def test_igual_que_texts_to_sequences(tokenizer):
+    textos = textos_prueba()
+    esperado = np.concatenate([secuencia_keras(t, tokenizer) for t in textos])
+    obtenido = nucleo.CodificadorLote(tokenizer).codificar(textos)
+    assert obtenido.dtype == np.int32 and obtenido.shape == (len(textos), nucleo.SEQUENCE_LENGTH, 1)
+    assert np.array_equal(obtenido, esperado)
+
+def test_buffer_reutilizado_se_limpia():
+    tokenizer = nucleo.crear_tokenizer()
+    textos = textos_prueba(40)
+    buffer = nucleo.buffer_secuencias(16)
+    # Un lote largo y después uno corto: no deben quedar ids del anterior
+    nucleo.codificar_lote(textos[-16:], tokenizer, buffer)
+    vista = nucleo.codificar_lote(textos[:5], tokenizer, buffer)
+    assert vista.shape[0] == 5 and np.shares_memory(vista, buffer)
+    assert np.array_equal(vista, np.concatenate([secuencia_keras(t, tokenizer) for t in textos[:5]]))
+
+def test_texto_a_secuencia_cacheada_solo_lectura():
+    tokenizer = nucleo.crear_tokenizer()
+    secuencia = nucleo.texto_a_secuencia("  A GREAT movie!  ", tokenizer)
+    assert np.array_equal(secuencia, secuencia_keras("A great movie!", tokenizer))
+    assert nucleo.texto_a_secuencia("a great movie!", tokenizer) is secuencia
+    assert not secuencia.flags.writeable
@@ -0,0 +1,70 @@
+# Pruebas de la fórmula de confianza y de los calibradores
+import numpy as np
+import pytest
+
+from confianza import (CONFIANZA_MAXIMA, CONFIANZA_MINIMA, NIVELES_CONFIANZA, CalibradorConfianza,
+                       ajustar_histograma, ajustar_isotonica, calcular_confianza, calcular_confianza_lote)
+
+def test_lote_igual_que_escalar():
+    rng = np.random.default_rng(0)
+    pred = np.r_[rng.random(200), 0.5, 0.45, 0.55, 0.35, 0.65, 0.0, 1.0]
+    consenso = rng.uniform(-5, 10, len(pred))
+    transformers = rng.random(len(pred)) > 0.5
+    palabras = rng.integers(0, 3, len(pred))
+    confianza, indices = calcular_confianza_lote(pred, consenso, 1.0, 2.0, transformers, palabras)
+    for i, p in enumerate(pred):
+        esperada, nivel, _ = calcular_confianza(p, consenso[i], 1.0, 2.0, transformers[i], palabras[i])
+        assert abs(confianza[i] - esperada) < 1e-9
+        assert NIVELES_CONFIANZA[indices[i]][1] == nivel
+    assert confianza.min() >= CONFIANZA_MINIMA and confianza.max() <= CONFIANZA_MAXIMA
+
+def datos_sinteticos(n=5000, semilla=0):
+    """Predicciones cuya probabilidad de acierto crece con la distancia a 0.5"""
+    rng = np.random.default_rng(semilla)
+    pred = rng.random(n)
+    acierto = rng.random(n) < 0.5 + np.abs(pred - 0.5)
+    etiquetas = np.where(acierto, pred > 0.5, pred <= 0.5).astype(int)
+    return pred, etiquetas
+
+def test_histograma_monotono():
+    pred, etiquetas = datos_sinteticos()
+    calibrador = ajustar_histograma(pred, etiquetas, n_intervalos=10)
+    assert calibrador.metodo == "histograma" and len(calibrador.valores) == 10
+    assert np.all(np.diff(calibrador.valores) >= 0)
+    assert 0 <= calibrador.valores.min() and calibrador.valores.max() <= 100
+    # Cerca de la neutralidad ~50% de aciertos; en los extremos ~100%
+    assert abs(calibrador.transformar(0.5) - 50) < 10
+    assert calibrador.transformar(0.999) > 90
+
+def test_isotonica_fusiona_violaciones():
+    # Distancias 0.1..0.4; el fallo en 0.2 viola la monotonía y se fusiona con 0.1
+    pred = np.array([0.6, 0.7, 0.8, 0.9])
+    etiquetas = np.array([1, 0, 1, 1])
+    calibrador = ajustar_isotonica(pred, etiquetas)
+    assert calibrador.metodo == "isotonica"
+    assert np.allclose(calibrador.bordes, [0.0, 0.3, 0.4])
+    assert np.allclose(calibrador.valores, [50.0, 100.0, 100.0])
+    assert np.allclose(calibrador.transformar([0.5, 0.75, 0.85, 1.0]), [50.0, 50.0, 100.0, 100.0])
+
+def test_isotonica_sin_datos():
+    with pytest.raises(ValueError, match="al menos un ejemplo"):
+        ajustar_isotonica([], [])
+
+def test_isotonica_monotona_y_simetrica():
+    pred, etiquetas = datos_sinteticos(semilla=1)
+    calibrador = ajustar_isotonica(pred, etiquetas)
+    assert calibrador.bordes[0] == 0.0
+    assert np.all(np.diff(calibrador.valores) >= 0)
+    # Solo cuenta la distancia a la neutralidad
+    assert calibrador.transformar(0.9) == calibrador.transformar(0.1)
+
+def test_guardar_y_cargar(tmp_path):
+    pred, etiquetas = datos_sinteticos(semilla=2)
+    calibrador = ajustar_isotonica(pred, etiquetas)
+    ruta = tmp_path / "calibracion.npz"
+    calibrador.guardar(ruta)
+    cargado = CalibradorConfianza.cargar(ruta)
+    assert cargado.metodo == "isotonica"
+    muestras = np.linspace(0, 1, 101)
+    assert np.array_equal(cargado.transformar(muestras), calibrador.transformar(muestras))
+    assert cargado.calcular(0.97) == calibrador.calcular(0.97)
@@ -0,0 +1,58 @@
+# Pruebas del modelo destilado: la predicción individual y la del lote deben
+# coincidir, y analizar_lote_rapido() debe decidir igual que analizar_rapido()
+import numpy as np
+import pytest
+
+from destilacion import (ModeloRapido, analizar_lote_rapido, analizar_rapido, caracteristicas,
+                         entrenar)
+
+POSITIVAS = ["great wonderful film, loved it", "brilliant acting and a superb story",
+             "an amazing, moving masterpiece", "excellent cast, I enjoyed every minute"]
+NEGATIVAS = ["awful boring terrible waste", "the worst plot, dreadful acting",
+             "a stupid, disappointing mess", "horrible script and a boring ending"]
+TEXTOS = POSITIVAS + NEGATIVAS + [
+    "", "the film", "great but boring", "LOVED IT!!!",
+    "Esta película fue una de las mejores que he visto en años y la actuación fue excelente de principio a fin",
+]
+
+@pytest.fixture(scope="module")
+def modelo():
+    textos = POSITIVAS * 10 + NEGATIVAS * 10
+    objetivos = np.r_[np.full(len(POSITIVAS) * 10, 0.99), np.full(len(NEGATIVAS) * 10, 0.01)]
+    return entrenar(caracteristicas(textos), objetivos)
+
+def test_individual_igual_que_lote(modelo):
+    lote = modelo.predecir_lote(TEXTOS)
+    for texto, prediccion in zip(TEXTOS, lote):
+        assert modelo.predecir(texto) == pytest.approx(float(prediccion), abs=1e-6), texto
+    assert lote[0] > 0.5 and lote[len(POSITIVAS)] < 0.5
+
+def test_guardar_y_cargar(modelo, tmp_path):
+    ruta = str(tmp_path / "modelo_rapido.npz")
+    modelo.guardar(ruta)
+    cargado = ModeloRapido.cargar(ruta)
+    assert np.allclose(cargado.predecir_lote(TEXTOS), modelo.predecir_lote(TEXTOS))
+
+def test_lote_decide_igual_que_individual(modelo):
+    completos = []
+
+    def analizar_completo(textos):
+        completos.append(list(textos))
+        return [{'texto': texto, 'nivel': 'completo'} for texto in textos]
+
+    margen = 0.3
+    resultados = analizar_lote_rapido(TEXTOS, modelo, analizar_completo, margen)
+    assert [r['texto'] for r in resultados] == TEXTOS
+    esperados_completos = []
+    for texto, resultado in zip(TEXTOS, resultados):
+        individual = analizar_rapido(texto, modelo, margen)
+        if resultado['nivel'] == 'rapido':
+            assert individual is not None
+            assert resultado['pred_ensemble'] == pytest.approx(individual['pred_ensemble'], abs=1e-6)
+            assert resultado['pred_original'] is None
+            assert resultado['confianza'] == pytest.approx(individual['confianza'], abs=1e-3)
+        else:
+            esperados_completos.append(texto)
+    # Las dudosas y las que no pasan el filtro de idioma van juntas, en orden
+    assert completos == [esperados_completos]
+    assert TEXTOS[-1] in esperados_completos and "" in esperados_completos
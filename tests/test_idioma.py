@@ -0,0 +1,45 @@
+# Pruebas del filtro de idioma: reseñas vacías, cortas y umbrales de rechazo
+import idioma
+from idioma import evaluar_entrada, detectar_idioma
+
+ESPANOL_MEDIO = "La película fue muy aburrida y larga"
+ESPANOL_LARGO = ("Esta película fue una de las mejores que he visto en años y la actuación "
+                 "fue excelente de principio a fin, de verdad")
+INGLES_LARGO = ("This movie was one of the best films I have seen in years and the acting "
+                "was great from start to finish, really")
+
+def test_sin_texto_no_es_apta():
+    for texto in ("", "   ", "!!! 123 ???"):
+        evaluacion = evaluar_entrada(texto)
+        assert not evaluacion['apta'] and evaluacion['motivo'] == 'vacia'
+
+def test_resenas_inglesas_cortas_pasan():
+    for texto in ("Masterpiece.", "Loved it", "Boring", "La La Land rocks"):
+        assert evaluar_entrada(texto)['apta'], texto
+
+def test_por_debajo_del_minimo_de_trigramas_se_da_por_ingles():
+    _, _, n = detectar_idioma("Muy buena")
+    assert n < idioma.MIN_TRIGRAMAS_RECHAZO
+    assert evaluar_entrada("Muy buena") == {'apta': True, 'idioma': 'en', 'motivo': None, 'mensaje': None}
+
+def test_rechaza_otros_idiomas():
+    for texto in (ESPANOL_MEDIO, ESPANOL_LARGO):
+        evaluacion = evaluar_entrada(texto)
+        assert not evaluacion['apta'] and evaluacion['motivo'] == 'idioma'
+        assert evaluacion['idioma'] == 'es'
+    assert evaluar_entrada(INGLES_LARGO)['apta']
+
+def test_margen_segun_longitud(monkeypatch):
+    _, _, n_medio = detectar_idioma(ESPANOL_MEDIO)
+    _, _, n_largo = detectar_idioma(ESPANOL_LARGO)
+    assert idioma.MIN_TRIGRAMAS_RECHAZO <= n_medio < idioma.TRIGRAMAS_TEXTO_LARGO <= n_largo
+    # Con pocos trigramas se exige el margen corto; el largo usa MARGEN_RECHAZO
+    monkeypatch.setattr(idioma, "MARGEN_RECHAZO_CORTO", 10.0)
+    assert evaluar_entrada(ESPANOL_MEDIO)['apta']
+    assert not evaluar_entrada(ESPANOL_LARGO)['apta']
+    monkeypatch.setattr(idioma, "MARGEN_RECHAZO", 10.0)
+    assert evaluar_entrada(ESPANOL_LARGO)['apta']
+
+def test_minimo_de_trigramas(monkeypatch):
+    monkeypatch.setattr(idioma, "MIN_TRIGRAMAS_RECHAZO", 1000)
+    assert evaluar_entrada(ESPANOL_LARGO)['apta']
@@ -0,0 +1,46 @@
+# Pruebas del cambio de modelo en caliente (versiones.GestorModelos) con los
+# sustitutos diminutos de benchmarks/bench_cambio_modelo.py
+import os
+import time
+
+import nucleo
+from versiones import GestorModelos
+from bench_carga import ModeloSustituto
+from bench_cambio_modelo import ejecutar_cambio, invariantes
+
+def test_cambio_en_caliente():
+    fallos = invariantes(ejecutar_cambio(hilos=2, segundos=3.0, dim=8, intervalo=0.1))
+    assert not fallos, fallos
+
+def test_vigilancia_sobrevive_a_errores(tmp_path):
+    """Un error que no es OSError/ValueError al cargar no detiene la vigilancia"""
+    ruta = os.path.join(tmp_path, "modelo.h5")
+    with open(ruta, "wb") as f:
+        f.write(b"a")
+    tokenizer = nucleo.crear_tokenizer()
+    cargas = []
+
+    def cargador(_):
+        cargas.append(1)
+        if len(cargas) > 1:
+            raise TypeError("capa desconocida")
+        return ModeloSustituto(dim=8), tokenizer
+
+    gestor = GestorModelos(ruta, cargador=cargador, intervalo=0.05).cargar().vigilar()
+    version_a = gestor.version
+    try:
+        with open(ruta, "wb") as f:
+            f.write(b"b")
+        limite = time.perf_counter() + 10
+        while gestor.ultimo_error is None and time.perf_counter() < limite:
+            time.sleep(0.05)
+        time.sleep(0.2)
+        estado = gestor.instantanea()
+        assert estado['ultimo_error'].startswith("TypeError"), estado
+        assert estado['vigilando'] and gestor.version == version_a
+        # La versión fallida no se reintenta en cada vuelta
+        assert len(cargas) == 2
+        with gestor.usar() as version:
+            nucleo.analizar_resena("A solid, enjoyable film.", version.modelo, version.tokenizer)
+    finally:
+        gestor.detener()
@@ -0,0 +1,200 @@
+# Cambio del modelo en caliente, sin reiniciar la app.
+# La versión de un modelo es la huella de su .h5 (version_modelo), la misma que
+# indexa los artefactos convertidos (artefactos.py) y el almacén de análisis.
+# Un hilo en segundo plano vigila la ruta del modelo; cuando aparece una versión
+# nueva la carga, la calienta con unas predicciones y la publica con un solo
+# cambio de referencia. Cada petición fija la versión vigente al empezar
+# (GestorModelos.usar()) y termina con ella aunque entre tanto se publique otra;
+# la versión retirada se suelta en cuanto acaba su última petición.
+#
+# Para desplegar, el .h5 nuevo se copia junto al actual y se renombra encima
+# (os.replace), de forma que nunca se lea un archivo a medio escribir.
+
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+import nucleo
+from nucleo import MODEL_PATH, version_modelo, codificar_lote
+
+# Segundos entre comprobaciones de la ruta del modelo
+INTERVALO_VIGILANCIA = float(os.environ.get("CINEMASCOPE_INTERVALO_MODELO", 5.0))
+
+# Textos con los que se calienta (y se valida) una versión antes de publicarla
+TEXTOS_CALENTAMIENTO = (
+    "This movie is absolutely brilliant, the acting was superb!",
+    "Boring, predictable and a complete waste of time.",
+    "The film was okay, nothing special.",
+)
+
+class VersionModelo:
+    """Modelo y tokenizer de una versión, con el número de peticiones que la usan"""
+
+    def __init__(self, version, modelo, tokenizer):
+        self.version = version
+        self.modelo = modelo
+        self.tokenizer = tokenizer
+        self.en_uso = 0
+        self.retirada = False
+        self.publicada_en = None
+
+def calentar(modelo, tokenizer, textos=TEXTOS_CALENTAMIENTO):
+    """Primeras predicciones (trazado, reserva de memoria); falla si la salida no es válida"""
+    secuencias = codificar_lote(textos, tokenizer)
+    # Una llamada por lote y otra individual: las dos formas que usa la app
+    for x in (secuencias, secuencias[:1]):
+        pred = np.asarray(modelo.predict(x, verbose=0))
+        if pred.shape != (len(x), 1) or not np.all((pred >= 0) & (pred <= 1)):
+            raise ValueError(f"Salida inesperada del modelo: forma {pred.shape}")
+
+class GestorModelos:
+    """Versión vigente del modelo, cambiable en caliente
+
+    'cargador' recibe la ruta y devuelve (modelo, tokenizer); por defecto
+    artefactos.cargar_modelo_y_tokenizer.
+    """
+
+    def __init__(self, ruta=MODEL_PATH, cargador=None, intervalo=INTERVALO_VIGILANCIA):
+        if cargador is None:
+            from artefactos import cargar_modelo_y_tokenizer as cargador
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self._cargador = cargador
+        self._lock = threading.Lock()
+        self._vigente = None
+        self._retiradas = []
+        self._firma = None     # (mtime, tamaño) de la última lectura del archivo
+        self._fallida = None   # versión que no pudo cargarse (no se reintenta)
+        self._parar = threading.Event()
+        self._hilo = None
+        self.cambios = 0
+        self.liberadas = 0
+        self.ultimo_error = None
+
+    @property
+    def version(self):
+        vigente = self._vigente
+        return vigente.version if vigente else None
+
+    def _firma_archivo(self):
+        estado = os.stat(self.ruta)
+        return estado.st_mtime_ns, estado.st_size
+
+    def _preparar(self, version):
+        """Carga y calienta la versión fuera del lock: las peticiones siguen con la vigente"""
+        modelo, tokenizer = self._cargador(self.ruta)
+        # Si el archivo cambió mientras se cargaba, lo cargado puede no ser 'version'
+        if version_modelo(self.ruta) != version:
+            raise OSError("El modelo cambió durante la carga")
+        calentar(modelo, tokenizer)
+        return VersionModelo(version, modelo, tokenizer)
+
+    def _publicar(self, nueva):
+        nueva.publicada_en = time.time()
+        with self._lock:
+            anterior, self._vigente = self._vigente, nueva
+            liberar = False
+            if anterior is not None:
+                self.cambios += 1
+                anterior.retirada = True
+                liberar = anterior.en_uso == 0
+                if not liberar:
+                    self._retiradas.append(anterior)
+        if liberar:
+            self._liberar(anterior)
+
+    def _liberar(self, version):
+        version.modelo = version.tokenizer = None
+        with self._lock:
+            self.liberadas += 1
+        # Las cachés de secuencias y codificadores guardan referencias al tokenizer retirado
+        nucleo._secuencia_cacheada.cache_clear()
+        nucleo.codificador.cache_clear()
+        gc.collect()
+
+    def cargar(self):
+        """Carga síncrona de la versión actual de la ruta (arranque)"""
+        self._firma = self._firma_archivo()
+        self._publicar(self._preparar(version_modelo(self.ruta)))
+        return self
+
+    def comprobar(self):
+        """Publica la versión del archivo si es nueva; True si hubo cambio.
+        Nunca lanza: el error queda en 'ultimo_error' y el hilo de vigilancia sigue."""
+        version = None
+        try:
+            firma = self._firma_archivo()
+            if firma == self._firma:
+                return False
+            version = version_modelo(self.ruta)
+            self._firma = firma
+            if version in (self.version, self._fallida):
+                return False
+            nueva = self._preparar(version)
+        except OSError as e:
+            # Archivo ausente o cambiando: se sigue con la vigente y se reintenta
+            self.ultimo_error = f"{type(e).__name__}: {e}"
+            self._firma = None
+            return False
+        except Exception as e:
+            # Modelo inválido (ValueError de calentar, TypeError de Keras, errores
+            # de TensorFlow...): se sigue con la vigente y no se reintenta esta versión
+            self.ultimo_error = f"{type(e).__name__}: {e}"
+            self._fallida = version
+            return False
+        self._publicar(nueva)
+        self.ultimo_error = None
+        return True
+
+    @contextmanager
+    def usar(self):
+        """Fija la versión vigente durante una petición"""
+        with self._lock:
+            version = self._vigente
+            if version is None:
+                raise RuntimeError("No hay ninguna versión del modelo cargada")
+            version.en_uso += 1
+        try:
+            yield version
+        finally:
+            with self._lock:
+                version.en_uso -= 1
+                liberar = version.retirada and version.en_uso == 0 and version in self._retiradas
+                if liberar:
+                    self._retiradas.remove(version)
+            if liberar:
+                self._liberar(version)
+
+    def vigilar(self):
+        """Comprueba la ruta cada 'intervalo' segundos en un hilo en segundo plano"""
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._bucle, name="vigilancia-modelo", daemon=True)
+            self._hilo.start()
+        return self
+
+    def _bucle(self):
+        while not self._parar.wait(self.intervalo):
+            self.comprobar()
+
+    def detener(self):
+        self._parar.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+    def instantanea(self):
+        with self._lock:
+            return {
+                'version': self.version,
+                'publicada_en': self._vigente.publicada_en if self._vigente else None,
+                'en_uso': self._vigente.en_uso if self._vigente else 0,
+                'retiradas_en_uso': {v.version: v.en_uso for v in self._retiradas},
+                'cambios': self.cambios,
+                'liberadas': self.liberadas,
+                'ultimo_error': self.ultimo_error,
+                'vigilando': self._hilo is not None and self._hilo.is_alive(),
+            }